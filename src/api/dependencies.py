@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
+import logging
 from collections.abc import Iterable
 from pathlib import Path
 from typing import Annotated
 
 from fastapi import Depends
+from sqlalchemy import Engine, inspect, text
 from sqlmodel import Session, SQLModel, create_engine
 
 from service.projectdb import get_projectdb_client
 from service.projectdb_client import ProjectDBClient
+from utils.logging import log_event
 
 # Ensure the driveoff data directory exists
 (Path.home() / ".driveoff").mkdir(exist_ok=True)
@@ -25,6 +28,49 @@ engine = create_engine(DB_URL, connect_args=connect_args, echo=False)
 def create_db_and_tables() -> None:
     """Create database tables for archive submissions and retrievals."""
     SQLModel.metadata.create_all(engine)
+    add_missing_columns(engine)
+
+
+def add_missing_columns(bind: Engine) -> list[str]:
+    """Add columns the models gained since an existing database was created.
+
+    ``create_all`` only creates missing tables, so a database created by an
+    earlier release keeps its old columns and every query of a new field
+    fails.  Each model column missing from its table is added with
+    ``ALTER TABLE ... ADD COLUMN``; running this again adds nothing.  Only
+    nullable columns can be added this way, existing rows reading NULL.
+
+    Returns:
+        The ``table.column`` names that were added.
+
+    Raises:
+        RuntimeError: If a missing column is ``NOT NULL``.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    added: list[str] = []
+    with bind.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"Cannot add NOT NULL column {table.name}.{column.name} to an existing table")
+                column_type = column.type.compile(dialect=bind.dialect)
+                preparer = bind.dialect.identifier_preparer
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {preparer.format_table(table)} "
+                        f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                    )
+                )
+                added.append(f"{table.name}.{column.name}")
+    if added:
+        log_event(logging.INFO, "db.columns_added", columns=added)
+    return added
 
 
 def get_session() -> Iterable[Session]:
@@ -15,7 +15,7 @@ from fastapi.responses import JSONResponse
 from api.cors import add_cors_middleware
 from api.dependencies import create_db_and_tables, engine
 from api.routers import drives, retrievals, submissions
-from service.activescale import init_activescale
+from service.activescale import init_activescale, shutdown_activescale
 from service.projectdb import init_projectdb
 from utils.job_reconciliation import (
     reconcile_interrupted_archiving_jobs,
@@ -63,6 +63,7 @@ async def lifespan(app_instance: FastAPI) -> AsyncGenerator[None]:
         )
 
     yield
+    shutdown_activescale()
     engine.dispose()
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from datetime import datetime
 from typing import Any, cast
@@ -128,6 +129,7 @@ def create_retrieval(
         drive_name=drive_name,
         submission_id=submission.id,
         destination_path=request.destination_path,
+        include_paths_json=json.dumps(request.include_paths) if request.include_paths is not None else None,
         stage=RetrievalJobStage.QUEUED,
         started_timestamp=now,
         last_updated_timestamp=now,
@@ -148,6 +150,7 @@ def create_retrieval(
         retrieval_id=retrieval.id,
         drive_name=drive_name,
         destination_path=request.destination_path,
+        include_paths=request.include_paths,
         submission_id=submission.id,
     )
 
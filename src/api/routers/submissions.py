@@ -109,12 +109,15 @@ def _upsert_submission(
         existing_submission.retention_period_years = request.retention_period_years
         existing_submission.retention_period_justification = request.retention_period_justification
         existing_submission.data_classification = request.data_classification
+        existing_submission.archive_codec = request.archive_codec
         existing_submission.failure_reason = None
         existing_submission.failed_timestamp = None
         existing_submission.archive_file_key = None
         existing_submission.archive_object_prefix = None
         existing_submission.archive_manifest_key = None
         existing_submission.archive_part_keys_json = None
+        existing_submission.archive_part_sha256_json = None
+        existing_submission.archive_multipart_upload_json = None
         existing_submission.archive_part_count = None
         existing_submission.archive_total_bytes = None
         submission = existing_submission
@@ -126,6 +129,7 @@ def _upsert_submission(
             retention_period_years=request.retention_period_years,
             retention_period_justification=request.retention_period_justification,
             data_classification=request.data_classification,
+            archive_codec=request.archive_codec,
         )
 
     now = datetime.now()
@@ -4,10 +4,13 @@ import os
 import tempfile
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from models.common import ArchiveCodec, ArchivePartLayout
+
 
 def get_env_file() -> list[Path]:
     """Given the mode this app should run in, return the dotenv files
@@ -41,7 +44,35 @@ class Settings(BaseSettings):
     activescale_connect_timeout: int = 5
     activescale_read_timeout: int = 15
     activescale_retry_attempts: int = 2
+    # Seconds an upload may go without transferring any bytes before it is given up.
     activescale_upload_timeout: int = 120
+    # Archive parts uploaded in parallel (each with its verification and retention).
+    activescale_upload_concurrency: int = 4
+    # Send each archive part's SHA-256 with its upload so the server validates it on receipt.
+    activescale_upload_checksums_enabled: bool = True
+    # Upload large archive parts as multipart uploads that a retry resumes from the last stored chunk.
+    activescale_resumable_part_uploads_enabled: bool = True
+    # Send object lock retention with each upload instead of a PutObjectRetention call after it.
+    activescale_inline_object_lock_enabled: bool = True
+    # Objects at least this large are transferred as multipart uploads / ranged GETs.
+    activescale_multipart_threshold_bytes: int = 64 * 1024 * 1024
+    # Size of each multipart chunk (the auto-tuner may raise it for large objects).
+    activescale_multipart_chunk_size_bytes: int = 64 * 1024 * 1024
+    # Chunks of a single object transferred in parallel (upper bound when auto-tuning).
+    activescale_transfer_max_concurrency: int = 8
+    # Pooled HTTP connections per S3 client; keep >= concurrency to avoid pool waits.
+    activescale_max_pool_connections: int = 32
+    # TCP send/receive buffer sizes for S3 connections; None keeps the OS default.
+    activescale_socket_send_buffer_bytes: int | None = None
+    activescale_socket_receive_buffer_bytes: int | None = None
+    # Adapt chunk size and concurrency to object size and measured throughput.
+    activescale_transfer_autotune_enabled: bool = False
+    # Tries per byte range of a ranged download before the download fails.
+    activescale_download_range_attempts: int = 3
+    # Seconds between health checks of a pooled S3 client before it is lent out.
+    activescale_client_health_check_interval: int = 300
+    # Seconds an unused pooled S3 client is kept before it is closed.
+    activescale_client_idle_timeout: int = 900
     log_level: str = "INFO"
     log_to_file_enabled: bool = False
     log_file_path: str = "logs/driveoff.log"
@@ -60,14 +91,72 @@ class Settings(BaseSettings):
     # Chunked tar packaging settings for very large archives. Defaults to 512 MiB.
     archive_chunk_size_bytes: int = 512 * 1024 * 1024
     archive_chunk_manifest_file_name: str = "archive-manifest.json"
+    # Compression codec for chunked archives: "gzip" (tar.gz) or "zstd" (tar.zst).
+    # A submission may override this with its own archive_codec.
+    archive_codec: ArchiveCodec = ArchiveCodec.GZIP
+    # Compression level for the archive codec. None uses the codec default (gzip 9, zstd 3).
+    archive_compression_level: int | None = None
+    # Threads used to compress the tar stream: parallel gzip blocks (pigz-style)
+    # or zstd worker threads. 1 keeps single-threaded compression.
+    archive_compression_workers: int = 1
+    # Upload each archive part as soon as it is sealed, while compression continues,
+    # and delete it locally once stored. Local scratch then holds at most
+    # archive_pipeline_max_pending_parts queued parts plus the part being written.
+    archive_pipelined_upload_enabled: bool = False
+    archive_pipeline_max_pending_parts: int = 2
+    # Stream each archive part straight into an S3 multipart upload instead of writing
+    # it to archive_temp_base_path (takes precedence over pipelined upload). Memory use
+    # is bounded by the chunk size (5 MiB - 5 GiB, at most 10,000 chunks per part).
+    archive_streaming_upload_enabled: bool = False
+    archive_stream_upload_chunk_size_bytes: int = 64 * 1024 * 1024
+    # Compute the BagIt manifests while the payload is tarred instead of in a separate
+    # bagging pass, so each source file is read once. The bag written to the drive is
+    # the same; its manifests are only copied out once packaging finishes.
+    archive_fused_bagging_enabled: bool = False
+    # Threads used to checksum files when creating and validating BagIt bags.
+    bagit_checksum_workers: int = 4
+    # SQLite cache of payload checksums keyed by path, size, mtime and inode, so
+    # re-bagging a drive on retry only hashes new or changed files. None disables it.
+    bagit_checksum_cache_path: str | None = "~/.driveoff/checksum-cache.db"
+    # How packaged archives are verified: "post" re-reads and decompresses every part
+    # after packaging; "inline" decompresses the stream on a background thread while
+    # it is written, avoiding the second read. Inline is always used when parts are uploaded
+    # during packaging (pipelined or streaming upload), as they are not kept for a later read.
+    archive_verification_mode: Literal["post", "inline"] = "post"
+    # "stream" splits one compressed stream into byte slices; "independent" makes each
+    # part its own gzip member / zstd frame (the concatenation is still a valid archive)
+    # so parts can be verified and extracted in parallel, without reassembly.
+    archive_part_layout: ArchivePartLayout = ArchivePartLayout.STREAM
+    # Threads used for post-packaging verification of independent parts.
+    archive_verify_workers: int = 4
+    # Write a member offset index next to the manifest so single files or directories
+    # can be retrieved by restoring only the parts that hold them. Needs the
+    # "independent" part layout; ignored (with a warning) otherwise.
+    archive_member_index_enabled: bool = False
     # ActiveScale bucket used for all archive storage
     activescale_bucket_name: str = "research-archive-test"
     # Number of days to request an object restore for (tape/archival tier)
     activescale_restore_days: int = 3
-    # How often to poll for restore completion, in seconds
+    # Longest wait between restore completion checks, in seconds (checks back off up to it)
     activescale_restore_poll_interval_seconds: int = 60
     # Maximum total time to wait for a restore to complete, in seconds (default 24 h)
     activescale_restore_poll_max_seconds: int = 86400
+    # Restore requests and readiness checks sent in parallel
+    activescale_restore_workers: int = 8
+    # Threads used to extract retrieved archives: one per part with the independent part
+    # layout; otherwise file writers fed by a single decoding thread (1 = plain extractall).
+    retrieval_extract_workers: int = 4
+    # Archive parts downloaded at once during a retrieval (each one is also fetched
+    # as concurrent ranged GETs); a part starts downloading as soon as it is restored.
+    retrieval_download_workers: int = 4
+    # Stream-layout retrievals extract while parts download; downloads run at most this
+    # many parts ahead of the extractor, bounding scratch usage to this many parts.
+    retrieval_max_local_parts: int = 4
+    # Size budget of the local cache of verified archive parts (under archive_temp_base_path)
+    # that retrievals and their retries reuse instead of restoring and downloading the
+    # parts again. Least recently used parts are evicted first. The cache is kept on the
+    # scratch volume on top of retrieval_max_local_parts, so it is off (0) unless enabled.
+    retrieval_part_cache_max_bytes: int = 0
     # Object retention (object lock COMPLIANCE mode) - (default True).
     # Set to False in TEST environments so objects can be deleted quickly.
     activescale_enable_object_retention: bool = True
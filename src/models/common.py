@@ -55,3 +55,22 @@ class DataClassification(StrEnum):
     INTERNAL = "Internal"
     SENSITIVE = "Sensitive"
     RESTRICTED = "Restricted"
+
+
+class ArchiveCodec(StrEnum):
+    """Compression codecs available for chunked tar archives."""
+
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class ArchivePartLayout(StrEnum):
+    """How a chunked tar archive is divided into parts.
+
+    ``stream`` parts are raw byte slices of one compressed stream.
+    ``independent`` parts are each a complete gzip member / zstd frame that
+    starts on a tar block boundary, so each part can be decoded on its own.
+    """
+
+    STREAM = "stream"
+    INDEPENDENT = "independent"
@@ -5,7 +5,7 @@ from __future__ import annotations
 from pydantic import BaseModel, field_validator
 from sqlmodel import SQLModel
 
-from models.common import DataClassification, ResearchDriveName
+from models.common import ArchiveCodec, DataClassification, ResearchDriveName
 from models.retrieval import RetrievalJobStage
 from models.submission import ArchiveJobStage
 
@@ -19,6 +19,7 @@ class CreateSubmissionRequest(SQLModel):
     data_classification: DataClassification = DataClassification.SENSITIVE
     project_id: int | None = None
     force: bool = False
+    archive_codec: ArchiveCodec | None = None
 
     @field_validator("retention_period_years")
     @classmethod
@@ -53,6 +54,22 @@ class CreateRetrievalRequest(SQLModel):
     """Request body for starting an archive retrieval job."""
 
     destination_path: str
+    # Paths relative to the archived drive (e.g. "data/results") to retrieve on their
+    # own, each with everything below it. None retrieves the whole archive.
+    include_paths: list[str] | None = None
+
+    @field_validator("include_paths")
+    @classmethod
+    def check_include_paths(cls, v: list[str] | None) -> list[str] | None:
+        """Reject empty filter lists and paths that escape the archive root."""
+        if v is None:
+            return v
+        if not v:
+            raise ValueError("include_paths must not be empty; omit it to retrieve the whole archive.")
+        for path in v:
+            if ".." in path.split("/"):
+                raise ValueError(f"include_paths entry must not contain '..': {path}")
+        return v
 
 
 class PatchRetrievalRequest(BaseModel):
@@ -6,7 +6,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from models.common import DataClassification
+from models.common import ArchiveCodec, DataClassification
 from models.retrieval import RetrievalJobStage
 from models.submission import ArchiveJobStage
 
@@ -119,6 +119,7 @@ class SubmissionResponse(BaseModel):
     archive_part_keys_json: str | None
     archive_part_count: int | None
     archive_total_bytes: int | None
+    archive_codec: ArchiveCodec | None = None
 
 
 class RetrievalResponse(BaseModel):
@@ -130,7 +131,10 @@ class RetrievalResponse(BaseModel):
     drive_name: str
     submission_id: int
     destination_path: str
+    include_paths_json: str | None = None
     stage: RetrievalJobStage
+    restore_part_count: int | None = None
+    restored_part_count: int | None = None
     failure_reason: str | None
     started_timestamp: datetime | None
     last_updated_timestamp: datetime | None
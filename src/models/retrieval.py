@@ -62,6 +62,15 @@ class ArchiveRetrieval(SQLModel, table=True):
     # parts that are already on disk if the task is ever restarted mid-download.
     retrieved_part_keys_json: str | None = Field(default=None)
 
+    # Restore progress: parts the retrieval needs and how many of them are
+    # available for download so far (None until restore requests are sent).
+    restore_part_count: int | None = Field(default=None)
+    restored_part_count: int | None = Field(default=None)
+
+    # Partial retrieval: JSON-encoded list of archive-relative paths to extract.
+    # None retrieves the whole archive.
+    include_paths_json: str | None = Field(default=None)
+
     # Timestamps
     started_timestamp: datetime | None = Field(default=None)
     last_updated_timestamp: datetime | None = Field(default=None)
@@ -7,7 +7,7 @@ from enum import StrEnum
 
 from sqlmodel import Field, SQLModel
 
-from models.common import DataClassification
+from models.common import ArchiveCodec, DataClassification
 
 
 class ArchiveJobStage(StrEnum):
@@ -63,6 +63,10 @@ class ArchiveSubmission(SQLModel, table=True):
     retention_period_years: int
     retention_period_justification: str | None = Field(default=None)
     data_classification: DataClassification
+    archive_codec: ArchiveCodec | None = Field(
+        default=None,
+        description="Compression codec requested for this archive; None uses the archive_codec setting",
+    )
 
     # Archive upload metadata (optional, only populated after upload attempt)
     archive_file_key: str | None = Field(default=None, description="S3 path where archive was uploaded")
@@ -78,6 +82,14 @@ class ArchiveSubmission(SQLModel, table=True):
         default=None,
         description="JSON-encoded ordered list of uploaded part object keys",
     )
+    archive_part_sha256_json: str | None = Field(
+        default=None,
+        description="JSON-encoded sha256 of each streamed part object, keyed by part key, recorded as it is stored",
+    )
+    archive_multipart_upload_json: str | None = Field(
+        default=None,
+        description="JSON-encoded UploadId and part ETags of the in-progress streamed multipart upload",
+    )
     archive_part_count: int | None = Field(default=None)
     archive_total_bytes: int | None = Field(default=None)
 
@@ -99,3 +111,26 @@ class ArchiveSubmission(SQLModel, table=True):
     # Cleanup outcome (populated after the cleanup block runs)
     cleanup_succeeded: bool | None = Field(default=None)
     cleanup_error: str | None = Field(default=None)
+
+
+class ArchivePartUpload(SQLModel, table=True):
+    """Resumable multipart upload of one archive part object.
+
+    A row exists while the upload can be resumed; it is deleted once the part
+    object is complete or the upload is aborted.
+    """
+
+    id: int | None = Field(default=None, primary_key=True)
+    submission_id: int | None = Field(default=None, foreign_key="archivesubmission.id", index=True)
+    object_key: str = Field(index=True, unique=True)
+    upload_id: str
+    part_etags_json: str = Field(
+        default="[]",
+        description="JSON-encoded part numbers and ETags of the chunks uploaded so far",
+    )
+    object_locked: bool = Field(default=False)
+    checksum_algorithm: str | None = Field(
+        default=None,
+        description="Checksum algorithm the upload was created with; every chunk must carry one",
+    )
+    last_updated_timestamp: datetime | None = Field(default=None)
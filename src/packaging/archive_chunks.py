@@ -6,9 +6,25 @@ import hashlib
 import json
 import os
 import tarfile
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO, cast
+from typing import Any, BinaryIO, cast
+
+from models.common import ArchiveCodec, ArchivePartLayout
+from packaging.archive_codecs import (
+    DECOMPRESSION_ERRORS,
+    archive_format_for_codec,
+    open_compressed_writer,
+    open_decompressed_reader,
+    resolve_compression_level,
+)
+from packaging.archive_verification import InlineTarVerifier, count_tar_members
+from packaging.independent_parts import has_independent_layout, verify_independent_tar_parts
+from packaging.member_index import MemberIndexEntry, MemberIndexWriter
+from packaging.tar_extraction import extract_members
+
+_READ_BLOCK_SIZE = 1024 * 1024
 
 
 @dataclass
@@ -19,6 +35,27 @@ class ArchivePartInfo:
     file_name: str
     size_bytes: int
     sha256: str
+    #: Independent part layout only: the uncompressed tar range held by this part
+    #: and the offset (relative to ``tar_offset``) of the first header starting in it.
+    tar_offset: int | None = None
+    tar_size: int | None = None
+    first_member_offset: int | None = None
+    #: Base64 ``ChecksumSHA256`` the object store confirmed when the part was uploaded.
+    s3_checksum_sha256: str | None = None
+
+    @classmethod
+    def from_manifest_entry(cls, entry: dict[str, Any]) -> ArchivePartInfo:
+        """Build part info from an ``archive-manifest.json`` ``parts`` entry."""
+        return cls(
+            index=int(entry["index"]),
+            file_name=str(entry["file_name"]),
+            size_bytes=int(entry["size_bytes"]),
+            sha256=str(entry["sha256"]),
+            tar_offset=entry.get("tar_offset"),
+            tar_size=entry.get("tar_size"),
+            first_member_offset=entry.get("first_member_offset"),
+            s3_checksum_sha256=entry.get("s3_checksum_sha256"),
+        )
 
 
 @dataclass
@@ -28,18 +65,44 @@ class ChunkedArchiveResult:
     parts: list[ArchivePartInfo]
     total_bytes: int
     manifest_path: Path
+    #: Tar member count confirmed by inline verification, or ``None`` if it was not run.
+    verified_member_count: int | None = None
+    #: Member offset index sidecar, if one was requested.
+    member_index_path: Path | None = None
 
 
 class _SplitPartWriter:  # pylint: disable=too-many-instance-attributes
-    """Write byte streams into sequentially numbered part files."""
+    """Write byte streams into sequentially numbered part files.
 
-    def __init__(self, output_dir: Path, base_name: str, part_size_bytes: int) -> None:
+    Splitting, hashing and part bookkeeping live here; where the bytes of each
+    part go is delegated to the ``_open_part_sink`` / ``_write_part_sink`` /
+    ``_close_part_sink`` hooks, which write local files by default.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        base_name: str,
+        part_size_bytes: int,
+        archive_format: str = "tar.gz",
+        on_part_finalized: Callable[[ArchivePartInfo], None] | None = None,
+        verifier: InlineTarVerifier | None = None,
+        split_by_size: bool = True,
+    ) -> None:
         """Initialise the writer.
 
         Args:
             output_dir: Directory where part files will be written.
             base_name: Stem used to derive part file names.
             part_size_bytes: Maximum number of bytes per part file.
+            archive_format: Format infix used in part file names (e.g. ``tar.zst``).
+            on_part_finalized: Optional callback invoked with each part once its
+                file is complete and fsynced.  It runs on the writing thread, so
+                blocking in it applies back-pressure to packaging.
+            verifier: Optional inline verifier that receives a copy of every
+                byte written, in order.
+            split_by_size: Roll over to a new part every *part_size_bytes*.  When
+                False the caller ends parts explicitly with :meth:`seal_part`.
         """
 
         if part_size_bytes <= 0:
@@ -48,9 +111,14 @@ class _SplitPartWriter:  # pylint: disable=too-many-instance-attributes
         self.output_dir = output_dir
         self.base_name = base_name
         self.part_size_bytes = part_size_bytes
+        self.archive_format = archive_format
+        self._on_part_finalized = on_part_finalized
+        self._verifier = verifier
+        self._split_by_size = split_by_size
 
         self._parts: list[ArchivePartInfo] = []
         self._current_fp: BinaryIO | None = None
+        self._current_file_name: str | None = None
         self._current_index = 0
         self._current_size = 0
         self._current_hasher: hashlib._Hash | None = None
@@ -66,6 +134,11 @@ class _SplitPartWriter:  # pylint: disable=too-many-instance-attributes
         """Get the total number of bytes written across all parts."""
         return self._total_bytes
 
+    @property
+    def current_part_bytes(self) -> int:
+        """Get the number of bytes written to the part currently open."""
+        return self._current_size
+
     def writable(self) -> bool:
         """Indicate whether this object supports writing."""
         return True
@@ -84,25 +157,28 @@ class _SplitPartWriter:  # pylint: disable=too-many-instance-attributes
         """
         if not data:
             return 0
+        if self._verifier is not None:
+            self._verifier.feed(data)
 
         start = 0
         data_len = len(data)
         while start < data_len:
-            if self._current_fp is None:
+            if self._current_file_name is None:
                 self._open_new_part()
 
-            assert self._current_fp is not None
             assert self._current_hasher is not None
-            remaining = self.part_size_bytes - self._current_size
-            chunk = data[start : start + remaining]
-            self._current_fp.write(chunk)
+            if self._split_by_size:
+                chunk = data[start : start + self.part_size_bytes - self._current_size]
+            else:
+                chunk = data[start:]
+            self._write_part_sink(chunk)
             self._current_hasher.update(chunk)
             written = len(chunk)
             self._current_size += written
             self._total_bytes += written
             start += written
 
-            if self._current_size >= self.part_size_bytes:
+            if self._split_by_size and self._current_size >= self.part_size_bytes:
                 self._finalize_current_part()
 
         return data_len
@@ -114,56 +190,223 @@ class _SplitPartWriter:  # pylint: disable=too-many-instance-attributes
 
     def close(self) -> None:
         """Finalise and close the current part file, if one is open."""
-        if self._current_fp is not None:
+        if self._current_file_name is not None:
             self._finalize_current_part()
 
+    def seal_part(self, *, tar_offset: int, tar_size: int, first_member_offset: int | None) -> None:
+        """Finalise the current part, recording the uncompressed tar range it holds.
+
+        Used with ``split_by_size=False`` by the independent part layout.
+        """
+        if self._current_file_name is not None:
+            self._finalize_current_part(
+                tar_offset=tar_offset,
+                tar_size=tar_size,
+                first_member_offset=first_member_offset,
+            )
+
     def __enter__(self) -> _SplitPartWriter:
         return self
 
     def __exit__(self, exc_type: type[BaseException] | None, *_: object) -> None:
-        self.close()
-        if exc_type is not None:
-            # Archive creation failed; delete every part file written so far
-            # so that the output directory is clean for a retry.
-            for part in self._parts:
-                (self.output_dir / part.file_name).unlink(missing_ok=True)
+        if exc_type is None:
+            self.close()
+            return
+        # Archive creation failed: drop the partial trailing part instead of
+        # finalising it, then discard the parts written so far.
+        if self._current_file_name is not None:
+            self._abort_part_sink()
+            self._current_file_name = None
+        self._discard_parts()
 
     def _open_new_part(self) -> None:
-        """Open the next numbered part file, ready to receive data.
+        """Open the next numbered part, ready to receive data.
 
         The caller is responsible for finalising any current part before
-        calling this method.  This method only ever opens a new file.
+        calling this method.  This method only ever opens a new part.
         """
         self._current_index += 1
         self._current_hasher = hashlib.sha256()
+        self._current_file_name = f"{self.base_name}.{self.archive_format}.part-{self._current_index:05d}"
+        self._open_part_sink(self._current_file_name)
+
+    def _finalize_current_part(
+        self,
+        *,
+        tar_offset: int | None = None,
+        tar_size: int | None = None,
+        first_member_offset: int | None = None,
+    ) -> None:
+        """Close the current part's sink and record its :class:`ArchivePartInfo`."""
+        assert self._current_file_name is not None
+        assert self._current_hasher is not None
 
-        file_name = f"{self.base_name}.tar.gz.part-{self._current_index:05d}"
-        file_path = self.output_dir / file_name
+        self._close_part_sink()
+        part = ArchivePartInfo(
+            index=self._current_index,
+            file_name=self._current_file_name,
+            size_bytes=self._current_size,
+            sha256=self._current_hasher.hexdigest(),
+            tar_offset=tar_offset,
+            tar_size=tar_size,
+            first_member_offset=first_member_offset,
+        )
+        self._parts.append(part)
+
+        self._current_file_name = None
+        self._current_hasher = None
+        self._current_size = 0
+
+        if self._on_part_finalized is not None:
+            try:
+                self._on_part_finalized(part)
+            except BaseException:
+                # Packaging is being aborted; later (trailing) parts must not be handed off.
+                self._on_part_finalized = None
+                raise
+
+    def _open_part_sink(self, file_name: str) -> None:
+        """Open the local part file *file_name* in ``output_dir``."""
         self._current_fp = open(  # noqa: SIM115  # pylint: disable=consider-using-with
-            file_path, "wb"
+            self.output_dir / file_name, "wb"
         )
 
-    def _finalize_current_part(self) -> None:
-        """Flush, close, and record :class:`ArchivePartInfo` for the current part."""
+    def _write_part_sink(self, chunk: bytes) -> None:
+        """Append *chunk* to the current part file."""
         assert self._current_fp is not None
-        assert self._current_hasher is not None
+        self._current_fp.write(chunk)
 
-        file_name = Path(self._current_fp.name).name
+    def _close_part_sink(self) -> None:
+        """Flush, fsync and close the current part file."""
+        assert self._current_fp is not None
         self._current_fp.flush()
         os.fsync(self._current_fp.fileno())
         self._current_fp.close()
-        self._parts.append(
-            ArchivePartInfo(
-                index=self._current_index,
-                file_name=file_name,
-                size_bytes=self._current_size,
-                sha256=self._current_hasher.hexdigest(),
+        self._current_fp = None
+
+    def _abort_part_sink(self) -> None:
+        """Close and delete the partially written current part file."""
+        assert self._current_fp is not None
+        self._current_fp.close()
+        self._current_fp = None
+        assert self._current_file_name is not None
+        (self.output_dir / self._current_file_name).unlink(missing_ok=True)
+
+    def _discard_parts(self) -> None:
+        """Delete every part file written so far after archive creation failed.
+
+        Leaves the output directory clean for a retry.
+        """
+        for part in self._parts:
+            (self.output_dir / part.file_name).unlink(missing_ok=True)
+
+
+class _IndependentPartStream:  # pylint: disable=too-many-instance-attributes
+    """Uncompressed tar sink that compresses each archive part as a self-contained member.
+
+    Bytes are compressed into the current part with a fresh gzip member / zstd
+    frame.  Once the part holds *part_size_bytes* of compressed output the
+    compressor is finished on the next tar block boundary and the part is
+    sealed, so parts may run over the target by the compressor's final flush.
+    Concatenated, the parts are still one valid multi-member ``.tar.gz`` /
+    multi-frame ``.tar.zst``.
+    """
+
+    def __init__(
+        self,
+        writer: _SplitPartWriter,
+        codec: ArchiveCodec,
+        *,
+        compression_level: int | None,
+        compression_workers: int,
+        member_index: MemberIndexWriter | None = None,
+    ) -> None:
+        self._writer = writer
+        self._codec = codec
+        self._compression_level = compression_level
+        self._compression_workers = compression_workers
+        self._compressor: BinaryIO | None = None
+        self._offset = 0
+        self._part_start = 0
+        self._first_member_offset: int | None = None
+        self._member_index = member_index
+
+    def writable(self) -> bool:
+        """Indicate whether this object supports writing."""
+        return True
+
+    def tell(self) -> int:
+        """Return the uncompressed tar offset; :mod:`tarfile` records member offsets from it."""
+        return self._offset
+
+    def member_started(self, tarinfo: tarfile.TarInfo) -> None:
+        """Note that the header of *tarinfo* is about to be written at the current offset."""
+        if self._first_member_offset is None:
+            self._first_member_offset = self._offset - self._part_start
+        if self._member_index is not None:
+            # The header lands in the part currently open (or the next one to open).
+            self._member_index.add(
+                MemberIndexEntry(
+                    path=tarinfo.name,
+                    size=tarinfo.size,
+                    mtime=int(tarinfo.mtime),
+                    part_index=len(self._writer.parts) + 1,
+                    compressed_offset=self._writer.total_bytes - self._writer.current_part_bytes,
+                    uncompressed_offset=self._offset,
+                )
+            )
+
+    def write(self, data: bytes) -> int:
+        """Compress *data* into the current part, sealing it once it is full."""
+        if not data:
+            return 0
+        if self._compressor is None:
+            self._compressor = open_compressed_writer(
+                cast(BinaryIO, self._writer),
+                self._codec,
+                level=self._compression_level,
+                workers=self._compression_workers,
             )
+        self._compressor.write(data)
+        self._offset += len(data)
+        if self._writer.current_part_bytes >= self._writer.part_size_bytes and self._offset % tarfile.BLOCKSIZE == 0:
+            self._seal()
+        return len(data)
+
+    def flush(self) -> None:
+        """Nothing to flush: parts are only written out when sealed."""
+
+    def close(self) -> None:
+        """Seal the trailing part."""
+        self._seal()
+
+    def abort(self) -> None:
+        """Drop the compressor after packaging failed."""
+        abort = getattr(self._compressor, "abort", None)
+        if abort is not None:
+            abort()
+        self._compressor = None
+
+    def _seal(self) -> None:
+        if self._compressor is None:
+            return
+        self._compressor.close()
+        self._compressor = None
+        self._writer.seal_part(
+            tar_offset=self._part_start,
+            tar_size=self._offset - self._part_start,
+            first_member_offset=self._first_member_offset,
         )
+        self._part_start = self._offset
+        self._first_member_offset = None
 
-        self._current_fp = None
-        self._current_hasher = None
-        self._current_size = 0
+
+class _MemberOffsetTarFile(tarfile.TarFile):
+    """TarFile that tells an :class:`_IndependentPartStream` where each member starts."""
+
+    def addfile(self, tarinfo: tarfile.TarInfo, fileobj: Any = None) -> None:
+        cast(_IndependentPartStream, self.fileobj).member_started(tarinfo)
+        super().addfile(tarinfo, fileobj)
 
 
 class _ChainReader:
@@ -172,15 +415,42 @@ class _ChainReader:
     Presents a file-like ``read()`` interface so the concatenated byte stream
     can be passed directly to :func:`tarfile.open` without first assembling a
     single file on disk.
+
+    With *verify*, each part's size and sha256 are computed as it is read and
+    checked against its :class:`ArchivePartInfo` when its last byte has been
+    read.  With *delete_consumed*, each part file is removed once fully read.
+    *before_part* is called with each part before its file is opened (it may
+    block until the part is available) and *after_part* once it has been read.
     """
 
-    def __init__(self, parts: list[ArchivePartInfo], parts_dir: Path) -> None:
-        self._paths = [parts_dir / p.file_name for p in sorted(parts, key=lambda p: p.index)]
+    def __init__(
+        self,
+        parts: list[ArchivePartInfo],
+        parts_dir: Path,
+        *,
+        verify: bool = False,
+        delete_consumed: bool = False,
+        before_part: Callable[[ArchivePartInfo], None] | None = None,
+        after_part: Callable[[ArchivePartInfo], None] | None = None,
+    ) -> None:
+        self._parts = sorted(parts, key=lambda p: p.index)
+        self._before_part = before_part
+        self._after_part = after_part
+        self._parts_dir = parts_dir
+        self._verify = verify
+        self._delete_consumed = delete_consumed
         self._file_index = 0
         self._current_fp: BinaryIO | None = None
+        self._digest = hashlib.sha256()
+        self._part_bytes = 0
 
     def read(self, size: int = -1) -> bytes:
-        """Read up to *size* bytes across part boundaries, or all remaining bytes if -1."""
+        """Read up to *size* bytes across part boundaries, or all remaining bytes if -1.
+
+        Raises:
+            ValueError: With *verify*, if a part just read to its end does not
+                match its recorded size or sha256.
+        """
         if size == 0:
             return b""
 
@@ -189,15 +459,22 @@ class _ChainReader:
 
         while True:
             if self._current_fp is None:
-                if self._file_index >= len(self._paths):
+                if self._file_index >= len(self._parts):
                     break
+                if self._before_part is not None:
+                    self._before_part(self._parts[self._file_index])
                 self._current_fp = open(  # noqa: SIM115  # pylint: disable=consider-using-with
-                    self._paths[self._file_index], "rb"
+                    self._parts_dir / self._parts[self._file_index].file_name, "rb"
                 )
                 self._file_index += 1
+                self._digest = hashlib.sha256()
+                self._part_bytes = 0
 
             chunk = self._current_fp.read(remaining if remaining != -1 else -1)
             if chunk:
+                if self._verify:
+                    self._digest.update(chunk)
+                    self._part_bytes += len(chunk)
                 buf.extend(chunk)
                 if remaining != -1:
                     remaining -= len(chunk)
@@ -207,9 +484,24 @@ class _ChainReader:
                 # Current file exhausted — move to next
                 self._current_fp.close()
                 self._current_fp = None
+                self._finish_part(self._parts[self._file_index - 1])
 
         return bytes(buf)
 
+    def _finish_part(self, part: ArchivePartInfo) -> None:
+        """Check (and optionally delete) a part that has been read to its end."""
+        if self._verify:
+            if self._part_bytes != part.size_bytes:
+                raise ValueError(
+                    f"Part size mismatch for {part.file_name}: expected {part.size_bytes}, got {self._part_bytes}"
+                )
+            if self._digest.hexdigest() != part.sha256:
+                raise ValueError(f"Part checksum mismatch for {part.file_name}")
+        if self._delete_consumed:
+            (self._parts_dir / part.file_name).unlink(missing_ok=True)
+        if self._after_part is not None:
+            self._after_part(part)
+
     def close(self) -> None:
         """Close any open file handle."""
         if self._current_fp is not None:
@@ -223,79 +515,344 @@ class _ChainReader:
         self.close()
 
 
-def verify_tar_parts_stream(parts: list[ArchivePartInfo], parts_dir: Path) -> None:
-    """Verify the integrity of a chunked tar.gz archive by streaming all parts.
+def verify_tar_parts_stream(
+    parts: list[ArchivePartInfo],
+    parts_dir: Path,
+    codec: ArchiveCodec = ArchiveCodec.GZIP,
+    workers: int = 1,
+) -> None:
+    """Verify the integrity of a chunked compressed tar archive by streaming all parts.
+
+    Chains the ordered part files into a single logical byte stream, decompresses
+    it with *codec* and walks it with :func:`tarfile.open` in streaming read mode
+    (``r|``) via :func:`~packaging.archive_verification.count_tar_members`.  This
+    forces full decompression and checksum validation (gzip CRC32 / zstd content
+    checksum) without writing anything to disk.
 
-    Chains the ordered part files into a single logical byte stream and passes
-    it to :func:`tarfile.open` in streaming read mode (``r|gz``).  Iterating
-    :meth:`~tarfile.TarFile.getmembers` forces full decompression and gzip CRC
-    validation without writing anything to disk.
+    Parts packaged with the independent layout are instead verified *workers*
+    at a time with :func:`~packaging.independent_parts.verify_independent_tar_parts`.
 
     Raises:
         FileNotFoundError: If any part file is missing.
-        tarfile.TarError: If the gzip stream is corrupt or the tar structure is invalid.
+        tarfile.TarError: If the compressed stream is corrupt or the tar structure is invalid.
     """
     for part in parts:
         part_path = parts_dir / part.file_name
         if not part_path.exists():
             raise FileNotFoundError(f"Archive part file not found: {part_path}")
 
+    if workers > 1 and has_independent_layout(parts):
+        verify_independent_tar_parts(parts, parts_dir, codec, workers=workers)
+        return
     with _ChainReader(parts, parts_dir) as chain:
-        with tarfile.open(fileobj=cast(BinaryIO, chain), mode="r|gz") as tar:
-            member_count = 0
-            for _ in tar:
-                member_count += 1
+        count_tar_members(cast(BinaryIO, chain), codec)
+
+
+def extract_tar_parts_stream(  # pylint: disable=too-many-arguments
+    parts: list[ArchivePartInfo],
+    parts_dir: Path,
+    dest_path: Path,
+    codec: ArchiveCodec = ArchiveCodec.GZIP,
+    *,
+    verify: bool = True,
+    delete_consumed: bool = False,
+    before_part: Callable[[ArchivePartInfo], None] | None = None,
+    after_part: Callable[[ArchivePartInfo], None] | None = None,
+    workers: int = 1,
+) -> None:
+    """Extract a chunked compressed tar archive straight from its part files.
+
+    The ordered parts are chained into one stream, decompressed with *codec*
+    and extracted with :func:`tarfile.open` in streaming mode (``r|``) and the
+    ``data`` filter, so no reassembled archive is written to disk.  With
+    *verify*, each part's size and sha256 are checked as it is read (callers
+    that checked the parts as they downloaded can skip this); with
+    *delete_consumed*, each part file is removed as soon as it has been read,
+    so scratch usage shrinks as extraction proceeds.
+
+    With *workers* above 1, decoding stays on the calling thread while files
+    are written by that many threads (see
+    :func:`~packaging.tar_extraction.extract_members`).
+
+    *before_part* and *after_part* are passed to :class:`_ChainReader`; a
+    caller still downloading parts can use them to wait for each part to
+    arrive and to learn when its space is free again.
+
+    A part is only checked once all of it has been read, so members decoded
+    from a corrupt part may already be on disk when the mismatch is raised.
 
-    if member_count == 0:
-        raise tarfile.TarError("Tar stream contained no members — archive may be empty or corrupt")
-
-
-def build_chunked_tar_archive(
+    Raises:
+        FileNotFoundError: If a part file is missing.
+        ValueError: If a part does not match its recorded size or sha256.
+        tarfile.TarError: If the compressed stream is corrupt or the tar structure is invalid.
+    """
+    with _ChainReader(
+        parts,
+        parts_dir,
+        verify=verify,
+        delete_consumed=delete_consumed,
+        before_part=before_part,
+        after_part=after_part,
+    ) as chain:
+        try:
+            with open_decompressed_reader(cast(BinaryIO, chain), codec) as stream:
+                with tarfile.open(fileobj=stream, mode="r|") as tar:
+                    if workers > 1:
+                        extract_members(tar, dest_path, workers)
+                    else:
+                        tar.extractall(path=dest_path, filter="data")
+                # Read past the end-of-archive marker so the trailing codec
+                # checksum and the last parts are checked too.
+                while stream.read(_READ_BLOCK_SIZE):
+                    pass
+        except DECOMPRESSION_ERRORS as e:
+            raise tarfile.ReadError(f"invalid compressed data: {e}") from e
+        while chain.read(_READ_BLOCK_SIZE):
+            pass
+
+
+def build_chunked_tar_archive(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     source_dir: Path,
     output_dir: Path,
     base_name: str,
     part_size_bytes: int,
     manifest_file_name: str = "archive-manifest.json",
+    compression_workers: int = 1,
+    codec: ArchiveCodec = ArchiveCodec.GZIP,
+    compression_level: int | None = None,
+    on_part_finalized: Callable[[ArchivePartInfo], None] | None = None,
+    add_members: Callable[[tarfile.TarFile, Path], None] | None = None,
+    verify_inline: bool = False,
+    part_layout: ArchivePartLayout = ArchivePartLayout.STREAM,
+    member_index_file_name: str | None = None,
 ) -> ChunkedArchiveResult:
-    """Create a gzip-compressed streamed tar split into sequential part files.
+    """Create a compressed streamed tar split into sequential part files.
 
     The resulting part files are contiguous byte segments of one logical
-    gzip-compressed tar stream.  Reassembly is done by concatenating parts
-    in index order and then extracting the resulting ``.tar.gz``.
+    compressed tar stream.  Reassembly is done by concatenating parts in index
+    order and then extracting the resulting ``.tar.gz`` / ``.tar.zst``.
+
+    *codec*, *compression_level* and *compression_workers* select the
+    compressor (see :func:`~packaging.archive_codecs.open_compressed_writer`)
+    and are recorded in the manifest's ``compression`` block alongside
+    ``archive_format`` so retrieval can pick the matching decompressor.
+
+    *on_part_finalized*, if given, is called with each part as soon as it is
+    sealed, while compression of later parts continues.  The callback may
+    remove the part file (e.g. once it has been uploaded); the returned result
+    and manifest still describe every part.
+
+    *add_members*, if given, is called as ``add_members(tar, source_dir)`` to
+    fill the tar stream instead of ``tar.add(source_dir)``, e.g.
+    :func:`~packaging.fused_bagging.add_bag_to_tar` to checksum the bag payload
+    in the same pass.
+
+    With *verify_inline*, the compressed stream is decompressed and its tar
+    structure checked on a background thread as it is written, replacing a
+    separate :func:`verify_tar_parts_stream` pass; the member count is returned
+    in ``verified_member_count``.  A corrupt stream raises
+    :class:`tarfile.TarError` and the parts written so far are removed.
+
+    With the ``independent`` *part_layout* each part is its own gzip member /
+    zstd frame starting on a tar block boundary, and the manifest records each
+    part's ``tar_offset``, ``tar_size`` and ``first_member_offset`` so parts
+    can be verified and extracted in parallel (see
+    :mod:`packaging.independent_parts`).
+
+    *member_index_file_name* (independent layout only) also writes a member
+    offset index (see :mod:`packaging.member_index`) to *output_dir* and
+    references it from the manifest, so single files can be retrieved
+    without fetching every part.
     """
     if not source_dir.exists() or not source_dir.is_dir():
         raise FileNotFoundError(f"source_dir does not exist or is not a directory: {source_dir}")
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    with _SplitPartWriter(output_dir=output_dir, base_name=base_name, part_size_bytes=part_size_bytes) as writer:
-        with tarfile.open(
-            fileobj=cast(BinaryIO, writer),
-            mode="w|gz",
-        ) as tar_stream:
-            tar_stream.add(str(source_dir), arcname=source_dir.name)
+    member_index = open_member_index(output_dir, member_index_file_name, part_layout)
+    verifier = InlineTarVerifier(codec) if verify_inline else None
+    verified_member_count: int | None = None
+    try:
+        with _SplitPartWriter(
+            output_dir=output_dir,
+            base_name=base_name,
+            part_size_bytes=part_size_bytes,
+            archive_format=archive_format_for_codec(codec),
+            on_part_finalized=on_part_finalized,
+            verifier=verifier,
+            split_by_size=part_layout == ArchivePartLayout.STREAM,
+        ) as writer:
+            write_compressed_tar_stream(
+                writer,
+                source_dir,
+                codec=codec,
+                compression_level=compression_level,
+                compression_workers=compression_workers,
+                add_members=add_members,
+                part_layout=part_layout,
+                member_index=member_index,
+            )
+            if verifier is not None:
+                verified_member_count = verifier.finish()
+    finally:
+        if verifier is not None:
+            verifier.abort()
+        if member_index is not None:
+            member_index.close()
+
+    manifest_path = write_archive_manifest(
+        output_dir / manifest_file_name,
+        base_name=base_name,
+        source_dir=source_dir,
+        parts=writer.parts,
+        total_bytes=writer.total_bytes,
+        codec=codec,
+        compression_level=compression_level,
+        compression_workers=compression_workers,
+        part_layout=part_layout,
+        member_index=member_index,
+    )
 
+    return ChunkedArchiveResult(
+        parts=writer.parts,
+        total_bytes=writer.total_bytes,
+        manifest_path=manifest_path,
+        verified_member_count=verified_member_count,
+        member_index_path=member_index.path if member_index is not None else None,
+    )
+
+
+def write_compressed_tar_stream(
+    writer: _SplitPartWriter,
+    source_dir: Path,
+    *,
+    codec: ArchiveCodec,
+    compression_level: int | None,
+    compression_workers: int,
+    add_members: Callable[[tarfile.TarFile, Path], None] | None = None,
+    part_layout: ArchivePartLayout = ArchivePartLayout.STREAM,
+    member_index: MemberIndexWriter | None = None,
+) -> None:
+    """Tar *source_dir* (arcname = its base name) through *codec* into *writer*.
+
+    *add_members* replaces the default ``tar.add(source_dir)`` when given.  With
+    the independent *part_layout*, *writer* must not split by size; parts are
+    sealed by :class:`_IndependentPartStream` instead, and every member is
+    recorded in *member_index* if given.
+    """
+    if part_layout == ArchivePartLayout.INDEPENDENT:
+        part_stream = _IndependentPartStream(
+            writer,
+            codec,
+            compression_level=resolve_compression_level(codec, compression_level),
+            compression_workers=compression_workers,
+            member_index=member_index,
+        )
+        try:
+            with _MemberOffsetTarFile.open(fileobj=cast(BinaryIO, part_stream), mode="w") as tar:
+                _add_source_members(tar, source_dir, add_members)
+        except BaseException:
+            part_stream.abort()
+            raise
+        part_stream.close()
+        return
+
+    with open_compressed_writer(
+        cast(BinaryIO, writer),
+        codec,
+        level=resolve_compression_level(codec, compression_level),
+        workers=compression_workers,
+    ) as compressed_stream:
+        with tarfile.open(fileobj=compressed_stream, mode="w|") as tar_stream:
+            _add_source_members(tar_stream, source_dir, add_members)
+
+
+def open_member_index(
+    output_dir: Path,
+    member_index_file_name: str | None,
+    part_layout: ArchivePartLayout,
+) -> MemberIndexWriter | None:
+    """Open the member index writer requested by *member_index_file_name*, if any.
+
+    Raises:
+        ValueError: If an index is requested without the independent part layout,
+            where member offsets cannot be mapped to parts.
+    """
+    if member_index_file_name is None:
+        return None
+    if part_layout != ArchivePartLayout.INDEPENDENT:
+        raise ValueError("A member index requires the independent part layout")
+    return MemberIndexWriter(output_dir / member_index_file_name)
+
+
+def _add_source_members(
+    tar: tarfile.TarFile,
+    source_dir: Path,
+    add_members: Callable[[tarfile.TarFile, Path], None] | None,
+) -> None:
+    if add_members is None:
+        tar.add(str(source_dir), arcname=source_dir.name)
+    else:
+        add_members(tar, source_dir)
+
+
+def write_archive_manifest(  # pylint: disable=too-many-arguments
+    manifest_path: Path,
+    *,
+    base_name: str,
+    source_dir: Path,
+    parts: list[ArchivePartInfo],
+    total_bytes: int,
+    codec: ArchiveCodec,
+    compression_level: int | None,
+    compression_workers: int,
+    part_layout: ArchivePartLayout = ArchivePartLayout.STREAM,
+    member_index: MemberIndexWriter | None = None,
+) -> Path:
+    """Write ``archive-manifest.json`` describing *parts* and the codec used."""
     manifest = {
         "archive_name": base_name,
-        "archive_format": "tar.gz",
+        "archive_format": archive_format_for_codec(codec),
+        "part_layout": part_layout.value,
+        "compression": {
+            "codec": codec.value,
+            "level": resolve_compression_level(codec, compression_level),
+            "workers": compression_workers,
+        },
         "source_root": source_dir.name,
-        "total_bytes": writer.total_bytes,
-        "part_count": len(writer.parts),
-        "parts": [
-            {
-                "index": p.index,
-                "file_name": p.file_name,
-                "size_bytes": p.size_bytes,
-                "sha256": p.sha256,
-            }
-            for p in writer.parts
-        ],
+        "total_bytes": total_bytes,
+        "part_count": len(parts),
+        "parts": [_manifest_part_entry(p) for p in parts],
     }
-    manifest_path = output_dir / manifest_file_name
+    if member_index is not None:
+        manifest["member_index"] = {
+            "file_name": member_index.path.name,
+            "entry_count": member_index.entry_count,
+        }
     with open(manifest_path, "w", encoding="utf-8") as manifest_file:
         json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    return manifest_path
 
-    return ChunkedArchiveResult(
-        parts=writer.parts,
-        total_bytes=writer.total_bytes,
-        manifest_path=manifest_path,
-    )
+
+def _manifest_part_entry(part: ArchivePartInfo) -> dict[str, Any]:
+    entry: dict[str, Any] = {
+        "index": part.index,
+        "file_name": part.file_name,
+        "size_bytes": part.size_bytes,
+        "sha256": part.sha256,
+    }
+    if part.tar_offset is not None:
+        entry["tar_offset"] = part.tar_offset
+        entry["tar_size"] = part.tar_size
+        entry["first_member_offset"] = part.first_member_offset
+    if part.s3_checksum_sha256 is not None:
+        entry["s3_checksum_sha256"] = part.s3_checksum_sha256
+    return entry
+
+
+def record_part_checksums(manifest_path: Path, parts: list[ArchivePartInfo]) -> None:
+    """Rewrite the ``parts`` of an existing manifest with *parts*' upload checksums."""
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    manifest["parts"] = [_manifest_part_entry(p) for p in sorted(parts, key=lambda p: p.index)]
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
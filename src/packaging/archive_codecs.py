@@ -0,0 +1,117 @@
+"""Compression codecs for chunked tar archives.
+
+Each codec wraps a raw byte stream in a compressing writer or decompressing
+reader so the tar layer can stay codec-agnostic (``tarfile`` ``w|`` / ``r|``).
+The codec and its parameters are recorded in ``archive-manifest.json`` so
+retrieval can dispatch on them instead of assuming ``tar.gz``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from compression import zstd
+from typing import Any, BinaryIO, cast
+
+from models.common import ArchiveCodec
+from packaging.parallel_gzip import ParallelGzipWriter
+
+#: Manifest ``archive_format`` value (and part file name infix) for each codec.
+ARCHIVE_FORMATS: dict[ArchiveCodec, str] = {
+    ArchiveCodec.GZIP: "tar.gz",
+    ArchiveCodec.ZSTD: "tar.zst",
+}
+
+#: Compression level used when none is configured.
+DEFAULT_COMPRESSION_LEVELS: dict[ArchiveCodec, int] = {
+    ArchiveCodec.GZIP: 9,  # matches tarfile's "w|gz" default
+    ArchiveCodec.ZSTD: zstd.COMPRESSION_LEVEL_DEFAULT,
+}
+
+#: Exceptions raised by the codec readers on corrupt or truncated input.
+DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (
+    gzip.BadGzipFile,
+    zlib.error,
+    zstd.ZstdError,
+    EOFError,
+)
+
+
+def archive_format_for_codec(codec: ArchiveCodec) -> str:
+    """Return the ``archive_format`` string (e.g. ``tar.zst``) for *codec*."""
+    return ARCHIVE_FORMATS[codec]
+
+
+def codec_for_archive_format(archive_format: str) -> ArchiveCodec:
+    """Return the codec that produced *archive_format*.
+
+    Raises:
+        ValueError: If *archive_format* is not a known archive format.
+    """
+    for codec, known_format in ARCHIVE_FORMATS.items():
+        if known_format == archive_format:
+            return codec
+    raise ValueError(f"Unsupported archive format: {archive_format!r}")
+
+
+def codec_from_manifest(manifest: dict[str, Any]) -> ArchiveCodec:
+    """Resolve the codec recorded in an archive manifest.
+
+    Manifests written before codecs were configurable carry neither a
+    ``compression`` block nor a non-gzip ``archive_format``; they resolve to gzip.
+    """
+    compression = manifest.get("compression")
+    if isinstance(compression, dict) and isinstance(compression.get("codec"), str):
+        return ArchiveCodec(compression["codec"])
+    return codec_for_archive_format(str(manifest.get("archive_format", ARCHIVE_FORMATS[ArchiveCodec.GZIP])))
+
+
+def resolve_compression_level(codec: ArchiveCodec, level: int | None) -> int:
+    """Return *level*, or the codec's default level when *level* is ``None``."""
+    return DEFAULT_COMPRESSION_LEVELS[codec] if level is None else level
+
+
+def open_compressed_writer(
+    fileobj: BinaryIO,
+    codec: ArchiveCodec,
+    *,
+    level: int | None = None,
+    workers: int = 1,
+) -> BinaryIO:
+    """Wrap *fileobj* in a writer that compresses with *codec*.
+
+    Closing the returned writer finishes the compressed stream but leaves
+    *fileobj* open.
+
+    Args:
+        fileobj: Destination for the compressed bytes.
+        codec: Compression codec to use.
+        level: Compression level; ``None`` uses the codec default.
+        workers: Compression threads.  gzip uses :class:`ParallelGzipWriter`
+            when greater than one; zstd passes it to libzstd as ``nb_workers``.
+    """
+    level = resolve_compression_level(codec, level)
+    if codec == ArchiveCodec.ZSTD:
+        options = {
+            zstd.CompressionParameter.compression_level: level,
+            # Embed a content checksum so verification catches corruption, like gzip's CRC32.
+            zstd.CompressionParameter.checksum_flag: 1,
+        }
+        if workers > 1:
+            options[zstd.CompressionParameter.nb_workers] = workers
+        return cast(BinaryIO, zstd.ZstdFile(fileobj, mode="w", options=options))
+    if workers > 1:
+        return cast(BinaryIO, ParallelGzipWriter(fileobj, workers=workers, compresslevel=level))
+    # A fixed mtime and empty file name keep the output deterministic.
+    return cast(BinaryIO, gzip.GzipFile(filename="", mode="wb", compresslevel=level, fileobj=fileobj, mtime=0))
+
+
+def open_decompressed_reader(fileobj: BinaryIO, codec: ArchiveCodec) -> BinaryIO:
+    """Wrap *fileobj* in a reader that decompresses *codec* data.
+
+    Closing the returned reader leaves *fileobj* open.  Corrupt input surfaces
+    as one of :data:`DECOMPRESSION_ERRORS` while reading.
+    """
+    if codec == ArchiveCodec.ZSTD:
+        return cast(BinaryIO, zstd.ZstdFile(fileobj, mode="r"))
+    return cast(BinaryIO, gzip.GzipFile(fileobj=fileobj, mode="rb"))
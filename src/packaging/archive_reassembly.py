@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import hashlib
 import json
+from collections.abc import Collection
 from pathlib import Path
 from typing import Any
 
@@ -55,6 +56,42 @@ def _sha256_file(file_path: Path) -> str:
     return digest.hexdigest()
 
 
+def _checked_part_path(parts_dir: Path, part: dict[str, Any], *, verify: bool) -> Path:
+    """Return the local path of *part*, checking it exists and (optionally) its size and sha256."""
+    part_path = parts_dir / str(part["file_name"])
+    if not part_path.exists() or not part_path.is_file():
+        raise FileNotFoundError(f"Missing archive part file: {part_path}")
+
+    if verify:
+        expected_size = part.get("size_bytes")
+        if isinstance(expected_size, int) and part_path.stat().st_size != expected_size:
+            raise ValueError(
+                f"Part size mismatch for {part_path.name}: expected {expected_size}, got {part_path.stat().st_size}"
+            )
+
+        expected_sha = part.get("sha256")
+        if isinstance(expected_sha, str) and _sha256_file(part_path) != expected_sha:
+            raise ValueError(f"Part checksum mismatch for {part_path.name}")
+    return part_path
+
+
+def verify_downloaded_parts(
+    *,
+    parts_dir: Path,
+    manifest: dict[str, Any],
+    file_names: Collection[str] | None = None,
+) -> None:
+    """Check every manifest part is present in *parts_dir* with the recorded size and sha256.
+
+    Used instead of :func:`reassemble_archive_from_manifest` when parts are
+    extracted directly (independent part layout).  *file_names* limits the
+    check to the parts that were downloaded for a partial retrieval.
+    """
+    for part in ordered_part_entries(manifest):
+        if file_names is None or part["file_name"] in file_names:
+            _checked_part_path(parts_dir, part, verify=True)
+
+
 def reassemble_archive_from_manifest(
     *,
     parts_dir: Path,
@@ -76,22 +113,7 @@ def reassemble_archive_from_manifest(
     output_tar_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_tar_path, "wb") as output_file:
         for part in parts:
-            part_path = parts_dir / part["file_name"]
-            if not part_path.exists() or not part_path.is_file():
-                raise FileNotFoundError(f"Missing archive part file: {part_path}")
-
-            if verify_parts:
-                expected_size = part.get("size_bytes")
-                if isinstance(expected_size, int) and part_path.stat().st_size != expected_size:
-                    raise ValueError(
-                        f"Part size mismatch for {part_path.name}: "
-                        f"expected {expected_size}, got {part_path.stat().st_size}"
-                    )
-
-                expected_sha = part.get("sha256")
-                if isinstance(expected_sha, str) and _sha256_file(part_path) != expected_sha:
-                    raise ValueError(f"Part checksum mismatch for {part_path.name}")
-
+            part_path = _checked_part_path(parts_dir, part, verify=verify_parts)
             with open(part_path, "rb") as part_file:
                 while True:
                     chunk = part_file.read(1024 * 1024)
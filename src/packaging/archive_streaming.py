@@ -0,0 +1,348 @@
+"""Disk-less chunked archive packaging straight into S3 multipart uploads.
+
+Each logical archive part (the same byte ranges :func:`build_chunked_tar_archive`
+would write to ``*.part-NNNNN`` files) is streamed into its own object through
+a multipart upload, buffering at most one multipart chunk in memory.  Only the
+small ``archive-manifest.json`` is written locally.
+
+After a restart the source is packaged again from the start.  Parts whose
+objects an earlier run completed are only re-hashed, and chunks of the
+in-progress multipart upload whose MD5 matches the persisted ETag are not
+uploaded again.  The tar stream is not guaranteed to be reproducible (bag and
+package metadata are regenerated on every run), so a re-hashed part must match
+the sha256 recorded when its object was stored; if it does not, packaging stops
+with :class:`StoredPartMismatchError`, since a locked object cannot be replaced.
+"""
+
+from __future__ import annotations
+
+import tarfile
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from models.common import ArchiveCodec, ArchivePartLayout
+from packaging.archive_chunks import (
+    ArchivePartInfo,
+    ChunkedArchiveResult,
+    _SplitPartWriter,
+    open_member_index,
+    write_archive_manifest,
+    write_compressed_tar_stream,
+)
+from packaging.archive_codecs import archive_format_for_codec
+from packaging.archive_verification import InlineTarVerifier
+from service.activescale import (
+    complete_multipart_upload,
+    confirm_object_lock,
+    inline_object_lock_available,
+    set_object_retention,
+    upload_multipart_part,
+)
+from service.multipart_upload import (
+    MAX_MULTIPART_PARTS,
+    MultipartStateStore,
+    MultipartUploadState,
+    etag_matches,
+    open_multipart_upload,
+)
+
+#: S3 limits on multipart uploads.
+MIN_MULTIPART_CHUNK_BYTES = 5 * 1024 * 1024
+MAX_MULTIPART_CHUNK_BYTES = 5 * 1024 * 1024 * 1024
+
+
+class StoredPartMismatchError(RuntimeError):
+    """A part stored by an earlier run differs from the regenerated archive."""
+
+    def __init__(self, object_key: str, stored_sha256: str, sha256: str) -> None:
+        super().__init__(
+            f"Archive part {object_key} stored by an earlier run has sha256 {stored_sha256}, "
+            f"but the regenerated archive has {sha256}"
+        )
+        self.object_key = object_key
+
+
+class _MultipartPartWriter(_SplitPartWriter):  # pylint: disable=too-many-instance-attributes
+    """Split a byte stream into archive parts, each streamed into a multipart upload."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        client: Any,
+        bucket_name: str,
+        object_prefix: str,
+        chunk_size_bytes: int,
+        state_store: MultipartStateStore,
+        completed_parts: dict[str, str],
+        metadata: dict[str, str] | None,
+        retain_until: datetime | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._client = client
+        self._bucket_name = bucket_name
+        self._object_prefix = object_prefix
+        self._chunk_size_bytes = chunk_size_bytes
+        self._state_store = state_store
+        self._completed_parts = completed_parts
+        self._resumed_key: str | None = None
+        self._metadata = metadata
+        self._retain_until = retain_until
+
+        self._buffer = bytearray()
+        self._state: MultipartUploadState | None = None
+        self._next_part_number = 1
+
+    def _open_part_sink(self, file_name: str) -> None:
+        """Resume or start the multipart upload for the part object *file_name*."""
+        object_key = f"{self._object_prefix}{file_name}"
+        self._next_part_number = 1
+        self._buffer.clear()
+        self._resumed_key = None
+        if object_key in self._completed_parts:
+            # Already stored by an earlier run; the bytes are only hashed.
+            self._state = None
+            self._resumed_key = object_key
+            return
+
+        state = open_multipart_upload(
+            self._client,
+            self._bucket_name,
+            object_key,
+            self._state_store,
+            metadata=self._metadata,
+            retain_until=self._retain_until,
+        )
+        if state is None:
+            raise RuntimeError(f"Failed to start multipart upload for {object_key}")
+        self._state = state
+
+    def _write_part_sink(self, chunk: bytes) -> None:
+        """Buffer *chunk*, uploading every full multipart chunk."""
+        if self._state is None:
+            return
+        self._buffer.extend(chunk)
+        while len(self._buffer) >= self._chunk_size_bytes:
+            body = bytes(self._buffer[: self._chunk_size_bytes])
+            del self._buffer[: self._chunk_size_bytes]
+            self._upload_chunk(body)
+
+    def _close_part_sink(self) -> None:
+        """Upload the trailing chunk and complete the part object.
+
+        Raises:
+            StoredPartMismatchError: If the part was stored by an earlier run
+                with a different sha256.
+        """
+        if self._state is None:
+            if self._resumed_key is not None:
+                assert self._current_hasher is not None
+                stored_sha256 = self._completed_parts[self._resumed_key]
+                sha256 = self._current_hasher.hexdigest()
+                if sha256 != stored_sha256:
+                    raise StoredPartMismatchError(self._resumed_key, stored_sha256, sha256)
+            return
+        if self._buffer or self._next_part_number == 1:
+            self._upload_chunk(bytes(self._buffer))
+            self._buffer.clear()
+
+        state = self._state
+        # A resumed upload may hold stale chunks past the end of the regenerated part.
+        part_etags = {number: etag for number, etag in state.part_etags.items() if number < self._next_part_number}
+        completed, _ = complete_multipart_upload(
+            self._client,
+            self._bucket_name,
+            state.object_key,
+            state.upload_id,
+            part_etags,
+        )
+        if not completed:
+            raise RuntimeError(f"Failed to complete multipart upload for {state.object_key}")
+        self._state_store.clear()
+        self._state = None
+        if self._retain_until is not None and not self._protect(state):
+            raise RuntimeError(f"Failed to set retention on archive part {state.object_key}")
+
+    def _protect(self, state: MultipartUploadState) -> bool:
+        """Make sure the completed part object is under retention."""
+        assert self._retain_until is not None
+        if state.object_locked and inline_object_lock_available():
+            return confirm_object_lock(self._client, self._bucket_name, state.object_key, self._retain_until)
+        return set_object_retention(self._client, self._bucket_name, state.object_key, self._retain_until)
+
+    def _abort_part_sink(self) -> None:
+        """Stop streaming the current part without completing its upload.
+
+        The multipart upload and its persisted state are kept so a retry can resume.
+        """
+        self._state = None
+        self._buffer.clear()
+
+    def _discard_parts(self) -> None:
+        """Keep completed part objects; a retry skips them via ``completed_parts``."""
+
+    def _upload_chunk(self, body: bytes) -> None:
+        """Upload the next multipart chunk unless the server already holds identical bytes."""
+        assert self._state is not None
+        part_number = self._next_part_number
+        self._next_part_number += 1
+        if part_number > MAX_MULTIPART_PARTS:
+            raise RuntimeError(f"Multipart upload for {self._state.object_key} exceeds {MAX_MULTIPART_PARTS} parts")
+
+        stored_etag = self._state.part_etags.get(part_number)
+        if stored_etag is not None and etag_matches(stored_etag, body):
+            return
+
+        etag = upload_multipart_part(
+            self._client,
+            self._bucket_name,
+            self._state.object_key,
+            self._state.upload_id,
+            part_number,
+            body,
+        )
+        if etag is None:
+            raise RuntimeError(f"Failed to upload chunk {part_number} of {self._state.object_key}")
+        self._state.part_etags[part_number] = etag
+        self._state_store.save(self._state)
+
+
+def stream_chunked_tar_archive_to_multipart(  # pylint: disable=too-many-arguments,too-many-locals
+    *,
+    source_dir: Path,
+    output_dir: Path,
+    base_name: str,
+    part_size_bytes: int,
+    client: Any,
+    bucket_name: str,
+    object_prefix: str,
+    chunk_size_bytes: int,
+    state_store: MultipartStateStore,
+    completed_parts: dict[str, str] | None = None,
+    metadata: dict[str, str] | None = None,
+    retain_until: datetime | None = None,
+    manifest_file_name: str = "archive-manifest.json",
+    compression_workers: int = 1,
+    codec: ArchiveCodec = ArchiveCodec.GZIP,
+    compression_level: int | None = None,
+    on_part_finalized: Callable[[ArchivePartInfo], None] | None = None,
+    add_members: Callable[[tarfile.TarFile, Path], None] | None = None,
+    verify_inline: bool = False,
+    part_layout: ArchivePartLayout = ArchivePartLayout.STREAM,
+    member_index_file_name: str | None = None,
+) -> ChunkedArchiveResult:
+    """Package *source_dir* like :func:`build_chunked_tar_archive`, uploading instead of writing parts.
+
+    Part objects are stored as ``{object_prefix}{file_name}`` with the same
+    names, sizes and sha256 values that the on-disk mode would record, and the
+    same manifest is written to ``output_dir``.  Memory use is bounded by
+    *chunk_size_bytes* (plus the compressor's own buffers).
+
+    Args:
+        source_dir: Directory to archive.
+        output_dir: Local directory for the manifest (no part data is written).
+        base_name: Stem used to derive part object names.
+        part_size_bytes: Size of each logical archive part.
+        client: An initialized S3 client.
+        bucket_name: Destination bucket.
+        object_prefix: Key prefix for the part objects.
+        chunk_size_bytes: Multipart chunk size (5 MiB - 5 GiB).
+        state_store: Persists the in-progress multipart upload for resume.
+        completed_parts: The sha256 of each part object already stored by an
+            earlier run, keyed by object key.  Those parts are not uploaded
+            again, but must regenerate with the same sha256.
+        metadata: Custom metadata applied to every part object.
+        retain_until: Optional COMPLIANCE retention date; each part object is
+            created under it (or has it set once complete, where the endpoint
+            does not support that) before *on_part_finalized* runs.
+        manifest_file_name: File name of the manifest written to *output_dir*.
+        compression_workers: See :func:`build_chunked_tar_archive`.
+        codec: See :func:`build_chunked_tar_archive`.
+        compression_level: See :func:`build_chunked_tar_archive`.
+        on_part_finalized: Called with each part once its object is complete.
+        add_members: See :func:`build_chunked_tar_archive`.
+        verify_inline: See :func:`build_chunked_tar_archive`.
+        part_layout: See :func:`build_chunked_tar_archive`.
+        member_index_file_name: See :func:`build_chunked_tar_archive`; the index
+            is written to *output_dir* next to the manifest.
+
+    Raises:
+        ValueError: If the chunk size is outside S3 limits or would need more
+            than 10,000 chunks for one part.
+        RuntimeError: If a multipart request fails; packaging stops and the
+            persisted state is kept so a retry can resume.
+        StoredPartMismatchError: If a part in *completed_parts* regenerates
+            with a different sha256.
+    """
+    if not source_dir.exists() or not source_dir.is_dir():
+        raise FileNotFoundError(f"source_dir does not exist or is not a directory: {source_dir}")
+    if not MIN_MULTIPART_CHUNK_BYTES <= chunk_size_bytes <= MAX_MULTIPART_CHUNK_BYTES:
+        raise ValueError("chunk_size_bytes must be between 5 MiB and 5 GiB")
+    if -(-part_size_bytes // chunk_size_bytes) > MAX_MULTIPART_PARTS:
+        raise ValueError(
+            f"part_size_bytes {part_size_bytes} needs more than {MAX_MULTIPART_PARTS} "
+            f"chunks of {chunk_size_bytes} bytes"
+        )
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    member_index = open_member_index(output_dir, member_index_file_name, part_layout)
+    verifier = InlineTarVerifier(codec) if verify_inline else None
+    verified_member_count: int | None = None
+    try:
+        with _MultipartPartWriter(
+            client=client,
+            bucket_name=bucket_name,
+            object_prefix=object_prefix,
+            chunk_size_bytes=chunk_size_bytes,
+            state_store=state_store,
+            completed_parts=completed_parts or {},
+            metadata=metadata,
+            retain_until=retain_until,
+            output_dir=output_dir,
+            base_name=base_name,
+            part_size_bytes=part_size_bytes,
+            archive_format=archive_format_for_codec(codec),
+            on_part_finalized=on_part_finalized,
+            verifier=verifier,
+            split_by_size=part_layout == ArchivePartLayout.STREAM,
+        ) as writer:
+            write_compressed_tar_stream(
+                writer,
+                source_dir,
+                codec=codec,
+                compression_level=compression_level,
+                compression_workers=compression_workers,
+                add_members=add_members,
+                part_layout=part_layout,
+                member_index=member_index,
+            )
+            if verifier is not None:
+                verified_member_count = verifier.finish()
+    finally:
+        if verifier is not None:
+            verifier.abort()
+        if member_index is not None:
+            member_index.close()
+
+    manifest_path = write_archive_manifest(
+        output_dir / manifest_file_name,
+        base_name=base_name,
+        source_dir=source_dir,
+        parts=writer.parts,
+        total_bytes=writer.total_bytes,
+        codec=codec,
+        compression_level=compression_level,
+        compression_workers=compression_workers,
+        part_layout=part_layout,
+        member_index=member_index,
+    )
+
+    return ChunkedArchiveResult(
+        parts=writer.parts,
+        total_bytes=writer.total_bytes,
+        manifest_path=manifest_path,
+        verified_member_count=verified_member_count,
+        member_index_path=member_index.path if member_index is not None else None,
+    )
@@ -0,0 +1,135 @@
+"""Integrity checks for compressed tar streams.
+
+:func:`count_tar_members` decompresses a stream to the end, so the codec's
+checksums (gzip CRC32 / zstd content checksum) are validated, and walks the tar
+headers on the way.  :class:`InlineTarVerifier` runs the same check on a
+background thread fed with the compressed bytes as they are produced, so
+packaging does not need a second read of the parts afterwards.
+"""
+
+from __future__ import annotations
+
+import queue
+import tarfile
+import threading
+from typing import BinaryIO, cast
+
+from models.common import ArchiveCodec
+from packaging.archive_codecs import DECOMPRESSION_ERRORS, open_decompressed_reader
+
+_DRAIN_BLOCK_SIZE = 1024 * 1024
+
+
+def count_tar_members(fileobj: BinaryIO, codec: ArchiveCodec) -> int:
+    """Decompress *fileobj* with *codec* to the end and return its tar member count.
+
+    Raises:
+        tarfile.ReadError: If the compressed stream is corrupt or truncated.
+        tarfile.TarError: If the tar structure is invalid or holds no members.
+    """
+    try:
+        with open_decompressed_reader(fileobj, codec) as stream:
+            member_count = 0
+            with tarfile.open(fileobj=stream, mode="r|") as tar:
+                for _ in tar:
+                    member_count += 1
+            # tarfile stops at the end-of-archive marker; read the rest so the
+            # trailing checksum is validated too.
+            while stream.read(_DRAIN_BLOCK_SIZE):
+                pass
+    except DECOMPRESSION_ERRORS as e:
+        raise tarfile.ReadError(f"invalid compressed data: {e}") from e
+
+    if member_count == 0:
+        raise tarfile.TarError("Tar stream contained no members — archive may be empty or corrupt")
+    return member_count
+
+
+class _QueueReader:
+    """File-like ``read()`` over byte chunks handed over through a queue.
+
+    ``None`` marks the end of the stream.
+    """
+
+    def __init__(self, chunks: queue.Queue[bytes | None]) -> None:
+        self._chunks = chunks
+        self._buffer = bytearray()
+        self._eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to *size* bytes, blocking until they arrive or the stream ends."""
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer.extend(chunk)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def drain(self) -> None:
+        """Discard everything up to the end of the stream."""
+        self._buffer.clear()
+        while not self._eof:
+            if self._chunks.get() is None:
+                self._eof = True
+
+
+class InlineTarVerifier:
+    """Verify a compressed tar stream on a background thread while it is written.
+
+    Call :meth:`feed` with every compressed chunk in order, then :meth:`finish`
+    to wait for the result.  The queue between the two threads is bounded, so
+    a slow verifier applies back-pressure to packaging rather than buffering
+    the archive in memory.
+    """
+
+    def __init__(self, codec: ArchiveCodec, max_pending_chunks: int = 64) -> None:
+        self._codec = codec
+        self._chunks: queue.Queue[bytes | None] = queue.Queue(maxsize=max_pending_chunks)
+        self._member_count: int | None = None
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="archive-inline-verifier", daemon=True)
+        self._thread.start()
+
+    def feed(self, data: bytes) -> None:
+        """Hand the next chunk of compressed bytes to the verifier."""
+        if data and not self._closed:
+            self._chunks.put(bytes(data))
+
+    def finish(self) -> int:
+        """Signal the end of the stream and return the verified member count.
+
+        Raises:
+            tarfile.ReadError: If the compressed stream is corrupt or truncated.
+            tarfile.TarError: If the tar structure is invalid or holds no members.
+        """
+        self._close()
+        if self._error is not None:
+            raise self._error
+        assert self._member_count is not None
+        return self._member_count
+
+    def abort(self) -> None:
+        """Stop verifying after packaging failed; any verification error is discarded."""
+        self._close()
+
+    def _close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._chunks.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        reader = _QueueReader(self._chunks)
+        try:
+            self._member_count = count_tar_members(cast(BinaryIO, reader), self._codec)
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            self._error = e
+        finally:
+            # Keep consuming so feed() never blocks on a verifier that has stopped reading.
+            reader.drain()
@@ -0,0 +1,89 @@
+"""Persistent cache of file checksums, so re-bagging only hashes changed files.
+
+When a submission is retried the drive is already a bag and
+:func:`~packaging.manifests.bag_directory` regenerates its manifests, which
+used to mean re-reading every payload file.  Digests are cached in a small
+SQLite database keyed by absolute path and validated against the file's size,
+``st_mtime_ns`` and inode, so a digest is reused only while the file on disk is
+provably unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_checksums (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digests TEXT NOT NULL
+)
+"""
+
+# Rows written between commits; keeps a crash from losing more than a batch.
+_COMMIT_INTERVAL = 1000
+
+
+class ChecksumCache:
+    """SQLite-backed map of ``(path, size, mtime_ns, inode)`` to hex digests.
+
+    Safe to share between the hashing threads of
+    :func:`~packaging.checksum_engine.write_payload_manifests`.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, stat: os.stat_result, algorithms: Iterable[str]) -> dict[str, str] | None:
+        """Return cached digests of *path* for *algorithms*, or None if it may have changed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, inode, digests FROM file_checksums WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+            if row is not None and tuple(row[:3]) == (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+                digests: dict[str, str] = json.loads(row[3])
+                if all(alg in digests for alg in algorithms):
+                    self.hits += 1
+                    return {alg: digests[alg] for alg in algorithms}
+            self.misses += 1
+            return None
+
+    def put(self, path: Path, stat: os.stat_result, digests: dict[str, str]) -> None:
+        """Record *digests* for *path* as it was when *stat* was taken."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_checksums (path, size, mtime_ns, inode, digests) VALUES (?, ?, ?, ?, ?)",
+                (str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino, json.dumps(digests, sort_keys=True)),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= _COMMIT_INTERVAL:
+                self._conn.commit()
+                self._uncommitted = 0
+
+    def close(self) -> None:
+        """Commit outstanding rows and close the database."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def __enter__(self) -> ChecksumCache:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
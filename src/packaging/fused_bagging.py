@@ -0,0 +1,155 @@
+"""Single-pass BagIt packaging: checksum payload files while they are tarred.
+
+:func:`packaging.manifests.bag_directory` reads every payload file to build the
+BagIt manifests, and the tar packaging then reads it all again.  On network
+mounts that doubles source I/O.  Here the payload is hashed as :mod:`tarfile`
+streams it into the archive, and the tag files are written and appended to the
+archive afterwards.
+
+The bag left on disk matches what ``bag_directory`` writes (same manifest,
+``bag-info.txt`` and tagmanifest bytes), so it can still be validated and its
+manifests copied with :func:`~packaging.manifests.create_manifests_directory`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tarfile
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import bagit
+
+from packaging.checksum_engine import encode_manifest_path, write_tag_file, write_tagmanifest
+from packaging.manifests import DEFAULT_CHECKSUM, merge_bag_info
+
+
+class _HashingReader:
+    """Pass reads through to *fileobj*, feeding every block to *hashers*."""
+
+    def __init__(self, fileobj: BinaryIO, hashers: dict[str, Any]) -> None:
+        self._fileobj = fileobj
+        self._hashers = hashers
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to *size* bytes and hash them."""
+        data = self._fileobj.read(size)
+        for hasher in self._hashers.values():
+            hasher.update(data)
+        self.bytes_read += len(data)
+        return data
+
+
+def add_bag_to_tar(tar: tarfile.TarFile, bag_dir: Path, bag_info: dict[str, str]) -> None:
+    """Add the bag at *bag_dir* to *tar*, writing its BagIt tag files on the way.
+
+    Members are added in the same order as ``tar.add(bag_dir)`` would, except
+    that the manifests, the bag info file and the tagmanifests are written once
+    the payload has been streamed and appended at the end.  Each regular
+    payload file is read exactly once, by :mod:`tarfile`, and hashed as it goes.
+
+    *bag_info* is merged into the existing bag info the same way
+    ``bag_directory`` does: new bags get ``Bagging-Date`` and
+    ``Bag-Software-Agent`` unless supplied, existing bags keep their tags.
+
+    Args:
+        tar: Archive opened for writing.
+        bag_dir: Bag laid out by :func:`~packaging.manifests.prepare_bag_layout`
+            (or an existing bag).
+        bag_info: Tags documenting ownership of the bag.
+
+    Raises:
+        bagit.BagError: If *bag_dir* is not a bag.
+        OSError: If a payload file cannot be read.
+    """
+    bag = bagit.Bag(str(bag_dir))
+    algorithms = list(bag.algorithms) or list(DEFAULT_CHECKSUM)
+    info = merge_bag_info(bag, bag_info)
+
+    regenerated = {bag.tag_file_name}
+    regenerated.update(f"manifest-{alg}.txt" for alg in algorithms)
+    regenerated.update(f"tagmanifest-{alg}.txt" for alg in algorithms)
+
+    payload: dict[str, dict[str, str]] = {}
+    payload_bytes = _add_tree(tar, bag_dir, bag_dir, algorithms, regenerated, payload)
+
+    for alg in algorithms:
+        manifest_lines = [
+            f"{payload[path][alg]}  {encode_manifest_path(path)}\n" for path in sorted(payload, key=_bagit_walk_key)
+        ]
+        (bag_dir / f"manifest-{alg}.txt").write_bytes("".join(manifest_lines).encode(bag.encoding))
+
+    info["Payload-Oxum"] = f"{payload_bytes}.{len(payload)}"
+    write_tag_file(bag_dir / bag.tag_file_name, info, bag.encoding)
+
+    for alg in algorithms:
+        write_tagmanifest(bag_dir, alg, bag.encoding)
+
+    for name in sorted(regenerated):
+        path = bag_dir / name
+        if path.is_file():
+            tar.add(str(path), arcname=f"{bag_dir.name}/{name}")
+
+
+def _add_tree(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    tar: tarfile.TarFile,
+    path: Path,
+    bag_dir: Path,
+    algorithms: list[str],
+    regenerated: set[str],
+    payload: dict[str, dict[str, str]],
+) -> int:
+    """Recursively add *path* like :meth:`tarfile.TarFile.add`, hashing payload files.
+
+    Returns the number of payload bytes added below *path*.
+    """
+    rel_path = path.relative_to(bag_dir).as_posix()
+    arcname = bag_dir.name if rel_path == "." else f"{bag_dir.name}/{rel_path}"
+    tarinfo = tar.gettarinfo(str(path), arcname)
+    if tarinfo is None:
+        # Sockets and the like: tarfile.add skips them too.
+        return 0
+
+    in_payload = rel_path == "data" or rel_path.startswith("data/")
+    if tarinfo.isdir():
+        tar.addfile(tarinfo)
+        payload_bytes = 0
+        for entry in sorted(os.listdir(path)):
+            if rel_path == "." and entry in regenerated:
+                continue
+            payload_bytes += _add_tree(tar, path / entry, bag_dir, algorithms, regenerated, payload)
+        return payload_bytes
+
+    if tarinfo.isreg():
+        hashers = {alg: hashlib.new(alg) for alg in algorithms} if in_payload else {}
+        with open(path, "rb") as source:
+            reader = _HashingReader(source, hashers)
+            tar.addfile(tarinfo, reader)
+    else:
+        tar.addfile(tarinfo)
+        if not in_payload or path.is_dir():
+            return 0
+        # Links are archived as links but bagit hashes the file they point at,
+        # which needs a separate read.
+        hashers = {alg: hashlib.new(alg) for alg in algorithms}
+        with open(path, "rb") as source:
+            reader = _HashingReader(source, hashers)
+            while reader.read(bagit.HASH_BLOCK_SIZE):
+                pass
+
+    if not in_payload:
+        return 0
+    payload[rel_path] = {alg: hasher.hexdigest() for alg, hasher in hashers.items()}
+    return reader.bytes_read
+
+
+def _bagit_walk_key(rel_path: str) -> tuple[tuple[int, str], ...]:
+    """Sort key reproducing bagit's manifest order.
+
+    bagit lists a directory's files (sorted) before descending into its
+    subdirectories (sorted), i.e. ``os.walk`` order.
+    """
+    *dir_names, file_name = rel_path.split("/")
+    return (*((1, name) for name in dir_names), (0, file_name))
@@ -0,0 +1,359 @@
+"""Parallel verification and extraction of independently decodable archive parts.
+
+With the ``independent`` part layout every part is a complete gzip member (or
+zstd frame) holding a known, block-aligned range of the tar stream, and the
+manifest records where that range starts (``tar_offset``), how long it is
+(``tar_size``) and where the first tar header inside it begins
+(``first_member_offset``).  One worker per part can then decode its part and
+handle every member whose header starts inside it; a member whose data runs on
+into later parts is read through them, so nothing has to be reassembled first.
+"""
+
+from __future__ import annotations
+
+import os
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, cast
+
+from models.common import ArchiveCodec
+from packaging.archive_codecs import DECOMPRESSION_ERRORS, open_decompressed_reader
+
+if TYPE_CHECKING:
+    from packaging.archive_chunks import ArchivePartInfo
+    from packaging.member_index import SelectedMember
+
+_READ_BLOCK_SIZE = 1024 * 1024
+
+
+def has_independent_layout(parts: list[ArchivePartInfo]) -> bool:
+    """Return True if every part carries the offsets needed to decode it on its own."""
+    return bool(parts) and all(part.tar_offset is not None and part.tar_size is not None for part in parts)
+
+
+class _PartChainReader:
+    """Decompressed tar bytes from ``parts[start:]``, opening each part only when needed.
+
+    Every part is decoded to its end before the next one is opened, so its
+    checksum is validated, and its decoded length is checked against
+    ``tar_size``.  Given *end*, an offset in the tar stream, reads stop there
+    as if the stream ended, so a reader buffering ahead (``tarfile`` reads
+    whole records) never opens a part past it.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        parts: list[ArchivePartInfo],
+        parts_dir: Path,
+        codec: ArchiveCodec,
+        start: int,
+        end: int | None = None,
+    ) -> None:
+        self._parts = parts
+        self._parts_dir = parts_dir
+        self._codec = codec
+        self._position = start
+        self._file: BinaryIO | None = None
+        self._stream: BinaryIO | None = None
+        self._decoded = 0
+        self._remaining = None if end is None else end - cast(int, parts[start].tar_offset)
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to *size* decoded bytes, moving on to later parts as each one ends."""
+        if self._remaining is not None:
+            size = self._remaining if size < 0 else min(size, self._remaining)
+        buf = bytearray()
+        while size < 0 or len(buf) < size:
+            chunk = self._read_part_chunk(_READ_BLOCK_SIZE if size < 0 else size - len(buf))
+            if chunk is None:
+                break
+            buf.extend(chunk)
+        if self._remaining is not None:
+            self._remaining -= len(buf)
+        return bytes(buf)
+
+    def skip(self, size: int) -> None:
+        """Discard the next *size* decoded bytes."""
+        while size > 0:
+            chunk = self.read(min(size, _READ_BLOCK_SIZE))
+            if not chunk:
+                raise tarfile.ReadError("Archive part ended before its first member")
+            size -= len(chunk)
+
+    def finish_part(self, index: int) -> None:
+        """Decode the rest of part *index* so its checksum and length are validated."""
+        while self._position <= index and self._read_part_chunk(_READ_BLOCK_SIZE) is not None:
+            pass
+
+    def close(self) -> None:
+        """Close the part currently open, if any."""
+        self._close_current(finished=False)
+
+    def __enter__(self) -> _PartChainReader:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def _read_part_chunk(self, size: int) -> bytes | None:
+        """Read from the current part: ``b""`` once it ends, ``None`` after the last part."""
+        if self._stream is None and not self._open_next():
+            return None
+        assert self._stream is not None
+        chunk = self._stream.read(size)
+        if chunk:
+            self._decoded += len(chunk)
+        else:
+            self._close_current(finished=True)
+        return chunk
+
+    def _open_next(self) -> bool:
+        if self._position >= len(self._parts):
+            return False
+        part = self._parts[self._position]
+        self._file = open(  # noqa: SIM115  # pylint: disable=consider-using-with
+            self._parts_dir / part.file_name, "rb"
+        )
+        self._stream = open_decompressed_reader(self._file, self._codec)
+        self._decoded = 0
+        return True
+
+    def _close_current(self, *, finished: bool) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if finished:
+            part = self._parts[self._position]
+            if part.tar_size is not None and self._decoded != part.tar_size:
+                raise tarfile.ReadError(
+                    f"Archive part {part.file_name} decoded to {self._decoded} bytes, expected {part.tar_size}"
+                )
+            self._position += 1
+
+
+def _extract_member(
+    tar: tarfile.TarFile,
+    member: tarfile.TarInfo,
+    dest_path: Path,
+    directories: list[tarfile.TarInfo],
+) -> None:
+    """Extract *member* with the ``data`` filter, deferring directory attributes."""
+    if member.isdir():
+        # Like extractall: directory attributes are applied once every member
+        # is in place, in case they are read-only.
+        directories.append(tarfile.data_filter(member, str(dest_path)))
+        tar.extract(member, path=dest_path, set_attrs=False, filter="data")
+    else:
+        tar.extract(member, path=dest_path, filter="data")
+
+
+def _apply_directory_attributes(dest_path: Path, directories: list[tarfile.TarInfo]) -> None:
+    """Set the mtime and mode of extracted directories, deepest first."""
+    for directory in sorted(directories, key=lambda d: d.name, reverse=True):
+        directory_path = dest_path / directory.name
+        os.utime(directory_path, (directory.mtime, directory.mtime))
+        if directory.mode is not None:
+            os.chmod(directory_path, directory.mode)
+
+
+def _process_part(  # pylint: disable=too-many-arguments
+    parts: list[ArchivePartInfo],
+    position: int,
+    parts_dir: Path,
+    codec: ArchiveCodec,
+    *,
+    dest_path: Path | None,
+    directories: list[tarfile.TarInfo],
+) -> int:
+    """Walk (and optionally extract) the members whose headers start in ``parts[position]``.
+
+    Returns the number of members handled.
+    """
+    part = parts[position]
+    assert part.tar_offset is not None and part.tar_size is not None
+    member_count = 0
+    try:
+        with _PartChainReader(parts, parts_dir, codec, position) as reader:
+            if part.first_member_offset is not None:
+                reader.skip(part.first_member_offset)
+                members_start = part.tar_offset + part.first_member_offset
+                part_end = part.tar_offset + part.tar_size
+                with tarfile.open(fileobj=cast(BinaryIO, reader), mode="r|") as tar:
+                    for member in tar:
+                        if members_start + member.offset >= part_end:
+                            break
+                        member_count += 1
+                        if dest_path is not None:
+                            _extract_member(tar, member, dest_path, directories)
+            reader.finish_part(position)
+    except DECOMPRESSION_ERRORS as e:
+        raise tarfile.ReadError(f"invalid compressed data in {part.file_name}: {e}") from e
+    return member_count
+
+
+def _process_parts_in_parallel(
+    parts: list[ArchivePartInfo],
+    parts_dir: Path,
+    codec: ArchiveCodec,
+    workers: int,
+    dest_path: Path | None,
+) -> int:
+    """Run :func:`_process_part` for every part on a thread pool; return the member count."""
+    if workers <= 0:
+        raise ValueError("workers must be greater than zero")
+    ordered = sorted(parts, key=lambda p: p.index)
+    for part in ordered:
+        part_path = parts_dir / part.file_name
+        if not part_path.exists():
+            raise FileNotFoundError(f"Archive part file not found: {part_path}")
+
+    directories: list[tarfile.TarInfo] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive-part") as executor:
+        futures = [
+            executor.submit(
+                _process_part,
+                ordered,
+                position,
+                parts_dir,
+                codec,
+                dest_path=dest_path,
+                directories=directories,
+            )
+            for position in range(len(ordered))
+        ]
+        member_count = sum(future.result() for future in futures)
+
+    if member_count == 0:
+        raise tarfile.TarError("Tar stream contained no members — archive may be empty or corrupt")
+
+    if dest_path is not None:
+        _apply_directory_attributes(dest_path, directories)
+    return member_count
+
+
+def verify_independent_tar_parts(
+    parts: list[ArchivePartInfo],
+    parts_dir: Path,
+    codec: ArchiveCodec,
+    workers: int = 4,
+) -> int:
+    """Verify independently decodable parts in parallel and return the tar member count.
+
+    Every part is fully decoded (validating gzip CRC32 / zstd checksums and its
+    decoded length) and every tar header is parsed, as the streamed check in
+    :func:`~packaging.archive_chunks.verify_tar_parts_stream` would.
+
+    Raises:
+        FileNotFoundError: If any part file is missing.
+        tarfile.TarError: If a part is corrupt or the tar structure is invalid.
+    """
+    return _process_parts_in_parallel(parts, parts_dir, codec, workers, dest_path=None)
+
+
+def extract_independent_tar_parts(
+    parts: list[ArchivePartInfo],
+    parts_dir: Path,
+    dest_path: Path,
+    codec: ArchiveCodec,
+    workers: int = 4,
+) -> int:
+    """Extract independently decodable parts into *dest_path* in parallel.
+
+    Members are extracted with the ``data`` filter, as the sequential
+    ``extractall`` path does.  Returns the number of members extracted.
+
+    Raises:
+        FileNotFoundError: If any part file is missing.
+        tarfile.TarError: If a part is corrupt or the tar structure is invalid.
+    """
+    dest_path.mkdir(parents=True, exist_ok=True)
+    return _process_parts_in_parallel(parts, parts_dir, codec, workers, dest_path=dest_path)
+
+
+def _extract_member_group(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    parts: list[ArchivePartInfo],
+    position: int,
+    parts_dir: Path,
+    codec: ArchiveCodec,
+    group: list[SelectedMember],
+    dest_path: Path,
+    directories: list[tarfile.TarInfo],
+) -> int:
+    """Extract the selected members whose headers start in ``parts[position]``.
+
+    Decoding starts at the first selected header and ends where the last
+    selected member's data does, so only the parts spanned by the selected
+    members are read.
+    """
+    part = parts[position]
+    assert part.tar_offset is not None
+    wanted = {member.entry.uncompressed_offset for member in group}
+    first = group[0].entry.uncompressed_offset
+    last = group[-1].entry.uncompressed_offset
+    end = max(member.end_offset for member in group)
+    extracted = 0
+    try:
+        with _PartChainReader(parts, parts_dir, codec, position, end=end) as reader:
+            reader.skip(first - part.tar_offset)
+            with tarfile.open(fileobj=cast(BinaryIO, reader), mode="r|") as tar:
+                for member in tar:
+                    offset = first + member.offset
+                    if offset in wanted:
+                        _extract_member(tar, member, dest_path, directories)
+                        extracted += 1
+                    if offset >= last:
+                        break
+    except DECOMPRESSION_ERRORS as e:
+        raise tarfile.ReadError(f"invalid compressed data in {part.file_name}: {e}") from e
+    return extracted
+
+
+def extract_selected_members(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    parts: list[ArchivePartInfo],
+    parts_dir: Path,
+    dest_path: Path,
+    codec: ArchiveCodec,
+    selected: list[SelectedMember],
+    workers: int = 4,
+) -> int:
+    """Extract only the *selected* members into *dest_path*, in parallel.
+
+    Only the parts returned by :func:`~packaging.member_index.parts_for_members`
+    for *selected* need to be present in *parts_dir*.  Returns the number of
+    members extracted.
+
+    Raises:
+        tarfile.TarError: If a part is corrupt or the tar structure is invalid.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be greater than zero")
+    ordered = sorted(parts, key=lambda p: p.index)
+    positions = {part.index: position for position, part in enumerate(ordered)}
+    groups: dict[int, list[SelectedMember]] = {}
+    for member in selected:
+        groups.setdefault(member.entry.part_index, []).append(member)
+
+    dest_path.mkdir(parents=True, exist_ok=True)
+    directories: list[tarfile.TarInfo] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive-part") as executor:
+        futures = [
+            executor.submit(
+                _extract_member_group,
+                ordered,
+                positions[part_index],
+                parts_dir,
+                codec,
+                group,
+                dest_path,
+                directories,
+            )
+            for part_index, group in groups.items()
+        ]
+        extracted = sum(future.result() for future in futures)
+
+    _apply_directory_attributes(dest_path, directories)
+    return extracted
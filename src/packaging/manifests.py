@@ -1,18 +1,27 @@
 """Scripts for generating file manifests"""
 
-import multiprocessing
 import os
 import shutil
+import tempfile
+from contextlib import nullcontext
+from datetime import date
 from pathlib import Path
+from typing import Any
 
 import bagit
 
-# bagit uses multiprocessing.Pool for checksum generation when processes > 1.
-# On Linux, exceptions raised during bagging can leave semaphore resources
-# behind at shutdown, so we keep it single-process there for deterministic
-# cleanup.
-PROCESSES = 1 if os.name != "nt" else max(multiprocessing.cpu_count() - 2, 1)
+from packaging.checksum_cache import ChecksumCache
+from packaging.checksum_engine import (
+    validate_bag_entries,
+    write_payload_manifests,
+    write_tag_file,
+    write_tagmanifest,
+)
+
+# Checksums are computed by packaging.checksum_engine on a thread pool rather
+# than by bagit's multiprocessing pool, which leaks semaphores on error on Linux.
 DEFAULT_CHECKSUM = ["sha256"]
+BAGIT_TXT = "BagIt-Version: 0.97\nTag-File-Character-Encoding: UTF-8\n"
 
 
 def bagit_exists(drive_path: Path) -> bool:
@@ -20,37 +29,96 @@ def bagit_exists(drive_path: Path) -> bool:
     return (drive_path / "bagit.txt").is_file() and (drive_path / "data").is_dir()
 
 
-def validate_bag(bag_path: Path) -> None:
+def validate_bag(bag_path: Path, workers: int = 1) -> None:
     """Validate a BagIt bag at the given path.
 
+    Structure and completeness are checked by bagit; file fixity is checked
+    on *workers* threads.
+
     Raises:
         bagit.BagValidationError: if the bag does not pass validation.
         bagit.BagError: if the path does not look like a valid bag at all.
     """
     bag = bagit.Bag(str(bag_path))
-    bag.validate(processes=PROCESSES)
+    bag.validate(completeness_only=True)
+    validate_bag_entries(bag, workers=workers)
+
+
+def prepare_bag_layout(drive_path: Path) -> None:
+    """Move the contents of *drive_path* into ``data/`` and write ``bagit.txt``.
+
+    This is the layout half of :func:`bagit.make_bag`; the manifests and
+    ``bag-info.txt`` are written once the payload has been hashed.  Does
+    nothing if *drive_path* is already a bag.
+    """
+    if bagit_exists(drive_path):
+        return
+
+    temp_data = Path(tempfile.mkdtemp(dir=drive_path))
+    for entry in os.listdir(drive_path):
+        if drive_path / entry == temp_data:
+            continue
+        os.rename(drive_path / entry, temp_data / entry)
+    data_dir = drive_path / "data"
+    os.rename(temp_data, data_dir)
+    # Match make_bag: the payload directory keeps the original directory's permissions.
+    os.chmod(data_dir, os.stat(drive_path).st_mode)
+
+    (drive_path / "bagit.txt").write_bytes(BAGIT_TXT.encode("utf-8"))
 
 
-def bag_directory(drive_path: Path, bag_info: dict[str, str]) -> None:
+def merge_bag_info(bag: bagit.Bag, bag_info: dict[str, str]) -> dict[str, Any]:
+    """Merge *bag_info* into the existing tags of *bag*.
+
+    New bags get ``Bagging-Date`` and ``Bag-Software-Agent`` unless supplied,
+    as :func:`bagit.make_bag` does; existing bags keep their tags.
+    """
+    info: dict[str, Any] = bag.info | bag_info
+    if "Bagging-Date" not in info:
+        info["Bagging-Date"] = date.strftime(date.today(), "%Y-%m-%d")
+    if "Bag-Software-Agent" not in info:
+        info["Bag-Software-Agent"] = f"bagit.py v{bagit.VERSION} <{bagit.PROJECT_URL}>"
+    return info
+
+
+def bag_directory(
+    drive_path: Path,
+    bag_info: dict[str, str],
+    workers: int = 1,
+    cache_path: Path | None = None,
+) -> None:
     """Create a bagit bag from a given directory
 
+    If a bag already exists its manifests are regenerated and *bag_info* is
+    merged into its tags.  The result is byte-for-byte what
+    :func:`bagit.make_bag` / ``Bag.save(manifests=True)`` writes, but payload
+    files are hashed on *workers* threads.
+
     Args:
         drive_path (Path): the path to the directory to bag
         bag_info (Dict[str,str]): a dictionary documenting ownership of the bag
+        workers (int): number of threads used to checksum the payload
+        cache_path (Path | None): SQLite checksum cache; unchanged files reuse
+            their cached digests, so re-bagging on a retry only hashes new or
+            modified files
     """
-    # if a bagit already exists update it
-    if bagit_exists(drive_path):
-        bag = bagit.Bag(str(drive_path))
-        bag.info = bag.info | bag_info
-        bag.save(processes=PROCESSES, manifests=True)
-        return
-
-    _ = bagit.make_bag(
-        bag_dir=drive_path.as_posix(),
-        bag_info=bag_info,
-        processes=PROCESSES,
-        checksums=DEFAULT_CHECKSUM,
-    )
+    prepare_bag_layout(drive_path)
+    bag = bagit.Bag(str(drive_path))
+    algorithms = list(bag.algorithms) or list(DEFAULT_CHECKSUM)
+    info = merge_bag_info(bag, bag_info)
+
+    with ChecksumCache(cache_path) if cache_path is not None else nullcontext() as cache:
+        total_bytes, total_files = write_payload_manifests(
+            drive_path,
+            algorithms,
+            bag.encoding,
+            workers=workers,
+            cache=cache,
+        )
+    info["Payload-Oxum"] = f"{total_bytes}.{total_files}"
+    write_tag_file(drive_path / bag.tag_file_name, info, bag.encoding)
+    for alg in algorithms:
+        write_tagmanifest(drive_path, alg, bag.encoding)
 
 
 def get_manifests_in_bag(drive_path: Path) -> list[Path]:
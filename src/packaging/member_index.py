@@ -0,0 +1,181 @@
+"""Tar member offset index for random-access retrieval of independent archive parts.
+
+The index is a gzip-compressed binary sidecar uploaded next to
+``archive-manifest.json``.  After a short header it holds one fixed-size
+record per tar member followed by the member's UTF-8 path::
+
+    <path length u32> <size u64> <mtime i64> <part index u32>
+    <compressed offset u64> <uncompressed offset u64> <path bytes>
+
+Records are in archive order, so writing and filtering both stream with
+constant memory, even for tens of millions of entries.  ``compressed offset``
+is where the member's part starts in the concatenated part stream (the nearest point
+decoding can start from) and ``uncompressed offset`` is where the member's
+first header starts in the tar stream.
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from packaging.archive_chunks import ArchivePartInfo
+
+#: Default file name of the index sidecar.
+MEMBER_INDEX_FILE_NAME = "archive-member-index.bin.gz"
+
+_MAGIC = b"DRVIDX\x00\x01"
+_RECORD = struct.Struct("<IQqIQQ")
+
+
+@dataclass(frozen=True)
+class MemberIndexEntry:
+    """Location of one tar member within a chunked archive."""
+
+    path: str
+    size: int
+    mtime: int
+    part_index: int
+    compressed_offset: int
+    uncompressed_offset: int
+
+
+@dataclass(frozen=True)
+class SelectedMember:
+    """An index entry matched by a path filter, with the end of its tar range."""
+
+    entry: MemberIndexEntry
+    #: Offset just past the member's data (the next member's header, or the end of the tar).
+    end_offset: int
+
+
+class MemberIndexWriter:
+    """Stream :class:`MemberIndexEntry` records into an index file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entry_count = 0
+        self._file = gzip.GzipFile(path, "wb")  # pylint: disable=consider-using-with
+        self._file.write(_MAGIC)
+
+    def add(self, entry: MemberIndexEntry) -> None:
+        """Append *entry*; entries must be added in archive order."""
+        path_bytes = entry.path.encode("utf-8", "surrogateescape")
+        self._file.write(
+            _RECORD.pack(
+                len(path_bytes),
+                entry.size,
+                entry.mtime,
+                entry.part_index,
+                entry.compressed_offset,
+                entry.uncompressed_offset,
+            )
+        )
+        self._file.write(path_bytes)
+        self.entry_count += 1
+
+    def close(self) -> None:
+        """Finish the compressed index file."""
+        self._file.close()
+
+    def __enter__(self) -> MemberIndexWriter:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+def read_member_index(path: Path) -> Iterator[MemberIndexEntry]:
+    """Yield the entries of the index at *path* in archive order.
+
+    Raises:
+        ValueError: If *path* is not a member index or is truncated.
+    """
+    with gzip.open(path, "rb") as index_file:
+        if index_file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not an archive member index: {path}")
+        while header := index_file.read(_RECORD.size):
+            if len(header) != _RECORD.size:
+                raise ValueError(f"Truncated archive member index: {path}")
+            path_length, size, mtime, part_index, compressed_offset, uncompressed_offset = _RECORD.unpack(header)
+            path_bytes = index_file.read(path_length)
+            if len(path_bytes) != path_length:
+                raise ValueError(f"Truncated archive member index: {path}")
+            yield MemberIndexEntry(
+                path=path_bytes.decode("utf-8", "surrogateescape"),
+                size=size,
+                mtime=mtime,
+                part_index=part_index,
+                compressed_offset=compressed_offset,
+                uncompressed_offset=uncompressed_offset,
+            )
+
+
+def _normalise_filters(include_paths: Iterable[str], source_root: str) -> list[str]:
+    filters = []
+    for include_path in include_paths:
+        relative = include_path.strip().strip("/")
+        if not relative or relative == ".":
+            filters.append(source_root)
+        else:
+            filters.append(f"{source_root}/{relative}")
+    return filters
+
+
+def select_members(
+    index_path: Path,
+    include_paths: Iterable[str],
+    *,
+    source_root: str,
+    tar_size: int,
+) -> list[SelectedMember]:
+    """Return the members matching *include_paths*, in archive order.
+
+    A filter matches the member with that path and everything below it.
+    Paths are relative to the archived directory (*source_root*), e.g.
+    ``data/results`` selects ``<source_root>/data/results`` and its contents.
+
+    Args:
+        index_path: Local copy of the member index.
+        include_paths: Paths to select, relative to the archive root.
+        source_root: Top-level directory name stored in the archive.
+        tar_size: Size of the whole uncompressed tar stream, which bounds the
+            last member.
+    """
+    filters = _normalise_filters(include_paths, source_root)
+    selected: list[SelectedMember] = []
+    pending: MemberIndexEntry | None = None
+    for entry in read_member_index(index_path):
+        if pending is not None:
+            selected.append(SelectedMember(entry=pending, end_offset=entry.uncompressed_offset))
+            pending = None
+        if any(entry.path == f or entry.path.startswith(f"{f}/") for f in filters):
+            pending = entry
+    if pending is not None:
+        selected.append(SelectedMember(entry=pending, end_offset=tar_size))
+    return selected
+
+
+def parts_for_members(selected: Iterable[SelectedMember], parts: list[ArchivePartInfo]) -> list[ArchivePartInfo]:
+    """Return the parts (in index order) holding any byte of the *selected* members.
+
+    Raises:
+        ValueError: If *parts* were not packaged with the independent layout.
+    """
+    ordered = sorted(parts, key=lambda p: p.index)
+    if any(part.tar_offset is None for part in ordered):
+        raise ValueError("Selective retrieval requires the independent part layout")
+    part_starts = [cast(int, part.tar_offset) for part in ordered]
+
+    needed: set[int] = set()
+    for member in selected:
+        first = bisect.bisect_right(part_starts, member.entry.uncompressed_offset) - 1
+        last = bisect.bisect_left(part_starts, member.end_offset) - 1
+        needed.update(range(max(first, 0), last + 1))
+    return [ordered[position] for position in sorted(needed)]
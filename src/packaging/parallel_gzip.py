@@ -0,0 +1,154 @@
+"""Block-parallel gzip compression for streamed tar archives.
+
+Splits the uncompressed stream into fixed-size blocks and deflates them on a
+thread pool, in the spirit of ``pigz``.  Each block is primed with the last
+32 KiB of the block before it and ends with a ``Z_SYNC_FLUSH`` so the
+compressed blocks can simply be concatenated: the output is a single, standard
+gzip member that any gzip reader (including ``tarfile`` ``r|gz``) can decode.
+
+:mod:`zlib` releases the GIL while compressing, so threads are sufficient to
+keep every core busy.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO
+
+DEFAULT_BLOCK_SIZE_BYTES = 1024 * 1024
+DEFAULT_COMPRESS_LEVEL = 9  # matches tarfile's "w|gz" default
+
+# Deflate can reference at most 32 KiB of preceding data.
+_DICTIONARY_SIZE_BYTES = 32 * 1024
+
+# Magic, CM=deflate, no flags, MTIME=0, XFL=0, OS=unknown.  A zero mtime keeps
+# the output deterministic, so re-packaging an unchanged tree yields identical parts.
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+def _deflate_block(block: bytes, dictionary: bytes, level: int, final: bool) -> bytes:
+    """Raw-deflate one block, primed with *dictionary*, ending on a byte boundary."""
+    if dictionary:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, dictionary
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipWriter:  # pylint: disable=too-many-instance-attributes
+    """Write-only file object that gzip-compresses into *fileobj* using a thread pool.
+
+    Compressed blocks are written to *fileobj* strictly in order.  At most
+    ``2 * workers`` blocks are in flight, which bounds memory use to roughly
+    ``2 * workers * block_size_bytes``.  Closing the writer emits the gzip
+    trailer but does not close *fileobj*.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        *,
+        workers: int,
+        compresslevel: int = DEFAULT_COMPRESS_LEVEL,
+        block_size_bytes: int = DEFAULT_BLOCK_SIZE_BYTES,
+    ) -> None:
+        """Initialise the writer and emit the gzip header.
+
+        Args:
+            fileobj: Destination for the compressed stream.
+            workers: Number of compression threads.
+            compresslevel: zlib compression level (0-9).
+            block_size_bytes: Uncompressed bytes per independently compressed block.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be greater than zero")
+        if block_size_bytes <= 0:
+            raise ValueError("block_size_bytes must be greater than zero")
+
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._block_size_bytes = block_size_bytes
+        self._max_pending = workers * 2
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gzip-block")
+        self._pending: deque[Future[bytes]] = deque()
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._crc = 0
+        self._size = 0
+        self._closed = False
+
+        self._fileobj.write(_GZIP_HEADER)
+
+    def writable(self) -> bool:
+        """Indicate whether this object supports writing."""
+        return True
+
+    def tell(self) -> int:
+        """Return the number of uncompressed bytes consumed so far."""
+        return self._size
+
+    def write(self, data: bytes) -> int:
+        """Buffer *data* and dispatch every complete block for compression."""
+        if self._closed:
+            raise ValueError("write to closed ParallelGzipWriter")
+        if not data:
+            return 0
+
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        self._buffer.extend(data)
+        while len(self._buffer) >= self._block_size_bytes:
+            block = bytes(self._buffer[: self._block_size_bytes])
+            del self._buffer[: self._block_size_bytes]
+            self._submit(block, final=False)
+        return len(data)
+
+    def flush(self) -> None:
+        """Write every block that has finished compressing to *fileobj*."""
+        while self._pending and self._pending[0].done():
+            self._write_next_block()
+
+    def close(self) -> None:
+        """Compress the remaining data and write the gzip trailer."""
+        if self._closed:
+            return
+        try:
+            self._submit(bytes(self._buffer), final=True)
+            self._buffer.clear()
+            while self._pending:
+                self._write_next_block()
+            self._fileobj.write(struct.pack("<II", self._crc & 0xFFFFFFFF, self._size & 0xFFFFFFFF))
+        finally:
+            self._closed = True
+            self._executor.shutdown(wait=True)
+
+    def abort(self) -> None:
+        """Discard pending work without writing a trailer."""
+        self._closed = True
+        self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> ParallelGzipWriter:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _submit(self, block: bytes, *, final: bool) -> None:
+        """Queue *block* for compression, writing completed blocks to keep the queue bounded."""
+        self._pending.append(self._executor.submit(_deflate_block, block, self._dictionary, self._compresslevel, final))
+        self._dictionary = (self._dictionary + block)[-_DICTIONARY_SIZE_BYTES:]
+        while len(self._pending) > self._max_pending:
+            self._write_next_block()
+
+    def _write_next_block(self) -> None:
+        """Wait for the oldest in-flight block and write it to *fileobj*."""
+        self._fileobj.write(self._pending.popleft().result())
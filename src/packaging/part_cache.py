@@ -0,0 +1,196 @@
+"""Local cache of verified archive parts, shared by retrievals.
+
+Every retrieval downloads into its own scratch directory, which is deleted when
+the job ends, so retrieving the same drive again (or retrying after a failed
+extraction) used to restore and download every part again.  A
+:class:`PartCache` keeps verified parts under their manifest sha256 instead.
+A job hard-links a cached part into its scratch directory rather than fetching
+it, and adds each part it downloads the same way, so a cached part costs no
+extra space while a job is using it.
+
+The cache has a size budget.  Entries are evicted least recently used first,
+but never while pinned: each job that takes or adds an entry holds a pin on it
+until it releases it, and entries are reference-counted across jobs.  Files are
+only ever added once verified, so their names can be trusted when the cache is
+reopened.
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from utils.logging import log_event
+
+_DIGEST_NAME = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass
+class _Entry:
+    """A cached part: its size, how many jobs currently pin it, and whether its file is in place."""
+
+    size: int
+    pins: int = 0
+    linked: bool = True
+
+
+def _link_or_copy(source: Path, dest: Path) -> None:
+    """Hard-link *source* to *dest*, copying instead across filesystems."""
+    try:
+        os.link(source, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        partial = dest.with_name(f"{dest.name}.partial")
+        shutil.copyfile(source, partial)
+        os.replace(partial, dest)
+
+
+class PartCache:
+    """Size-bounded LRU cache of archive parts keyed by sha256.
+
+    Safe to share between the threads of concurrent retrievals.
+
+    Args:
+        root: Directory holding the cached parts; created if missing.  It
+            should be on the same filesystem as the retrieval scratch space
+            so parts can be hard-linked rather than copied.
+        max_bytes: Total size of unpinned entries the cache may keep.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Least recently used first.
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        root.mkdir(parents=True, exist_ok=True)
+        for path in sorted(root.iterdir(), key=lambda p: p.stat().st_mtime):
+            if path.is_file() and _DIGEST_NAME.fullmatch(path.name):
+                self._entries[path.name] = _Entry(size=path.stat().st_size)
+            elif path.is_file():
+                # Left over from a copy interrupted by a crash.
+                path.unlink(missing_ok=True)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached parts."""
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
+
+    def acquire(self, sha256: str, dest: Path) -> bool:
+        """Pin the part cached as *sha256* and link it to *dest*.
+
+        Returns:
+            True on a hit; False if the part is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(sha256)
+            if entry is None or not entry.linked:
+                self.misses += 1
+                return False
+            entry.pins += 1
+            self._entries.move_to_end(sha256)
+            self.hits += 1
+        path = self._root / sha256
+        try:
+            _link_or_copy(path, dest)
+            # Persist the recency for when the cache is reopened.
+            os.utime(path)
+        except OSError as e:
+            with self._lock:
+                self._entries.pop(sha256, None)
+            log_event(logging.WARNING, "part_cache.entry_unreadable", sha256=sha256, error=str(e))
+            return False
+        return True
+
+    def add(self, sha256: str, source: Path) -> bool:
+        """Cache the verified part at *source* as *sha256* and pin it.
+
+        Least recently used unpinned entries are evicted to make room.
+
+        Returns:
+            True if the part is cached (now or already); False if it does not
+            fit beside the pinned entries.
+        """
+        size = source.stat().st_size
+        with self._lock:
+            entry = self._entries.get(sha256)
+            if entry is not None:
+                entry.pins += 1
+                self._entries.move_to_end(sha256)
+                return True
+            if not self._make_room(size):
+                return False
+            # Reserved for the budget, but not handed out until its file is in place.
+            entry = self._entries[sha256] = _Entry(size=size, pins=1, linked=False)
+        path = self._root / sha256
+        try:
+            _link_or_copy(source, path)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            with self._lock:
+                if self._entries.get(sha256) is entry:
+                    del self._entries[sha256]
+            log_event(logging.WARNING, "part_cache.add_failed", sha256=sha256, error=str(e))
+            return False
+        with self._lock:
+            if self._entries.get(sha256) is not entry:
+                # Discarded while it was being linked; do not leave an untracked file.
+                path.unlink(missing_ok=True)
+                return False
+            entry.linked = True
+        return True
+
+    def release(self, sha256: str) -> None:
+        """Drop one pin on *sha256*, making it evictable once no job pins it."""
+        with self._lock:
+            entry = self._entries.get(sha256)
+            if entry is not None and entry.pins > 0:
+                entry.pins -= 1
+
+    def discard(self, sha256: str) -> None:
+        """Remove *sha256* from the cache, pinned or not.
+
+        Jobs using it keep their own hard links to the file.
+        """
+        with self._lock:
+            if self._entries.pop(sha256, None) is not None:
+                (self._root / sha256).unlink(missing_ok=True)
+
+    def _make_room(self, size: int) -> bool:
+        """Evict unpinned entries, oldest first, until *size* more bytes fit. Needs the lock."""
+        used = sum(entry.size for entry in self._entries.values())
+        for sha256, entry in list(self._entries.items()):
+            if used + size <= self._max_bytes:
+                break
+            if entry.pins == 0:
+                (self._root / sha256).unlink(missing_ok=True)
+                del self._entries[sha256]
+                used -= entry.size
+                log_event(logging.DEBUG, "part_cache.evicted", sha256=sha256, size_bytes=entry.size)
+        return used + size <= self._max_bytes
+
+
+_shared_caches: dict[Path, PartCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_part_cache(root: Path, max_bytes: int) -> PartCache:
+    """Return the process-wide :class:`PartCache` for *root*, opening it on first use."""
+    with _shared_lock:
+        cache = _shared_caches.get(root)
+        if cache is None:
+            cache = _shared_caches[root] = PartCache(root, max_bytes)
+        return cache
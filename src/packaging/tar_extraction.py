@@ -0,0 +1,163 @@
+"""Tar extraction with file writes spread over a pool of writer threads.
+
+On a network-backed destination the create/write/close round trips of each
+file, not decompression, bound how fast ``extractall`` can restore a drive of
+many small files.  :func:`extract_members` keeps decoding on one thread (a
+streamed tar can only be read in order) and hands each regular file to a
+writer pool: small files as a buffer, large ones as a bounded queue of chunks
+the reader fills while the stream moves past them.
+
+Every member goes through :func:`tarfile.data_filter` first, so the same path,
+link and mode checks apply as for ``extractall(filter="data")``.  A file's
+mode and mtime are set once its content has been written and closed;
+directory attributes are applied last, deepest first, as ``extractall`` does.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import tarfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+#: Regular files up to this size are read into memory and written in one go.
+_SMALL_MEMBER_BYTES = 1024 * 1024
+#: Read size for larger files, which are streamed to their writer.
+_STREAM_CHUNK_BYTES = 1024 * 1024
+#: Chunks of a streamed file buffered ahead of its writer.
+_STREAM_QUEUE_CHUNKS = 8
+#: Writes queued per writer thread before the reader waits, bounding buffered memory.
+_PENDING_WRITES_PER_WORKER = 4
+
+
+def _set_file_attributes(path: Path, info: tarfile.TarInfo) -> None:
+    """Apply *info*'s mode and mtime to a written file."""
+    if info.mode is not None:
+        os.chmod(path, info.mode)
+    if info.mtime is not None:
+        os.utime(path, (info.mtime, info.mtime))
+
+
+def _write_buffered(path: Path, data: bytes, info: tarfile.TarInfo) -> None:
+    with open(path, "wb") as file_obj:
+        file_obj.write(data)
+    _set_file_attributes(path, info)
+
+
+def _write_streamed(path: Path, chunks: queue.Queue[bytes | None], info: tarfile.TarInfo) -> None:
+    try:
+        with open(path, "wb") as file_obj:
+            while (chunk := chunks.get()) is not None:
+                file_obj.write(chunk)
+        _set_file_attributes(path, info)
+    except BaseException:
+        # Keep draining so the reader is never left blocked on a full queue.
+        while chunks.get() is not None:
+            pass
+        raise
+
+
+class _WriterPool:
+    """A thread pool for file writes with a cap on writes waiting to run."""
+
+    def __init__(self, workers: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract-write")
+        self._slots = threading.BoundedSemaphore(workers * _PENDING_WRITES_PER_WORKER)
+        self._pending: dict[Path, Future[None]] = {}
+
+    def submit(self, path: Path, write: Callable[..., None], *args: object) -> None:
+        """Run ``write(path, *args)`` on the pool, after any earlier write to *path*.
+
+        Blocks while the pool already has its cap of writes waiting.
+
+        Raises:
+            Exception: The error of a write that has already failed.
+        """
+        for future in [f for f in self._pending.values() if f.done()]:
+            future.result()
+        earlier = self._pending.pop(path, None)
+        if earlier is not None:
+            earlier.result()
+        self._slots.acquire()  # pylint: disable=consider-using-with
+        future = self._executor.submit(write, path, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._pending[path] = future
+
+    def drain(self) -> None:
+        """Wait for every submitted write, raising the first error."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.result()
+
+    def close(self) -> None:
+        """Stop the pool, cancelling writes that have not started."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def extract_members(tar: tarfile.TarFile, dest_path: Path, workers: int) -> int:
+    """Extract every member of *tar* into *dest_path*, writing files on *workers* threads.
+
+    *tar* may be opened in streaming mode (``r|``); it is read once, in order,
+    on the calling thread.  Links and special files are created on the calling
+    thread after the writes queued before them have finished, so a hard link
+    always finds its target.  Returns the number of members extracted.
+
+    Raises:
+        tarfile.FilterError: If a member is refused by the ``data`` filter.
+        OSError: If a file cannot be written.
+        ValueError: If *workers* is not positive.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be greater than zero")
+    destination = os.path.realpath(dest_path)
+    os.makedirs(destination, exist_ok=True)
+    created_dirs: set[str] = {destination}
+    directories: list[tarfile.TarInfo] = []
+    member_count = 0
+    writers = _WriterPool(workers)
+    try:
+        for member in tar:
+            info = tarfile.data_filter(member, destination)
+            target = Path(destination, info.name)
+            member_count += 1
+            if info.isdir():
+                os.makedirs(target, exist_ok=True)
+                created_dirs.add(str(target))
+                directories.append(info)
+                continue
+
+            parent = str(target.parent)
+            if parent not in created_dirs:
+                os.makedirs(parent, exist_ok=True)
+                created_dirs.add(parent)
+            if not info.isreg():
+                writers.drain()
+                tar.extract(member, path=destination, filter="data")
+                continue
+
+            source = tar.extractfile(member)
+            assert source is not None
+            if info.size <= _SMALL_MEMBER_BYTES:
+                writers.submit(target, _write_buffered, source.read(), info)
+                continue
+            chunks: queue.Queue[bytes | None] = queue.Queue(maxsize=_STREAM_QUEUE_CHUNKS)
+            writers.submit(target, _write_streamed, chunks, info)
+            try:
+                while chunk := source.read(_STREAM_CHUNK_BYTES):
+                    chunks.put(chunk)
+            finally:
+                chunks.put(None)
+        writers.drain()
+    finally:
+        writers.close()
+
+    for directory in sorted(directories, key=lambda d: d.name, reverse=True):
+        directory_path = Path(destination, directory.name)
+        if directory.mtime is not None:
+            os.utime(directory_path, (directory.mtime, directory.mtime))
+        if directory.mode is not None:
+            os.chmod(directory_path, directory.mode)
+    return member_count
@@ -6,24 +6,37 @@ storage, including session management, file upload/download, and bucket operatio
 
 from __future__ import annotations
 
+import base64
+import io
 import json
 import logging
 import threading
 import time
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor, wait
 from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, cast
 
 import boto3
+from boto3.s3.transfer import BaseSubscriber, ProgressCallbackInvoker, create_transfer_manager
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError, EndpointConnectionError
 from fastapi import FastAPI, Request
 from types_boto3_s3 import S3Client
-from types_boto3_s3.type_defs import TagTypeDef
+from types_boto3_s3.type_defs import CompletedPartTypeDef, TagTypeDef
 
 from config import get_settings
+from service.ranged_download import RangeDownloadError, download_object_ranges
+from service.s3_client_pool import S3ClientPool
+from service.transfer_profile import (
+    TransferProfile,
+    get_transfer_profile,
+    record_transfer,
+    transfer_profile_from_settings,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -81,7 +94,7 @@ def _get_client_config() -> Config:
         signature_version="s3v4",
         connect_timeout=connect_timeout,
         read_timeout=read_timeout,
-        max_pool_connections=10,
+        max_pool_connections=transfer_profile_from_settings(settings).max_pool_connections,
         request_checksum_calculation="when_required",
         response_checksum_validation="when_required",
         # Explicitly bypass any system proxy env vars (HTTP_PROXY / HTTPS_PROXY).
@@ -90,6 +103,23 @@ def _get_client_config() -> Config:
     )
 
 
+def _apply_socket_options(client: Any, profile: TransferProfile) -> None:
+    """Add the profile's socket buffer sizes to *client*'s connection options.
+
+    botocore has no public setting for them, so they are appended to the
+    socket options its urllib3 session hands to every new connection.
+    """
+    extra_options = profile.socket_options()
+    if not extra_options:
+        return
+    http_session = getattr(getattr(client, "_endpoint", None), "http_session", None)
+    socket_options = getattr(http_session, "_socket_options", None)
+    if not isinstance(socket_options, list):
+        _log_event(logging.WARNING, "activescale.client.socket_options_unsupported")
+        return
+    socket_options.extend(extra_options)
+
+
 _activescale_session: boto3.Session | None = None
 
 
@@ -133,28 +163,84 @@ def init_activescale(app: FastAPI) -> None:
         raise
 
 
-def get_activescale_client(request: Request) -> S3Client:
-    """FastAPI dependency to create an ActiveScale S3 client for a request.
+def _client_is_healthy(client: Any) -> bool:
+    """Return whether *client* can still reach ActiveScale.
 
-    Clients created from the session are thread-safe and lightweight.
-    Multiple concurrent requests can safely use separate clients.
+    Any HTTP response, including an error status, shows the endpoint and the
+    client's connections are usable; only transport failures count as unhealthy.
+    """
+    try:
+        client.head_bucket(Bucket=get_settings().activescale_bucket_name)
+    except ClientError:
+        return True
+    except BotoCoreError as e:
+        _log_event(logging.WARNING, "activescale.client.health_check_failed", error=str(e))
+        return False
+    return True
+
+
+_client_pool: S3ClientPool | None = None
+_client_pool_lock = threading.Lock()
+
+
+def _get_client_pool() -> S3ClientPool:
+    """Return the process-wide S3 client pool, creating it on first use."""
+    global _client_pool  # pylint: disable=global-statement
+    with _client_pool_lock:
+        if _client_pool is None:
+            settings = get_settings()
+            _client_pool = S3ClientPool(
+                health_check=_client_is_healthy,
+                health_check_interval=settings.activescale_client_health_check_interval,
+                idle_timeout=settings.activescale_client_idle_timeout,
+            )
+        return _client_pool
+
+
+@contextmanager
+def _borrow_client(session: boto3.Session) -> Generator[S3Client]:
+    """Borrow the pooled client for *session* and the current client settings."""
+    settings = get_settings()
+    endpoint_url = f"https://{settings.activescale_hostname}"
+    profile = transfer_profile_from_settings(settings)
+    # Everything the client is built from, so a settings change gets a new client.
+    key = (
+        id(session),
+        endpoint_url,
+        settings.activescale_retry_attempts,
+        settings.activescale_connect_timeout,
+        settings.activescale_read_timeout,
+        profile.max_pool_connections,
+        tuple(profile.socket_options()),
+    )
+
+    def create_client() -> S3Client:
+        client = session.client("s3", endpoint_url=endpoint_url, config=_get_client_config())
+        _apply_socket_options(client, profile)
+        return cast(S3Client, client)
+
+    with _get_client_pool().borrow(key, create_client) as client:
+        yield client
+
+
+def get_activescale_client(request: Request) -> Generator[S3Client]:
+    """FastAPI dependency lending the pooled ActiveScale S3 client for a request.
+
+    Clients are thread-safe and shared, so concurrent requests reuse the same
+    client and its warm connections.
     """
     session = getattr(request.app.state, "activescale_session", None)
     if session is None:
         _log_event(logging.ERROR, "activescale.session.missing_on_app_state")
         raise RuntimeError("ActiveScale session not initialised on application state")
 
-    client = session.client(
-        "s3",
-        endpoint_url=f"https://{get_settings().activescale_hostname}",
-        config=_get_client_config(),
-    )
-    return cast(S3Client, client)
+    with _borrow_client(session) as client:
+        yield client
 
 
 @contextmanager
 def get_activescale_client_context() -> Generator[S3Client]:
-    """Context manager for creating a temporary ActiveScale S3 client.
+    """Context manager lending the pooled ActiveScale S3 client.
 
     Use this in background tasks or other contexts where you don't have access to the
     FastAPI request object.
@@ -167,27 +253,32 @@ def get_activescale_client_context() -> Generator[S3Client]:
         _log_event(logging.ERROR, "activescale.session.missing_global")
         raise RuntimeError("ActiveScale session not initialized. Call init_activescale first.")
 
-    client: S3Client = cast(
-        S3Client,
-        _activescale_session.client(
-            "s3",
-            endpoint_url=f"https://{get_settings().activescale_hostname}",
-            config=_get_client_config(),
-        ),
-    )
-    try:
+    with _borrow_client(_activescale_session) as client:
         yield client
-    finally:
-        # Clients are lightweight and don't hold significant resources
-        # but closing explicitly is good practice
-        client.close()
+
+
+def shutdown_activescale() -> None:
+    """Close the pooled ActiveScale clients during app shutdown."""
+    global _client_pool  # pylint: disable=global-statement
+    with _client_pool_lock:
+        pool, _client_pool = _client_pool, None
+    if pool is not None:
+        pool.close()
+        _log_event(logging.INFO, "activescale.client_pool.closed")
 
 
 ######################################################################################
 # S3 interactions - generic for any S3-compatible service. Pass in initialised client.
 ######################################################################################
-class ProgressTracker:  # pylint: disable=too-few-public-methods
-    """Tracks upload progress and logs periodic updates with stall detection."""
+#: Seconds between checks of a running upload for stalls.
+_STALL_POLL_SECONDS = 1.0
+
+
+class ProgressTracker:
+    """Tracks upload progress and logs periodic updates with stall detection.
+
+    Safe to call from several threads, e.g. the chunks of one multipart upload.
+    """
 
     def __init__(self, file_key: str, file_size: int, stall_timeout: int = 30):
         """Initialize progress tracker.
@@ -204,6 +295,8 @@ class ProgressTracker:  # pylint: disable=too-few-public-methods
         self.last_update_bytes = 0
         self.stall_timeout = stall_timeout
         self.stall_warned = False
+        self.last_progress_time = time.monotonic()
+        self._lock = threading.Lock()
 
     def __call__(self, chunk_bytes: int) -> None:
         """Called by boto3 for each uploaded chunk.
@@ -211,6 +304,18 @@ class ProgressTracker:  # pylint: disable=too-few-public-methods
         Args:
             chunk_bytes (int): Number of bytes transferred in this chunk
         """
+        with self._lock:
+            self._record(chunk_bytes)
+
+    def seconds_since_progress(self) -> float:
+        """Return how long it has been since any bytes were transferred."""
+        with self._lock:
+            return time.monotonic() - self.last_progress_time
+
+    def _record(self, chunk_bytes: int) -> None:
+        """Count *chunk_bytes*, logging progress and stalls (caller holds the lock)."""
+        if chunk_bytes > 0:
+            self.last_progress_time = time.monotonic()
         self.bytes_transferred += chunk_bytes
         current_time = time.time()
         time_since_update = current_time - self.last_update_time
@@ -304,6 +409,20 @@ def list_buckets(client: S3Client) -> list[str]:
 
 
 # pylint: disable-next=too-many-arguments,too-many-positional-arguments,too-many-locals
+class _DoneSubscriber(BaseSubscriber):  # type: ignore[misc]
+    """Transfer subscriber that signals once its transfer finishes, however it ends."""
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+
+    def on_done(self, future: Any, **kwargs: Any) -> None:
+        self._done.set()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to *timeout* seconds for the transfer; return whether it finished."""
+        return self._done.wait(timeout)
+
+
 def upload_file(
     client: S3Client,
     bucket_name: str,
@@ -311,6 +430,7 @@ def upload_file(
     file_path: str,
     timeout: int = 300,
     metadata: dict[str, str] | None = None,
+    retain_until: datetime | None = None,
 ) -> bool:
     """Upload a file to an S3 bucket using streaming for large files.
 
@@ -319,20 +439,31 @@ def upload_file(
         bucket_name (str): The name of the S3 bucket to upload to.
         file_key (str): The key (path/filename) in the bucket.
         file_path (str): Path to file on disk.
-        timeout (int): Timeout in seconds for the upload operation. Defaults to 300
-            (5 minutes). Use higher values for very large files.
+        timeout (int): Seconds the upload may go without transferring any bytes
+            before it is abandoned. Defaults to 300 (5 minutes).
         metadata (dict[str, str] | None): Optional dictionary of metadata to attach to
             the S3 object.
+        retain_until (datetime | None): Optional COMPLIANCE retention date, sent
+            with the upload while :func:`inline_object_lock_available`.  If the
+            endpoint rejects it the file is uploaded again without it.  Either
+            way, finish with :func:`confirm_object_lock` or
+            :func:`set_object_retention`.
 
     Returns:
         bool: True if the upload is successful, False otherwise.
 
     Note:
-        Uses boto3 upload_file which handles multipart uploads automatically
-        for files larger than 8 MB.
-
-        If the upload operation exceeds the timeout, it will be aborted and logged
-        as an error. This prevents indefinite hangs due to poor network connectivity.
+        Uses a boto3 transfer manager, which switches to a multipart upload
+        above the transfer profile's threshold (see
+        :mod:`service.transfer_profile`).
+
+        If no bytes are transferred for the timeout, the transfer is cancelled
+        and logged as an error. This prevents indefinite hangs due to poor network
+        connectivity without failing large uploads that are merely slow.  A
+        cancelled transfer starts no further requests and aborts its multipart
+        upload; the call returns once requests already in flight have ended
+        (within the client's read timeout), so nothing is still writing the
+        object when the caller retries it.
 
         Progress is logged every 5 seconds or every 100 MB. Stalls (no progress for
         30 seconds) are detected and logged as warnings.
@@ -348,68 +479,221 @@ def upload_file(
             file_key=file_key,
             bucket_name=bucket_name,
             size_mb=round(file_size / (1024 * 1024), 1),
-            timeout_seconds=timeout,
+            stall_timeout_seconds=timeout,
         )
 
         # Create progress tracker with stall detection
         progress_tracker = ProgressTracker(file_key, file_size, stall_timeout=30)
+        profile = get_transfer_profile("upload", file_size)
+        started = time.monotonic()
+
+        extra_args: dict[str, Any] = _object_lock_args(retain_until)
+        if metadata:
+            extra_args["Metadata"] = metadata
+
+        done = _DoneSubscriber()
+        with create_transfer_manager(client, profile.to_transfer_config()) as manager:
+            future = manager.upload(
+                file_path,
+                bucket_name,
+                file_key,
+                extra_args=extra_args or None,
+                subscribers=[ProgressCallbackInvoker(progress_tracker), done],
+            )
+            # Give up only once no bytes have moved for `timeout` seconds, however long the upload takes.
+            while not done.wait(timeout=min(timeout, _STALL_POLL_SECONDS)):
+                if progress_tracker.seconds_since_progress() >= timeout:
+                    _log_event(
+                        logging.ERROR,
+                        "s3.upload.stalled",
+                        file_key=file_key,
+                        stall_timeout_seconds=timeout,
+                        transferred_mb=round(progress_tracker.bytes_transferred / (1024 * 1024), 1),
+                        total_mb=round(file_size / (1024 * 1024), 1),
+                    )
+                    # Leaving the block waits for the cancelled transfer to stop.
+                    future.cancel()
+                    return False
+            future.result()
+
+        elapsed_seconds = time.monotonic() - started
+        record_transfer("upload", file_size, elapsed_seconds, profile)
+        _log_event(
+            logging.INFO,
+            "s3.upload.completed",
+            file_key=file_key,
+            bucket_name=bucket_name,
+            chunk_size_bytes=profile.multipart_chunk_size_bytes,
+            max_concurrency=profile.max_concurrency,
+            elapsed_seconds=round(elapsed_seconds, 2),
+        )
+        return True
 
-        # Use a threading-based timeout to prevent indefinite hangs
-        upload_result: list[bool | None] = [None]
-        upload_exception: list[Exception | None] = [None]
-
-        def perform_upload() -> None:
-            try:
-                client.upload_file(
-                    file_path,
-                    bucket_name,
-                    file_key,
-                    Callback=progress_tracker,
-                    ExtraArgs={"Metadata": metadata} if metadata else None,
-                )
-                upload_result[0] = True
-            except (ClientError, EndpointConnectionError, BotoCoreError, OSError) as e:
-                upload_exception[0] = e
+    except ClientError as e:
+        if retain_until is not None and "ObjectLockMode" in extra_args and _is_object_lock_rejection(e):
+            _set_inline_object_lock_supported(False, file_key=file_key, error=str(e))
+            return upload_file(client, bucket_name, file_key, file_path, timeout, metadata, retain_until)
+        _log_client_error("s3.upload.client_error", e, file_key=file_key)
+        return False
+    except EndpointConnectionError:
+        _log_endpoint_connection_error(file_key=file_key)
+        return False
+    except (BotoCoreError, OSError, ValueError, TypeError) as e:
+        _log_unexpected_error("s3.upload.unexpected_error", e, file_key=file_key)
+        return False
 
-        upload_thread = threading.Thread(target=perform_upload, daemon=False)
-        upload_thread.start()
-        upload_thread.join(timeout=timeout)
 
-        if upload_thread.is_alive():
-            _log_event(
-                logging.ERROR,
-                "s3.upload.timeout",
-                file_key=file_key,
-                timeout_seconds=timeout,
-                transferred_mb=round(progress_tracker.bytes_transferred / (1024 * 1024), 1),
-                total_mb=round(file_size / (1024 * 1024), 1),
-            )
-            return False
+#: Largest object S3 accepts in a single PUT.
+MAX_SINGLE_PUT_BYTES = 5 * 1024 * 1024 * 1024
+
+
+def sha256_hex_to_base64(sha256_hex: str) -> str:
+    """Convert a hex SHA-256 digest to the base64 form S3 uses for ``ChecksumSHA256``."""
+    return base64.b64encode(bytes.fromhex(sha256_hex)).decode("ascii")
+
+
+class _ProgressFile(io.FileIO):
+    """File opened for reading that reports each read to a progress callback."""
+
+    def __init__(self, path: str, progress: Callable[[int], None]) -> None:
+        super().__init__(path, "rb")
+        self._progress = progress
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        if chunk:
+            self._progress(len(chunk))
+        return chunk
+
+
+def upload_file_with_checksum(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    client: S3Client,
+    bucket_name: str,
+    file_key: str,
+    file_path: str,
+    sha256_hex: str,
+    metadata: dict[str, str] | None = None,
+    retain_until: datetime | None = None,
+    timeout: int = 300,
+) -> tuple[bool, str | None]:
+    """Upload a file in a single PUT carrying its precomputed SHA-256.
+
+    The server hashes the body as it receives it and rejects the request
+    (``BadDigest``) if it does not match, so a successful upload whose response
+    echoes the checksum needs no separate verification.
+
+    As with :func:`upload_file`, the upload is abandoned once no bytes have
+    been sent for *timeout* seconds.  The body is then closed, so the request
+    fails on its next read instead of sending the rest of the file.
 
-        upload_error = upload_exception[0]
-        if upload_error is not None:
-            raise upload_error
+    Args:
+        client: An initialized S3 client.
+        bucket_name: Name of the S3 bucket.
+        file_key: The key to upload to.
+        file_path: Path to the file on disk; at most :data:`MAX_SINGLE_PUT_BYTES`.
+        sha256_hex: Hex SHA-256 of the file, as recorded in the archive manifest.
+        metadata: Optional metadata to attach to the object.
+        retain_until: Optional COMPLIANCE retention date, applied as by
+            :func:`upload_file`.
+        timeout: Seconds the upload may go without sending any bytes before
+            it is abandoned. Defaults to 300 (5 minutes).
 
-        if upload_result[0]:
+    Returns:
+        Tuple of (upload success, base64 ``ChecksumSHA256`` confirmed by the
+        server).  The checksum is None when the server did not report one, in
+        which case the caller still has to verify the stored object.
+    """
+    checksum = sha256_hex_to_base64(sha256_hex)
+    lock_args = _object_lock_args(retain_until)
+    try:
+        file_size = Path(file_path).stat().st_size
+        if file_size > MAX_SINGLE_PUT_BYTES:
+            raise ValueError(f"{file_path} is larger than a single PUT allows")
+        started = time.monotonic()
+        progress_tracker = ProgressTracker(file_key, file_size)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checksum-upload")
+        with _ProgressFile(file_path, progress_tracker) as body:
+            future = executor.submit(
+                client.put_object,
+                Bucket=bucket_name,
+                Key=file_key,
+                Body=body,
+                ContentLength=file_size,
+                ChecksumSHA256=checksum,
+                Metadata=metadata or {},
+                **lock_args,
+            )
+            executor.shutdown(wait=False)
+            # Give up only once no bytes have moved for `timeout` seconds, however long the upload takes.
+            while not future.done():
+                wait([future], timeout=min(timeout, _STALL_POLL_SECONDS))
+                if not future.done() and progress_tracker.seconds_since_progress() >= timeout:
+                    _log_event(
+                        logging.ERROR,
+                        "s3.upload.stalled",
+                        file_key=file_key,
+                        stall_timeout_seconds=timeout,
+                        transferred_mb=round(progress_tracker.bytes_transferred / (1024 * 1024), 1),
+                        total_mb=round(file_size / (1024 * 1024), 1),
+                    )
+                    # Leaving the block closes the body, failing the request on its next read.
+                    return False, None
+        response = future.result()
+        confirmed = response.get("ChecksumSHA256")
+        if confirmed is not None and confirmed != checksum:
             _log_event(
-                logging.INFO,
-                "s3.upload.completed",
+                logging.ERROR,
+                "s3.upload.checksum_mismatch",
                 file_key=file_key,
                 bucket_name=bucket_name,
+                expected_checksum=checksum,
+                reported_checksum=confirmed,
             )
-            return True
-
-        return False
-
+            return False, None
+        _log_event(
+            logging.INFO,
+            "s3.upload.completed",
+            file_key=file_key,
+            bucket_name=bucket_name,
+            checksum_confirmed=confirmed is not None,
+            elapsed_seconds=round(time.monotonic() - started, 2),
+        )
+        return True, confirmed
     except ClientError as e:
+        if retain_until is not None and lock_args and _is_object_lock_rejection(e):
+            _set_inline_object_lock_supported(False, file_key=file_key, error=str(e))
+            return upload_file_with_checksum(
+                client, bucket_name, file_key, file_path, sha256_hex, metadata, retain_until, timeout
+            )
         _log_client_error("s3.upload.client_error", e, file_key=file_key)
-        return False
+        return False, None
     except EndpointConnectionError:
         _log_endpoint_connection_error(file_key=file_key)
-        return False
+        return False, None
     except (BotoCoreError, OSError, ValueError, TypeError) as e:
         _log_unexpected_error("s3.upload.unexpected_error", e, file_key=file_key)
-        return False
+        return False, None
+
+
+def get_object_checksum_sha256(client: S3Client, bucket_name: str, file_key: str) -> str | None:
+    """Return the full-object base64 ``ChecksumSHA256`` S3 stored for *file_key*.
+
+    Returns:
+        The checksum, or None if the object has none, only a composite
+        multipart checksum (``<checksum>-<parts>``), or could not be read.
+    """
+    try:
+        response = client.head_object(Bucket=bucket_name, Key=file_key, ChecksumMode="ENABLED")
+    except ClientError as e:
+        _log_client_error("s3.object.checksum.client_error", e, file_key=file_key, bucket_name=bucket_name)
+        return None
+    except (BotoCoreError, EndpointConnectionError) as e:
+        _log_unexpected_error("s3.object.checksum.unexpected_error", e, file_key=file_key)
+        return None
+    checksum = response.get("ChecksumSHA256")
+    if checksum is None or "-" in checksum:
+        return None
+    return str(checksum)
 
 
 def download_file(client: S3Client, bucket_name: str, file_key: str) -> bytes | None:
@@ -503,6 +787,53 @@ def object_exists(client: S3Client, bucket_name: str, file_key: str) -> tuple[bo
         return False, None
 
 
+@dataclass(frozen=True)
+class StoredObject:
+    """Size and ETag of an object, as reported by a bucket listing."""
+
+    size: int
+    etag: str
+
+
+def list_object_inventory(client: S3Client, bucket_name: str, prefix: str) -> dict[str, StoredObject] | None:
+    """List every object under *prefix* with paginated ``ListObjectsV2`` calls.
+
+    One listing page covers up to 1,000 keys, so this replaces a ``head_object``
+    per key when checking which of many objects are already stored.
+
+    Args:
+        client: An initialized S3 client.
+        bucket_name: Name of the S3 bucket.
+        prefix: Key prefix to list, e.g. a submission's ``archive_object_prefix``.
+
+    Returns:
+        Mapping of object key to its :class:`StoredObject`, or None on error.
+    """
+    inventory: dict[str, StoredObject] = {}
+    try:
+        paginator = client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            for item in page.get("Contents", []):
+                inventory[item["Key"]] = StoredObject(size=int(item["Size"]), etag=str(item.get("ETag", "")))
+        _log_event(
+            logging.INFO,
+            "s3.object.inventory_listed",
+            bucket_name=bucket_name,
+            prefix=prefix,
+            object_count=len(inventory),
+        )
+        return inventory
+    except ClientError as e:
+        _log_client_error("s3.object.inventory.client_error", e, bucket_name=bucket_name, prefix=prefix)
+        return None
+    except EndpointConnectionError:
+        _log_endpoint_connection_error(bucket_name=bucket_name, prefix=prefix)
+        return None
+    except (BotoCoreError, OSError, ValueError, TypeError, KeyError) as e:
+        _log_unexpected_error("s3.object.inventory.unexpected_error", e, bucket_name=bucket_name, prefix=prefix)
+        return None
+
+
 def verify_uploaded_part_size(
     client: S3Client,
     bucket_name: str,
@@ -566,6 +897,80 @@ def verify_uploaded_part_size(
         return False
 
 
+#: Error codes with which an endpoint refuses object lock headers on an upload.
+_OBJECT_LOCK_REJECTION_CODES = frozenset({"InvalidRequest", "InvalidArgument", "NotImplemented", "MissingContentMD5"})
+
+# Whether the endpoint honours object lock headers sent with uploads: None until
+# the first locked upload has been checked, then True or False for the process.
+_inline_object_lock_supported: bool | None = None
+_inline_object_lock_state_lock = threading.Lock()
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def inline_object_lock_available() -> bool:
+    """Return whether uploads should carry their object lock retention."""
+    return get_settings().activescale_inline_object_lock_enabled and _inline_object_lock_supported is not False
+
+
+def _object_lock_args(retain_until: datetime | None) -> dict[str, Any]:
+    """Return the ``ObjectLock*`` upload arguments for *retain_until*, if inline locking is available."""
+    if retain_until is None or not inline_object_lock_available():
+        return {}
+    return {"ObjectLockMode": "COMPLIANCE", "ObjectLockRetainUntilDate": _as_utc(retain_until)}
+
+
+def _set_inline_object_lock_supported(supported: bool, **context: Any) -> None:
+    global _inline_object_lock_supported  # pylint: disable=global-statement
+    with _inline_object_lock_state_lock:
+        if _inline_object_lock_supported is supported:
+            return
+        # Once found unsupported, stay on the fallback for the rest of the process.
+        if _inline_object_lock_supported is False:
+            return
+        _inline_object_lock_supported = supported
+    _log_event(
+        logging.INFO if supported else logging.WARNING,
+        "s3.object_lock.inline_supported" if supported else "s3.object_lock.inline_unsupported",
+        **context,
+    )
+
+
+def _is_object_lock_rejection(error: ClientError) -> bool:
+    error_code, _ = _extract_client_error(error)
+    return error_code in _OBJECT_LOCK_REJECTION_CODES
+
+
+def confirm_object_lock(client: S3Client, bucket_name: str, file_key: str, retain_until: datetime) -> bool:
+    """Make sure an object uploaded with object lock headers really is under retention.
+
+    Some S3-compatible endpoints accept the headers and silently ignore them, so
+    the first such object is checked with a HEAD.  If the lock is missing, this
+    object gets a ``PutObjectRetention`` call and later uploads stop sending the
+    headers.  Once one object has passed the check, no more HEADs are sent.
+
+    Call this only if :func:`inline_object_lock_available` is still True after
+    the upload. Otherwise use :func:`set_object_retention`.
+
+    Returns:
+        True if the object is protected, False otherwise.
+    """
+    if _inline_object_lock_supported:
+        return True
+    try:
+        stored_until = client.head_object(Bucket=bucket_name, Key=file_key).get("ObjectLockRetainUntilDate")
+    except (ClientError, BotoCoreError) as e:
+        _log_unexpected_error("s3.object_lock.check_failed", e, file_key=file_key, bucket_name=bucket_name)
+        return set_object_retention(client, bucket_name, file_key, retain_until)
+    if stored_until is not None and stored_until >= _as_utc(retain_until).replace(microsecond=0):
+        _set_inline_object_lock_supported(True, file_key=file_key)
+        return True
+    _set_inline_object_lock_supported(False, file_key=file_key, reason="headers_ignored")
+    return set_object_retention(client, bucket_name, file_key, retain_until)
+
+
 def set_object_retention(
     client: S3Client,
     bucket_name: str,
@@ -628,6 +1033,277 @@ def set_object_retention(
         return False
 
 
+def create_multipart_upload(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    client: S3Client,
+    bucket_name: str,
+    file_key: str,
+    metadata: dict[str, str] | None = None,
+    retain_until: datetime | None = None,
+    checksum_algorithm: str | None = None,
+) -> str | None:
+    """Start an S3 multipart upload.
+
+    Args:
+        client: An initialized S3 client.
+        bucket_name: Name of the S3 bucket.
+        file_key: Object key the completed upload will be stored under.
+        metadata: Optional custom metadata for the completed object.
+        retain_until: Optional COMPLIANCE retention date for the completed
+            object.  If the endpoint rejects it the upload is started without
+            it, as with :func:`upload_file`.
+        checksum_algorithm: Optional checksum algorithm (e.g. ``"SHA256"``)
+            every part will be sent with.  S3 rejects part checksums of an
+            upload not created with their algorithm.
+
+    Returns:
+        The ``UploadId`` of the new upload, or None on error.
+    """
+    extra_args: dict[str, Any] = _object_lock_args(retain_until)
+    if metadata:
+        extra_args["Metadata"] = metadata
+    if checksum_algorithm is not None:
+        extra_args["ChecksumAlgorithm"] = checksum_algorithm
+    try:
+        response = client.create_multipart_upload(Bucket=bucket_name, Key=file_key, **extra_args)
+        upload_id = response["UploadId"]
+        _log_event(
+            logging.INFO,
+            "s3.multipart.created",
+            file_key=file_key,
+            bucket_name=bucket_name,
+            upload_id=upload_id,
+        )
+        return upload_id
+    except ClientError as e:
+        if "ObjectLockMode" in extra_args and _is_object_lock_rejection(e):
+            _set_inline_object_lock_supported(False, file_key=file_key, error=str(e))
+            return create_multipart_upload(client, bucket_name, file_key, metadata, retain_until, checksum_algorithm)
+        _log_client_error("s3.multipart.create.client_error", e, file_key=file_key, bucket_name=bucket_name)
+        return None
+    except EndpointConnectionError:
+        _log_endpoint_connection_error(file_key=file_key, bucket_name=bucket_name)
+        return None
+    except (BotoCoreError, OSError, ValueError, TypeError, KeyError) as e:
+        _log_unexpected_error("s3.multipart.create.unexpected_error", e, file_key=file_key, bucket_name=bucket_name)
+        return None
+
+
+class _ProgressBody(io.BytesIO):
+    """In-memory request body that reports each read to a progress callback."""
+
+    def __init__(self, data: bytes, progress: Callable[[int], None]) -> None:
+        super().__init__(data)
+        self._progress = progress
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        if chunk:
+            self._progress(len(chunk))
+        return chunk
+
+
+def upload_multipart_part(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    client: S3Client,
+    bucket_name: str,
+    file_key: str,
+    upload_id: str,
+    part_number: int,
+    body: bytes,
+    checksum_sha256: str | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> str | None:
+    """Upload one part of a multipart upload from memory.
+
+    Args:
+        client: An initialized S3 client.
+        bucket_name: Name of the S3 bucket.
+        file_key: Object key of the multipart upload.
+        upload_id: ``UploadId`` returned by :func:`create_multipart_upload`.
+        part_number: 1-based part number (1-10000).
+        body: Part contents; every part except the last must be at least 5 MiB.
+        checksum_sha256: Optional base64 SHA-256 of *body* for the server to
+            validate on receipt.
+        progress: Optional callback given the number of bytes of *body* read
+            for sending, such as a :class:`ProgressTracker`.
+
+    Returns:
+        The part's ``ETag``, or None on error.
+    """
+    request: dict[str, Any] = {}
+    if checksum_sha256 is not None:
+        request["ChecksumSHA256"] = checksum_sha256
+    try:
+        response = client.upload_part(
+            Bucket=bucket_name,
+            Key=file_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=_ProgressBody(body, progress) if progress is not None else body,
+            **request,
+        )
+        etag = response["ETag"]
+        _log_event(
+            logging.DEBUG,
+            "s3.multipart.part_uploaded",
+            file_key=file_key,
+            upload_id=upload_id,
+            part_number=part_number,
+            size_bytes=len(body),
+        )
+        return etag
+    except ClientError as e:
+        _log_client_error(
+            "s3.multipart.upload_part.client_error",
+            e,
+            file_key=file_key,
+            upload_id=upload_id,
+            part_number=part_number,
+        )
+        return None
+    except EndpointConnectionError:
+        _log_endpoint_connection_error(file_key=file_key, bucket_name=bucket_name)
+        return None
+    except (BotoCoreError, OSError, ValueError, TypeError, KeyError) as e:
+        _log_unexpected_error(
+            "s3.multipart.upload_part.unexpected_error",
+            e,
+            file_key=file_key,
+            upload_id=upload_id,
+            part_number=part_number,
+        )
+        return None
+
+
+def list_multipart_upload_parts(
+    client: S3Client,
+    bucket_name: str,
+    file_key: str,
+    upload_id: str,
+) -> dict[int, str] | None:
+    """List the parts the server holds for an in-progress multipart upload.
+
+    Returns:
+        Mapping of part number to ``ETag``, or None if the upload no longer
+        exists (e.g. it was aborted or completed) or on error.
+    """
+    parts: dict[int, str] = {}
+    try:
+        paginator = client.get_paginator("list_parts")
+        for page in paginator.paginate(Bucket=bucket_name, Key=file_key, UploadId=upload_id):
+            for part in page.get("Parts", []):
+                parts[int(part["PartNumber"])] = str(part["ETag"])
+        return parts
+    except ClientError as e:
+        error_code, _ = _extract_client_error(e)
+        if error_code == "NoSuchUpload":
+            _log_event(
+                logging.INFO,
+                "s3.multipart.not_found",
+                file_key=file_key,
+                bucket_name=bucket_name,
+                upload_id=upload_id,
+            )
+            return None
+        _log_client_error("s3.multipart.list_parts.client_error", e, file_key=file_key, upload_id=upload_id)
+        return None
+    except EndpointConnectionError:
+        _log_endpoint_connection_error(file_key=file_key, bucket_name=bucket_name)
+        return None
+    except (BotoCoreError, OSError, ValueError, TypeError, KeyError) as e:
+        _log_unexpected_error("s3.multipart.list_parts.unexpected_error", e, file_key=file_key, upload_id=upload_id)
+        return None
+
+
+def complete_multipart_upload(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    client: S3Client,
+    bucket_name: str,
+    file_key: str,
+    upload_id: str,
+    part_etags: dict[int, str],
+    part_checksums: dict[int, str] | None = None,
+) -> tuple[bool, str | None]:
+    """Complete a multipart upload from its part numbers and ETags.
+
+    Args:
+        client: An initialized S3 client.
+        bucket_name: Name of the S3 bucket.
+        file_key: Object key of the multipart upload.
+        upload_id: ``UploadId`` returned by :func:`create_multipart_upload`.
+        part_etags: ``ETag`` of every part, by part number.
+        part_checksums: Base64 SHA-256 every part was sent with, by part
+            number, for an upload created with the ``SHA256`` algorithm.
+
+    Returns:
+        Tuple of (whether the object was assembled, the ``ChecksumSHA256``
+        the server reports for it or None).  For a multipart object this is
+        the composite checksum of the parts' checksums, suffixed ``-<count>``,
+        not the SHA-256 of the object.
+    """
+    parts: list[CompletedPartTypeDef] = []
+    for part_number, etag in sorted(part_etags.items()):
+        part: CompletedPartTypeDef = {"PartNumber": part_number, "ETag": etag}
+        if part_checksums is not None:
+            part["ChecksumSHA256"] = part_checksums[part_number]
+        parts.append(part)
+    try:
+        response = client.complete_multipart_upload(
+            Bucket=bucket_name,
+            Key=file_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        checksum = (response or {}).get("ChecksumSHA256")
+        _log_event(
+            logging.INFO,
+            "s3.multipart.completed",
+            file_key=file_key,
+            bucket_name=bucket_name,
+            upload_id=upload_id,
+            part_count=len(part_etags),
+            checksum_sha256=checksum,
+        )
+        return True, checksum
+    except ClientError as e:
+        _log_client_error("s3.multipart.complete.client_error", e, file_key=file_key, upload_id=upload_id)
+        return False, None
+    except EndpointConnectionError:
+        _log_endpoint_connection_error(file_key=file_key, bucket_name=bucket_name)
+        return False, None
+    except (BotoCoreError, OSError, ValueError, TypeError, KeyError) as e:
+        _log_unexpected_error("s3.multipart.complete.unexpected_error", e, file_key=file_key, upload_id=upload_id)
+        return False, None
+
+
+def abort_multipart_upload(client: S3Client, bucket_name: str, file_key: str, upload_id: str) -> bool:
+    """Abort a multipart upload so the server discards its stored parts.
+
+    Returns:
+        True if the upload was aborted (or no longer exists), False otherwise.
+    """
+    try:
+        client.abort_multipart_upload(Bucket=bucket_name, Key=file_key, UploadId=upload_id)
+        _log_event(
+            logging.INFO,
+            "s3.multipart.aborted",
+            file_key=file_key,
+            bucket_name=bucket_name,
+            upload_id=upload_id,
+        )
+        return True
+    except ClientError as e:
+        error_code, _ = _extract_client_error(e)
+        if error_code == "NoSuchUpload":
+            return True
+        _log_client_error("s3.multipart.abort.client_error", e, file_key=file_key, upload_id=upload_id)
+        return False
+    except EndpointConnectionError:
+        _log_endpoint_connection_error(file_key=file_key, bucket_name=bucket_name)
+        return False
+    except (BotoCoreError, OSError, ValueError, TypeError) as e:
+        _log_unexpected_error("s3.multipart.abort.unexpected_error", e, file_key=file_key, upload_id=upload_id)
+        return False
+
+
 def create_bucket(
     client: S3Client,
     bucket_name: str,
@@ -880,11 +1556,15 @@ def download_file_to_disk(
     bucket_name: str,
     file_key: str,
     dest_path: Path,
-) -> bool:
+) -> str | None:
     """Download an S3 object to a local file, streaming to avoid memory pressure.
 
-    Streams the response body in 8 MiB chunks so that very large archive
-    parts are not loaded into memory all at once.
+    Objects above the transfer profile's multipart threshold are fetched as
+    concurrent ranged GETs written straight to their offsets in the file (see
+    :mod:`service.ranged_download`), using the chunk size and concurrency from
+    :func:`service.transfer_profile.get_transfer_profile`; smaller objects are
+    fetched with a single GET.  The file's SHA-256 is computed as it is
+    written, so callers can verify it without reading the file back.
 
     Args:
         client: An initialized S3 client.
@@ -894,18 +1574,28 @@ def download_file_to_disk(
             Any existing file at this path will be overwritten.
 
     Returns:
-        True if the download completed successfully, False otherwise.
+        The hex SHA-256 of the downloaded file, or None if the download failed.
     """
-    chunk_size = 8 * 1024 * 1024  # 8 MiB
     try:
-        response = client.get_object(Bucket=bucket_name, Key=file_key)
-        total_bytes = response.get("ContentLength", 0)
-        body = response["Body"]
-        bytes_written = 0
-        with open(dest_path, "wb") as dest_file:
-            for chunk in body.iter_chunks(chunk_size=chunk_size):
-                dest_file.write(chunk)
-                bytes_written += len(chunk)
+        head = client.head_object(Bucket=bucket_name, Key=file_key)
+        total_bytes = head.get("ContentLength", 0)
+        profile = get_transfer_profile("download", total_bytes)
+        multipart = total_bytes >= profile.multipart_threshold_bytes
+        started = time.monotonic()
+        sha256 = download_object_ranges(
+            client,
+            bucket_name,
+            file_key,
+            dest_path,
+            size=total_bytes,
+            etag=head.get("ETag"),
+            range_size=profile.multipart_chunk_size_bytes if multipart else max(total_bytes, 1),
+            workers=profile.max_concurrency if multipart else 1,
+            attempts=get_settings().activescale_download_range_attempts,
+        )
+        elapsed_seconds = time.monotonic() - started
+        bytes_written = dest_path.stat().st_size
+        record_transfer("download", total_bytes, elapsed_seconds, profile)
         _log_event(
             logging.INFO,
             "s3.object.download.complete",
@@ -914,8 +1604,11 @@ def download_file_to_disk(
             dest_path=str(dest_path),
             bytes_written=bytes_written,
             content_length=total_bytes,
+            chunk_size_bytes=profile.multipart_chunk_size_bytes,
+            max_concurrency=profile.max_concurrency,
+            elapsed_seconds=round(elapsed_seconds, 2),
         )
-        return True
+        return sha256
     except ClientError as e:
         _log_client_error(
             "s3.object.download.client_error",
@@ -923,10 +1616,20 @@ def download_file_to_disk(
             bucket_name=bucket_name,
             file_key=file_key,
         )
-        return False
+        return None
     except EndpointConnectionError:
         _log_endpoint_connection_error(bucket_name=bucket_name, file_key=file_key)
-        return False
+        return None
+    except RangeDownloadError as e:
+        _log_event(
+            logging.ERROR,
+            "s3.object.download.incomplete",
+            bucket_name=bucket_name,
+            file_key=file_key,
+            dest_path=str(dest_path),
+            error=str(e),
+        )
+        return None
     except (BotoCoreError, OSError, ValueError) as e:
         _log_unexpected_error(
             "s3.object.download.unexpected_error",
@@ -934,4 +1637,4 @@ def download_file_to_disk(
             bucket_name=bucket_name,
             file_key=file_key,
         )
-        return False
+        return None
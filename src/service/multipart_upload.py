@@ -0,0 +1,447 @@
+"""Resumable multipart uploads with persisted ``UploadId`` and chunk ETags.
+
+boto3's ``upload_file`` starts a failed transfer again from byte zero.
+:func:`upload_file_resumable` drives the multipart upload itself instead: the
+``UploadId`` and the ETag of every finished chunk are saved through a
+:class:`MultipartStateStore` as each chunk lands, so the next attempt lists the
+chunks the server still holds and only sends the ones that are missing.
+
+An attempt gives up when no bytes have moved for its stall timeout rather than
+after a fixed time, and keeps its state so the next attempt can resume.  A
+cancelled attempt aborts the upload so the server discards its chunks.
+
+An upload created with the ``SHA256`` checksum algorithm sends every chunk
+with its SHA-256 and lists them again when completing, so the server validates
+each chunk on receipt and reports a composite checksum of the object that is
+checked against the chunks sent.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import math
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+from service.activescale import (
+    ProgressTracker,
+    abort_multipart_upload,
+    complete_multipart_upload,
+    create_multipart_upload,
+    inline_object_lock_available,
+    list_multipart_upload_parts,
+    upload_multipart_part,
+)
+from service.transfer_profile import TransferProfile, record_transfer
+from utils.logging import log_event
+
+#: S3 limit on the number of chunks in one multipart upload.
+MAX_MULTIPART_PARTS = 10_000
+#: Seconds between checks of a running upload for stalls and cancellation.
+_POLL_SECONDS = 1.0
+
+
+@dataclass
+class MultipartUploadState:
+    """Resumable state of the multipart upload for one archive part object."""
+
+    object_key: str
+    upload_id: str
+    part_etags: dict[int, str] = field(default_factory=dict)
+    #: Whether the upload was created with its object lock retention.
+    object_locked: bool = False
+    #: Checksum algorithm the upload was created with; its chunks must all carry one.
+    checksum_algorithm: str | None = None
+    #: Base64 SHA-256 of each stored chunk, for an upload created with ``SHA256``.
+    part_checksums: dict[int, str] = field(default_factory=dict)
+
+    def to_json_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable representation."""
+        parts: list[dict[str, Any]] = []
+        for number, etag in sorted(self.part_etags.items()):
+            part: dict[str, Any] = {"PartNumber": number, "ETag": etag}
+            if number in self.part_checksums:
+                part["ChecksumSHA256"] = self.part_checksums[number]
+            parts.append(part)
+        return {
+            "object_key": self.object_key,
+            "upload_id": self.upload_id,
+            "parts": parts,
+            "object_locked": self.object_locked,
+            "checksum_algorithm": self.checksum_algorithm,
+        }
+
+    @classmethod
+    def from_json_dict(cls, data: dict[str, Any]) -> MultipartUploadState:
+        """Rebuild state persisted with :meth:`to_json_dict`."""
+        parts = data.get("parts", [])
+        return cls(
+            object_key=str(data["object_key"]),
+            upload_id=str(data["upload_id"]),
+            part_etags={int(part["PartNumber"]): str(part["ETag"]) for part in parts},
+            object_locked=bool(data.get("object_locked", False)),
+            checksum_algorithm=data.get("checksum_algorithm"),
+            part_checksums={
+                int(part["PartNumber"]): str(part["ChecksumSHA256"]) for part in parts if "ChecksumSHA256" in part
+            },
+        )
+
+
+class MultipartStateStore(Protocol):
+    """Persists the in-progress multipart upload so a restart can resume it."""
+
+    def load(self) -> MultipartUploadState | None:
+        """Return the persisted state, if any."""
+
+    def save(self, state: MultipartUploadState) -> None:
+        """Persist *state* (called after every uploaded chunk)."""
+
+    def clear(self) -> None:
+        """Forget the persisted state once its upload is completed or abandoned."""
+
+
+def etag_matches(etag: str, body: bytes) -> bool:
+    """Return whether a multipart chunk stored with *etag* (its MD5) holds exactly *body*."""
+    return etag.strip('"') == hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+
+def open_multipart_upload(  # pylint: disable=too-many-arguments
+    client: Any,
+    bucket_name: str,
+    file_key: str,
+    state_store: MultipartStateStore,
+    *,
+    metadata: dict[str, str] | None = None,
+    retain_until: datetime | None = None,
+    checksum_algorithm: str | None = None,
+) -> MultipartUploadState | None:
+    """Resume the persisted multipart upload of *file_key*, or start a new one.
+
+    A persisted upload of a different key is aborted.  Of a resumed upload,
+    only chunks the server still holds with the persisted ETag are kept.  A
+    new upload is created with *checksum_algorithm*; a resumed one keeps the
+    algorithm it was created with.
+
+    Returns:
+        The upload's state (already saved to *state_store*), or None if a new
+        upload could not be started.
+    """
+    state = state_store.load()
+    if state is not None and state.object_key != file_key:
+        abort_multipart_upload(client, bucket_name, state.object_key, state.upload_id)
+        state_store.clear()
+        state = None
+    if state is not None:
+        server_parts = list_multipart_upload_parts(client, bucket_name, file_key, state.upload_id)
+        if server_parts is None:
+            state_store.clear()
+            state = None
+        else:
+            state.part_etags = {
+                number: etag for number, etag in state.part_etags.items() if server_parts.get(number) == etag
+            }
+            state.part_checksums = {
+                number: checksum for number, checksum in state.part_checksums.items() if number in state.part_etags
+            }
+    if state is None:
+        upload_id = create_multipart_upload(
+            client,
+            bucket_name,
+            file_key,
+            metadata=metadata,
+            retain_until=retain_until,
+            checksum_algorithm=checksum_algorithm,
+        )
+        if upload_id is None:
+            return None
+        state = MultipartUploadState(
+            object_key=file_key,
+            upload_id=upload_id,
+            # Still available afterwards means the endpoint accepted the lock.
+            object_locked=retain_until is not None and inline_object_lock_available(),
+            checksum_algorithm=checksum_algorithm,
+        )
+        state_store.save(state)
+    return state
+
+
+def _read_chunk(file_path: Path, offset: int, length: int) -> bytes:
+    """Read *length* bytes of *file_path* starting at *offset*."""
+    with file_path.open("rb") as handle:
+        handle.seek(offset)
+        data = handle.read(length)
+    if len(data) != length:
+        raise OSError(f"{file_path} ended {length - len(data)} bytes short of chunk at offset {offset}")
+    return data
+
+
+class _ResumableUpload:  # pylint: disable=too-many-instance-attributes
+    """One attempt at uploading a file's chunks into a (possibly resumed) multipart upload."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        client: Any,
+        bucket_name: str,
+        file_path: Path,
+        size: int,
+        chunk_size_bytes: int,
+        state: MultipartUploadState,
+        state_store: MultipartStateStore,
+        tracker: ProgressTracker,
+    ) -> None:
+        self._client = client
+        self._bucket_name = bucket_name
+        self._file_path = file_path
+        self._size = size
+        self._chunk_size_bytes = chunk_size_bytes
+        self._state = state
+        self._state_store = state_store
+        self._tracker = tracker
+        self._send_checksums = state.checksum_algorithm == "SHA256"
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        """Skip chunks not yet started and stop persisting late results."""
+        self._stopped.set()
+
+    def idle_seconds(self) -> float:
+        """Seconds since any chunk bytes were sent or confirmed."""
+        return self._tracker.seconds_since_progress()
+
+    def part_etags(self, chunk_count: int) -> dict[int, str]:
+        """Return the ETags of chunks 1..*chunk_count* for completing the upload."""
+        with self._lock:
+            return {number: etag for number, etag in self._state.part_etags.items() if number <= chunk_count}
+
+    def part_checksums(self, chunk_count: int) -> dict[int, str] | None:
+        """Return the SHA-256 of chunks 1..*chunk_count*, or None if chunks are sent without one."""
+        if not self._send_checksums:
+            return None
+        with self._lock:
+            return {number: sha for number, sha in self._state.part_checksums.items() if number <= chunk_count}
+
+    def send_chunk(self, part_number: int) -> None:
+        """Upload chunk *part_number* unless the server already holds identical bytes.
+
+        Raises:
+            RuntimeError: If the chunk upload fails.
+            OSError: If the chunk cannot be read.
+        """
+        if self._stopped.is_set():
+            return
+        offset = (part_number - 1) * self._chunk_size_bytes
+        body = _read_chunk(self._file_path, offset, min(self._chunk_size_bytes, self._size - offset))
+        checksum = base64.b64encode(hashlib.sha256(body).digest()).decode("ascii") if self._send_checksums else None
+        with self._lock:
+            stored_etag = self._state.part_etags.get(part_number)
+        if stored_etag is not None and etag_matches(stored_etag, body):
+            if checksum is not None:
+                with self._lock:
+                    self._state.part_checksums[part_number] = checksum
+            self._tracker(len(body))
+            return
+
+        etag = upload_multipart_part(
+            self._client,
+            self._bucket_name,
+            self._state.object_key,
+            self._state.upload_id,
+            part_number,
+            body,
+            checksum_sha256=checksum,
+            progress=self._tracker,
+        )
+        if etag is None:
+            raise RuntimeError(f"Failed to upload chunk {part_number} of {self._state.object_key}")
+        with self._lock:
+            if self._stopped.is_set():
+                return
+            self._state.part_etags[part_number] = etag
+            if checksum is not None:
+                self._state.part_checksums[part_number] = checksum
+            self._state_store.save(self._state)
+
+
+# pylint: disable-next=too-many-arguments,too-many-locals
+def upload_file_resumable(
+    client: Any,
+    bucket_name: str,
+    file_key: str,
+    file_path: Path,
+    *,
+    state_store: MultipartStateStore,
+    profile: TransferProfile,
+    stall_timeout: float,
+    metadata: dict[str, str] | None = None,
+    retain_until: datetime | None = None,
+    send_checksums: bool = False,
+    cancel_event: threading.Event | None = None,
+) -> tuple[bool, str | None]:
+    """Upload *file_path* as a multipart upload that a later call can resume.
+
+    Chunks of ``profile.multipart_chunk_size_bytes`` are read from disk and
+    sent ``profile.max_concurrency`` at a time.  The state is persisted after
+    every chunk; chunks a resumed upload already holds are only read and
+    compared with their ETag.  The attempt fails, keeping its state, as soon
+    as a chunk fails or no bytes have moved for *stall_timeout* seconds.
+
+    Args:
+        client: An initialized S3 client.
+        bucket_name: Name of the S3 bucket.
+        file_key: Object key to upload to.
+        file_path: File to upload.
+        state_store: Persists the upload's state for this *file_key*.
+        profile: Transfer profile giving the chunk size and concurrency.
+        stall_timeout: Seconds without progress before the attempt is given up.
+        metadata: Optional custom metadata for the completed object.
+        retain_until: Optional COMPLIANCE retention date the upload is created
+            under; see :func:`service.activescale.create_multipart_upload`.
+        send_checksums: Create the upload with the ``SHA256`` algorithm and
+            send each chunk's SHA-256 for the server to validate.  A resumed
+            upload keeps the algorithm it was created with.
+        cancel_event: When set, the attempt stops and the upload is aborted
+            rather than kept for resume.
+
+    Returns:
+        Tuple of (whether the object was completed, the composite
+        ``ChecksumSHA256`` the server reported for it, already checked against
+        the chunks sent, or None if the upload carries no checksums or the
+        server reported none).
+
+    Raises:
+        ValueError: If the file needs more than 10,000 chunks of the profile's size.
+    """
+    size = file_path.stat().st_size
+    chunk_size_bytes = profile.multipart_chunk_size_bytes
+    chunk_count = max(math.ceil(size / chunk_size_bytes), 1)
+    if chunk_count > MAX_MULTIPART_PARTS:
+        raise ValueError(f"{file_path} needs more than {MAX_MULTIPART_PARTS} chunks of {chunk_size_bytes} bytes")
+
+    state = open_multipart_upload(
+        client,
+        bucket_name,
+        file_key,
+        state_store,
+        metadata=metadata,
+        retain_until=retain_until,
+        checksum_algorithm="SHA256" if send_checksums else None,
+    )
+    if state is None:
+        return False, None
+    resumed_chunks = len(state.part_etags)
+    log_event(
+        logging.INFO,
+        "s3.multipart.resumable.start",
+        file_key=file_key,
+        upload_id=state.upload_id,
+        chunk_count=chunk_count,
+        resumed_chunks=resumed_chunks,
+        stall_timeout_seconds=stall_timeout,
+    )
+
+    upload = _ResumableUpload(
+        client=client,
+        bucket_name=bucket_name,
+        file_path=file_path,
+        size=size,
+        chunk_size_bytes=chunk_size_bytes,
+        state=state,
+        state_store=state_store,
+        tracker=ProgressTracker(file_key, size),
+    )
+    started = time.monotonic()
+    outcome = _run_chunks(upload, chunk_count, profile.max_concurrency, stall_timeout, cancel_event)
+    if outcome == "cancelled":
+        abort_multipart_upload(client, bucket_name, file_key, state.upload_id)
+        state_store.clear()
+    if outcome != "completed":
+        log_event(
+            logging.WARNING if outcome == "cancelled" else logging.ERROR,
+            f"s3.multipart.resumable.{outcome}",
+            file_key=file_key,
+            upload_id=state.upload_id,
+            stall_timeout_seconds=stall_timeout,
+        )
+        return False, None
+
+    part_checksums = upload.part_checksums(chunk_count)
+    completed, checksum = complete_multipart_upload(
+        client, bucket_name, file_key, state.upload_id, upload.part_etags(chunk_count), part_checksums
+    )
+    if not completed:
+        return False, None
+    state_store.clear()
+    if checksum is not None and part_checksums is not None:
+        expected = composite_checksum(part_checksums)
+        if checksum.split("-", 1)[0] != expected:
+            log_event(
+                logging.ERROR,
+                "s3.multipart.checksum_mismatch",
+                file_key=file_key,
+                upload_id=state.upload_id,
+                expected_checksum=expected,
+                reported_checksum=checksum,
+            )
+            return False, None
+    record_transfer("upload", size, time.monotonic() - started, profile)
+    return True, checksum if part_checksums is not None else None
+
+
+def composite_checksum(part_checksums: dict[int, str]) -> str:
+    """Return the base64 SHA-256 of the chunks' SHA-256 digests, in part order.
+
+    This is the composite checksum S3 reports for a multipart object (without
+    its ``-<count>`` suffix).
+    """
+    digests = b"".join(base64.b64decode(checksum) for _, checksum in sorted(part_checksums.items()))
+    return base64.b64encode(hashlib.sha256(digests).digest()).decode("ascii")
+
+
+def _run_chunks(
+    upload: _ResumableUpload,
+    chunk_count: int,
+    concurrency: int,
+    stall_timeout: float,
+    cancel_event: threading.Event | None,
+) -> str:
+    """Send every chunk of *upload*, watching for failure, stalls and cancellation.
+
+    Returns:
+        One of ``"completed"``, ``"failed"``, ``"stalled"`` or ``"cancelled"``.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=max(min(concurrency, chunk_count), 1), thread_name_prefix="multipart-upload"
+    )
+    pending: set[Future[None]] = {executor.submit(upload.send_chunk, number) for number in range(1, chunk_count + 1)}
+    outcome = "completed"
+    try:
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                outcome = "cancelled"
+                break
+            done, pending = wait(pending, timeout=_POLL_SECONDS, return_when=FIRST_EXCEPTION)
+            errors = [future.exception() for future in done if future.exception() is not None]
+            if errors:
+                for error in errors:
+                    log_event(logging.ERROR, "s3.multipart.chunk_failed", error=str(error))
+                outcome = "failed"
+                break
+            if pending and upload.idle_seconds() >= stall_timeout:
+                outcome = "stalled"
+                break
+    finally:
+        if outcome != "completed":
+            upload.stop()
+        # Chunks still in flight are not waited for: a stalled request may hang
+        # until the read timeout, and their results are no longer persisted.
+        executor.shutdown(wait=False, cancel_futures=True)
+    return outcome
@@ -0,0 +1,268 @@
+"""Parallel ranged GET downloads into a preallocated file.
+
+A single ``get_object`` stream is bound by the round-trip latency to
+ActiveScale rather than by bandwidth.  :func:`download_object_ranges` splits an
+object into byte ranges, fetches them concurrently and writes each straight
+to its offset with :func:`os.pwrite`, so ranges can land in any order without
+a shared file position or reassembly step.  A range whose stream fails is
+retried on its own; every GET carries ``IfMatch`` so an object replaced
+mid-download fails rather than producing a mixed file.
+
+The file's SHA-256 is computed while it is written (see :class:`_FileDigest`),
+so callers can verify the download without reading it back afterwards.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from botocore.exceptions import BotoCoreError
+from types_boto3_s3 import S3Client
+
+from utils.logging import log_event
+
+#: Size of the reads from each response body.
+_READ_CHUNK_BYTES = 1024 * 1024
+#: Seconds before the first retry of a range; doubles per attempt up to the cap.
+_RETRY_BACKOFF_SECONDS = 0.5
+_RETRY_BACKOFF_CAP_SECONDS = 10.0
+
+
+class RangeDownloadError(Exception):
+    """A byte range could not be downloaded in full."""
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    """An inclusive byte range of an object, as used in an HTTP ``Range`` header."""
+
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        """Number of bytes in the range."""
+        return self.end - self.start + 1
+
+    @property
+    def header(self) -> str:
+        """The ``Range`` header value selecting this range."""
+        return f"bytes={self.start}-{self.end}"
+
+
+def split_ranges(size: int, range_size: int) -> list[ByteRange]:
+    """Split an object of *size* bytes into consecutive ranges of at most *range_size*."""
+    if range_size <= 0:
+        raise ValueError("range_size must be greater than zero")
+    return [ByteRange(start, min(start + range_size, size) - 1) for start in range(0, size, range_size)]
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve *size* bytes for the file, falling back to a sparse extend."""
+    if size == 0:
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except AttributeError, OSError:
+        # Not every platform or filesystem supports fallocate.
+        os.ftruncate(fd, size)
+
+
+def _write_at(fd: int, data: bytes, offset: int) -> None:
+    """Write all of *data* at *offset*, continuing after short writes."""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+class _FileDigest:
+    """SHA-256 of a file whose bytes are written out of order.
+
+    The digest covers the file's contiguous written prefix.  A write at the end
+    of that prefix is hashed straight from memory; a write further ahead is only
+    noted, and hashed once the gap before it closes by reading it back from the
+    file (it is still in the page cache by then).  Rewrites of bytes already
+    hashed, as when a broken range is retried, are ignored.
+    """
+
+    def __init__(self, fd: int) -> None:
+        self._fd = fd
+        self._digest = hashlib.sha256()
+        self._hashed = 0
+        self._ahead: list[tuple[int, int]] = []
+        self._lock = threading.Lock()
+
+    def written(self, offset: int, data: bytes) -> None:
+        """Record that *data* has been written at *offset*."""
+        end = offset + len(data)
+        with self._lock:
+            if offset > self._hashed:
+                heapq.heappush(self._ahead, (offset, end))
+                return
+            if end > self._hashed:
+                self._digest.update(memoryview(data)[self._hashed - offset :])
+                self._hashed = end
+            self._catch_up()
+
+    def hexdigest(self, size: int) -> str:
+        """Return the digest of the first *size* bytes, which must all have been written."""
+        with self._lock:
+            self._catch_up()
+            if self._hashed != size:
+                raise RangeDownloadError(f"Only {self._hashed} of {size} bytes were written")
+            return self._digest.hexdigest()
+
+    def _catch_up(self) -> None:
+        """Hash noted writes that the contiguous prefix now reaches, reading them back from the file."""
+        while self._ahead and self._ahead[0][0] <= self._hashed:
+            _, end = heapq.heappop(self._ahead)
+            while self._hashed < end:
+                chunk = os.pread(self._fd, min(_READ_CHUNK_BYTES, end - self._hashed), self._hashed)
+                if not chunk:
+                    raise RangeDownloadError(f"Written bytes at offset {self._hashed} could not be read back")
+                self._digest.update(chunk)
+                self._hashed += len(chunk)
+
+
+def _fetch_range(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    client: S3Client,
+    bucket_name: str,
+    file_key: str,
+    etag: str | None,
+    fd: int,
+    byte_range: ByteRange,
+    digest: _FileDigest,
+) -> None:
+    """GET one range and write it at its offset, raising if it arrives short."""
+    request: dict[str, str] = {"Bucket": bucket_name, "Key": file_key, "Range": byte_range.header}
+    if etag:
+        request["IfMatch"] = etag
+    body = client.get_object(**request)["Body"]  # type: ignore[arg-type]
+    offset = byte_range.start
+    try:
+        for chunk in body.iter_chunks(chunk_size=_READ_CHUNK_BYTES):
+            if offset + len(chunk) > byte_range.end + 1:
+                raise RangeDownloadError(f"Range {byte_range.header} returned more bytes than requested")
+            _write_at(fd, chunk, offset)
+            digest.written(offset, chunk)
+            offset += len(chunk)
+    finally:
+        body.close()
+    if offset != byte_range.end + 1:
+        raise RangeDownloadError(
+            f"Range {byte_range.header} returned {offset - byte_range.start} of {byte_range.length} bytes"
+        )
+
+
+def _fetch_range_with_retry(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    client: S3Client,
+    bucket_name: str,
+    file_key: str,
+    etag: str | None,
+    fd: int,
+    byte_range: ByteRange,
+    digest: _FileDigest,
+    attempts: int,
+) -> None:
+    """Fetch *byte_range*, retrying it alone when its stream breaks or comes up short.
+
+    HTTP errors are not retried here: botocore's retry policy has already had
+    its turn at them by the time ``get_object`` raises.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            _fetch_range(client, bucket_name, file_key, etag, fd, byte_range, digest)
+            return
+        except (BotoCoreError, RangeDownloadError) as e:
+            if attempt == attempts:
+                raise
+            log_event(
+                logging.WARNING,
+                "s3.object.download.range_retry",
+                bucket_name=bucket_name,
+                file_key=file_key,
+                byte_range=byte_range.header,
+                attempt=attempt,
+                error=str(e),
+            )
+            time.sleep(min(_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1), _RETRY_BACKOFF_CAP_SECONDS))
+
+
+def download_object_ranges(  # pylint: disable=too-many-arguments
+    client: S3Client,
+    bucket_name: str,
+    file_key: str,
+    dest_path: Path,
+    *,
+    size: int,
+    etag: str | None = None,
+    range_size: int,
+    workers: int,
+    attempts: int = 3,
+) -> str:
+    """Download *size* bytes of an object into *dest_path* as concurrent ranged GETs.
+
+    Args:
+        client: An initialized S3 client.
+        bucket_name: Name of the S3 bucket.
+        file_key: Object key to download.
+        dest_path: File to write; it is truncated and preallocated to *size*.
+        size: The object's ``ContentLength``.
+        etag: The object's ETag, sent as ``IfMatch`` with every range request.
+        range_size: Bytes per ranged GET.
+        workers: Ranges fetched in parallel.
+        attempts: Tries per range before the download fails.
+
+    Returns:
+        The hex SHA-256 of the downloaded file, computed as it was written.
+
+    Raises:
+        RangeDownloadError: If a range still arrives short after *attempts* tries.
+        botocore.exceptions.ClientError: If a range request is rejected.
+        botocore.exceptions.BotoCoreError: If a range keeps failing in transport.
+        OSError: If the destination file cannot be written.
+    """
+    ranges = split_ranges(size, range_size)
+    # Opened for reading too, so the digest can read back ranges that landed ahead.
+    fd = os.open(dest_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    digest = _FileDigest(fd)
+    try:
+        _preallocate(fd, size)
+        with ThreadPoolExecutor(
+            max_workers=max(min(workers, len(ranges)), 1), thread_name_prefix="ranged-download"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _fetch_range_with_retry,
+                    client,
+                    bucket_name,
+                    file_key,
+                    etag,
+                    fd,
+                    byte_range,
+                    digest,
+                    max(attempts, 1),
+                )
+                for byte_range in ranges
+            ]
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+            for future in done:
+                future.result()
+        written = os.fstat(fd).st_size
+        if written != size:
+            raise RangeDownloadError(f"Downloaded file is {written} bytes, expected ContentLength {size}")
+        return digest.hexdigest(size)
+    finally:
+        os.close(fd)
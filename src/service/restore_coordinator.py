@@ -0,0 +1,172 @@
+"""Concurrent restore initiation and readiness polling for tape-tier objects.
+
+A retrieval needs every archive part back from tape before it can download
+it.  :class:`RestoreCoordinator` sends the restore requests on a thread pool,
+then polls only the objects that are still being restored, backing off
+exponentially (with jitter, up to the configured poll interval) between
+rounds.  Objects are handed to the caller as soon as each one is ready.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from service.activescale import initiate_object_restore, is_object_ready_for_download
+from utils.logging import log_event
+
+#: Delay before the first readiness re-check; doubles each round up to the cap.
+_BASE_POLL_DELAY_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class RestoreProgress:
+    """How many of a batch of objects are available for download."""
+
+    total: int
+    ready: int
+
+    @property
+    def pending(self) -> int:
+        """Objects still being restored."""
+        return self.total - self.ready
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: random.Random | None = None) -> float:
+    """Return the jittered delay before poll round *attempt* (0-based).
+
+    The delay doubles from *base* each round, is capped at *cap*, and is then
+    drawn uniformly from its upper half so concurrent jobs don't poll in step.
+    """
+    delay = min(cap, base * 2**attempt)
+    return (rng or random).uniform(delay / 2, delay)
+
+
+class RestoreCoordinator:  # pylint: disable=too-few-public-methods
+    """Restore a batch of objects concurrently and yield each one once it is ready.
+
+    Args:
+        client: An initialized S3 client, shared by the pool's threads.
+        bucket_name: Bucket holding the objects.
+        restore_days: Days the restored copies stay available.
+        workers: Restore requests and readiness checks sent in parallel.
+        poll_interval_cap: Longest delay between readiness checks, in seconds.
+        max_wait: Seconds to wait for every object before giving up.
+        on_progress: Called with the batch's :class:`RestoreProgress` whenever
+            more objects become ready.
+        clock: Monotonic time source, replaceable in tests.
+        sleep: Sleep function, replaceable in tests.
+        rng: Random source for the backoff jitter.
+        stop: Once set, :meth:`ready_keys` stops polling and returns.  Pass
+            ``sleep=stop.wait`` so a stop also cuts the backoff delay short.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client: Any,
+        bucket_name: str,
+        *,
+        restore_days: int,
+        workers: int,
+        poll_interval_cap: float,
+        max_wait: float,
+        on_progress: Callable[[RestoreProgress], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], object] = time.sleep,
+        rng: random.Random | None = None,
+        stop: threading.Event | None = None,
+    ) -> None:
+        self._client = client
+        self._bucket_name = bucket_name
+        self._restore_days = restore_days
+        self._workers = max(workers, 1)
+        self._poll_interval_cap = poll_interval_cap
+        self._max_wait = max_wait
+        self._on_progress = on_progress
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self._stop = stop
+
+    def ready_keys(self, keys: list[str]) -> Iterator[str]:
+        """Request a restore of every key in *keys*, yielding each key once it can be downloaded.
+
+        Keys already in active storage are yielded first; the rest follow in
+        the order their restores finish.  Returns early, with keys still
+        pending, once the *stop* event is set.
+
+        Raises:
+            RuntimeError: If a restore request fails.
+            TimeoutError: If some keys are still being restored after *max_wait*.
+        """
+        if not keys:
+            return
+        total = len(keys)
+        with ThreadPoolExecutor(max_workers=min(self._workers, total), thread_name_prefix="restore") as executor:
+            needs_restore = list(executor.map(self._initiate, keys))
+            pending = [key for key, needed in zip(keys, needs_restore, strict=True) if needed]
+            ready_count = total - len(pending)
+            log_event(
+                logging.INFO,
+                "s3.restore.initiated",
+                bucket_name=self._bucket_name,
+                object_count=total,
+                pending_count=len(pending),
+            )
+            self._report(total, ready_count)
+            yield from (key for key, needed in zip(keys, needs_restore, strict=True) if not needed)
+
+            deadline = self._clock() + self._max_wait
+            attempt = 0
+            while pending and not self._stopped():
+                readiness = list(executor.map(self._is_ready, pending))
+                newly_ready = [key for key, ready in zip(pending, readiness, strict=True) if ready]
+                pending = [key for key, ready in zip(pending, readiness, strict=True) if not ready]
+                if newly_ready:
+                    ready_count += len(newly_ready)
+                    self._report(total, ready_count)
+                    yield from newly_ready
+                if not pending:
+                    break
+                if self._clock() >= deadline:
+                    raise TimeoutError(
+                        f"{len(pending)} archive objects not restored within {self._max_wait}s."
+                        " Re-submit a retrieval request to try again."
+                    )
+                delay = backoff_delay(attempt, _BASE_POLL_DELAY_SECONDS, self._poll_interval_cap, self._rng)
+                attempt += 1
+                log_event(
+                    logging.INFO,
+                    "s3.restore.polling",
+                    bucket_name=self._bucket_name,
+                    pending_count=len(pending),
+                    ready_count=ready_count,
+                    delay_seconds=round(delay, 2),
+                )
+                self._sleep(delay)
+            if pending and self._stopped():
+                log_event(
+                    logging.INFO,
+                    "s3.restore.polling_stopped",
+                    bucket_name=self._bucket_name,
+                    pending_count=len(pending),
+                )
+
+    def _stopped(self) -> bool:
+        return self._stop is not None and self._stop.is_set()
+
+    def _initiate(self, key: str) -> bool:
+        return initiate_object_restore(self._client, self._bucket_name, key, days=self._restore_days)
+
+    def _is_ready(self, key: str) -> bool:
+        return is_object_ready_for_download(self._client, self._bucket_name, key)
+
+    def _report(self, total: int, ready: int) -> None:
+        if self._on_progress is not None:
+            self._on_progress(RestoreProgress(total=total, ready=ready))
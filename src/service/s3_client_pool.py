@@ -0,0 +1,162 @@
+"""Process-wide pool of long-lived S3 clients.
+
+Building a boto3 client resolves the endpoint, loads the service model and
+creates a fresh urllib3 connection pool, so a client per unit of work also
+throws away every warm TLS connection.  boto3 clients are thread-safe, so
+:class:`S3ClientPool` keeps one client per key (the settings it was built
+from) and lends it to every caller until it has been idle too long, fails a
+health check or the pool is closed.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from utils.logging import log_event
+
+
+@dataclass
+class _PooledClient:
+    """A pooled client and its bookkeeping."""
+
+    key: Hashable
+    client: Any
+    last_used: float
+    last_checked: float
+    borrowers: int = 0
+    retired: bool = False
+
+
+class S3ClientPool:
+    """Thread-safe map of settings key to a shared, long-lived client.
+
+    Args:
+        health_check: Called with a client before it is lent out once
+            *health_check_interval* seconds have passed since its last check;
+            a client for which it returns False is retired and replaced.
+        health_check_interval: Seconds between health checks of a client.
+        idle_timeout: Seconds a client may go unborrowed before it is closed.
+        clock: Monotonic time source, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        health_check: Callable[[Any], bool] | None = None,
+        health_check_interval: float = 300.0,
+        idle_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._health_check = health_check
+        self._health_check_interval = health_check_interval
+        self._idle_timeout = idle_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, _PooledClient] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @contextmanager
+    def borrow(self, key: Hashable, factory: Callable[[], Any]) -> Iterator[Any]:
+        """Lend the client for *key*, building it with *factory* if there is none.
+
+        The client stays open for as long as it is borrowed, even if the pool
+        evicts or closes it meanwhile.
+        """
+        entry = self._checkout(key, factory)
+        try:
+            yield entry.client
+        finally:
+            self._checkin(entry)
+
+    def evict_idle(self) -> int:
+        """Close clients nobody has borrowed for longer than the idle timeout.
+
+        Returns:
+            The number of clients closed.
+        """
+        now = self._clock()
+        with self._lock:
+            idle = [
+                entry
+                for entry in self._entries.values()
+                if entry.borrowers == 0 and now - entry.last_used > self._idle_timeout
+            ]
+            for entry in idle:
+                self._retire(entry)
+        for entry in idle:
+            _close_client(entry, reason="idle")
+        return len(idle)
+
+    def close(self) -> None:
+        """Close every pooled client; borrowed ones are closed when returned."""
+        with self._lock:
+            entries = list(self._entries.values())
+            for entry in entries:
+                self._retire(entry)
+            unused = [entry for entry in entries if entry.borrowers == 0]
+        for entry in unused:
+            _close_client(entry, reason="shutdown")
+
+    def _checkout(self, key: Hashable, factory: Callable[[], Any]) -> _PooledClient:
+        self.evict_idle()
+        while True:
+            with self._lock:
+                now = self._clock()
+                entry = self._entries.get(key)
+                if entry is None:
+                    # Built under the lock so concurrent first borrowers share one client.
+                    entry = _PooledClient(key=key, client=factory(), last_used=now, last_checked=now)
+                    self._entries[key] = entry
+                    log_event(logging.INFO, "s3.client_pool.client_created")
+                check_due = self._health_check is not None and now - entry.last_checked >= self._health_check_interval
+                if check_due:
+                    # Claim the check so concurrent borrowers don't repeat it.
+                    entry.last_checked = now
+                entry.borrowers += 1
+            if not check_due or self._is_healthy(entry):
+                return entry
+            log_event(logging.WARNING, "s3.client_pool.client_unhealthy")
+            with self._lock:
+                self._retire(entry)
+            self._checkin(entry)
+
+    def _checkin(self, entry: _PooledClient) -> None:
+        with self._lock:
+            entry.borrowers -= 1
+            entry.last_used = self._clock()
+            close_now = entry.retired and entry.borrowers == 0
+        if close_now:
+            _close_client(entry, reason="retired")
+
+    def _retire(self, entry: _PooledClient) -> None:
+        """Remove *entry* from the pool (caller holds the lock)."""
+        entry.retired = True
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+
+    def _is_healthy(self, entry: _PooledClient) -> bool:
+        assert self._health_check is not None
+        try:
+            return self._health_check(entry.client)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log_event(logging.WARNING, "s3.client_pool.health_check_failed", error=str(e))
+            return False
+
+
+def _close_client(entry: _PooledClient, reason: str) -> None:
+    """Close a client that is no longer pooled or borrowed."""
+    try:
+        entry.client.close()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        log_event(logging.WARNING, "s3.client_pool.close_failed", error=str(e))
+        return
+    log_event(logging.INFO, "s3.client_pool.client_closed", reason=reason)
@@ -0,0 +1,164 @@
+"""Transfer profiles for S3 multipart uploads and downloads, with optional auto-tuning.
+
+A :class:`TransferProfile` gathers the knobs that decide how fast a single
+object moves to or from ActiveScale: when to switch to multipart, the chunk
+size, how many chunks are in flight, the connection pool size and the TCP
+socket buffer sizes.  Operators set it through ``config.Settings``.
+
+With auto-tuning enabled, :class:`TransferAutotuner` derives the chunk size
+from each object's size and hill-climbs the concurrency on the throughput
+measured for recent transfers, within the configured bounds.
+"""
+
+from __future__ import annotations
+
+import math
+import socket
+import threading
+from dataclasses import dataclass, replace
+from typing import Any
+
+from boto3.s3.transfer import TransferConfig
+
+from config import get_settings
+
+_MIB = 1024 * 1024
+#: S3 limits: parts are 5 MiB - 5 GiB and an upload has at most 10,000 parts.
+_S3_MIN_CHUNK_BYTES = 5 * _MIB
+_S3_MAX_CHUNK_BYTES = 5 * 1024 * _MIB
+_S3_MAX_PARTS = 10_000
+#: Chunks per worker the auto-tuner aims for, so workers stay busy to the end of an object.
+_CHUNKS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class TransferProfile:
+    """How a single object is split and transferred."""
+
+    multipart_threshold_bytes: int
+    multipart_chunk_size_bytes: int
+    max_concurrency: int
+    max_pool_connections: int
+    socket_send_buffer_bytes: int | None = None
+    socket_receive_buffer_bytes: int | None = None
+
+    def to_transfer_config(self) -> TransferConfig:
+        """Return the boto3 ``TransferConfig`` for this profile."""
+        return TransferConfig(
+            multipart_threshold=self.multipart_threshold_bytes,
+            multipart_chunksize=self.multipart_chunk_size_bytes,
+            max_concurrency=self.max_concurrency,
+        )
+
+    def socket_options(self) -> list[tuple[int, int, int]]:
+        """Return the extra ``setsockopt`` options for the configured buffer sizes."""
+        options: list[tuple[int, int, int]] = []
+        if self.socket_send_buffer_bytes:
+            options.append((socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_send_buffer_bytes))
+        if self.socket_receive_buffer_bytes:
+            options.append((socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_receive_buffer_bytes))
+        return options
+
+
+def transfer_profile_from_settings(settings: Any) -> TransferProfile:
+    """Build the operator-configured :class:`TransferProfile` from *settings*."""
+    return TransferProfile(
+        multipart_threshold_bytes=settings.activescale_multipart_threshold_bytes,
+        multipart_chunk_size_bytes=settings.activescale_multipart_chunk_size_bytes,
+        max_concurrency=max(settings.activescale_transfer_max_concurrency, 1),
+        max_pool_connections=max(settings.activescale_max_pool_connections, 1),
+        socket_send_buffer_bytes=settings.activescale_socket_send_buffer_bytes,
+        socket_receive_buffer_bytes=settings.activescale_socket_receive_buffer_bytes,
+    )
+
+
+def _chunk_size_for(size_bytes: int, concurrency: int, base: TransferProfile) -> int:
+    """Pick a whole-MiB chunk size giving every worker a few chunks of the object.
+
+    Never below the configured chunk size, and within S3's part limits.
+    """
+    target = math.ceil(size_bytes / (concurrency * _CHUNKS_PER_WORKER))
+    chunk = max(target, base.multipart_chunk_size_bytes, _S3_MIN_CHUNK_BYTES, math.ceil(size_bytes / _S3_MAX_PARTS))
+    chunk = min(chunk, _S3_MAX_CHUNK_BYTES)
+    return math.ceil(chunk / _MIB) * _MIB
+
+
+class TransferAutotuner:
+    """Choose chunk size and concurrency per object from measured throughput.
+
+    Concurrency starts at half the configured maximum and moves one step at a
+    time: it keeps going in the same direction while throughput improves and
+    turns round when it drops.  Only objects above the multipart threshold are
+    measured, since small single-request transfers say nothing about it.
+    """
+
+    def __init__(self, base: TransferProfile) -> None:
+        self._base = base
+        self._lock = threading.Lock()
+        self._concurrency = max(base.max_concurrency // 2, 1)
+        self._step = 1
+        self._last_throughput: float | None = None
+
+    @property
+    def base(self) -> TransferProfile:
+        """The operator-configured profile this tuner adjusts."""
+        return self._base
+
+    @property
+    def concurrency(self) -> int:
+        """Concurrency the next transfer will use."""
+        with self._lock:
+            return self._concurrency
+
+    def profile_for(self, size_bytes: int) -> TransferProfile:
+        """Return the profile to use for an object of *size_bytes*."""
+        with self._lock:
+            concurrency = self._concurrency
+        return replace(
+            self._base,
+            multipart_chunk_size_bytes=_chunk_size_for(size_bytes, concurrency, self._base),
+            max_concurrency=concurrency,
+        )
+
+    def record(self, size_bytes: int, seconds: float, profile: TransferProfile) -> None:
+        """Feed back the throughput of a finished transfer made with *profile*."""
+        if size_bytes < self._base.multipart_threshold_bytes or seconds <= 0:
+            return
+        throughput = size_bytes / seconds
+        with self._lock:
+            if profile.max_concurrency != self._concurrency:
+                # Measured with a setting that has since changed; not comparable.
+                return
+            if self._last_throughput is not None and throughput < self._last_throughput:
+                self._step = -self._step
+            self._last_throughput = throughput
+            self._concurrency = min(max(self._concurrency + self._step, 1), self._base.max_concurrency)
+
+
+_autotuners: dict[str, TransferAutotuner] = {}
+_autotuners_lock = threading.Lock()
+
+
+def get_transfer_profile(direction: str, size_bytes: int) -> TransferProfile:
+    """Return the transfer profile for moving *size_bytes* in *direction* ("upload"/"download").
+
+    The configured profile is used as is unless auto-tuning is enabled, in which
+    case each direction has its own :class:`TransferAutotuner`.
+    """
+    settings = get_settings()
+    base = transfer_profile_from_settings(settings)
+    if not settings.activescale_transfer_autotune_enabled:
+        return base
+    with _autotuners_lock:
+        tuner = _autotuners.get(direction)
+        if tuner is None or tuner.base != base:
+            tuner = _autotuners[direction] = TransferAutotuner(base)
+    return tuner.profile_for(size_bytes)
+
+
+def record_transfer(direction: str, size_bytes: int, seconds: float, profile: TransferProfile) -> None:
+    """Report a finished transfer to the *direction*'s auto-tuner, if there is one."""
+    with _autotuners_lock:
+        tuner = _autotuners.get(direction)
+    if tuner is not None:
+        tuner.record(size_bytes, seconds, profile)
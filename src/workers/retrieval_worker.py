@@ -4,34 +4,45 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
 import shutil
-import tarfile
+import threading
 import time
-from datetime import datetime, timedelta
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Any
 
 from sqlmodel import Session
 
 from api.dependencies import engine
 from config import get_settings
+from models.common import ArchivePartLayout
 from models.retrieval import ArchiveRetrieval, RetrievalJobStage
 from models.submission import ArchiveSubmission
+from packaging.archive_chunks import ArchivePartInfo, extract_tar_parts_stream
+from packaging.archive_codecs import codec_from_manifest
 from packaging.archive_reassembly import (
     load_archive_manifest,
+    ordered_part_entries,
     ordered_part_object_keys,
-    reassemble_archive_from_manifest,
 )
+from packaging.independent_parts import extract_independent_tar_parts, extract_selected_members
 from packaging.manifests import bagit_exists, validate_bag
-from service.activescale import (
-    download_file_to_disk,
-    get_activescale_client_context,
-    initiate_object_restore,
-    is_object_ready_for_download,
-)
+from packaging.member_index import SelectedMember, parts_for_members, select_members
+from packaging.part_cache import PartCache, shared_part_cache
+from service.activescale import download_file_to_disk, get_activescale_client_context
 from service.notifications import notify_job_result
+from service.restore_coordinator import RestoreCoordinator, RestoreProgress
 from utils.logging import elapsed_ms, log_event
 from workers import parse_part_keys_json
 
+#: Downloads of a part whose sha256 does not match the manifest before giving up.
+_PART_DOWNLOAD_ATTEMPTS = 3
+
 
 def _transition_retrieval_stage(
     session: Session,
@@ -71,19 +82,490 @@ def _persist_retrieved_part_keys(
     session.commit()
 
 
+def _part_mismatch(entry: dict[str, Any], size: int, sha256: str) -> str | None:
+    """Describe how a downloaded part differs from its manifest *entry*, or return None if it matches."""
+    expected_size = entry.get("size_bytes")
+    if isinstance(expected_size, int) and size != expected_size:
+        return f"Part size mismatch for {entry['file_name']}: expected {expected_size}, got {size}"
+    expected_sha = entry.get("sha256")
+    if isinstance(expected_sha, str) and sha256 != expected_sha:
+        return f"Part checksum mismatch for {entry['file_name']}"
+    return None
+
+
+def _persist_restore_progress(session: Session, retrieval: ArchiveRetrieval, progress: RestoreProgress) -> None:
+    """Record how many of the retrieval's parts are available for download."""
+    retrieval.restore_part_count = progress.total
+    retrieval.restored_part_count = progress.ready
+    retrieval.last_updated_timestamp = datetime.now()
+    session.add(retrieval)
+    session.commit()
+
+
+def _restore_coordinator(
+    client: Any,
+    settings: Any,
+    bucket_name: str,
+    on_progress: Callable[[RestoreProgress], None] | None = None,
+    stop: threading.Event | None = None,
+) -> RestoreCoordinator:
+    """Build a :class:`RestoreCoordinator` configured from *settings*, polling until *stop* is set."""
+    return RestoreCoordinator(
+        client,
+        bucket_name,
+        restore_days=settings.activescale_restore_days,
+        workers=settings.activescale_restore_workers,
+        poll_interval_cap=settings.activescale_restore_poll_interval_seconds,
+        max_wait=settings.activescale_restore_poll_max_seconds,
+        on_progress=on_progress,
+        sleep=stop.wait if stop is not None else time.sleep,
+        stop=stop,
+    )
+
+
+@dataclass(frozen=True)
+class _PartEvent:
+    """Something that happened to an archive part on one of the pipeline's threads."""
+
+    kind: str
+    part_key: str = ""
+    progress: RestoreProgress | None = None
+    error: BaseException | None = None
+
+
+class _PartRetrievalPipeline:  # pylint: disable=too-many-instance-attributes
+    """Download and verify archive parts as soon as each one is restored.
+
+    A restore thread feeds parts from :class:`RestoreCoordinator` into an event
+    queue as they become ready; each ready part is downloaded on a bounded pool
+    and checked against its manifest entry using the sha256 computed while it
+    was written, so no part is read back for verification.  A part that does
+    not match is downloaded again straight away.  So a part in active storage
+    is on disk while others are still thawing from tape.
+
+    Given an *extract* callable, :meth:`run` also extracts while parts download:
+    *extract* runs on its own thread, reading the parts in order and using
+    :meth:`wait_for_part` and :meth:`part_consumed` as its per-part hooks.
+    Parts are then downloaded at most *max_local_parts* ahead of the extractor
+    (counting the part it is reading), which bounds scratch usage to that many
+    parts; ready parts further ahead wait until the extractor catches up.
+
+    Events are handled on the calling thread, which owns the database session:
+    restore counts and verified part keys (``retrieved_part_keys_json``) are
+    persisted as they arrive.  Parts already recorded there and still present
+    locally are neither restored nor downloaded again.
+
+    Given a *part_cache*, parts found there by sha256 are linked into the
+    download directory instead of being restored and downloaded, and every part
+    downloaded is added to it.  The job pins those cache entries until
+    :meth:`release_cached_parts`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        session: Session,
+        retrieval: ArchiveRetrieval,
+        client: Any,
+        settings: Any,
+        object_prefix: str,
+        download_dir: Path,
+        part_entries: dict[str, dict[str, Any]],
+        started_at: datetime,
+        max_local_parts: int | None = None,
+        part_cache: PartCache | None = None,
+    ) -> None:
+        self._session = session
+        self._retrieval = retrieval
+        # Read once here: the restore and download threads must not touch the
+        # ORM instance, which the calling thread expires on every commit.
+        self._retrieval_id = retrieval.id
+        self._drive_name = retrieval.drive_name
+        self._client = client
+        self._settings = settings
+        self._bucket_name = settings.activescale_bucket_name
+        self._object_prefix = object_prefix
+        self._download_dir = download_dir
+        self._part_entries = part_entries
+        self._started_at = started_at
+        self._max_local_parts = max(max_local_parts, 1) if max_local_parts is not None else None
+        self._events: queue.Queue[_PartEvent] = queue.Queue()
+        self._stopped = threading.Event()
+        self._available = threading.Condition()
+        self._on_disk: set[str] = set()
+        self._positions: dict[str, int] = {}
+        self._consumed_count = 0
+        self._deferred: list[str] = []
+        self._part_cache = part_cache
+        self._pinned: list[str] = []
+        self._pinned_lock = threading.Lock()
+
+    def run(self, part_keys: list[str], extract: Callable[[], None] | None = None) -> None:
+        """Restore, download and verify every part in *part_keys*, then wait for *extract*.
+
+        *part_keys* must be in archive order when *extract* is given.  The job
+        moves to EXTRACTING once every part is on disk and only *extract* is
+        still running.
+
+        Raises:
+            RuntimeError: If a part fails to restore or download.
+            TimeoutError: If parts are still being restored after the configured wait.
+            ValueError: If a downloaded part does not match its manifest entry.
+            Exception: Whatever *extract* raises.
+        """
+        self._positions = {key: position for position, key in enumerate(part_keys)}
+        done = [
+            key
+            for key in parse_part_keys_json(self._retrieval.retrieved_part_keys_json)
+            if key in self._positions and self._local_path(key).exists()
+        ]
+        for key in done:
+            log_event(logging.DEBUG, "retrieval.download.part.skip", retrieval_id=self._retrieval_id, part_key=key)
+        cached = [key for key in part_keys if key not in done and self._take_from_cache(key)]
+        if cached:
+            done.extend(cached)
+            _persist_retrieved_part_keys(self._session, self._retrieval, done)
+        self._on_disk.update(done)
+        remaining = [key for key in part_keys if key not in self._on_disk]
+
+        restorer = threading.Thread(target=self._restore, args=(remaining,), name="retrieval-restore", daemon=True)
+        restorer.start()
+        extractor = None
+        if extract is not None:
+            extractor = threading.Thread(target=self._extract, args=(extract,), name="retrieval-extract", daemon=True)
+            extractor.start()
+        with ThreadPoolExecutor(
+            max_workers=max(self._settings.retrieval_download_workers, 1), thread_name_prefix="retrieval-download"
+        ) as downloads:
+            try:
+                self._handle_events(set(remaining), done, extractor is not None, downloads)
+            except BaseException:
+                self._stop()
+                downloads.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                if extractor is not None:
+                    extractor.join()
+
+    def wait_for_part(self, part: ArchivePartInfo) -> None:
+        """Extractor hook: block until *part* has been downloaded and verified.
+
+        Raises:
+            RuntimeError: If the pipeline stopped after a failure first.
+        """
+        key = f"{self._object_prefix}{part.file_name}"
+        with self._available:
+            self._available.wait_for(lambda: key in self._on_disk or self._stopped.is_set())
+        if self._stopped.is_set():
+            raise RuntimeError(f"Retrieval stopped before archive part {part.file_name} was available")
+
+    def part_consumed(self, part: ArchivePartInfo) -> None:
+        """Extractor hook: *part* has been read, so another part may be downloaded."""
+        self._events.put(_PartEvent("consumed", part_key=f"{self._object_prefix}{part.file_name}"))
+
+    def release_cached_parts(self) -> None:
+        """Unpin the part cache entries this job took or added, once it no longer needs them."""
+        if self._part_cache is None:
+            return
+        with self._pinned_lock:
+            pinned, self._pinned = self._pinned, []
+        for sha256 in pinned:
+            self._part_cache.release(sha256)
+
+    def _take_from_cache(self, part_key: str) -> bool:
+        """Link *part_key* into the download directory from the part cache, if it is there."""
+        entry = self._part_entries.get(part_key)
+        if self._part_cache is None or entry is None or not entry.get("sha256"):
+            return False
+        sha256 = str(entry["sha256"])
+        local_path = self._local_path(part_key)
+        local_path.unlink(missing_ok=True)
+        if not self._part_cache.acquire(sha256, local_path):
+            return False
+        if local_path.stat().st_size != entry.get("size_bytes"):
+            # Damaged on disk since it was cached; download it instead.
+            self._part_cache.discard(sha256)
+            local_path.unlink()
+            return False
+        with self._pinned_lock:
+            self._pinned.append(sha256)
+        log_event(logging.INFO, "retrieval.part_cache.hit", retrieval_id=self._retrieval_id, part_key=part_key)
+        return True
+
+    def _add_to_cache(self, entry: dict[str, Any] | None, local_path: Path) -> None:
+        """Add a verified download to the part cache."""
+        if self._part_cache is None or entry is None or not entry.get("sha256"):
+            return
+        sha256 = str(entry["sha256"])
+        if self._part_cache.add(sha256, local_path):
+            with self._pinned_lock:
+                self._pinned.append(sha256)
+
+    def _handle_events(  # pylint: disable=too-many-branches
+        self,
+        remaining: set[str],
+        done: list[str],
+        extracting: bool,
+        downloads: ThreadPoolExecutor,
+    ) -> None:
+        """Move parts between stages until none remain, persisting progress as it happens."""
+        resumed_count = len(done)
+        total = resumed_count + len(remaining)
+        while remaining or extracting:
+            if not remaining and self._retrieval.stage != RetrievalJobStage.EXTRACTING:
+                _transition_retrieval_stage(
+                    self._session, self._retrieval, RetrievalJobStage.EXTRACTING, self._started_at
+                )
+            event = self._events.get()
+            if event.error is not None:
+                raise event.error
+            if event.progress is not None:
+                # Parts resumed from an earlier attempt count as restored.
+                _persist_restore_progress(
+                    self._session,
+                    self._retrieval,
+                    RestoreProgress(total=total, ready=resumed_count + event.progress.ready),
+                )
+            elif event.kind == "ready":
+                if self._retrieval.stage == RetrievalJobStage.RESTORING:
+                    _transition_retrieval_stage(
+                        self._session, self._retrieval, RetrievalJobStage.DOWNLOADING, self._started_at
+                    )
+                self._deferred.append(event.part_key)
+                self._start_downloads(downloads)
+            elif event.kind == "verified":
+                remaining.discard(event.part_key)
+                done.append(event.part_key)
+                _persist_retrieved_part_keys(self._session, self._retrieval, done)
+                with self._available:
+                    self._on_disk.add(event.part_key)
+                    self._available.notify_all()
+                log_event(
+                    logging.INFO,
+                    "retrieval.download.part.completed",
+                    retrieval_id=self._retrieval_id,
+                    part_key=event.part_key,
+                    remaining_count=len(remaining),
+                    elapsed_ms=elapsed_ms(self._started_at),
+                )
+            elif event.kind == "consumed":
+                self._consumed_count += 1
+                self._start_downloads(downloads)
+            elif event.kind == "extracted":
+                extracting = False
+
+    def _start_downloads(self, downloads: ThreadPoolExecutor) -> None:
+        """Start downloading every ready part inside the look-ahead window."""
+        limit = None if self._max_local_parts is None else self._consumed_count + self._max_local_parts
+        startable = [key for key in self._deferred if limit is None or self._positions[key] < limit]
+        for key in startable:
+            self._deferred.remove(key)
+            log_event(
+                logging.INFO,
+                "retrieval.download.part.start",
+                retrieval_id=self._retrieval_id,
+                part_key=key,
+                dest=str(self._local_path(key)),
+                elapsed_ms=elapsed_ms(self._started_at),
+            )
+            self._submit(downloads, self._download, key, "verified")
+
+    def _restore(self, part_keys: list[str]) -> None:
+        """Restore thread: queue each part as soon as it can be downloaded."""
+        coordinator = _restore_coordinator(
+            self._client,
+            self._settings,
+            self._bucket_name,
+            on_progress=lambda progress: self._events.put(_PartEvent("progress", progress=progress)),
+            stop=self._stopped,
+        )
+        try:
+            for key in coordinator.ready_keys(part_keys):
+                if self._stopped.is_set():
+                    return
+                self._events.put(_PartEvent("ready", part_key=key))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._events.put(_PartEvent("failed", error=e))
+            return
+        if self._stopped.is_set():
+            return
+        log_event(
+            logging.INFO,
+            "retrieval.restore.complete",
+            retrieval_id=self._retrieval_id,
+            drive_name=self._drive_name,
+            part_count=len(part_keys),
+            elapsed_ms=elapsed_ms(self._started_at),
+        )
+
+    def _extract(self, extract: Callable[[], None]) -> None:
+        """Extractor thread: run *extract*, queueing its outcome."""
+        try:
+            extract()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._events.put(_PartEvent("failed", error=e))
+            return
+        self._events.put(_PartEvent("extracted"))
+
+    def _stop(self) -> None:
+        """Stop restoring and wake an extractor waiting for a part that will not come."""
+        with self._available:
+            self._stopped.set()
+            self._available.notify_all()
+
+    def _submit(self, executor: ThreadPoolExecutor, task: Callable[[str], None], part_key: str, kind: str) -> None:
+        """Run *task* for *part_key* on *executor*, queueing a *kind* event when it finishes."""
+
+        def forward(future: Future[None]) -> None:
+            if future.cancelled():
+                return
+            error = future.exception()
+            self._events.put(_PartEvent("failed" if error else kind, part_key=part_key, error=error))
+
+        executor.submit(task, part_key).add_done_callback(forward)
+
+    def _download(self, part_key: str) -> None:
+        """Download *part_key*, retrying it while it does not match its manifest entry.
+
+        Raises:
+            RuntimeError: If the download fails.
+            ValueError: If the part still does not match after every attempt.
+        """
+        local_path = self._local_path(part_key)
+        entry = self._part_entries.get(part_key)
+        for attempt in range(1, _PART_DOWNLOAD_ATTEMPTS + 1):
+            sha256 = download_file_to_disk(self._client, self._bucket_name, part_key, local_path)
+            if sha256 is None:
+                raise RuntimeError(f"Failed to download archive part: {part_key}")
+            mismatch = None if entry is None else _part_mismatch(entry, local_path.stat().st_size, sha256)
+            if mismatch is None:
+                self._add_to_cache(entry, local_path)
+                return
+            if attempt == _PART_DOWNLOAD_ATTEMPTS:
+                raise ValueError(mismatch)
+            log_event(
+                logging.WARNING,
+                "retrieval.download.part.mismatch",
+                retrieval_id=self._retrieval_id,
+                part_key=part_key,
+                attempt=attempt,
+                error=mismatch,
+            )
+
+    def _local_path(self, part_key: str) -> Path:
+        # Local file name is the trailing segment of the object key.
+        return self._download_dir / part_key.removeprefix(self._object_prefix)
+
+
+def _restore_and_download_object(  # pylint: disable=too-many-arguments
+    *,
+    settings: Any,
+    bucket_name: str,
+    object_key: str,
+    local_path: Path,
+    retrieval_id: int,
+    drive_name: str,
+    started_at: datetime,
+) -> None:
+    """Restore *object_key* from tape if needed, wait for it, and download it to *local_path*.
+
+    Skipped when *local_path* already exists (e.g. on a resume).
+    """
+    if local_path.exists():
+        return
+
+    with get_activescale_client_context() as client:
+        for _ in _restore_coordinator(client, settings, bucket_name).ready_keys([object_key]):
+            log_event(
+                logging.INFO,
+                "retrieval.restore.object.ready",
+                retrieval_id=retrieval_id,
+                drive_name=drive_name,
+                object_key=object_key,
+                elapsed_ms=elapsed_ms(started_at),
+            )
+        if not download_file_to_disk(client, bucket_name, object_key, local_path):
+            raise RuntimeError(f"Failed to download archive object: {object_key}")
+
+
+def _select_partial_retrieval(  # pylint: disable=too-many-arguments
+    *,
+    settings: Any,
+    manifest_data: dict[str, Any],
+    include_paths: list[str],
+    object_prefix: str,
+    download_dir: Path,
+    retrieval_id: int,
+    drive_name: str,
+    started_at: datetime,
+) -> tuple[list[ArchivePartInfo], list[SelectedMember]]:
+    """Use the archive's member index to find the members and parts matching *include_paths*.
+
+    Returns every part of the archive (in index order) and the selected members.
+
+    Raises:
+        ValueError: If the archive has no member index or nothing matches.
+    """
+    member_index = manifest_data.get("member_index")
+    if manifest_data.get("part_layout") != ArchivePartLayout.INDEPENDENT or not isinstance(member_index, dict):
+        raise ValueError(
+            "This archive was packaged without a member index, so individual paths cannot be retrieved."
+            " Retrieve the whole archive instead."
+        )
+
+    index_file_name = str(member_index["file_name"])
+    index_local = download_dir / index_file_name
+    _restore_and_download_object(
+        settings=settings,
+        bucket_name=settings.activescale_bucket_name,
+        object_key=f"{object_prefix}{index_file_name}",
+        local_path=index_local,
+        retrieval_id=retrieval_id,
+        drive_name=drive_name,
+        started_at=started_at,
+    )
+
+    archive_parts = [ArchivePartInfo.from_manifest_entry(part) for part in ordered_part_entries(manifest_data)]
+    last_part = archive_parts[-1]
+    assert last_part.tar_offset is not None and last_part.tar_size is not None
+    selected = select_members(
+        index_local,
+        include_paths,
+        source_root=str(manifest_data.get("source_root", drive_name)),
+        tar_size=last_part.tar_offset + last_part.tar_size,
+    )
+    if not selected:
+        raise ValueError(f"No archived paths match include_paths: {include_paths}")
+    return archive_parts, selected
+
+
 def run_archive_retrieval(  # pylint: disable=too-many-statements,too-many-locals,too-many-branches
     retrieval_id: int,
 ) -> None:
     """Background task: restore, download, and extract a completed archive.
 
     Workflow:
-      1. RESTORING  - Download the manifest from S3; initiate a restore request
-                      for every archive part; poll until all parts are available.
-      2. DOWNLOADING - Download each archive part to a local temp directory,
-                      persisting progress so a future retry can resume mid-download.
-      3. EXTRACTING  - Reassemble the chunked parts into a single .tar.gz; extract
-                      into destination_path; validate the resulting BagIt bag;
-                      clean up temp files.
+      1. RESTORING  - Download the manifest from S3; initiate restore requests
+                      in parallel for every archive part (or, when include_paths
+                      is set, only the parts the member index maps those paths
+                      to); poll the parts not yet available, with backoff, until
+                      all are, recording the counts on the retrieval record.
+      2. DOWNLOADING - Entered once the first part is available.  Each part is
+                      downloaded to a local temp directory as soon as it is
+                      restored and checked against the manifest's size and
+                      sha256, persisting progress so a future retry can resume
+                      mid-download.  Restores of other parts carry on meanwhile.
+                      Parts already in the local part cache (shared across
+                      retrievals) are linked from it instead, and each part
+                      downloaded is added to it.
+                      Stream-layout archives are extracted during this phase:
+                      the chunked parts are read in order through the decompressor
+                      for the manifest's codec (e.g. .tar.gz / .tar.zst) into
+                      destination_path, each one deleted once consumed, with
+                      downloads kept at most retrieval_max_local_parts ahead.
+      3. EXTRACTING  - Entered once every part is on disk; finish extracting
+                      (independent and partial archives are extracted in parallel
+                      here); validate the resulting BagIt bag; clean up temp files.
       4. COMPLETED / FAILED - Final state written to the ArchiveRetrieval record.
     """
     started_at = datetime.now()
@@ -92,6 +574,7 @@ def run_archive_retrieval(  # pylint: disable=too-many-statements,too-many-local
     with Session(engine) as session:
         retrieval: ArchiveRetrieval | None = None
         download_dir: Path | None = None
+        pipeline: _PartRetrievalPipeline | None = None
 
         try:
             retrieval = session.get(ArchiveRetrieval, retrieval_id)
@@ -134,53 +617,54 @@ def run_archive_retrieval(  # pylint: disable=too-many-statements,too-many-local
             _transition_retrieval_stage(session, retrieval, RetrievalJobStage.RESTORING, started_at)
 
             manifest_local = download_dir / settings.archive_chunk_manifest_file_name
-            poll_interval = settings.activescale_restore_poll_interval_seconds
-            max_wait = settings.activescale_restore_poll_max_seconds
 
             # Step 1a: Restore and download the manifest.
             # The manifest itself may be on tape and require a restore before
-            # it can be read.  We only need to do this if it has not already
-            # been downloaded to the local scratch directory (e.g. on a resume).
-            if not manifest_local.exists():
-                with get_activescale_client_context() as client:
-                    manifest_needs_restore = initiate_object_restore(
-                        client,
-                        bucket_name,
-                        manifest_key,
-                        days=settings.activescale_restore_days,
-                    )
-
-                if manifest_needs_restore:
-                    deadline = datetime.now() + timedelta(seconds=max_wait)
-                    while True:
-                        with get_activescale_client_context() as client:
-                            ready = is_object_ready_for_download(client, bucket_name, manifest_key)
-                        if ready:
-                            break
-                        if datetime.now() >= deadline:
-                            raise TimeoutError(
-                                f"Archive manifest not restored within {max_wait}s."
-                                " Re-submit a retrieval request to try again."
-                            )
-                        log_event(
-                            logging.INFO,
-                            "retrieval.restore.manifest.waiting",
-                            retrieval_id=retrieval_id,
-                            drive_name=drive_name,
-                            manifest_key=manifest_key,
-                            poll_interval_seconds=poll_interval,
-                            elapsed_ms=elapsed_ms(started_at),
-                        )
-                        time.sleep(poll_interval)
-
-                with get_activescale_client_context() as client:
-                    if not download_file_to_disk(client, bucket_name, manifest_key, manifest_local):
-                        raise RuntimeError(f"Failed to download archive manifest: {manifest_key}")
+            # it can be read.
+            _restore_and_download_object(
+                settings=settings,
+                bucket_name=bucket_name,
+                object_key=manifest_key,
+                local_path=manifest_local,
+                retrieval_id=retrieval_id,
+                drive_name=drive_name,
+                started_at=started_at,
+            )
 
             manifest_data = load_archive_manifest(manifest_local)
-            part_keys = ordered_part_object_keys(object_prefix, manifest_data)
 
-            # Step 1b: Restore archive parts.
+            # A partial retrieval restores only the parts holding the requested
+            # paths, located through the archive's member index.
+            archive_parts: list[ArchivePartInfo] = []
+            selected_members: list[SelectedMember] | None = None
+            if retrieval.include_paths_json is not None:
+                archive_parts, selected_members = _select_partial_retrieval(
+                    settings=settings,
+                    manifest_data=manifest_data,
+                    include_paths=json.loads(retrieval.include_paths_json),
+                    object_prefix=object_prefix,
+                    download_dir=download_dir,
+                    retrieval_id=retrieval_id,
+                    drive_name=drive_name,
+                    started_at=started_at,
+                )
+                needed_parts = parts_for_members(selected_members, archive_parts)
+                part_keys = [f"{object_prefix}{part.file_name}" for part in needed_parts]
+                log_event(
+                    logging.INFO,
+                    "retrieval.partial.selected",
+                    retrieval_id=retrieval_id,
+                    drive_name=drive_name,
+                    member_count=len(selected_members),
+                    part_count=len(part_keys),
+                    total_part_count=len(archive_parts),
+                )
+            else:
+                part_keys = ordered_part_object_keys(object_prefix, manifest_data)
+
+            # Step 1b: Restore archive parts, downloading and verifying each
+            # one as soon as it is available (the job moves to DOWNLOADING with
+            # the first part), persisting progress so a retry can resume.
             log_event(
                 logging.INFO,
                 "retrieval.restore.initiating",
@@ -190,117 +674,129 @@ def run_archive_retrieval(  # pylint: disable=too-many-statements,too-many-local
                 bucket_name=bucket_name,
             )
 
-            # Send restore requests; track only parts that are on tape
-            # (parts already in active storage skip the polling loop).
-            needs_restore: list[str] = []
+            # Stream-layout archives are extracted while their parts download:
+            # the extractor reads the parts in order, and downloads run at most
+            # retrieval_max_local_parts ahead of it.
+            archive_codec = codec_from_manifest(manifest_data)
+            dest_path = Path(retrieval.destination_path)
+            streamed = selected_members is None and manifest_data.get("part_layout") != ArchivePartLayout.INDEPENDENT
+            # Verified parts are kept across retrievals (and their retries) in a
+            # shared cache beside the scratch directories, so they can be hard-linked.
+            part_cache = None
+            if settings.retrieval_part_cache_max_bytes > 0:
+                part_cache = shared_part_cache(
+                    temp_base / "retrieval-part-cache", settings.retrieval_part_cache_max_bytes
+                )
             with get_activescale_client_context() as client:
-                for part_key in part_keys:
-                    if initiate_object_restore(
-                        client,
-                        bucket_name,
-                        part_key,
-                        days=settings.activescale_restore_days,
-                    ):
-                        needs_restore.append(part_key)
-
-            # Poll until all tape-tier parts have been thawed.
-            if needs_restore:
-                deadline = datetime.now() + timedelta(seconds=max_wait)
-
-                while True:
-                    with get_activescale_client_context() as client:
-                        all_ready = all(is_object_ready_for_download(client, bucket_name, k) for k in needs_restore)
-                    if all_ready:
-                        log_event(
-                            logging.INFO,
-                            "retrieval.restore.complete",
-                            retrieval_id=retrieval_id,
-                            drive_name=drive_name,
-                            elapsed_ms=elapsed_ms(started_at),
-                        )
-                        break
-                    if datetime.now() >= deadline:
-                        raise TimeoutError(
-                            f"Archive objects not restored within {max_wait}s."
-                            " Re-submit a retrieval request to try again."
-                        )
+                pipeline = _PartRetrievalPipeline(
+                    session=session,
+                    retrieval=retrieval,
+                    client=client,
+                    settings=settings,
+                    object_prefix=object_prefix,
+                    download_dir=download_dir,
+                    part_entries={
+                        f"{object_prefix}{part['file_name']}": part for part in ordered_part_entries(manifest_data)
+                    },
+                    started_at=started_at,
+                    max_local_parts=settings.retrieval_max_local_parts if streamed else None,
+                    part_cache=part_cache,
+                )
+                extract = None
+                if streamed:
+                    archive_parts = [
+                        ArchivePartInfo.from_manifest_entry(part) for part in ordered_part_entries(manifest_data)
+                    ]
                     log_event(
                         logging.INFO,
-                        "retrieval.restore.polling",
+                        "retrieval.extract.start",
                         retrieval_id=retrieval_id,
                         drive_name=drive_name,
-                        pending_count=len(needs_restore),
-                        poll_interval_seconds=poll_interval,
+                        part_count=len(archive_parts),
+                        codec=archive_codec.value,
+                        max_local_parts=settings.retrieval_max_local_parts,
+                        workers=settings.retrieval_extract_workers,
                         elapsed_ms=elapsed_ms(started_at),
                     )
-                    time.sleep(poll_interval)
-
-            # ─── Phase 2: DOWNLOADING ─────────────────────────────────────────
-            _transition_retrieval_stage(session, retrieval, RetrievalJobStage.DOWNLOADING, started_at)
-
-            already_downloaded = parse_part_keys_json(retrieval.retrieved_part_keys_json)
-
-            with get_activescale_client_context() as client:
-                for part_key in part_keys:
-                    if part_key in already_downloaded:
-                        log_event(
-                            logging.DEBUG,
-                            "retrieval.download.part.skip",
-                            retrieval_id=retrieval_id,
-                            part_key=part_key,
-                        )
-                        continue
-
-                    # Derive local filename from the trailing segment of the object key.
-                    part_filename = part_key.removeprefix(object_prefix)
-                    dest = download_dir / part_filename
-
-                    log_event(
-                        logging.INFO,
-                        "retrieval.download.part.start",
-                        retrieval_id=retrieval_id,
-                        part_key=part_key,
-                        dest=str(dest),
-                        elapsed_ms=elapsed_ms(started_at),
+                    # Each part is deleted once read, freeing room for the next.
+                    extract = partial(
+                        extract_tar_parts_stream,
+                        archive_parts,
+                        download_dir,
+                        dest_path,
+                        archive_codec,
+                        # Already checked against the manifest as they downloaded.
+                        verify=False,
+                        delete_consumed=True,
+                        before_part=pipeline.wait_for_part,
+                        after_part=pipeline.part_consumed,
+                        workers=settings.retrieval_extract_workers,
                     )
-
-                    if not download_file_to_disk(client, bucket_name, part_key, dest):
-                        raise RuntimeError(f"Failed to download archive part: {part_key}")
-
-                    already_downloaded.append(part_key)
-                    _persist_retrieved_part_keys(session, retrieval, already_downloaded)
+                pipeline.run(part_keys, extract=extract)
 
             # ─── Phase 3: EXTRACTING ──────────────────────────────────────────
-            _transition_retrieval_stage(session, retrieval, RetrievalJobStage.EXTRACTING, started_at)
-
-            reassembled_tar = download_dir / f"{drive_name}.tar.gz"
-            reassemble_archive_from_manifest(
-                parts_dir=download_dir,
-                manifest_path=manifest_local,
-                output_tar_path=reassembled_tar,
-                verify_parts=True,
-            )
+            if retrieval.stage != RetrievalJobStage.EXTRACTING:
+                _transition_retrieval_stage(session, retrieval, RetrievalJobStage.EXTRACTING, started_at)
 
-            log_event(
-                logging.INFO,
-                "retrieval.extract.start",
-                retrieval_id=retrieval_id,
-                drive_name=drive_name,
-                tar_path=str(reassembled_tar),
-                elapsed_ms=elapsed_ms(started_at),
-            )
-
-            dest_path = Path(retrieval.destination_path)
-            with tarfile.open(reassembled_tar, "r:gz") as tar:
-                tar.extractall(path=dest_path, filter="data")
+            if selected_members is not None:
+                log_event(
+                    logging.INFO,
+                    "retrieval.extract.start",
+                    retrieval_id=retrieval_id,
+                    drive_name=drive_name,
+                    part_count=len(part_keys),
+                    member_count=len(selected_members),
+                    codec=archive_codec.value,
+                    workers=settings.retrieval_extract_workers,
+                    elapsed_ms=elapsed_ms(started_at),
+                )
+                extract_selected_members(
+                    archive_parts,
+                    download_dir,
+                    dest_path,
+                    archive_codec,
+                    selected_members,
+                    workers=settings.retrieval_extract_workers,
+                )
+            elif manifest_data.get("part_layout") == ArchivePartLayout.INDEPENDENT:
+                # Each part decodes on its own: extract them in parallel, no reassembly.
+                archive_parts = [
+                    ArchivePartInfo.from_manifest_entry(part) for part in ordered_part_entries(manifest_data)
+                ]
+                log_event(
+                    logging.INFO,
+                    "retrieval.extract.start",
+                    retrieval_id=retrieval_id,
+                    drive_name=drive_name,
+                    part_count=len(archive_parts),
+                    codec=archive_codec.value,
+                    workers=settings.retrieval_extract_workers,
+                    elapsed_ms=elapsed_ms(started_at),
+                )
+                extract_independent_tar_parts(
+                    archive_parts,
+                    download_dir,
+                    dest_path,
+                    archive_codec,
+                    workers=settings.retrieval_extract_workers,
+                )
 
             # Validate BagIt integrity of the extracted archive.
             # ``source_root`` from the manifest tells us the top-level directory
             # name that was stored in the tar (mirrors tarfile.add arcname).
             source_root = str(manifest_data.get("source_root", drive_name))
             extracted_bag_path = dest_path / source_root
-            if bagit_exists(extracted_bag_path):
-                validate_bag(extracted_bag_path)
+            if selected_members is not None:
+                # Only part of the payload was retrieved, so the bag cannot validate.
+                log_event(
+                    logging.INFO,
+                    "retrieval.bagit.skipped",
+                    retrieval_id=retrieval_id,
+                    reason="partial retrieval",
+                    bag_path=str(extracted_bag_path),
+                )
+            elif bagit_exists(extracted_bag_path):
+                validate_bag(extracted_bag_path, workers=settings.bagit_checksum_workers)
                 log_event(
                     logging.INFO,
                     "retrieval.bagit.validated",
@@ -379,3 +875,6 @@ def run_archive_retrieval(  # pylint: disable=too-many-statements,too-many-local
                 error=str(e),
                 exc_info=True,
             )
+        finally:
+            if pipeline is not None:
+                pipeline.release_cached_parts()
@@ -4,35 +4,56 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
 import shutil
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from functools import partial
 from pathlib import Path
 from typing import Any
 
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from api.dependencies import engine
 from config import get_settings
-from models.common import calculate_retention_end_date, calculate_retention_end_datetime
-from models.submission import ArchiveJobStage, ArchiveSubmission
+from models.common import ArchivePartLayout, calculate_retention_end_date, calculate_retention_end_datetime
+from models.submission import ArchiveJobStage, ArchivePartUpload, ArchiveSubmission
 from packaging.archive_chunks import (
     ArchivePartInfo,
+    ChunkedArchiveResult,
     build_chunked_tar_archive,
+    record_part_checksums,
     verify_tar_parts_stream,
 )
+from packaging.archive_streaming import StoredPartMismatchError, stream_chunked_tar_archive_to_multipart
 from packaging.crate.ro_builder import ROBuilder
 from packaging.crate.ro_loader import ROLoader
-from packaging.manifests import bag_directory, bagit_exists, create_manifests_directory
+from packaging.fused_bagging import add_bag_to_tar
+from packaging.manifests import bag_directory, bagit_exists, create_manifests_directory, prepare_bag_layout
+from packaging.member_index import MEMBER_INDEX_FILE_NAME
 from service.activescale import (
+    MAX_SINGLE_PUT_BYTES,
+    abort_multipart_upload,
+    confirm_object_lock,
     get_activescale_client_context,
+    get_object_checksum_sha256,
+    inline_object_lock_available,
+    list_object_inventory,
     object_exists,
     set_object_retention,
+    sha256_hex_to_base64,
     upload_file,
+    upload_file_with_checksum,
     verify_uploaded_part_size,
 )
+from service.multipart_upload import MultipartStateStore, MultipartUploadState, upload_file_resumable
 from service.notifications import notify_job_result
 from service.projectdb_client import ProjectDBClient
 from service.projectdb_helpers import filter_member_identities, get_project_owner_emails
+from service.transfer_profile import get_transfer_profile
 from utils.logging import elapsed_ms, log_event
 from utils.paths import resolve_archive_output_location, resolve_drive_path_for_archive
 from workers import parse_part_keys_json
@@ -100,7 +121,312 @@ def _persist_uploaded_part_keys(
     session.commit()
 
 
-def _upload_chunked_archive_parts(  # pylint: disable=too-many-arguments
+def _find_stored_parts(
+    client: Any,
+    bucket_name: str,
+    object_prefix: str,
+    part_keys: list[str],
+) -> dict[str, int | None]:
+    """Return the stored size of each of *part_keys* that still exists in object storage.
+
+    A single listing of *object_prefix* answers for every key.  If the listing
+    fails, each key is checked with a HEAD instead; a size the HEAD did not
+    report is None.
+    """
+    if not part_keys:
+        return {}
+    inventory = list_object_inventory(client, bucket_name, object_prefix)
+    if inventory is not None:
+        return {key: inventory[key].size for key in part_keys if key in inventory}
+    stored: dict[str, int | None] = {}
+    for key in part_keys:
+        exists, metadata = object_exists(client, bucket_name, key)
+        if exists:
+            stored[key] = (metadata or {}).get("content_length")
+    return stored
+
+
+def _is_part_stored(
+    submission_id: int | None,
+    drive_name: str,
+    stored_sizes: dict[str, int | None],
+    part_key: str,
+    expected_size: int,
+) -> bool:
+    """Return whether *part_key* is already stored with *expected_size*, logging a skip or mismatch."""
+    if part_key not in stored_sizes:
+        return False
+    stored_size = stored_sizes[part_key]
+    if stored_size is not None and stored_size != expected_size:
+        log_event(
+            logging.WARNING,
+            "crate.upload.part.stored_size_mismatch",
+            submission_id=submission_id,
+            drive_name=drive_name,
+            part_key=part_key,
+            expected_size=expected_size,
+            stored_size=stored_size,
+        )
+        return False
+    log_event(
+        logging.INFO,
+        "crate.upload.part.skipped",
+        submission_id=submission_id,
+        drive_name=drive_name,
+        part_key=part_key,
+        reason="already_uploaded",
+    )
+    return True
+
+
+class _PartUploadStateStore:
+    """Persist the resumable multipart upload of one archive part in ``ArchivePartUpload``.
+
+    Every call opens its own short-lived session, so the store can be used
+    from upload threads while the job's session stays on the job thread.
+    """
+
+    def __init__(self, bind: Any, submission_id: int | None, object_key: str) -> None:
+        self._bind = bind
+        self._submission_id = submission_id
+        self._object_key = object_key
+
+    def load(self) -> MultipartUploadState | None:
+        """Return the persisted upload of this part, if any."""
+        with Session(self._bind) as session:
+            row = self._row(session)
+            if row is None:
+                return None
+            try:
+                parts = json.loads(row.part_etags_json)
+                return MultipartUploadState.from_json_dict(
+                    {
+                        "object_key": row.object_key,
+                        "upload_id": row.upload_id,
+                        "parts": parts,
+                        "object_locked": row.object_locked,
+                        "checksum_algorithm": row.checksum_algorithm,
+                    }
+                )
+            except json.JSONDecodeError, KeyError, TypeError, ValueError:
+                return None
+
+    def save(self, state: MultipartUploadState) -> None:
+        """Persist *state* so a later attempt can resume the upload."""
+        with Session(self._bind) as session:
+            row = self._row(session) or ArchivePartUpload(
+                submission_id=self._submission_id,
+                object_key=self._object_key,
+                upload_id=state.upload_id,
+            )
+            row.upload_id = state.upload_id
+            row.part_etags_json = json.dumps(state.to_json_dict()["parts"])
+            row.object_locked = state.object_locked
+            row.checksum_algorithm = state.checksum_algorithm
+            row.last_updated_timestamp = datetime.now()
+            session.add(row)
+            session.commit()
+
+    def clear(self) -> None:
+        """Forget the persisted upload of this part."""
+        with Session(self._bind) as session:
+            row = self._row(session)
+            if row is not None:
+                session.delete(row)
+                session.commit()
+
+    def _row(self, session: Session) -> ArchivePartUpload | None:
+        return session.exec(select(ArchivePartUpload).where(ArchivePartUpload.object_key == self._object_key)).first()
+
+
+def _abort_orphaned_part_uploads(
+    session: Session, submission: ArchiveSubmission, client: Any, bucket_name: str
+) -> None:
+    """Abort part uploads left behind once every part of *submission* is stored.
+
+    A part whose upload was given up (for example after repackaging changed
+    the part layout) would otherwise keep its chunks on the server.
+    """
+    rows = session.exec(select(ArchivePartUpload).where(ArchivePartUpload.submission_id == submission.id)).all()
+    for row in rows:
+        if not abort_multipart_upload(client, bucket_name, row.object_key, row.upload_id):
+            # Kept so a later run tries again.
+            continue
+        session.delete(row)
+        log_event(
+            logging.INFO,
+            "crate.upload.part.orphan_aborted",
+            submission_id=submission.id,
+            drive_name=submission.drive_name,
+            part_key=row.object_key,
+            upload_id=row.upload_id,
+        )
+    session.commit()
+
+
+def _stored_part_checksum(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    submission_id: int | None,
+    drive_name: str,
+    client: Any,
+    bucket_name: str,
+    part_key: str,
+    sha256: str,
+) -> str | None:
+    """Return the server's checksum of a part stored by an earlier run, if it matches *sha256*.
+
+    Keeps the ``s3_checksum_sha256`` of parts skipped on resume in the manifest.
+    """
+    checksum = get_object_checksum_sha256(client, bucket_name, part_key)
+    if checksum is None:
+        return None
+    if checksum != sha256_hex_to_base64(sha256):
+        log_event(
+            logging.WARNING,
+            "crate.upload.part.stored_checksum_mismatch",
+            submission_id=submission_id,
+            drive_name=drive_name,
+            part_key=part_key,
+            stored_checksum=checksum,
+        )
+        return None
+    return checksum
+
+
+def _upload_and_verify_part(  # pylint: disable=too-many-arguments
+    *,
+    submission_id: int | None,
+    drive_name: str,
+    client: Any,
+    bucket_name: str,
+    part_key: str,
+    part_path: Path,
+    expected_size: int,
+    timeout_seconds: int,
+    metadata: dict[str, str] | None,
+    sha256: str | None = None,
+    retain_until: datetime | None = None,
+    state_store: MultipartStateStore | None = None,
+    cancel_event: threading.Event | None = None,
+) -> tuple[bool, str | None]:
+    """Upload one archive part and confirm it was stored intact.
+
+    With a *state_store*, a part at or above the multipart threshold is sent
+    with :func:`upload_file_resumable`, so a retry resumes from its last
+    stored chunk.  With *sha256*, each chunk carries its own checksum, and a
+    composite checksum reported on completion that matches the chunks sent
+    stands in for the HEAD size check; it is not the part's SHA-256, so no
+    checksum is returned for the manifest.  Else,
+    with *sha256* and a part small enough for a single PUT, the part is sent
+    with its checksum for the server to validate on receipt; once the server
+    confirms it, the HEAD size check is skipped.  Otherwise the stored
+    object's size is compared with *expected_size*.  *retain_until* is sent
+    with the upload where the endpoint supports it; the caller still finishes
+    with :func:`_set_part_retention`.
+
+    Returns:
+        Tuple of (success, base64 checksum confirmed by the server or None).
+    """
+    confirmed_checksum: str | None = None
+    chunks_confirmed = False
+    profile = get_transfer_profile("upload", expected_size)
+    if state_store is not None and expected_size >= profile.multipart_threshold_bytes:
+        success, composite_checksum = upload_file_resumable(
+            client,
+            bucket_name,
+            part_key,
+            part_path,
+            state_store=state_store,
+            profile=profile,
+            stall_timeout=timeout_seconds,
+            metadata=metadata,
+            retain_until=retain_until,
+            send_checksums=sha256 is not None,
+            cancel_event=cancel_event,
+        )
+        chunks_confirmed = composite_checksum is not None
+    elif sha256 is not None and expected_size <= MAX_SINGLE_PUT_BYTES:
+        success, confirmed_checksum = upload_file_with_checksum(
+            client,
+            bucket_name,
+            part_key,
+            file_path=str(part_path),
+            sha256_hex=sha256,
+            metadata=metadata,
+            retain_until=retain_until,
+            timeout=timeout_seconds,
+        )
+    else:
+        success = upload_file(
+            client,
+            bucket_name,
+            part_key,
+            file_path=str(part_path),
+            timeout=timeout_seconds,
+            metadata=metadata,
+            retain_until=retain_until,
+        )
+    if not success:
+        log_event(
+            logging.ERROR,
+            "crate.upload.part.failed",
+            submission_id=submission_id,
+            drive_name=drive_name,
+            part_key=part_key,
+        )
+        return False, None
+
+    if confirmed_checksum is not None:
+        return True, confirmed_checksum
+    if chunks_confirmed:
+        return True, None
+    if not verify_uploaded_part_size(client, bucket_name, part_key, expected_size):
+        log_event(
+            logging.ERROR,
+            "crate.upload.part.size_mismatch",
+            submission_id=submission_id,
+            drive_name=drive_name,
+            part_key=part_key,
+            expected_size=expected_size,
+        )
+        return False, None
+    return True, None
+
+
+def _protect_object(client: Any, bucket_name: str, file_key: str, retain_until: datetime) -> bool:
+    """Make sure an object uploaded with *retain_until* is under retention.
+
+    Uploads carry their retention where the endpoint supports it, so the
+    object only needs confirming; otherwise retention is set with a separate
+    ``PutObjectRetention`` call.
+    """
+    if inline_object_lock_available():
+        return confirm_object_lock(client, bucket_name, file_key, retain_until)
+    return set_object_retention(client, bucket_name, file_key, retain_until)
+
+
+def _set_part_retention(
+    *,
+    submission_id: int | None,
+    drive_name: str,
+    client: Any,
+    bucket_name: str,
+    part_key: str,
+    retain_until: datetime,
+) -> bool:
+    """Make sure an uploaded archive part is under retention, logging on failure."""
+    if _protect_object(client, bucket_name, part_key, retain_until):
+        return True
+    log_event(
+        logging.ERROR,
+        "crate.upload.part.retention_failed",
+        submission_id=submission_id,
+        drive_name=drive_name,
+        part_key=part_key,
+    )
+    return False
+
+
+def _upload_chunked_archive_parts(  # pylint: disable=too-many-arguments,too-many-locals
     *,
     session: Session,
     submission: ArchiveSubmission,
@@ -112,12 +438,25 @@ def _upload_chunked_archive_parts(  # pylint: disable=too-many-arguments
     timeout_seconds: int,
     metadata: dict[str, str] | None = None,
     retain_until: datetime | None = None,
+    concurrency: int = 1,
+    send_checksums: bool = False,
+    resumable: bool = False,
 ) -> tuple[bool, list[str]]:
     """Upload chunked archive part files with resume support.
 
     A part key is considered already uploaded only if:
     - it appears in persisted submission state, and
-    - the key currently exists in object storage.
+    - the key currently exists in object storage with the part's size.
+
+    Storage is checked with one listing of *object_prefix* rather than a HEAD
+    per persisted key (see :func:`_find_stored_parts`).
+
+    Up to *concurrency* parts are uploaded, verified and retention-locked at
+    once on worker threads.  Progress is persisted on the calling thread
+    (the database session is not thread-safe) as each part completes.  After
+    the first failure no further parts are started; parts already in flight
+    are allowed to finish and are recorded if they succeed, so a retry skips
+    them.
 
     Args:
         session: Database session for persisting progress
@@ -130,81 +469,302 @@ def _upload_chunked_archive_parts(  # pylint: disable=too-many-arguments
         timeout_seconds: Timeout for each individual part upload attempt
         retain_until: Optional datetime to set for object retention
         (object lock COMPLIANCE mode). If None, retention will not be set.
+        concurrency: Number of parts uploaded in parallel
+        send_checksums: Send each part's SHA-256 for the server to validate; a
+            confirmed checksum is stored on the part's ``s3_checksum_sha256``
+        resumable: Upload large parts as multipart uploads whose progress is
+            kept in ``ArchivePartUpload``, so a retry resumes mid-part
 
     Returns:
         Tuple of (overall upload success, list of uploaded part keys)
     """
-    part_files = sorted(archive_parts_dir.glob("*.tar.gz.part-*"))
+    if concurrency <= 0:
+        raise ValueError("concurrency must be greater than zero")
+
+    # Worker threads get plain values: the instance is expired on every commit
+    # and refreshing it would use the session from another thread.
+    submission_id = submission.id
+    drive_name = submission.drive_name
     uploaded_keys = parse_part_keys_json(submission.archive_part_keys_json)
-    manifest_sizes: dict[str, int] = {p.file_name: p.size_bytes for p in archive_parts}
+    stored_sizes = _find_stored_parts(client, bucket_name, object_prefix, uploaded_keys)
+    to_upload: deque[ArchivePartInfo] = deque()
+    for part in sorted(archive_parts, key=lambda p: p.index):
+        part_key = f"{object_prefix}{part.file_name}"
+        if not _is_part_stored(submission_id, drive_name, stored_sizes, part_key, part.size_bytes):
+            to_upload.append(part)
+        elif send_checksums:
+            part.s3_checksum_sha256 = _stored_part_checksum(
+                submission_id, drive_name, client, bucket_name, part_key, part.sha256
+            )
+    # Parts finish out of order; keys are persisted in part order.
+    part_order = {f"{object_prefix}{part.file_name}": part.index for part in archive_parts}
 
-    for part_file in part_files:
-        part_key = f"{object_prefix}{part_file.name}"
-        if part_key in uploaded_keys:
-            exists, _ = object_exists(client, bucket_name, part_key)
-            if exists:
-                log_event(
-                    logging.INFO,
-                    "crate.upload.part.skipped",
-                    submission_id=submission.id,
-                    drive_name=submission.drive_name,
-                    part_key=part_key,
-                    reason="already_uploaded",
-                )
-                continue
+    state_bind = session.get_bind()
 
-        success = upload_file(
-            client,
-            bucket_name,
-            part_key,
-            file_path=str(part_file),
-            timeout=timeout_seconds,
+    def upload_part(part: ArchivePartInfo) -> _PipelinedPartResult:
+        part_key = f"{object_prefix}{part.file_name}"
+        part_path = archive_parts_dir / part.file_name
+        uploaded, part.s3_checksum_sha256 = _upload_and_verify_part(
+            submission_id=submission_id,
+            drive_name=drive_name,
+            client=client,
+            bucket_name=bucket_name,
+            part_key=part_key,
+            part_path=part_path,
+            expected_size=part.size_bytes,
+            timeout_seconds=timeout_seconds,
             metadata=metadata,
+            sha256=part.sha256 if send_checksums else None,
+            retain_until=retain_until,
+            state_store=_PartUploadStateStore(state_bind, submission_id, part_key) if resumable else None,
         )
-        if not success:
-            log_event(
-                logging.ERROR,
-                "crate.upload.part.failed",
-                submission_id=submission.id,
-                drive_name=submission.drive_name,
-                part_key=part_key,
-            )
-            return False, uploaded_keys
-
-        expected_size = manifest_sizes.get(part_file.name, part_file.stat().st_size)
-        if not verify_uploaded_part_size(client, bucket_name, part_key, expected_size):
-            log_event(
-                logging.ERROR,
-                "crate.upload.part.size_mismatch",
-                submission_id=submission.id,
-                drive_name=submission.drive_name,
-                part_key=part_key,
-                expected_size=expected_size,
-            )
-            return False, uploaded_keys
-
-        uploaded_keys.append(part_key)
-        _persist_uploaded_part_keys(session, submission, uploaded_keys)
-        log_event(
-            logging.INFO,
-            "crate.upload.part.completed",
-            submission_id=submission.id,
-            drive_name=submission.drive_name,
+        if not uploaded:
+            return _PipelinedPartResult(part_key=part_key, uploaded=False)
+        retention_set = retain_until is None or _set_part_retention(
+            submission_id=submission_id,
+            drive_name=drive_name,
+            client=client,
+            bucket_name=bucket_name,
             part_key=part_key,
+            retain_until=retain_until,
         )
+        return _PipelinedPartResult(part_key=part_key, uploaded=True, retention_set=retention_set)
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="archive-part-upload") as executor:
+        in_flight: dict[Future[_PipelinedPartResult], ArchivePartInfo] = {}
+        while to_upload or in_flight:
+            while not failed and to_upload and len(in_flight) < concurrency:
+                part = to_upload.popleft()
+                in_flight[executor.submit(upload_part, part)] = part
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: in_flight[f].index):
+                part = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception:  # pylint: disable=broad-exception-caught
+                    log_event(
+                        logging.ERROR,
+                        "crate.upload.part.exception",
+                        submission_id=submission_id,
+                        drive_name=drive_name,
+                        part_file=part.file_name,
+                        exc_info=True,
+                    )
+                    result = _PipelinedPartResult(part_key=f"{object_prefix}{part.file_name}", uploaded=False)
+                if result.uploaded:
+                    if result.part_key not in uploaded_keys:
+                        uploaded_keys.append(result.part_key)
+                        uploaded_keys.sort(key=lambda key: part_order.get(key, len(part_order)))
+                    _persist_uploaded_part_keys(session, submission, uploaded_keys)
+                    log_event(
+                        logging.INFO,
+                        "crate.upload.part.completed",
+                        submission_id=submission_id,
+                        drive_name=drive_name,
+                        part_key=result.part_key,
+                    )
+                if not result.uploaded or not result.retention_set:
+                    failed = True
+
+    return not failed, uploaded_keys
+
 
-        if retain_until is not None:
-            if not set_object_retention(client, bucket_name, part_key, retain_until):
+@dataclass
+class _PipelinedPartResult:
+    """Outcome of one part handled by :class:`_PipelinedPartUploader`."""
+
+    part_key: str
+    uploaded: bool
+    skipped: bool = False
+    retention_set: bool = True
+
+
+class _PipelinedPartUploader:  # pylint: disable=too-many-instance-attributes
+    """Upload archive parts from a bounded queue while packaging continues.
+
+    :meth:`submit` is passed to :func:`build_chunked_tar_archive` as its
+    ``on_part_finalized`` callback.  A single uploader thread uploads,
+    size-verifies and (optionally) sets retention on each sealed part in order,
+    then deletes the local file.  ``submit`` blocks while ``max_pending_parts``
+    parts are already waiting, which caps local scratch usage.
+
+    Progress is persisted on the calling thread (the database session is not
+    thread-safe) each time :meth:`submit` or :meth:`finish` runs, with the same
+    resume semantics as :func:`_upload_chunked_archive_parts`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        session: Session,
+        submission: ArchiveSubmission,
+        client: Any,
+        bucket_name: str,
+        object_prefix: str,
+        archive_parts_dir: Path,
+        timeout_seconds: int,
+        max_pending_parts: int,
+        metadata: dict[str, str] | None = None,
+        retain_until: datetime | None = None,
+        send_checksums: bool = False,
+        resumable: bool = False,
+    ) -> None:
+        if max_pending_parts <= 0:
+            raise ValueError("max_pending_parts must be greater than zero")
+
+        self._session = session
+        self._submission = submission
+        self._client = client
+        self._bucket_name = bucket_name
+        self._object_prefix = object_prefix
+        self._archive_parts_dir = archive_parts_dir
+        self._timeout_seconds = timeout_seconds
+        self._metadata = metadata
+        self._retain_until = retain_until
+        self._send_checksums = send_checksums
+        self._state_bind = session.get_bind() if resumable else None
+        # The uploader thread only uses these plain values: the instance is
+        # expired on every commit and refreshing it would use the session
+        # from the wrong thread.
+        self._submission_id = submission.id
+        self._drive_name = submission.drive_name
+
+        self._uploaded_keys = parse_part_keys_json(submission.archive_part_keys_json)
+        self._stored_sizes = _find_stored_parts(client, bucket_name, object_prefix, self._uploaded_keys)
+        self._pending: queue.Queue[ArchivePartInfo | None] = queue.Queue(maxsize=max_pending_parts)
+        self._results: queue.Queue[_PipelinedPartResult] = queue.Queue()
+        self._failed = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="archive-part-uploader", daemon=True)
+        self._thread.start()
+
+    def submit(self, part: ArchivePartInfo) -> None:
+        """Queue a sealed part for upload, blocking while the queue is full.
+
+        Raises:
+            RuntimeError: If an earlier part failed to upload, to abort packaging.
+        """
+        self._record_results()
+        if self._failed.is_set():
+            raise RuntimeError("Archive part upload failed during packaging")
+        self._pending.put(part)
+
+    def finish(self) -> tuple[bool, list[str]]:
+        """Wait for queued parts to upload.
+
+        Returns:
+            Tuple of (overall upload success, list of uploaded part keys)
+        """
+        self._pending.put(None)
+        self._thread.join()
+        self._record_results()
+        return not self._failed.is_set(), self._uploaded_keys
+
+    def abort(self) -> None:
+        """Stop uploading after packaging fails; parts still queued are discarded.
+
+        A resumable upload in flight is cancelled and aborted, since the part it
+        was uploading is discarded with the failed packaging run.
+        """
+        self._failed.set()
+        self._cancelled.set()
+        self.finish()
+
+    def _record_results(self) -> None:
+        """Persist and log results produced by the uploader thread."""
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if not result.uploaded:
+                continue
+            if not result.skipped:
+                if result.part_key not in self._uploaded_keys:
+                    self._uploaded_keys.append(result.part_key)
+                _persist_uploaded_part_keys(self._session, self._submission, self._uploaded_keys)
                 log_event(
-                    logging.ERROR,
-                    "crate.upload.part.retention_failed",
-                    submission_id=submission.id,
-                    drive_name=submission.drive_name,
-                    part_key=part_key,
+                    logging.INFO,
+                    "crate.upload.part.completed",
+                    submission_id=self._submission_id,
+                    drive_name=self._drive_name,
+                    part_key=result.part_key,
+                    pipelined=True,
                 )
-                return False, uploaded_keys
 
-    return True, uploaded_keys
+    def _run(self) -> None:
+        """Uploader thread: drain the queue until the ``None`` sentinel arrives."""
+        while True:
+            part = self._pending.get()
+            if part is None:
+                return
+            if self._failed.is_set():
+                # Keep draining so a blocked submit() can return and see the failure.
+                continue
+            try:
+                result = self._upload_part(part)
+            except Exception:  # pylint: disable=broad-exception-caught
+                log_event(
+                    logging.ERROR,
+                    "crate.upload.part.exception",
+                    submission_id=self._submission_id,
+                    drive_name=self._drive_name,
+                    part_file=part.file_name,
+                    exc_info=True,
+                )
+                result = _PipelinedPartResult(part_key=f"{self._object_prefix}{part.file_name}", uploaded=False)
+            self._results.put(result)
+            if not result.uploaded or not result.retention_set:
+                self._failed.set()
+
+    def _upload_part(self, part: ArchivePartInfo) -> _PipelinedPartResult:
+        """Upload one part, then delete the local file once it is safely stored."""
+        part_key = f"{self._object_prefix}{part.file_name}"
+        part_path = self._archive_parts_dir / part.file_name
+
+        if _is_part_stored(self._submission_id, self._drive_name, self._stored_sizes, part_key, part.size_bytes):
+            if self._send_checksums:
+                part.s3_checksum_sha256 = _stored_part_checksum(
+                    self._submission_id, self._drive_name, self._client, self._bucket_name, part_key, part.sha256
+                )
+            part_path.unlink(missing_ok=True)
+            return _PipelinedPartResult(part_key=part_key, uploaded=True, skipped=True)
+
+        uploaded, part.s3_checksum_sha256 = _upload_and_verify_part(
+            submission_id=self._submission_id,
+            drive_name=self._drive_name,
+            client=self._client,
+            bucket_name=self._bucket_name,
+            part_key=part_key,
+            part_path=part_path,
+            expected_size=part.size_bytes,
+            timeout_seconds=self._timeout_seconds,
+            metadata=self._metadata,
+            sha256=part.sha256 if self._send_checksums else None,
+            retain_until=self._retain_until,
+            state_store=(
+                _PartUploadStateStore(self._state_bind, self._submission_id, part_key)
+                if self._state_bind is not None
+                else None
+            ),
+            cancel_event=self._cancelled,
+        )
+        if not uploaded:
+            return _PipelinedPartResult(part_key=part_key, uploaded=False)
+
+        retention_set = self._retain_until is None or _set_part_retention(
+            submission_id=self._submission_id,
+            drive_name=self._drive_name,
+            client=self._client,
+            bucket_name=self._bucket_name,
+            part_key=part_key,
+            retain_until=self._retain_until,
+        )
+        part_path.unlink(missing_ok=True)
+        return _PipelinedPartResult(part_key=part_key, uploaded=True, retention_set=retention_set)
 
 
 def build_crate_contents(  # pylint: disable=too-many-arguments, too-many-positional-arguments
@@ -214,6 +774,9 @@ def build_crate_contents(  # pylint: disable=too-many-arguments, too-many-positi
     project_data: dict[str, Any],
     drive_location: Path,
     output_location: Path,
+    fused_bagging: bool = False,
+    checksum_workers: int = 1,
+    checksum_cache_path: Path | None = None,
 ) -> None:
     """Generate RO-Crate with data from ProjectDB.
 
@@ -224,6 +787,10 @@ def build_crate_contents(  # pylint: disable=too-many-arguments, too-many-positi
         project_data: Project data from ProjectDB
         drive_location: Source drive location path
         output_location: Output archive location path
+        fused_bagging: Only lay out the bag; its manifests are written while the
+            archive is packaged (see :func:`packaging.fused_bagging.add_bag_to_tar`)
+        checksum_workers: Threads used to checksum the bag payload
+        checksum_cache_path: Checksum cache reused when re-bagging a drive
     """
     ro_crate_loader = ROLoader()
     ro_crate_loader.init_crate()
@@ -254,18 +821,24 @@ def build_crate_contents(  # pylint: disable=too-many-arguments, too-many-positi
         logging.INFO,
         "bag_directory.start",
         drive_name=submission.drive_name,
+        fused_bagging=fused_bagging,
     )
-    bag_directory(
-        drive_location,
-        bag_info={
-            "project_id": str(project_data.get("id", "")),
-            "drive_name": submission.drive_name,
-        },
-    )
+    if fused_bagging:
+        prepare_bag_layout(drive_location)
+    else:
+        bag_directory(
+            drive_location,
+            bag_info=_build_bag_info(project_data, submission),
+            workers=checksum_workers,
+            cache_path=checksum_cache_path,
+        )
 
     # Create output location after bagit processing so it doesn't get included in bag
     output_location.mkdir(parents=True, exist_ok=True)
 
+    if fused_bagging:
+        # Manifests do not exist until the archive has been packaged.
+        return
     create_manifests_directory(
         drive_path=drive_location,
         output_location=output_location,
@@ -273,13 +846,25 @@ def build_crate_contents(  # pylint: disable=too-many-arguments, too-many-positi
     )
 
 
+def _build_bag_info(project_data: dict[str, Any], submission: ArchiveSubmission) -> dict[str, str]:
+    """Build the bag-info.txt tags documenting ownership of the bag."""
+    return {
+        "project_id": str(project_data.get("id", "")),
+        "drive_name": submission.drive_name,
+    }
+
+
 def _build_archive_object_metadata(
     project_data: dict[str, Any],
     members_list: list[dict[str, Any]],
     submission: ArchiveSubmission,
-    archive_part_count: int,
+    archive_part_count: int | None,
 ) -> dict[str, str]:
-    """Build common S3 metadata attached to archive parts and manifest."""
+    """Build common S3 metadata attached to archive parts and manifest.
+
+    *archive_part_count* is ``None`` for parts uploaded while packaging is still
+    running; it is then recorded as ``"Unknown"``.
+    """
     return {
         "cer_project_id": str(project_data.get("id", "")),
         "project_owners": json.dumps(get_project_owner_emails(members_list)),
@@ -294,10 +879,157 @@ def _build_archive_object_metadata(
             if submission.retention_period_years is not None
             else "Unknown"
         ),
-        "archive_part_count": str(archive_part_count),
+        "archive_part_count": str(archive_part_count) if archive_part_count is not None else "Unknown",
     }
 
 
+class _SubmissionMultipartStateStore:
+    """Persist streamed multipart upload state on the submission record."""
+
+    def __init__(self, session: Session, submission: ArchiveSubmission) -> None:
+        self._session = session
+        self._submission = submission
+
+    def load(self) -> MultipartUploadState | None:
+        """Return the persisted multipart upload state, if any."""
+        if not self._submission.archive_multipart_upload_json:
+            return None
+        try:
+            return MultipartUploadState.from_json_dict(json.loads(self._submission.archive_multipart_upload_json))
+        except json.JSONDecodeError, KeyError, TypeError, ValueError:
+            return None
+
+    def save(self, state: MultipartUploadState) -> None:
+        """Persist *state* so a restart can resume the upload."""
+        self._store(json.dumps(state.to_json_dict()))
+
+    def clear(self) -> None:
+        """Forget the persisted multipart upload state."""
+        self._store(None)
+
+    def _store(self, value: str | None) -> None:
+        self._submission.archive_multipart_upload_json = value
+        self._submission.last_updated_timestamp = datetime.now()
+        self._session.add(self._submission)
+        self._session.commit()
+
+
+def _stream_archive_parts(  # pylint: disable=too-many-arguments
+    *,
+    session: Session,
+    submission: ArchiveSubmission,
+    client: Any,
+    bucket_name: str,
+    object_prefix: str,
+    chunk_size_bytes: int,
+    metadata: dict[str, str],
+    retain_until: datetime | None,
+    archive_options: dict[str, Any],
+) -> tuple[ChunkedArchiveResult, str, tuple[bool, list[str]]]:
+    """Package the archive straight into multipart uploads, one object per part.
+
+    Part keys and their sha256 are persisted as each object completes.  Keys
+    persisted by an earlier run are skipped only if the object still exists,
+    matching :func:`_upload_chunked_archive_parts`, and only if the part
+    regenerates with the recorded sha256.  If one does not, its locked object
+    cannot be replaced, so packaging starts again under a new object prefix.
+
+    Returns:
+        The packaging result, the object prefix the parts were stored under and
+        a tuple of (overall upload success, list of uploaded part keys)
+    """
+    uploaded_keys = parse_part_keys_json(submission.archive_part_keys_json)
+    part_sha256: dict[str, str] = json.loads(submission.archive_part_sha256_json or "{}")
+    stored = _find_stored_parts(client, bucket_name, object_prefix, uploaded_keys)
+    completed_parts = {key: part_sha256[key] for key in stored if key in part_sha256}
+
+    def on_part_finalized(part: ArchivePartInfo) -> None:
+        part_key = f"{object_prefix}{part.file_name}"
+        if part_key in completed_parts:
+            log_event(
+                logging.INFO,
+                "crate.upload.part.skipped",
+                submission_id=submission.id,
+                drive_name=submission.drive_name,
+                part_key=part_key,
+                reason="already_uploaded",
+            )
+            return
+        if part_key not in uploaded_keys:
+            uploaded_keys.append(part_key)
+        part_sha256[part_key] = part.sha256
+        submission.archive_part_sha256_json = json.dumps(part_sha256)
+        _persist_uploaded_part_keys(session, submission, uploaded_keys)
+        log_event(
+            logging.INFO,
+            "crate.upload.part.completed",
+            submission_id=submission.id,
+            drive_name=submission.drive_name,
+            part_key=part_key,
+            streamed=True,
+        )
+
+    def stream() -> ChunkedArchiveResult:
+        return stream_chunked_tar_archive_to_multipart(
+            **archive_options,
+            client=client,
+            bucket_name=bucket_name,
+            object_prefix=object_prefix,
+            chunk_size_bytes=chunk_size_bytes,
+            state_store=_SubmissionMultipartStateStore(session, submission),
+            completed_parts=completed_parts,
+            metadata=metadata,
+            retain_until=retain_until,
+            on_part_finalized=on_part_finalized,
+        )
+
+    try:
+        chunk_result = stream()
+    except StoredPartMismatchError as e:
+        previous_prefix = object_prefix
+        object_prefix = f"{submission.drive_name}/restart-{datetime.now(tz=UTC):%Y%m%dT%H%M%S%f}/"
+        log_event(
+            logging.WARNING,
+            "crate.upload.stream.restarted",
+            submission_id=submission.id,
+            drive_name=submission.drive_name,
+            part_key=e.object_key,
+            previous_object_prefix=previous_prefix,
+            object_prefix=object_prefix,
+            error=str(e),
+        )
+        # Persist the new prefix first, so a crash from here resumes under it.
+        completed_parts.clear()
+        uploaded_keys.clear()
+        part_sha256.clear()
+        submission.archive_object_prefix = object_prefix
+        submission.archive_part_sha256_json = None
+        _persist_uploaded_part_keys(session, submission, uploaded_keys)
+        chunk_result = stream()
+    return chunk_result, object_prefix, (True, uploaded_keys)
+
+
+def _compute_retain_until(settings: Any, submission: ArchiveSubmission) -> datetime | None:
+    """Return the object retention date for this job's objects, or None when retention is disabled."""
+    if not settings.activescale_enable_object_retention:
+        return None
+
+    now_utc = datetime.now(tz=UTC)
+    if settings.activescale_retention_override_days is not None:
+        retain_until = now_utc + timedelta(days=settings.activescale_retention_override_days)
+    else:
+        retention_years = submission.retention_period_years or settings.activescale_default_retention_years
+        retain_until = calculate_retention_end_datetime(now_utc, retention_years)
+    log_event(
+        logging.INFO,
+        "crate.upload.retention.computed",
+        submission_id=submission.id,
+        drive_name=submission.drive_name,
+        retain_until=retain_until.isoformat(),
+    )
+    return retain_until
+
+
 def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,too-many-branches
     drive: dict[str, Any],
     submission_id: int,
@@ -412,6 +1144,7 @@ def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,to
             )
 
             # Build crate contents (idempotent, safe to retry)
+            settings = get_settings()
             build_crate_contents(
                 drive=drive,
                 submission=submission,
@@ -419,11 +1152,18 @@ def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,to
                 project_data=project_data,
                 drive_location=drive_path,
                 output_location=output_location,
+                fused_bagging=settings.archive_fused_bagging_enabled,
+                checksum_workers=settings.bagit_checksum_workers,
+                checksum_cache_path=(
+                    Path(settings.bagit_checksum_cache_path).expanduser()
+                    if settings.bagit_checksum_cache_path
+                    else None
+                ),
             )
 
             # Build chunked tar archive package for upload.
-            settings = get_settings()
             archive_parts_dir = output_location / "archive_parts"
+            archive_codec = submission.archive_codec or settings.archive_codec
             log_event(
                 logging.INFO,
                 "crate.package.chunked_tar.start",
@@ -431,19 +1171,117 @@ def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,to
                 drive_name=drive_name,
                 archive_parts_dir=str(archive_parts_dir),
                 chunk_size_bytes=settings.archive_chunk_size_bytes,
+                codec=archive_codec.value,
+                compression_level=settings.archive_compression_level,
+                compression_workers=settings.archive_compression_workers,
+                pipelined_upload=settings.archive_pipelined_upload_enabled,
+                streaming_upload=settings.archive_streaming_upload_enabled,
+                verification_mode=settings.archive_verification_mode,
+                part_layout=settings.archive_part_layout.value,
                 stage=submission.stage.value,
                 retry_count=submission.retry_count,
                 elapsed_ms=elapsed_ms(started_at),
             )
-            chunk_result = build_chunked_tar_archive(
-                source_dir=drive_path,
-                output_dir=archive_parts_dir,
-                base_name=str(drive_name),
-                part_size_bytes=settings.archive_chunk_size_bytes,
-                manifest_file_name=settings.archive_chunk_manifest_file_name,
+            # A streamed upload restarted under a new prefix resumes there.
+            object_prefix = submission.archive_object_prefix or f"{drive_name}/"
+            archive_options: dict[str, Any] = {
+                "source_dir": drive_path,
+                "output_dir": archive_parts_dir,
+                "base_name": str(drive_name),
+                "part_size_bytes": settings.archive_chunk_size_bytes,
+                "manifest_file_name": settings.archive_chunk_manifest_file_name,
+                "compression_workers": settings.archive_compression_workers,
+                "codec": archive_codec,
+                "compression_level": settings.archive_compression_level,
+                "part_layout": settings.archive_part_layout,
+            }
+            # Parts uploaded during packaging are gone before a post-packaging
+            # check could re-read them, so they are always verified inline.
+            uploads_during_packaging = (
+                settings.archive_streaming_upload_enabled or settings.archive_pipelined_upload_enabled
             )
+            if settings.archive_verification_mode == "inline" or uploads_during_packaging:
+                archive_options["verify_inline"] = True
+            if settings.archive_member_index_enabled:
+                if settings.archive_part_layout == ArchivePartLayout.INDEPENDENT:
+                    archive_options["member_index_file_name"] = MEMBER_INDEX_FILE_NAME
+                else:
+                    log_event(
+                        logging.WARNING,
+                        "crate.package.member_index.skipped",
+                        submission_id=submission_id,
+                        drive_name=drive_name,
+                        reason="member index requires the independent part layout",
+                        part_layout=settings.archive_part_layout.value,
+                    )
+            if settings.archive_fused_bagging_enabled:
+                archive_options["add_members"] = partial(
+                    add_bag_to_tar,
+                    bag_info=_build_bag_info(project_data, submission),
+                )
+
+            # In streaming and pipelined modes parts are uploaded as soon as
+            # they are sealed, so upload overlaps compression.  Streaming mode
+            # never writes part data to local disk; pipelined mode removes each
+            # part file once it is stored.
+            pipelined_upload: tuple[bool, list[str]] | None = None
+            retain_until: datetime | None = None
+            if uploads_during_packaging:
+                retain_until = _compute_retain_until(settings, submission)
+                # The part count is only known once packaging finishes.
+                part_metadata = _build_archive_object_metadata(
+                    project_data=project_data,
+                    members_list=members_list,
+                    submission=submission,
+                    archive_part_count=None,
+                )
+                with get_activescale_client_context() as client:
+                    if settings.archive_streaming_upload_enabled:
+                        chunk_result, object_prefix, pipelined_upload = _stream_archive_parts(
+                            session=session,
+                            submission=submission,
+                            client=client,
+                            bucket_name=settings.activescale_bucket_name,
+                            object_prefix=object_prefix,
+                            chunk_size_bytes=settings.archive_stream_upload_chunk_size_bytes,
+                            metadata=part_metadata,
+                            retain_until=retain_until,
+                            archive_options=archive_options,
+                        )
+                    else:
+                        uploader = _PipelinedPartUploader(
+                            session=session,
+                            submission=submission,
+                            client=client,
+                            bucket_name=settings.activescale_bucket_name,
+                            object_prefix=object_prefix,
+                            archive_parts_dir=archive_parts_dir,
+                            timeout_seconds=settings.activescale_upload_timeout,
+                            max_pending_parts=settings.archive_pipeline_max_pending_parts,
+                            metadata=part_metadata,
+                            retain_until=retain_until,
+                            send_checksums=settings.activescale_upload_checksums_enabled,
+                            resumable=settings.activescale_resumable_part_uploads_enabled,
+                        )
+                        try:
+                            chunk_result = build_chunked_tar_archive(
+                                **archive_options,
+                                on_part_finalized=uploader.submit,
+                            )
+                        except BaseException:
+                            uploader.abort()
+                            raise
+                        pipelined_upload = uploader.finish()
+            else:
+                chunk_result = build_chunked_tar_archive(**archive_options)
+
+            if settings.archive_fused_bagging_enabled:
+                create_manifests_directory(
+                    drive_path=drive_path,
+                    output_location=output_location,
+                    drive_name=str(drive_name),
+                )
 
-            object_prefix = f"{drive_name}/"
             submission.archive_part_count = len(chunk_result.parts)
             submission.archive_total_bytes = chunk_result.total_bytes
             submission.archive_object_prefix = object_prefix
@@ -467,25 +1305,38 @@ def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,to
                 elapsed_ms=elapsed_ms(started_at),
             )
 
-            log_event(
-                logging.INFO,
-                "crate.package.tar_verify.start",
-                submission_id=submission_id,
-                drive_name=drive_name,
-                part_count=len(chunk_result.parts),
-                elapsed_ms=elapsed_ms(started_at),
-            )
-            verify_tar_parts_stream(
-                parts=chunk_result.parts,
-                parts_dir=archive_parts_dir,
-            )
-            log_event(
-                logging.INFO,
-                "crate.package.tar_verify.completed",
-                submission_id=submission_id,
-                drive_name=drive_name,
-                elapsed_ms=elapsed_ms(started_at),
-            )
+            if chunk_result.verified_member_count is not None:
+                log_event(
+                    logging.INFO,
+                    "crate.package.tar_verify.completed",
+                    submission_id=submission_id,
+                    drive_name=drive_name,
+                    mode="inline",
+                    member_count=chunk_result.verified_member_count,
+                    elapsed_ms=elapsed_ms(started_at),
+                )
+            else:
+                log_event(
+                    logging.INFO,
+                    "crate.package.tar_verify.start",
+                    submission_id=submission_id,
+                    drive_name=drive_name,
+                    part_count=len(chunk_result.parts),
+                    elapsed_ms=elapsed_ms(started_at),
+                )
+                verify_tar_parts_stream(
+                    parts=chunk_result.parts,
+                    parts_dir=archive_parts_dir,
+                    codec=archive_codec,
+                    workers=settings.archive_verify_workers,
+                )
+                log_event(
+                    logging.INFO,
+                    "crate.package.tar_verify.completed",
+                    submission_id=submission_id,
+                    drive_name=drive_name,
+                    elapsed_ms=elapsed_ms(started_at),
+                )
 
             # Transition: packaging → uploading
             previous_stage = submission.stage
@@ -517,23 +1368,6 @@ def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,to
                 elapsed_ms=elapsed_ms(started_at),
             )
 
-            # Compute the object retention date once for all objects in this job.
-            retain_until: datetime | None = None
-            if settings.activescale_enable_object_retention:
-                now_utc = datetime.now(tz=UTC)
-                if settings.activescale_retention_override_days is not None:
-                    retain_until = now_utc + timedelta(days=settings.activescale_retention_override_days)
-                else:
-                    retention_years = submission.retention_period_years or settings.activescale_default_retention_years
-                    retain_until = calculate_retention_end_datetime(now_utc, retention_years)
-                log_event(
-                    logging.INFO,
-                    "crate.upload.retention.computed",
-                    submission_id=submission_id,
-                    drive_name=drive_name,
-                    retain_until=retain_until.isoformat(),
-                )
-
             with get_activescale_client_context() as client:
                 bucket_name = settings.activescale_bucket_name
                 archive_metadata = _build_archive_object_metadata(
@@ -543,18 +1377,27 @@ def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,to
                     archive_part_count=len(chunk_result.parts),
                 )
 
-                upload_success, uploaded_part_keys = _upload_chunked_archive_parts(
-                    session=session,
-                    submission=submission,
-                    client=client,
-                    bucket_name=bucket_name,
-                    object_prefix=object_prefix,
-                    archive_parts_dir=archive_parts_dir,
-                    archive_parts=chunk_result.parts,
-                    timeout_seconds=settings.activescale_upload_timeout,
-                    metadata=archive_metadata,
-                    retain_until=retain_until,
-                )
+                if pipelined_upload is not None:
+                    # Parts were already uploaded while packaging ran.
+                    upload_success, uploaded_part_keys = pipelined_upload
+                else:
+                    # Compute the object retention date once for all objects in this job.
+                    retain_until = _compute_retain_until(settings, submission)
+                    upload_success, uploaded_part_keys = _upload_chunked_archive_parts(
+                        session=session,
+                        submission=submission,
+                        client=client,
+                        bucket_name=bucket_name,
+                        object_prefix=object_prefix,
+                        archive_parts_dir=archive_parts_dir,
+                        archive_parts=chunk_result.parts,
+                        timeout_seconds=settings.activescale_upload_timeout,
+                        metadata=archive_metadata,
+                        retain_until=retain_until,
+                        concurrency=settings.activescale_upload_concurrency,
+                        send_checksums=settings.activescale_upload_checksums_enabled,
+                        resumable=settings.activescale_resumable_part_uploads_enabled,
+                    )
 
                 if upload_success:
                     # Transition: uploading -> writing_manifest
@@ -576,14 +1419,44 @@ def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,to
                         elapsed_ms=elapsed_ms(started_at),
                     )
 
+                    _abort_orphaned_part_uploads(session, submission, client, bucket_name)
+
+                    if settings.activescale_upload_checksums_enabled:
+                        record_part_checksums(chunk_result.manifest_path, chunk_result.parts)
+
+                    # The member index goes first so a stored manifest never
+                    # references an index that is missing.
+                    if chunk_result.member_index_path is not None:
+                        index_key = f"{object_prefix}{chunk_result.member_index_path.name}"
+                        upload_success = upload_file(
+                            client,
+                            bucket_name,
+                            index_key,
+                            file_path=str(chunk_result.member_index_path),
+                            timeout=settings.activescale_upload_timeout,
+                            metadata=archive_metadata,
+                            retain_until=retain_until,
+                        )
+                        if upload_success and retain_until is not None:
+                            if not _protect_object(client, bucket_name, index_key, retain_until):
+                                log_event(
+                                    logging.ERROR,
+                                    "crate.upload.member_index.retention_failed",
+                                    submission_id=submission_id,
+                                    drive_name=drive_name,
+                                    file_key=index_key,
+                                )
+                                upload_success = False
+
                     file_key = f"{object_prefix}{chunk_result.manifest_path.name}"
-                    upload_success = upload_file(
+                    upload_success = upload_success and upload_file(
                         client,
                         bucket_name,
                         file_key,
                         file_path=str(chunk_result.manifest_path),
                         timeout=settings.activescale_upload_timeout,
                         metadata=archive_metadata,
+                        retain_until=retain_until,
                     )
                     submission.archive_manifest_key = file_key
                     submission.archive_part_keys_json = json.dumps(uploaded_part_keys)
@@ -591,7 +1464,7 @@ def generate_ro_crate(  # pylint: disable=too-many-locals,too-many-statements,to
                     session.commit()
 
                     if upload_success and retain_until is not None:
-                        if not set_object_retention(client, bucket_name, file_key, retain_until):
+                        if not _protect_object(client, bucket_name, file_key, retain_until):
                             log_event(
                                 logging.ERROR,
                                 "crate.upload.manifest.retention_failed",
@@ -2,12 +2,35 @@
 
 from __future__ import annotations
 
+import base64
+import hashlib
+import threading
 from datetime import UTC, datetime
+from pathlib import Path
 from unittest.mock import MagicMock
 
+import pytest
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import BotoCoreError, ClientError, EndpointConnectionError
 
-from service.activescale import set_object_retention, verify_uploaded_part_size
+from service.activescale import (
+    StoredObject,
+    abort_multipart_upload,
+    complete_multipart_upload,
+    confirm_object_lock,
+    create_multipart_upload,
+    download_file_to_disk,
+    get_object_checksum_sha256,
+    inline_object_lock_available,
+    list_multipart_upload_parts,
+    list_object_inventory,
+    set_object_retention,
+    sha256_hex_to_base64,
+    upload_file,
+    upload_file_with_checksum,
+    upload_multipart_part,
+    verify_uploaded_part_size,
+)
 
 
 def _make_client_error(code: str) -> ClientError:
@@ -66,6 +89,30 @@ class TestVerifyUploadedPartSize:
         assert verify_uploaded_part_size(client, "bucket", "key/empty", 0) is True
 
 
+class TestListObjectInventory:
+    def test_collects_every_page_under_the_prefix(self) -> None:
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "drive/part-00001", "Size": 10, "ETag": '"a"'}]},
+            {"Contents": [{"Key": "drive/part-00002", "Size": 7, "ETag": '"b"'}]},
+            {},
+        ]
+
+        inventory = list_object_inventory(client, "bucket", "drive/")
+
+        client.get_paginator.assert_called_once_with("list_objects_v2")
+        client.get_paginator.return_value.paginate.assert_called_once_with(Bucket="bucket", Prefix="drive/")
+        assert inventory == {
+            "drive/part-00001": StoredObject(size=10, etag='"a"'),
+            "drive/part-00002": StoredObject(size=7, etag='"b"'),
+        }
+
+    def test_returns_none_on_client_error(self) -> None:
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.side_effect = _make_client_error("AccessDenied")
+        assert list_object_inventory(client, "bucket", "drive/") is None
+
+
 class TestSetObjectRetention:
     _RETAIN_UNTIL = datetime(2032, 1, 1, tzinfo=UTC)
 
@@ -116,3 +163,291 @@ class TestSetObjectRetention:
         client.put_object_retention.side_effect = BotoCoreError()
 
         assert set_object_retention(client, "bucket", "key/part-00001", self._RETAIN_UNTIL) is False
+
+
+class TestMultipartHelpers:
+    def test_create_returns_upload_id(self) -> None:
+        client = MagicMock()
+        client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+
+        assert create_multipart_upload(client, "bucket", "key/part-00001", metadata={"a": "b"}) == "upload-1"
+        _, kwargs = client.create_multipart_upload.call_args
+        assert kwargs["Metadata"] == {"a": "b"}
+        assert "ChecksumAlgorithm" not in kwargs
+
+    def test_create_sets_checksum_algorithm(self) -> None:
+        client = MagicMock()
+        client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+
+        assert create_multipart_upload(client, "bucket", "key", checksum_algorithm="SHA256") == "upload-1"
+        assert client.create_multipart_upload.call_args.kwargs["ChecksumAlgorithm"] == "SHA256"
+
+    def test_create_returns_none_on_client_error(self) -> None:
+        client = MagicMock()
+        client.create_multipart_upload.side_effect = _make_client_error("AccessDenied")
+
+        assert create_multipart_upload(client, "bucket", "key/part-00001") is None
+
+    def test_upload_part_returns_etag_or_none(self) -> None:
+        client = MagicMock()
+        client.upload_part.return_value = {"ETag": '"abc"'}
+        assert upload_multipart_part(client, "bucket", "key", "upload-1", 1, b"data") == '"abc"'
+
+        client.upload_part.side_effect = EndpointConnectionError(endpoint_url="https://example.com")
+        assert upload_multipart_part(client, "bucket", "key", "upload-1", 2, b"data") is None
+
+    def test_list_parts_returns_none_for_missing_upload(self) -> None:
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.side_effect = _make_client_error("NoSuchUpload")
+
+        assert list_multipart_upload_parts(client, "bucket", "key", "upload-1") is None
+
+    def test_list_parts_maps_part_numbers_to_etags(self) -> None:
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.return_value = [
+            {"Parts": [{"PartNumber": 1, "ETag": '"a"'}]},
+            {"Parts": [{"PartNumber": 2, "ETag": '"b"'}]},
+        ]
+
+        assert list_multipart_upload_parts(client, "bucket", "key", "upload-1") == {1: '"a"', 2: '"b"'}
+
+    def test_complete_sends_parts_in_order(self) -> None:
+        client = MagicMock()
+        client.complete_multipart_upload.return_value = {}
+
+        assert complete_multipart_upload(client, "bucket", "key", "upload-1", {2: '"b"', 1: '"a"'}) == (True, None)
+        _, kwargs = client.complete_multipart_upload.call_args
+        assert kwargs["MultipartUpload"]["Parts"] == [
+            {"PartNumber": 1, "ETag": '"a"'},
+            {"PartNumber": 2, "ETag": '"b"'},
+        ]
+
+    def test_complete_sends_part_checksums_and_returns_object_checksum(self) -> None:
+        client = MagicMock()
+        client.complete_multipart_upload.return_value = {"ChecksumSHA256": "Y29tcG9zaXRl-2"}
+
+        result = complete_multipart_upload(
+            client, "bucket", "key", "upload-1", {1: '"a"', 2: '"b"'}, {1: "c1", 2: "c2"}
+        )
+
+        assert result == (True, "Y29tcG9zaXRl-2")
+        assert client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"] == [
+            {"PartNumber": 1, "ETag": '"a"', "ChecksumSHA256": "c1"},
+            {"PartNumber": 2, "ETag": '"b"', "ChecksumSHA256": "c2"},
+        ]
+
+    def test_abort_treats_missing_upload_as_success(self) -> None:
+        client = MagicMock()
+        client.abort_multipart_upload.side_effect = _make_client_error("NoSuchUpload")
+
+        assert abort_multipart_upload(client, "bucket", "key", "upload-1") is True
+
+
+class _FakeTransferManager:
+    """Stands in for boto3's transfer manager; the transfer ends when *finish* is set."""
+
+    def __init__(self, config: TransferConfig, finish: threading.Event) -> None:
+        self.config = config
+        self.finish = finish
+        self.cancelled = False
+        self.shut_down = False
+        self.future = MagicMock()
+        self.future.cancel.side_effect = self._cancel
+
+    def _cancel(self) -> None:
+        self.cancelled = True
+        self.finish.set()
+
+    def upload(self, _fileobj, _bucket, _key, extra_args=None, subscribers=None):
+        del extra_args
+
+        def run() -> None:
+            self.finish.wait()
+            for subscriber in subscribers or []:
+                subscriber.on_done(future=self.future)
+
+        threading.Thread(target=run, daemon=True).start()
+        return self.future
+
+    def __enter__(self) -> _FakeTransferManager:
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.shut_down = True
+
+
+class TestTransferConfig:
+    def test_upload_file_passes_transfer_config(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        source = tmp_path / "part.bin"
+        source.write_bytes(b"x" * 1024)
+        finished = threading.Event()
+        finished.set()
+        managers: list[_FakeTransferManager] = []
+
+        def fake_create_transfer_manager(_client, config: TransferConfig) -> _FakeTransferManager:
+            managers.append(_FakeTransferManager(config, finished))
+            return managers[-1]
+
+        monkeypatch.setattr("service.activescale.create_transfer_manager", fake_create_transfer_manager)
+
+        assert upload_file(MagicMock(), "bucket", "key/part.bin", str(source)) is True
+        config = managers[0].config
+        assert isinstance(config, TransferConfig)
+        assert config.max_concurrency >= 1
+        managers[0].future.result.assert_called_once()
+
+    def test_stalled_upload_is_cancelled_before_returning(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("service.activescale._STALL_POLL_SECONDS", 0.01)
+        source = tmp_path / "part.bin"
+        source.write_bytes(b"x" * 1024)
+        managers: list[_FakeTransferManager] = []
+
+        def fake_create_transfer_manager(_client, config: TransferConfig) -> _FakeTransferManager:
+            managers.append(_FakeTransferManager(config, threading.Event()))
+            return managers[-1]
+
+        monkeypatch.setattr("service.activescale.create_transfer_manager", fake_create_transfer_manager)
+
+        assert upload_file(MagicMock(), "bucket", "key/part.bin", str(source), timeout=0.05) is False
+        assert managers[0].cancelled
+        # The manager is shut down, waiting for the cancelled transfer, before the call returns.
+        assert managers[0].shut_down
+
+    def test_small_download_is_a_single_conditional_get(self, tmp_path: Path) -> None:
+        dest = tmp_path / "part.bin"
+        client = MagicMock()
+        client.head_object.return_value = {"ContentLength": 4, "ETag": '"abc"'}
+        client.get_object.return_value = {"Body": MagicMock(iter_chunks=MagicMock(return_value=[b"da", b"ta"]))}
+
+        assert download_file_to_disk(client, "bucket", "key/part.bin", dest) == hashlib.sha256(b"data").hexdigest()
+        assert dest.read_bytes() == b"data"
+        client.get_object.assert_called_once_with(
+            Bucket="bucket", Key="key/part.bin", Range="bytes=0-3", IfMatch='"abc"'
+        )
+
+
+class TestUploadFileWithChecksum:
+    _SHA256 = hashlib.sha256(b"part").hexdigest()
+
+    def test_sends_checksum_and_returns_server_confirmation(self, tmp_path: Path) -> None:
+        source = tmp_path / "part.bin"
+        source.write_bytes(b"part")
+        checksum = sha256_hex_to_base64(self._SHA256)
+        assert checksum == base64.b64encode(hashlib.sha256(b"part").digest()).decode()
+        client = MagicMock()
+        client.put_object.return_value = {"ChecksumSHA256": checksum}
+
+        assert upload_file_with_checksum(client, "bucket", "key", str(source), self._SHA256) == (True, checksum)
+        assert client.put_object.call_args.kwargs["ChecksumSHA256"] == checksum
+
+    def test_unconfirmed_upload_succeeds_without_checksum(self, tmp_path: Path) -> None:
+        source = tmp_path / "part.bin"
+        source.write_bytes(b"part")
+        client = MagicMock()
+        client.put_object.return_value = {}
+
+        assert upload_file_with_checksum(client, "bucket", "key", str(source), self._SHA256) == (True, None)
+
+    def test_bad_digest_fails(self, tmp_path: Path) -> None:
+        source = tmp_path / "part.bin"
+        source.write_bytes(b"part")
+        client = MagicMock()
+        client.put_object.side_effect = _make_client_error("BadDigest")
+
+        assert upload_file_with_checksum(client, "bucket", "key", str(source), self._SHA256) == (False, None)
+
+    def test_stalled_upload_is_abandoned_and_its_body_closed(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("service.activescale._STALL_POLL_SECONDS", 0.01)
+        source = tmp_path / "part.bin"
+        source.write_bytes(b"part")
+        release = threading.Event()
+        late_reads: list[str] = []
+
+        def stalled_put_object(**kwargs):
+            release.wait()
+            try:
+                kwargs["Body"].read()
+            except ValueError as e:
+                late_reads.append(str(e))
+            return {}
+
+        client = MagicMock()
+        client.put_object.side_effect = stalled_put_object
+
+        result = upload_file_with_checksum(client, "bucket", "key", str(source), self._SHA256, timeout=0.05)
+        release.set()
+
+        assert result == (False, None)
+        for thread in threading.enumerate():
+            if thread.name.startswith("checksum-upload"):
+                thread.join()
+        # The abandoned request cannot send the rest of the file.
+        assert late_reads == ["I/O operation on closed file"]
+
+
+class TestGetObjectChecksumSha256:
+    def test_returns_full_object_checksum(self) -> None:
+        client = MagicMock()
+        client.head_object.return_value = {"ChecksumSHA256": "abc="}
+
+        assert get_object_checksum_sha256(client, "bucket", "key") == "abc="
+        client.head_object.assert_called_once_with(Bucket="bucket", Key="key", ChecksumMode="ENABLED")
+
+    @pytest.mark.parametrize("response", [{}, {"ChecksumSHA256": "abc=-3"}])
+    def test_ignores_missing_and_composite_checksums(self, response: dict[str, str]) -> None:
+        client = MagicMock()
+        client.head_object.return_value = response
+
+        assert get_object_checksum_sha256(client, "bucket", "key") is None
+
+    def test_client_error_returns_none(self) -> None:
+        client = MagicMock()
+        client.head_object.side_effect = _make_client_error("403")
+
+        assert get_object_checksum_sha256(client, "bucket", "key") is None
+
+
+class TestInlineObjectLock:
+    _RETAIN_UNTIL = datetime(2032, 1, 1, tzinfo=UTC)
+
+    @pytest.fixture(autouse=True)
+    def _reset_support(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("service.activescale._inline_object_lock_supported", None)
+
+    def test_multipart_upload_is_created_locked(self) -> None:
+        client = MagicMock()
+        client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+
+        assert create_multipart_upload(client, "bucket", "key", retain_until=self._RETAIN_UNTIL) == "upload-1"
+        kwargs = client.create_multipart_upload.call_args.kwargs
+        assert kwargs["ObjectLockMode"] == "COMPLIANCE"
+        assert kwargs["ObjectLockRetainUntilDate"] == self._RETAIN_UNTIL
+
+    def test_rejected_lock_headers_fall_back_for_the_process(self) -> None:
+        client = MagicMock()
+        client.create_multipart_upload.side_effect = [_make_client_error("InvalidRequest"), {"UploadId": "upload-2"}]
+
+        assert create_multipart_upload(client, "bucket", "key", retain_until=self._RETAIN_UNTIL) == "upload-2"
+        assert "ObjectLockMode" not in client.create_multipart_upload.call_args.kwargs
+        assert inline_object_lock_available() is False
+
+    def test_first_locked_object_is_checked_once(self) -> None:
+        client = MagicMock()
+        client.head_object.return_value = {"ObjectLockRetainUntilDate": self._RETAIN_UNTIL}
+
+        assert confirm_object_lock(client, "bucket", "key-1", self._RETAIN_UNTIL) is True
+        assert confirm_object_lock(client, "bucket", "key-2", self._RETAIN_UNTIL) is True
+        client.head_object.assert_called_once()
+        client.put_object_retention.assert_not_called()
+
+    def test_ignored_lock_headers_fall_back_to_retention_call(self) -> None:
+        client = MagicMock()
+        client.head_object.return_value = {}
+
+        assert confirm_object_lock(client, "bucket", "key-1", self._RETAIN_UNTIL) is True
+        client.put_object_retention.assert_called_once()
+        assert inline_object_lock_available() is False
@@ -8,7 +8,11 @@ from pathlib import Path
 
 import pytest
 
-from packaging.archive_chunks import build_chunked_tar_archive, verify_tar_parts_stream
+from models.common import ArchiveCodec
+from packaging.archive_chunks import build_chunked_tar_archive, extract_tar_parts_stream, verify_tar_parts_stream
+from packaging.archive_codecs import codec_from_manifest, open_decompressed_reader
+from packaging.archive_reassembly import reassemble_archive_from_manifest
+from packaging.archive_verification import InlineTarVerifier
 
 
 def _write_file(path: Path, size: int) -> None:
@@ -146,3 +150,216 @@ def test_verify_tar_parts_stream_single_part(tmp_path: Path) -> None:
 
     assert len(result.parts) == 1
     verify_tar_parts_stream(parts=result.parts, parts_dir=output_dir)
+
+
+# ── parallel gzip compression ────────────────────────────────────────────────
+
+
+def test_parallel_compression_output_verifies_and_reassembles(tmp_path: Path) -> None:
+    source_dir = tmp_path / "source"
+    _write_file(source_dir / "a.txt", 300_000)
+    _write_file(source_dir / "nested" / "b.bin", 500_000)
+
+    output_dir = tmp_path / "output"
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=output_dir,
+        base_name="drive-archive",
+        part_size_bytes=200,
+        compression_workers=4,
+    )
+
+    assert len(result.parts) > 1
+    verify_tar_parts_stream(parts=result.parts, parts_dir=output_dir)
+
+    reassembled_tar = tmp_path / "reassembled.tar.gz"
+    reassemble_archive_from_manifest(
+        parts_dir=output_dir,
+        manifest_path=result.manifest_path,
+        output_tar_path=reassembled_tar,
+    )
+    with tarfile.open(reassembled_tar, "r:gz") as tar_obj:
+        names = tar_obj.getnames()
+        member = tar_obj.extractfile("source/nested/b.bin")
+        assert member is not None
+        assert member.read() == b"A" * 500_000
+
+    assert "source/a.txt" in names
+
+
+def test_extract_tar_parts_stream_extracts_and_deletes_consumed_parts(tmp_path: Path) -> None:
+    source_dir = tmp_path / "source"
+    _write_file(source_dir / "one.txt", 1500)
+    _write_file(source_dir / "nested" / "two.bin", 2600)
+
+    output_dir = tmp_path / "output"
+    result = build_chunked_tar_archive(
+        source_dir=source_dir, output_dir=output_dir, base_name="drive-archive", part_size_bytes=100
+    )
+    assert len(result.parts) > 1
+
+    dest = tmp_path / "restored"
+    extract_tar_parts_stream(result.parts, output_dir, dest, delete_consumed=True)
+
+    assert (dest / "source" / "one.txt").read_bytes() == b"A" * 1500
+    assert (dest / "source" / "nested" / "two.bin").read_bytes() == b"A" * 2600
+    assert not any((output_dir / part.file_name).exists() for part in result.parts)
+
+
+def test_extract_tar_parts_stream_rejects_part_with_wrong_checksum(tmp_path: Path) -> None:
+    source_dir = tmp_path / "source"
+    _write_file(source_dir / "one.txt", 3000)
+
+    output_dir = tmp_path / "output"
+    result = build_chunked_tar_archive(
+        source_dir=source_dir, output_dir=output_dir, base_name="drive-archive", part_size_bytes=100
+    )
+    result.parts[0].sha256 = "0" * 64
+
+    with pytest.raises(ValueError, match=f"Part checksum mismatch for {result.parts[0].file_name}"):
+        extract_tar_parts_stream(result.parts, output_dir, tmp_path / "restored")
+
+
+def test_on_part_finalized_receives_each_sealed_part_in_order(tmp_path: Path) -> None:
+    source_dir = tmp_path / "source"
+    _write_file(source_dir / "a.txt", 4000)
+
+    output_dir = tmp_path / "output"
+    seen: list[int] = []
+
+    def on_part_finalized(part) -> None:  # noqa: ANN001
+        # The part is complete on disk when handed off; the callback may consume it.
+        part_path = output_dir / part.file_name
+        assert part_path.stat().st_size == part.size_bytes
+        seen.append(part.index)
+        part_path.unlink()
+
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=output_dir,
+        base_name="drive-archive",
+        part_size_bytes=50,
+        on_part_finalized=on_part_finalized,
+    )
+
+    assert seen == [part.index for part in result.parts]
+    assert len(seen) > 1
+    assert not list(output_dir.glob("*.part-*"))
+
+
+# ── zstd codec ───────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_zstd_archive_records_codec_and_round_trips(tmp_path: Path, workers: int) -> None:
+    source_dir = tmp_path / "source"
+    _write_file(source_dir / "a.txt", 300_000)
+    _write_file(source_dir / "nested" / "b.bin", 200_000)
+
+    output_dir = tmp_path / "output"
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=output_dir,
+        base_name="drive-archive",
+        part_size_bytes=100,
+        compression_workers=workers,
+        codec=ArchiveCodec.ZSTD,
+        compression_level=5,
+    )
+
+    assert len(result.parts) > 1
+    assert all(".tar.zst.part-" in part.file_name for part in result.parts)
+    with open(result.manifest_path, encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    assert manifest["archive_format"] == "tar.zst"
+    assert manifest["compression"] == {"codec": "zstd", "level": 5, "workers": workers}
+    assert codec_from_manifest(manifest) == ArchiveCodec.ZSTD
+
+    verify_tar_parts_stream(parts=result.parts, parts_dir=output_dir, codec=ArchiveCodec.ZSTD)
+
+    reassembled = tmp_path / "reassembled.tar.zst"
+    reassemble_archive_from_manifest(
+        parts_dir=output_dir,
+        manifest_path=result.manifest_path,
+        output_tar_path=reassembled,
+    )
+    with open(reassembled, "rb") as raw, open_decompressed_reader(raw, ArchiveCodec.ZSTD) as stream:
+        with tarfile.open(fileobj=stream, mode="r|") as tar_obj:
+            names = [member.name for member in tar_obj]
+    assert "source/nested/b.bin" in names
+
+
+def test_verify_tar_parts_stream_raises_on_corrupt_zstd_part(tmp_path: Path) -> None:
+    source_dir = tmp_path / "source"
+    _write_file(source_dir / "a.txt", 2000)
+
+    output_dir = tmp_path / "output"
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=output_dir,
+        base_name="drive-archive",
+        part_size_bytes=40,
+        codec=ArchiveCodec.ZSTD,
+    )
+
+    last_part = output_dir / result.parts[-1].file_name
+    last_part.write_bytes(b"\xff" * last_part.stat().st_size)
+
+    with pytest.raises(tarfile.TarError):
+        verify_tar_parts_stream(parts=result.parts, parts_dir=output_dir, codec=ArchiveCodec.ZSTD)
+
+
+def test_codec_from_manifest_defaults_to_gzip_for_legacy_manifests() -> None:
+    assert codec_from_manifest({"parts": []}) == ArchiveCodec.GZIP
+    assert codec_from_manifest({"archive_format": "tar.gz", "parts": []}) == ArchiveCodec.GZIP
+    assert codec_from_manifest({"archive_format": "tar.zst", "parts": []}) == ArchiveCodec.ZSTD
+    with pytest.raises(ValueError, match="Unsupported archive format"):
+        codec_from_manifest({"archive_format": "tar.bz2", "parts": []})
+
+
+@pytest.mark.parametrize(
+    ("codec", "workers"),
+    [(ArchiveCodec.GZIP, 1), (ArchiveCodec.GZIP, 2), (ArchiveCodec.ZSTD, 1)],
+)
+def test_inline_verification_reports_member_count(tmp_path: Path, codec: ArchiveCodec, workers: int) -> None:
+    source_dir = tmp_path / "source"
+    _write_file(source_dir / "a.txt", 3000)
+    _write_file(source_dir / "nested" / "b.bin", 70_000)
+
+    output_dir = tmp_path / "output"
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=output_dir,
+        base_name="drive-archive",
+        part_size_bytes=500,
+        compression_workers=workers,
+        codec=codec,
+        verify_inline=True,
+    )
+
+    # Root dir, a.txt, nested/, nested/b.bin
+    assert result.verified_member_count == 4
+    verify_tar_parts_stream(parts=result.parts, parts_dir=output_dir, codec=codec)
+
+
+def test_inline_verifier_rejects_corrupt_stream_without_blocking_writer() -> None:
+    verifier = InlineTarVerifier(ArchiveCodec.GZIP, max_pending_chunks=2)
+    for _ in range(20):
+        verifier.feed(b"not a gzip stream" * 100)
+
+    with pytest.raises(tarfile.ReadError):
+        verifier.finish()
+
+
+def test_default_packaging_skips_inline_verification(tmp_path: Path) -> None:
+    source_dir = tmp_path / "source"
+    _write_file(source_dir / "a.txt", 100)
+
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=tmp_path / "output",
+        base_name="drive-archive",
+        part_size_bytes=1000,
+    )
+
+    assert result.verified_member_count is None
@@ -0,0 +1,187 @@
+"""Tests for disk-less archive packaging into S3 multipart uploads."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from botocore.exceptions import ClientError
+
+from packaging.archive_chunks import build_chunked_tar_archive
+from packaging.archive_streaming import (
+    MultipartUploadState,
+    StoredPartMismatchError,
+    stream_chunked_tar_archive_to_multipart,
+)
+
+
+class _FakeMultipartClient:
+    """In-memory stand-in for the multipart subset of the S3 API."""
+
+    def __init__(self, fail_after_uploads: int | None = None) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, tuple[str, dict[int, bytes]]] = {}
+        self.upload_part_calls = 0
+        self._fail_after_uploads = fail_after_uploads
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **_kwargs: Any) -> dict[str, str]:  # noqa: N803
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = (Key, {})
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes) -> dict[str, str]:  # noqa: N803
+        if self._fail_after_uploads is not None and self.upload_part_calls >= self._fail_after_uploads:
+            raise ClientError({"Error": {"Code": "InternalError", "Message": "boom"}}, "UploadPart")
+        self.upload_part_calls += 1
+        self.uploads[UploadId][1][PartNumber] = Body
+        return {"ETag": f'"{hashlib.md5(Body).hexdigest()}"'}
+
+    def get_paginator(self, _name: str) -> _FakeMultipartClient:
+        return self
+
+    def paginate(self, Bucket: str, Key: str, UploadId: str) -> list[dict[str, Any]]:  # noqa: N803
+        if UploadId not in self.uploads:
+            raise ClientError({"Error": {"Code": "NoSuchUpload", "Message": "gone"}}, "ListParts")
+        chunks = self.uploads[UploadId][1]
+        return [
+            {"Parts": [{"PartNumber": n, "ETag": f'"{hashlib.md5(b).hexdigest()}"'} for n, b in sorted(chunks.items())]}
+        ]
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict) -> None:  # noqa: N803
+        _, chunks = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(chunks[part["PartNumber"]] for part in MultipartUpload["Parts"])
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> None:  # noqa: N803
+        self.uploads.pop(UploadId, None)
+
+
+class _MemoryStateStore:
+    def __init__(self) -> None:
+        self.state: dict[str, Any] | None = None
+
+    def load(self) -> MultipartUploadState | None:
+        return MultipartUploadState.from_json_dict(self.state) if self.state else None
+
+    def save(self, state: MultipartUploadState) -> None:
+        self.state = state.to_json_dict()
+
+    def clear(self) -> None:
+        self.state = None
+
+
+@pytest.fixture(autouse=True)
+def _small_chunks(monkeypatch) -> None:
+    # Real S3 needs >= 5 MiB chunks; keep test data small.
+    monkeypatch.setattr("packaging.archive_streaming.MIN_MULTIPART_CHUNK_BYTES", 1)
+
+
+def _make_source(tmp_path: Path) -> Path:
+    source_dir = tmp_path / "source"
+    (source_dir / "nested").mkdir(parents=True)
+    (source_dir / "a.bin").write_bytes(os.urandom(6000))
+    (source_dir / "nested" / "b.bin").write_bytes(os.urandom(9000))
+    return source_dir
+
+
+def _stream(tmp_path: Path, source_dir: Path, client: _FakeMultipartClient, store: _MemoryStateStore, **kwargs: Any):
+    return stream_chunked_tar_archive_to_multipart(
+        source_dir=source_dir,
+        output_dir=tmp_path / "streamed",
+        base_name="drive-archive",
+        part_size_bytes=4096,
+        client=client,
+        bucket_name="bucket",
+        object_prefix="drive/",
+        chunk_size_bytes=1000,
+        state_store=store,
+        **kwargs,
+    )
+
+
+def test_streamed_parts_match_on_disk_packaging(tmp_path: Path) -> None:
+    source_dir = _make_source(tmp_path)
+    client = _FakeMultipartClient()
+
+    streamed = _stream(tmp_path, source_dir, client, _MemoryStateStore())
+    on_disk = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=tmp_path / "on_disk",
+        base_name="drive-archive",
+        part_size_bytes=4096,
+    )
+
+    assert len(streamed.parts) > 1
+    assert streamed.parts == on_disk.parts
+    assert streamed.manifest_path.read_text(encoding="utf-8") == on_disk.manifest_path.read_text(encoding="utf-8")
+    for part in on_disk.parts:
+        assert client.objects[f"drive/{part.file_name}"] == (tmp_path / "on_disk" / part.file_name).read_bytes()
+    assert not list((tmp_path / "streamed").glob("*.part-*"))
+    assert client.uploads == {}
+
+
+def test_streaming_resumes_from_persisted_upload_state(tmp_path: Path) -> None:
+    source_dir = _make_source(tmp_path)
+    store = _MemoryStateStore()
+    completed: dict[str, str] = {}
+
+    failing = _FakeMultipartClient(fail_after_uploads=7)
+    with pytest.raises(RuntimeError, match="Failed to upload chunk"):
+        _stream(
+            tmp_path,
+            source_dir,
+            failing,
+            store,
+            on_part_finalized=lambda part: completed.update({f"drive/{part.file_name}": part.sha256}),
+        )
+    assert completed
+    assert store.state is not None
+    assert store.state["parts"]
+
+    # Restart against the same server-side state.
+    failing._fail_after_uploads = None  # pylint: disable=protected-access
+    uploads_before = failing.upload_part_calls
+    result = _stream(tmp_path, source_dir, failing, store, completed_parts=completed)
+
+    total_chunks = sum(-(-part.size_bytes // 1000) for part in result.parts)
+    assert failing.upload_part_calls - uploads_before < total_chunks - len(completed)
+    assert store.state is None
+    for part in result.parts:
+        assert hashlib.sha256(failing.objects[f"drive/{part.file_name}"]).hexdigest() == part.sha256
+
+
+def test_streaming_resume_rejects_a_stored_part_that_no_longer_matches(tmp_path: Path) -> None:
+    source_dir = _make_source(tmp_path)
+    store = _MemoryStateStore()
+    completed: dict[str, str] = {}
+    client = _FakeMultipartClient(fail_after_uploads=7)
+    with pytest.raises(RuntimeError, match="Failed to upload chunk"):
+        _stream(
+            tmp_path,
+            source_dir,
+            client,
+            store,
+            on_part_finalized=lambda part: completed.update({f"drive/{part.file_name}": part.sha256}),
+        )
+    assert "drive/drive-archive.tar.gz.part-00001" in completed
+
+    # Regenerated metadata (like bag-info.txt) changes the first part's bytes.
+    (source_dir / "a.bin").write_bytes(os.urandom(6000))
+    client._fail_after_uploads = None  # pylint: disable=protected-access
+    stored = dict(client.objects)
+
+    with pytest.raises(StoredPartMismatchError) as excinfo:
+        _stream(tmp_path, source_dir, client, store, completed_parts=completed)
+
+    assert excinfo.value.object_key == "drive/drive-archive.tar.gz.part-00001"
+    assert client.objects == stored
+
+
+def test_streaming_rejects_chunk_sizes_outside_s3_limits(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("packaging.archive_streaming.MIN_MULTIPART_CHUNK_BYTES", 5 * 1024 * 1024)
+    source_dir = _make_source(tmp_path)
+
+    with pytest.raises(ValueError, match="chunk_size_bytes"):
+        _stream(tmp_path, source_dir, _FakeMultipartClient(), _MemoryStateStore())
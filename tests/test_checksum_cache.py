@@ -0,0 +1,81 @@
+"""Tests for the persistent checksum cache used when re-bagging a drive."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+import packaging.checksum_engine
+from packaging.checksum_cache import ChecksumCache
+from packaging.manifests import bag_directory, validate_bag
+
+BAG_INFO = {"project_id": "42", "drive_name": "drive01", "Bagging-Date": "2026-01-01"}
+
+
+@pytest.fixture(name="hashed_paths")
+def hashed_paths_fixture(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the files the checksum engine actually reads."""
+    hashed: list[str] = []
+    real_hash_file = packaging.checksum_engine.hash_file
+
+    def recording_hash_file(path: Path, *args: object, **kwargs: object) -> dict[str, str]:
+        hashed.append(path.name)
+        return real_hash_file(path, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(packaging.checksum_engine, "hash_file", recording_hash_file)
+    return hashed
+
+
+def test_rebagging_only_hashes_new_and_changed_files(tmp_path: Path, hashed_paths: list[str]) -> None:
+    drive = tmp_path / "drive01"
+    drive.mkdir()
+    for i in range(10):
+        (drive / f"file-{i}.bin").write_bytes(os.urandom(1000))
+    cache_path = tmp_path / "cache" / "checksums.db"
+
+    bag_directory(drive, bag_info=dict(BAG_INFO), workers=2, cache_path=cache_path)
+    first_manifest = (drive / "manifest-sha256.txt").read_bytes()
+    payload_hashed = [name for name in hashed_paths if name.startswith("file-")]
+    assert sorted(payload_hashed) == [f"file-{i}.bin" for i in range(10)]
+
+    hashed_paths.clear()
+    bag_directory(drive, bag_info=dict(BAG_INFO), workers=2, cache_path=cache_path)
+    assert (drive / "manifest-sha256.txt").read_bytes() == first_manifest
+    assert not [name for name in hashed_paths if name.startswith("file-")]
+
+    hashed_paths.clear()
+    (drive / "data" / "file-3.bin").write_bytes(os.urandom(1000))
+    (drive / "data" / "new.txt").write_text("new", encoding="utf-8")
+    bag_directory(drive, bag_info=dict(BAG_INFO), workers=2, cache_path=cache_path)
+    assert sorted(name for name in hashed_paths if name != "bagit.txt" and "-sha256" not in name) == [
+        "bag-info.txt",
+        "file-3.bin",
+        "new.txt",
+    ]
+    validate_bag(drive, workers=2)
+
+
+def test_cache_entry_is_invalidated_by_size_mtime_or_inode(tmp_path: Path) -> None:
+    target = tmp_path / "file.txt"
+    target.write_text("v1", encoding="utf-8")
+    stat = os.stat(target)
+
+    with ChecksumCache(tmp_path / "checksums.db") as cache:
+        cache.put(target, stat, {"sha256": "abc"})
+        assert cache.get(target, stat, ["sha256"]) == {"sha256": "abc"}
+        # Algorithms that were never computed are a miss.
+        assert cache.get(target, stat, ["sha256", "md5"]) is None
+
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert cache.get(target, os.stat(target), ["sha256"]) is None
+
+        replaced = tmp_path / "replacement.txt"
+        replaced.write_text("v1", encoding="utf-8")
+        os.utime(replaced, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(replaced, target)
+        assert cache.get(target, os.stat(target), ["sha256"]) is None
+
+    with ChecksumCache(tmp_path / "checksums.db") as cache:
+        assert cache.get(target, stat, ["sha256"]) == {"sha256": "abc"}
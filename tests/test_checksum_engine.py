@@ -0,0 +1,102 @@
+"""Tests for the threaded BagIt checksum engine."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import bagit
+import pytest
+
+from packaging.checksum_engine import map_in_threads
+from packaging.manifests import bag_directory, validate_bag
+
+TAG_FILES = ["bagit.txt", "bag-info.txt", "manifest-sha256.txt", "tagmanifest-sha256.txt"]
+BAG_INFO = {"project_id": "42", "drive_name": "drive01", "Bagging-Date": "2026-01-01"}
+
+
+def _write_tree(root: Path) -> None:
+    (root / "b-dir" / "nested").mkdir(parents=True)
+    (root / "a-dir").mkdir()
+    for i in range(20):
+        (root / f"file-{i:02d}.bin").write_bytes(os.urandom(1000 * i))
+    (root / "b-dir" / "nested" / "deep.txt").write_text("deep", encoding="utf-8")
+    (root / "a-dir" / "name with space.txt").write_text("space", encoding="utf-8")
+    (root / "z-last.txt").write_text("last", encoding="utf-8")
+
+
+def test_bag_directory_matches_bagit_make_bag(tmp_path: Path) -> None:
+    expected = tmp_path / "expected"
+    _write_tree(expected)
+    actual = tmp_path / "actual"
+    shutil.copytree(expected, actual)
+
+    bagit.make_bag(str(expected), bag_info=dict(BAG_INFO), checksums=["sha256"])
+    bag_directory(actual, bag_info=dict(BAG_INFO), workers=4)
+
+    for name in TAG_FILES:
+        assert (actual / name).read_bytes() == (expected / name).read_bytes(), name
+    validate_bag(actual, workers=4)
+
+
+def test_bag_directory_updates_existing_bag_like_bag_save(tmp_path: Path) -> None:
+    expected = tmp_path / "expected"
+    _write_tree(expected)
+    bagit.make_bag(str(expected), bag_info=dict(BAG_INFO), checksums=["sha256", "md5"])
+    actual = tmp_path / "actual"
+    shutil.copytree(expected, actual)
+    for bag_dir in (expected, actual):
+        (bag_dir / "data" / "added.txt").write_text("new", encoding="utf-8")
+
+    bag = bagit.Bag(str(expected))
+    bag.info = bag.info | {"project_id": "43"}
+    bag.save(manifests=True)
+    bag_directory(actual, bag_info={"project_id": "43"}, workers=3)
+
+    for name in [*TAG_FILES, "manifest-md5.txt", "tagmanifest-md5.txt"]:
+        assert (actual / name).read_bytes() == (expected / name).read_bytes(), name
+
+
+def test_validate_bag_reports_every_checksum_mismatch(tmp_path: Path) -> None:
+    bag_dir = tmp_path / "bag"
+    _write_tree(bag_dir)
+    bag_directory(bag_dir, bag_info=dict(BAG_INFO), workers=4)
+    (bag_dir / "data" / "file-03.bin").write_bytes(os.urandom(3000))
+    (bag_dir / "data" / "z-last.txt").write_text("LAST", encoding="utf-8")
+
+    with pytest.raises(bagit.BagValidationError) as exc_info:
+        validate_bag(bag_dir, workers=4)
+
+    assert sorted(d.path for d in exc_info.value.details) == ["data/file-03.bin", "data/z-last.txt"]
+
+
+def test_validate_bag_still_checks_completeness(tmp_path: Path) -> None:
+    bag_dir = tmp_path / "bag"
+    _write_tree(bag_dir)
+    bag_directory(bag_dir, bag_info=dict(BAG_INFO), workers=2)
+    (bag_dir / "data" / "file-05.bin").unlink()
+
+    with pytest.raises(bagit.BagValidationError):
+        validate_bag(bag_dir, workers=2)
+
+
+def test_map_in_threads_keeps_order_and_stops_on_error() -> None:
+    assert list(map_in_threads(lambda n: n * 2, range(100), workers=4)) == [n * 2 for n in range(100)]
+
+    started: list[int] = []
+    lock = threading.Lock()
+
+    def fail_on_ten(n: int) -> int:
+        with lock:
+            started.append(n)
+        if n == 10:
+            raise OSError("unreadable")
+        return n
+
+    with pytest.raises(OSError, match="unreadable"):
+        list(map_in_threads(fail_on_ten, range(10_000), workers=4))
+    # Only a bounded window of work was ever submitted, and the pool is gone.
+    assert len(started) < 100
+    assert not [t for t in threading.enumerate() if t.name.startswith("checksum")]
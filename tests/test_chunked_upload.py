@@ -3,16 +3,28 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 from datetime import UTC, datetime
 from pathlib import Path
 
-from sqlmodel import Session
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
 
 from models.common import DataClassification
-from models.submission import ArchiveSubmission
+from models.submission import ArchivePartUpload, ArchiveSubmission
 from packaging.archive_chunks import ArchivePartInfo
+from service.activescale import StoredObject, sha256_hex_to_base64
+from service.multipart_upload import MultipartUploadState
+from service.transfer_profile import TransferProfile
 from workers import parse_part_keys_json
-from workers.submission_worker import _upload_chunked_archive_parts
+from workers.submission_worker import (
+    _abort_orphaned_part_uploads,
+    _PartUploadStateStore,
+    _PipelinedPartUploader,
+    _upload_chunked_archive_parts,
+)
 
 
 def _create_submission(session: Session, drive_name: str) -> ArchiveSubmission:
@@ -56,14 +68,19 @@ def test_upload_chunked_parts_resumes_skipping_existing(
     second_key = f"{prefix}{second.name}"
 
     submission = _create_submission(session, drive_name="resmed202200024-testing")
-    submission.archive_part_keys_json = json.dumps([first_key])
+    submission.archive_part_keys_json = json.dumps([first_key, second_key])
     session.add(submission)
     session.commit()
 
     uploaded_keys: list[str] = []
 
-    def fake_exists(_client, _bucket: str, key: str):
-        return (key == first_key), None
+    def fake_inventory(_client, _bucket: str, listed_prefix: str) -> dict[str, StoredObject]:
+        assert listed_prefix == prefix
+        # The second part was stored truncated, so it is uploaded again.
+        return {
+            first_key: StoredObject(size=len(b"part1"), etag='"etag"'),
+            second_key: StoredObject(size=3, etag='"etag"'),
+        }
 
     def fake_upload(
         _client,
@@ -72,6 +89,7 @@ def test_upload_chunked_parts_resumes_skipping_existing(
         file_path: str,
         timeout: int,
         metadata: dict[str, str] | None = None,
+        retain_until: datetime | None = None,
     ):
         assert timeout == 60
         assert Path(file_path).exists()
@@ -79,7 +97,7 @@ def test_upload_chunked_parts_resumes_skipping_existing(
         uploaded_keys.append(key)
         return True
 
-    monkeypatch.setattr("workers.submission_worker.object_exists", fake_exists)
+    monkeypatch.setattr("workers.submission_worker.list_object_inventory", fake_inventory)
     monkeypatch.setattr("workers.submission_worker.upload_file", fake_upload)
     monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", lambda *_a, **_k: True)
 
@@ -99,8 +117,7 @@ def test_upload_chunked_parts_resumes_skipping_existing(
 
     assert success is True
     assert uploaded_keys == [second_key]
-    assert first_key in result_keys
-    assert second_key in result_keys
+    assert result_keys == [first_key, second_key]
 
 
 def test_upload_chunked_parts_stops_on_failure(
@@ -142,6 +159,47 @@ def test_upload_chunked_parts_stops_on_failure(
     assert expected_key not in result_keys
 
 
+def test_upload_chunked_parts_does_not_load_submission_on_worker_threads(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    parts = [_write_part(archive_parts_dir, index, b"part") for index in (1, 2)]
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+    loaded_on: list[str] = []
+
+    def record_refresh(*_args) -> None:
+        loaded_on.append(threading.current_thread().name)
+
+    def upload_while_main_thread_commits(*_args, **_kwargs) -> bool:
+        # A commit on the calling thread expires the instance mid-upload.
+        session.expire(submission)
+        return False
+
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file", upload_while_main_thread_commits)
+    event.listen(ArchiveSubmission, "refresh", record_refresh)
+    try:
+        success, _ = _upload_chunked_archive_parts(
+            session=session,
+            submission=submission,
+            client=object(),
+            bucket_name="bucket",
+            object_prefix="drive/",
+            archive_parts_dir=archive_parts_dir,
+            archive_parts=parts,
+            timeout_seconds=60,
+            concurrency=2,
+        )
+    finally:
+        event.remove(ArchiveSubmission, "refresh", record_refresh)
+
+    assert success is False
+    assert all(name == threading.current_thread().name for name in loaded_on)
+
+
 def test_upload_chunked_parts_fails_on_size_mismatch(
     tmp_path: Path,
     session: Session,
@@ -232,7 +290,7 @@ def test_upload_chunked_parts_sets_retention_when_provided(
     session: Session,
     monkeypatch,
 ) -> None:
-    """When retain_until is supplied, set_object_retention is called for each part."""
+    """Where uploads cannot carry retention, set_object_retention is called for each part."""
     from datetime import datetime
 
     archive_parts_dir = tmp_path / "parts"
@@ -256,6 +314,7 @@ def test_upload_chunked_parts_sets_retention_when_provided(
     monkeypatch.setattr("workers.submission_worker.upload_file", lambda *_a, **_k: True)
     monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", lambda *_a, **_k: True)
     monkeypatch.setattr("workers.submission_worker.set_object_retention", capture_retention)
+    monkeypatch.setattr("workers.submission_worker.inline_object_lock_available", lambda: False)
 
     success, _ = _upload_chunked_archive_parts(
         session=session,
@@ -304,6 +363,7 @@ def test_upload_chunked_parts_fails_on_retention_error(
     monkeypatch.setattr("workers.submission_worker.upload_file", lambda *_a, **_k: True)
     monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", lambda *_a, **_k: True)
     monkeypatch.setattr("workers.submission_worker.set_object_retention", lambda *_a, **_k: False)
+    monkeypatch.setattr("workers.submission_worker.inline_object_lock_available", lambda: False)
 
     success, result_keys = _upload_chunked_archive_parts(
         session=session,
@@ -329,3 +389,476 @@ def test_upload_chunked_parts_fails_on_retention_error(
     # it should still be recorded as uploaded so a retry skips re-uploading it
     # but the job overall is failed.
     assert part_key in result_keys
+
+
+def test_upload_chunked_parts_sends_retention_with_upload(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    """Where uploads carry retention, parts are only confirmed, not retention-set again."""
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    parts = [_write_part(archive_parts_dir, index, f"part{index}".encode()) for index in range(1, 4)]
+    retain_until = datetime(2032, 6, 1, tzinfo=UTC)
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+
+    sent_retention: list[datetime | None] = []
+    confirmed: list[str] = []
+
+    def fake_upload(_client, _bucket: str, _key: str, **kwargs) -> bool:
+        sent_retention.append(kwargs["retain_until"])
+        return True
+
+    def fake_confirm(_client, _bucket: str, key: str, date: datetime) -> bool:
+        assert date == retain_until
+        confirmed.append(key)
+        return True
+
+    def unexpected_retention_call(*_a, **_k) -> bool:
+        raise AssertionError("PutObjectRetention should not be needed")
+
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file", fake_upload)
+    monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", lambda *_a, **_k: True)
+    monkeypatch.setattr("workers.submission_worker.inline_object_lock_available", lambda: True)
+    monkeypatch.setattr("workers.submission_worker.confirm_object_lock", fake_confirm)
+    monkeypatch.setattr("workers.submission_worker.set_object_retention", unexpected_retention_call)
+
+    success, _ = _upload_chunked_archive_parts(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        archive_parts=parts,
+        timeout_seconds=60,
+        retain_until=retain_until,
+    )
+
+    assert success is True
+    assert sent_retention == [retain_until] * 3
+    assert sorted(confirmed) == [f"drive/{p.file_name}" for p in parts]
+
+
+# ── concurrent uploads ───────────────────────────────────────────────────────
+
+
+def test_upload_chunked_parts_concurrently_persists_every_part(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    parts = [_write_part(archive_parts_dir, index, f"part{index}".encode()) for index in range(1, 9)]
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def fake_upload(_client, _bucket: str, key: str, **_kwargs) -> bool:
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        # Earlier parts take longer, so parts finish out of order.
+        time.sleep(0.005 * (10 - int(key[-5:])))
+        with lock:
+            active -= 1
+        return True
+
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file", fake_upload)
+    monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", lambda *_a, **_k: True)
+
+    success, result_keys = _upload_chunked_archive_parts(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        archive_parts=parts,
+        timeout_seconds=60,
+        concurrency=3,
+    )
+
+    assert success is True
+    assert 1 < max_active <= 3
+    expected_keys = [f"drive/{part.file_name}" for part in parts]
+    assert result_keys == expected_keys
+    session.refresh(submission)
+    assert parse_part_keys_json(submission.archive_part_keys_json) == expected_keys
+
+
+def test_upload_chunked_parts_concurrently_stops_starting_parts_after_failure(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    parts = [_write_part(archive_parts_dir, index, f"part{index}".encode()) for index in range(1, 7)]
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+    started: list[str] = []
+
+    def fake_upload(_client, _bucket: str, key: str, **_kwargs) -> bool:
+        started.append(key)
+        if key.endswith("part-00001"):
+            return False
+        # Still in flight when the first part fails.
+        time.sleep(0.2)
+        return True
+
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file", fake_upload)
+    monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", lambda *_a, **_k: True)
+
+    success, result_keys = _upload_chunked_archive_parts(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        archive_parts=parts,
+        timeout_seconds=60,
+        concurrency=2,
+    )
+
+    assert success is False
+    assert sorted(started) == ["drive/drive.tar.gz.part-00001", "drive/drive.tar.gz.part-00002"]
+    # The part that was in flight finished and is recorded, so a retry skips it.
+    assert result_keys == ["drive/drive.tar.gz.part-00002"]
+    session.refresh(submission)
+    assert parse_part_keys_json(submission.archive_part_keys_json) == result_keys
+
+
+# ── pipelined uploads ────────────────────────────────────────────────────────
+
+
+def _write_part(parts_dir: Path, index: int, data: bytes) -> ArchivePartInfo:
+    part = ArchivePartInfo(index=index, file_name=f"drive.tar.gz.part-{index:05d}", size_bytes=len(data), sha256="x")
+    (parts_dir / part.file_name).write_bytes(data)
+    return part
+
+
+def test_pipelined_uploader_uploads_in_order_and_deletes_parts(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+
+    uploaded: list[str] = []
+
+    def fake_upload(
+        _client, _bucket: str, key: str, file_path: str, timeout: int, metadata=None, retain_until=None
+    ) -> bool:
+        assert Path(file_path).exists()
+        assert metadata == {"archive_part_count": "Unknown"}
+        uploaded.append(key)
+        return True
+
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file", fake_upload)
+    monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", lambda *_a, **_k: True)
+
+    uploader = _PipelinedPartUploader(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        timeout_seconds=60,
+        max_pending_parts=1,
+        metadata={"archive_part_count": "Unknown"},
+    )
+    parts = [_write_part(archive_parts_dir, index, b"part%d" % index) for index in range(1, 5)]
+    for part in parts:
+        uploader.submit(part)
+    success, result_keys = uploader.finish()
+
+    expected_keys = [f"drive/{part.file_name}" for part in parts]
+    assert success is True
+    assert uploaded == expected_keys
+    assert result_keys == expected_keys
+    assert parse_part_keys_json(submission.archive_part_keys_json) == expected_keys
+    assert list(archive_parts_dir.iterdir()) == []
+
+
+def test_pipelined_uploader_reports_failure_and_rejects_later_parts(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file", lambda *_a, **_k: False)
+
+    uploader = _PipelinedPartUploader(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        timeout_seconds=60,
+        max_pending_parts=1,
+    )
+    first = _write_part(archive_parts_dir, 1, b"part1")
+    uploader.submit(first)
+    success, result_keys = uploader.finish()
+
+    assert success is False
+    assert result_keys == []
+    # The failed part is left on disk for the job's cleanup step.
+    assert (archive_parts_dir / first.file_name).exists()
+    with pytest.raises(RuntimeError, match="upload failed"):
+        uploader.submit(_write_part(archive_parts_dir, 2, b"part2"))
+
+
+def test_pipelined_uploader_does_not_load_submission_on_uploader_thread(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+    loaded_on: list[str] = []
+
+    def record_refresh(*_args) -> None:
+        loaded_on.append(threading.current_thread().name)
+
+    def upload_while_packaging_commits(*_args, **_kwargs) -> bool:
+        # Packaging commits on the calling thread, expiring the instance mid-upload.
+        session.expire(submission)
+        return True
+
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file", upload_while_packaging_commits)
+    monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", lambda *_a, **_k: True)
+    monkeypatch.setattr("workers.submission_worker._protect_object", lambda *_a, **_k: True)
+    uploader = _PipelinedPartUploader(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        timeout_seconds=60,
+        max_pending_parts=1,
+        retain_until=datetime(2030, 1, 1, tzinfo=UTC),
+    )
+    event.listen(ArchiveSubmission, "refresh", record_refresh)
+    try:
+        uploader.submit(_write_part(archive_parts_dir, 1, b"part1"))
+        success, result_keys = uploader.finish()
+    finally:
+        event.remove(ArchiveSubmission, "refresh", record_refresh)
+
+    assert success is True
+    assert result_keys == ["drive/drive.tar.gz.part-00001"]
+    assert "archive-part-uploader" not in loaded_on
+
+
+def test_upload_chunked_parts_skips_size_check_when_server_confirms_checksum(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    parts = []
+    for index in (1, 2):
+        part_file = archive_parts_dir / f"drive.tar.gz.part-{index:05d}"
+        part_file.write_bytes(b"part")
+        parts.append(ArchivePartInfo(index=index, file_name=part_file.name, size_bytes=4, sha256=f"{index:064x}"))
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+
+    sent_checksums: list[str] = []
+    size_checked: list[str] = []
+
+    def fake_checksum_upload(
+        _client, _bucket: str, key: str, file_path: str, sha256_hex: str, metadata=None, retain_until=None, timeout=300
+    ):
+        del file_path, metadata, retain_until
+        assert timeout == 60
+        sent_checksums.append(sha256_hex)
+        # The server confirms the first part only.
+        return True, ("confirmed==" if key.endswith("00001") else None)
+
+    def capture_size_check(_client, _bucket: str, key: str, _expected_size: int) -> bool:
+        size_checked.append(key)
+        return True
+
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file_with_checksum", fake_checksum_upload)
+    monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", capture_size_check)
+
+    success, _ = _upload_chunked_archive_parts(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        archive_parts=parts,
+        timeout_seconds=60,
+        send_checksums=True,
+    )
+
+    assert success is True
+    assert sent_checksums == [f"{1:064x}", f"{2:064x}"]
+    assert size_checked == ["drive/drive.tar.gz.part-00002"]
+    assert [p.s3_checksum_sha256 for p in parts] == ["confirmed==", None]
+
+
+def test_upload_chunked_parts_skips_size_check_when_multipart_checksum_confirmed(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    parts = [_write_part(archive_parts_dir, index, b"part") for index in (1, 2)]
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+    size_checked: list[str] = []
+
+    def fake_resumable(_client, _bucket: str, key: str, _path: Path, **kwargs):
+        assert kwargs["send_checksums"] is True
+        # Only the first part's upload was created with checksums.
+        return True, ("composite==-1" if key.endswith("00001") else None)
+
+    def capture_size_check(_client, _bucket: str, key: str, _expected_size: int) -> bool:
+        size_checked.append(key)
+        return True
+
+    monkeypatch.setattr(
+        "workers.submission_worker.get_transfer_profile",
+        lambda *_a: TransferProfile(
+            multipart_threshold_bytes=1, multipart_chunk_size_bytes=1, max_concurrency=1, max_pool_connections=1
+        ),
+    )
+    monkeypatch.setattr("workers.submission_worker.object_exists", lambda *_a, **_k: (False, None))
+    monkeypatch.setattr("workers.submission_worker.upload_file_resumable", fake_resumable)
+    monkeypatch.setattr("workers.submission_worker.verify_uploaded_part_size", capture_size_check)
+
+    success, _ = _upload_chunked_archive_parts(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        archive_parts=parts,
+        timeout_seconds=60,
+        send_checksums=True,
+        resumable=True,
+    )
+
+    assert success is True
+    assert size_checked == ["drive/drive.tar.gz.part-00002"]
+    # A composite checksum is not the part's SHA-256, so none is recorded.
+    assert [p.s3_checksum_sha256 for p in parts] == [None, None]
+
+
+def test_part_upload_state_is_persisted_per_part_and_orphans_aborted(session: Session, monkeypatch) -> None:
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+    bind = session.get_bind()
+    first = _PartUploadStateStore(bind, submission.id, "drive/part-00001")
+    second = _PartUploadStateStore(bind, submission.id, "drive/part-00002")
+
+    assert first.load() is None
+    first.save(MultipartUploadState(object_key="drive/part-00001", upload_id="u1", part_etags={1: '"a"'}))
+    first.save(MultipartUploadState(object_key="drive/part-00001", upload_id="u1", part_etags={1: '"a"', 2: '"b"'}))
+    second.save(
+        MultipartUploadState(
+            object_key="drive/part-00002",
+            upload_id="u2",
+            part_etags={1: '"c"'},
+            checksum_algorithm="SHA256",
+            part_checksums={1: "c1=="},
+        )
+    )
+    assert first.load() == MultipartUploadState(
+        object_key="drive/part-00001", upload_id="u1", part_etags={1: '"a"', 2: '"b"'}
+    )
+    assert second.load() == MultipartUploadState(
+        object_key="drive/part-00002",
+        upload_id="u2",
+        part_etags={1: '"c"'},
+        checksum_algorithm="SHA256",
+        part_checksums={1: "c1=="},
+    )
+
+    # The first part completes; the second is left behind.
+    first.clear()
+    aborted: list[tuple[str, str]] = []
+
+    def fake_abort(_client, _bucket: str, key: str, upload_id: str) -> bool:
+        aborted.append((key, upload_id))
+        return True
+
+    monkeypatch.setattr("workers.submission_worker.abort_multipart_upload", fake_abort)
+    _abort_orphaned_part_uploads(session, submission, object(), "bucket")
+
+    assert aborted == [("drive/part-00002", "u2")]
+    assert session.exec(select(ArchivePartUpload)).all() == []
+
+
+def test_upload_chunked_parts_keeps_checksums_of_parts_skipped_on_resume(
+    tmp_path: Path,
+    session: Session,
+    monkeypatch,
+) -> None:
+    archive_parts_dir = tmp_path / "parts"
+    archive_parts_dir.mkdir(parents=True, exist_ok=True)
+    parts = [_write_part(archive_parts_dir, index, b"part") for index in (1, 2, 3)]
+    for part in parts:
+        part.sha256 = f"{part.index:064x}"
+    stored = {f"drive/{part.file_name}": part for part in parts[:2]}
+    submission = _create_submission(session, drive_name="resmed202200024-testing")
+    submission.archive_part_keys_json = json.dumps(list(stored))
+    session.add(submission)
+    session.commit()
+
+    def fake_checksum(_client, _bucket: str, key: str) -> str:
+        # The second stored object is not the part that was packaged this time.
+        return sha256_hex_to_base64(stored[key].sha256 if key.endswith("00001") else "f" * 64)
+
+    monkeypatch.setattr(
+        "workers.submission_worker.list_object_inventory",
+        lambda *_a: {key: StoredObject(size=4, etag='"etag"') for key in stored},
+    )
+    monkeypatch.setattr("workers.submission_worker.get_object_checksum_sha256", fake_checksum)
+    monkeypatch.setattr(
+        "workers.submission_worker.upload_file_with_checksum",
+        lambda *_a, **_k: (True, "confirmed=="),
+    )
+
+    success, result_keys = _upload_chunked_archive_parts(
+        session=session,
+        submission=submission,
+        client=object(),
+        bucket_name="bucket",
+        object_prefix="drive/",
+        archive_parts_dir=archive_parts_dir,
+        archive_parts=parts,
+        timeout_seconds=60,
+        send_checksums=True,
+    )
+
+    assert success is True
+    assert result_keys == [f"drive/{part.file_name}" for part in parts]
+    assert [p.s3_checksum_sha256 for p in parts] == [sha256_hex_to_base64(f"{1:064x}"), None, "confirmed=="]
@@ -12,9 +12,11 @@ from typing import Any
 from sqlalchemy.engine import Engine
 from sqlmodel import Session
 
-from models.common import DataClassification
+from models.common import ArchiveCodec, ArchivePartLayout, DataClassification
 from models.submission import ArchiveJobStage, ArchiveSubmission
-from workers.submission_worker import generate_ro_crate
+from packaging.archive_verification import InlineTarVerifier
+from service.activescale import StoredObject
+from workers.submission_worker import _stream_archive_parts, generate_ro_crate
 
 
 class _ProjectDbStub:
@@ -95,7 +97,24 @@ def test_generate_ro_crate_chunked_success_and_manifest_integrity(
     settings = SimpleNamespace(
         archive_chunk_size_bytes=1024,
         archive_chunk_manifest_file_name="archive-manifest.json",
+        archive_codec=ArchiveCodec.GZIP,
+        archive_compression_level=None,
+        archive_compression_workers=1,
+        archive_pipelined_upload_enabled=False,
+        archive_pipeline_max_pending_parts=2,
+        archive_streaming_upload_enabled=False,
+        archive_stream_upload_chunk_size_bytes=5 * 1024 * 1024,
+        archive_fused_bagging_enabled=False,
+        archive_verification_mode="post",
+        archive_part_layout=ArchivePartLayout.STREAM,
+        archive_verify_workers=1,
+        archive_member_index_enabled=False,
+        bagit_checksum_workers=2,
+        bagit_checksum_cache_path=None,
         activescale_upload_timeout=60,
+        activescale_upload_concurrency=2,
+        activescale_upload_checksums_enabled=False,
+        activescale_resumable_part_uploads_enabled=False,
         activescale_bucket_name="research-archive-test",
         activescale_enable_object_retention=False,
         activescale_default_retention_years=6,
@@ -126,6 +145,7 @@ def test_generate_ro_crate_chunked_success_and_manifest_integrity(
         file_path: str,
         timeout: int,
         metadata=None,
+        retain_until=None,
     ) -> bool:
         upload_calls.append(
             {
@@ -244,7 +264,24 @@ def test_generate_ro_crate_resumes_after_interrupted_part_upload(
     settings = SimpleNamespace(
         archive_chunk_size_bytes=100,  # small enough to produce multiple parts after gzip
         archive_chunk_manifest_file_name="archive-manifest.json",
+        archive_codec=ArchiveCodec.GZIP,
+        archive_compression_level=None,
+        archive_compression_workers=1,
+        archive_pipelined_upload_enabled=False,
+        archive_pipeline_max_pending_parts=2,
+        archive_streaming_upload_enabled=False,
+        archive_stream_upload_chunk_size_bytes=5 * 1024 * 1024,
+        archive_fused_bagging_enabled=False,
+        archive_verification_mode="post",
+        archive_part_layout=ArchivePartLayout.STREAM,
+        archive_verify_workers=1,
+        archive_member_index_enabled=False,
+        bagit_checksum_workers=2,
+        bagit_checksum_cache_path=None,
         activescale_upload_timeout=60,
+        activescale_upload_concurrency=1,
+        activescale_upload_checksums_enabled=False,
+        activescale_resumable_part_uploads_enabled=False,
         activescale_bucket_name="research-archive-test",
         activescale_enable_object_retention=False,
         activescale_default_retention_years=6,
@@ -266,7 +303,7 @@ def test_generate_ro_crate_resumes_after_interrupted_part_upload(
 
     monkeypatch.setattr("workers.submission_worker.notify_job_result", fake_notify_job_result)
 
-    first_run_uploaded: set[str] = set()
+    first_run_uploaded: dict[str, int] = {}
 
     def fail_on_second_part(
         _client,
@@ -275,6 +312,7 @@ def test_generate_ro_crate_resumes_after_interrupted_part_upload(
         file_path: str,
         timeout: int,
         metadata=None,
+        retain_until=None,
     ) -> bool:
         if key.endswith("archive-manifest.json"):
             return True
@@ -282,7 +320,7 @@ def test_generate_ro_crate_resumes_after_interrupted_part_upload(
         part_index = int(str(key).split("part-")[-1])
         if part_index == 2:
             return False
-        first_run_uploaded.add(key)
+        first_run_uploaded[key] = Path(file_path).stat().st_size
         return True
 
     monkeypatch.setattr("workers.submission_worker.upload_file", fail_on_second_part)
@@ -341,6 +379,7 @@ def test_generate_ro_crate_resumes_after_interrupted_part_upload(
         file_path: str,
         timeout: int,
         metadata=None,
+        retain_until=None,
     ) -> bool:
         second_run_uploaded.append(key)
         return True
@@ -351,10 +390,14 @@ def test_generate_ro_crate_resumes_after_interrupted_part_upload(
         lambda *_args, **_kwargs: True,
     )
 
-    def exists_if_previously_uploaded(_client, _bucket: str, key: str):
-        return (key in first_run_uploaded), None
+    def list_previously_uploaded(_client, _bucket: str, prefix: str) -> dict[str, StoredObject]:
+        return {
+            key: StoredObject(size=size, etag='"etag"')
+            for key, size in first_run_uploaded.items()
+            if key.startswith(prefix)
+        }
 
-    monkeypatch.setattr("workers.submission_worker.object_exists", exists_if_previously_uploaded)
+    monkeypatch.setattr("workers.submission_worker.list_object_inventory", list_previously_uploaded)
 
     generate_ro_crate(
         drive={"id": 1, "name": drive_name},
@@ -385,3 +428,291 @@ def test_generate_ro_crate_resumes_after_interrupted_part_upload(
             "archive_manifest_key": f"{drive_name}/archive-manifest.json",
         },
     }
+
+
+def test_generate_ro_crate_pipelined_upload_streams_parts(
+    tmp_path: Path,
+    monkeypatch,
+    test_engine: Engine,
+) -> None:
+    drive_name = "resint000000003-testing"
+    drive_path = tmp_path / drive_name
+    drive_path.mkdir(parents=True, exist_ok=True)
+    (drive_path / "a.bin").write_bytes(bytes(range(256)) * 40)
+    (drive_path / "b.bin").write_bytes(bytes(range(255, -1, -1)) * 40)
+
+    output_path = tmp_path / "output"
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    submission_id = _create_submission(test_engine, drive_name)
+
+    monkeypatch.setattr("workers.submission_worker.engine", test_engine)
+    monkeypatch.setattr(
+        "workers.submission_worker.resolve_drive_path_for_archive",
+        lambda _name: drive_path,
+    )
+    monkeypatch.setattr(
+        "workers.submission_worker.resolve_archive_output_location",
+        lambda _name: output_path,
+    )
+    monkeypatch.setattr(
+        "workers.submission_worker._cleanup_job_artifacts",
+        lambda *_args, **_kwargs: (True, None),
+    )
+    monkeypatch.setattr("workers.submission_worker.build_crate_contents", lambda **_kwargs: None)
+
+    settings = SimpleNamespace(
+        archive_chunk_size_bytes=512,
+        archive_chunk_manifest_file_name="archive-manifest.json",
+        archive_codec=ArchiveCodec.GZIP,
+        archive_compression_level=None,
+        archive_compression_workers=1,
+        archive_pipelined_upload_enabled=True,
+        archive_pipeline_max_pending_parts=1,
+        archive_streaming_upload_enabled=False,
+        archive_stream_upload_chunk_size_bytes=5 * 1024 * 1024,
+        archive_fused_bagging_enabled=False,
+        archive_verification_mode="post",
+        archive_part_layout=ArchivePartLayout.STREAM,
+        archive_verify_workers=1,
+        archive_member_index_enabled=False,
+        bagit_checksum_workers=2,
+        bagit_checksum_cache_path=None,
+        activescale_upload_timeout=60,
+        activescale_upload_concurrency=2,
+        activescale_upload_checksums_enabled=False,
+        activescale_resumable_part_uploads_enabled=False,
+        activescale_bucket_name="research-archive-test",
+        activescale_enable_object_retention=False,
+        activescale_default_retention_years=6,
+        activescale_retention_override_days=None,
+    )
+    monkeypatch.setattr("workers.submission_worker.get_settings", lambda: settings)
+
+    @contextmanager
+    def fake_client_context():
+        yield object()
+
+    monkeypatch.setattr("workers.submission_worker.get_activescale_client_context", fake_client_context)
+    monkeypatch.setattr("workers.submission_worker.notify_job_result", lambda **_kwargs: True)
+
+    upload_calls: list[dict[str, Any]] = []
+
+    def fake_upload(
+        _client,
+        _bucket: str,
+        key: str,
+        file_path: str,
+        timeout: int,
+        metadata=None,
+        retain_until=None,
+    ) -> bool:
+        # Scratch never holds more than the queued part plus the part being written.
+        assert len(list(Path(file_path).parent.glob("*.part-*"))) <= 2
+        upload_calls.append({"key": key, "file_path": file_path, "metadata": metadata})
+        return True
+
+    monkeypatch.setattr("workers.submission_worker.upload_file", fake_upload)
+    monkeypatch.setattr(
+        "workers.submission_worker.object_exists",
+        lambda *_args, **_kwargs: (False, None),
+    )
+    monkeypatch.setattr(
+        "workers.submission_worker.verify_uploaded_part_size",
+        lambda *_args, **_kwargs: True,
+    )
+    # Parts are gone before a post-packaging check could read them, so the
+    # archive is verified inline even though "post" is configured.
+    verified_member_counts: list[int] = []
+
+    class RecordingVerifier(InlineTarVerifier):
+        def finish(self) -> int:
+            verified_member_counts.append(super().finish())
+            return verified_member_counts[-1]
+
+    monkeypatch.setattr("packaging.archive_chunks.InlineTarVerifier", RecordingVerifier)
+
+    generate_ro_crate(
+        drive={"id": 1, "name": drive_name},
+        submission_id=submission_id,
+        projectdb_client=_ProjectDbStub(),
+    )
+
+    assert len(verified_member_counts) == 1
+    assert verified_member_counts[0] > 0
+    with Session(test_engine) as session:
+        submission = session.get(ArchiveSubmission, submission_id)
+        assert submission is not None
+        assert submission.stage == ArchiveJobStage.COMPLETED
+        assert submission.archive_part_count is not None
+        assert submission.archive_part_count > 1
+        part_keys = json.loads(submission.archive_part_keys_json or "[]")
+        assert len(part_keys) == submission.archive_part_count
+
+    part_uploads = [call for call in upload_calls if "archive-manifest.json" not in call["key"]]
+    assert [call["key"] for call in part_uploads] == part_keys
+    assert all(call["metadata"]["archive_part_count"] == "Unknown" for call in part_uploads)
+    assert not list((output_path / "archive_parts").glob("*.part-*"))
+
+    manifest_upload = upload_calls[-1]
+    assert manifest_upload["key"].endswith("archive-manifest.json")
+    assert manifest_upload["metadata"]["archive_part_count"] == str(submission.archive_part_count)
+
+
+class _FakeMultipartClient:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self._uploads: dict[str, dict[int, bytes]] = {}
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **_kwargs: Any) -> dict[str, str]:  # noqa: N803
+        upload_id = f"upload-{len(self._uploads) + 1}"
+        self._uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes) -> dict[str, str]:  # noqa: N803
+        self._uploads[UploadId][PartNumber] = Body
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict) -> None:  # noqa: N803
+        chunks = self._uploads.pop(UploadId)
+        self.objects[Key] = b"".join(chunks[part["PartNumber"]] for part in MultipartUpload["Parts"])
+
+
+def test_generate_ro_crate_streaming_upload_writes_no_parts_locally(
+    tmp_path: Path,
+    monkeypatch,
+    test_engine: Engine,
+) -> None:
+    drive_name = "resint000000004-testing"
+    drive_path = tmp_path / drive_name
+    drive_path.mkdir(parents=True, exist_ok=True)
+    (drive_path / "a.bin").write_bytes(bytes(range(256)) * 40)
+
+    output_path = tmp_path / "output"
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    submission_id = _create_submission(test_engine, drive_name)
+
+    monkeypatch.setattr("workers.submission_worker.engine", test_engine)
+    monkeypatch.setattr("workers.submission_worker.resolve_drive_path_for_archive", lambda _name: drive_path)
+    monkeypatch.setattr("workers.submission_worker.resolve_archive_output_location", lambda _name: output_path)
+    monkeypatch.setattr("workers.submission_worker._cleanup_job_artifacts", lambda *_args, **_kwargs: (True, None))
+    monkeypatch.setattr("workers.submission_worker.build_crate_contents", lambda **_kwargs: None)
+    monkeypatch.setattr("workers.submission_worker.notify_job_result", lambda **_kwargs: True)
+    monkeypatch.setattr("packaging.archive_streaming.MIN_MULTIPART_CHUNK_BYTES", 1)
+
+    settings = SimpleNamespace(
+        archive_chunk_size_bytes=512,
+        archive_chunk_manifest_file_name="archive-manifest.json",
+        archive_codec=ArchiveCodec.GZIP,
+        archive_compression_level=None,
+        archive_compression_workers=1,
+        archive_pipelined_upload_enabled=False,
+        archive_pipeline_max_pending_parts=2,
+        archive_streaming_upload_enabled=True,
+        archive_stream_upload_chunk_size_bytes=200,
+        archive_fused_bagging_enabled=False,
+        archive_verification_mode="post",
+        archive_part_layout=ArchivePartLayout.STREAM,
+        archive_verify_workers=1,
+        archive_member_index_enabled=False,
+        bagit_checksum_workers=2,
+        bagit_checksum_cache_path=None,
+        activescale_upload_timeout=60,
+        activescale_upload_concurrency=2,
+        activescale_upload_checksums_enabled=False,
+        activescale_resumable_part_uploads_enabled=False,
+        activescale_bucket_name="research-archive-test",
+        activescale_enable_object_retention=False,
+        activescale_default_retention_years=6,
+        activescale_retention_override_days=None,
+    )
+    monkeypatch.setattr("workers.submission_worker.get_settings", lambda: settings)
+
+    client = _FakeMultipartClient()
+
+    @contextmanager
+    def fake_client_context():
+        yield client
+
+    monkeypatch.setattr("workers.submission_worker.get_activescale_client_context", fake_client_context)
+
+    manifest_uploads: list[str] = []
+
+    def fake_upload(
+        _client, _bucket: str, key: str, file_path: str, timeout: int, metadata=None, retain_until=None
+    ) -> bool:
+        manifest_uploads.append(key)
+        return True
+
+    monkeypatch.setattr("workers.submission_worker.upload_file", fake_upload)
+
+    generate_ro_crate(
+        drive={"id": 1, "name": drive_name},
+        submission_id=submission_id,
+        projectdb_client=_ProjectDbStub(),
+    )
+
+    with Session(test_engine) as session:
+        submission = session.get(ArchiveSubmission, submission_id)
+        assert submission is not None
+        assert submission.stage == ArchiveJobStage.COMPLETED
+        assert submission.archive_multipart_upload_json is None
+        part_keys = json.loads(submission.archive_part_keys_json or "[]")
+        assert submission.archive_part_count == len(part_keys) > 1
+
+    assert sorted(client.objects) == sorted(part_keys)
+    assert manifest_uploads == [f"{drive_name}/archive-manifest.json"]
+    assert not list((output_path / "archive_parts").glob("*.part-*"))
+    manifest = json.loads((output_path / "archive_parts" / "archive-manifest.json").read_text(encoding="utf-8"))
+    assert [part["size_bytes"] for part in manifest["parts"]] == [len(client.objects[key]) for key in part_keys]
+
+
+def test_streamed_resume_restarts_under_a_new_prefix_when_a_stored_part_differs(
+    tmp_path: Path,
+    monkeypatch,
+    session: Session,
+    submission: ArchiveSubmission,
+) -> None:
+    monkeypatch.setattr("packaging.archive_streaming.MIN_MULTIPART_CHUNK_BYTES", 1)
+    drive_path = tmp_path / submission.drive_name
+    drive_path.mkdir()
+    (drive_path / "bag-info.txt").write_text("Bagging-Date: 2026-01-02\n", encoding="utf-8")
+    (drive_path / "a.bin").write_bytes(bytes(range(256)) * 40)
+    old_prefix = f"{submission.drive_name}/"
+    stored_key = f"{old_prefix}{submission.drive_name}.tar.gz.part-00001"
+    # An earlier run stored the first part, packaged with different bag metadata.
+    submission.archive_part_keys_json = json.dumps([stored_key])
+    submission.archive_part_sha256_json = json.dumps({stored_key: "0" * 64})
+    session.add(submission)
+    session.commit()
+    monkeypatch.setattr(
+        "workers.submission_worker._find_stored_parts", lambda _client, _bucket, _prefix, keys: dict.fromkeys(keys)
+    )
+    client = _FakeMultipartClient()
+
+    chunk_result, object_prefix, (uploaded, part_keys) = _stream_archive_parts(
+        session=session,
+        submission=submission,
+        client=client,
+        bucket_name="research-archive-test",
+        object_prefix=old_prefix,
+        chunk_size_bytes=200,
+        metadata={},
+        retain_until=None,
+        archive_options={
+            "source_dir": drive_path,
+            "output_dir": tmp_path / "archive_parts",
+            "base_name": submission.drive_name,
+            "part_size_bytes": 512,
+        },
+    )
+
+    assert uploaded
+    assert object_prefix.startswith(f"{old_prefix}restart-")
+    assert submission.archive_object_prefix == object_prefix
+    assert part_keys == [f"{object_prefix}{part.file_name}" for part in chunk_result.parts]
+    assert sorted(client.objects) == sorted(part_keys)
+    assert json.loads(submission.archive_part_sha256_json or "{}") == {
+        f"{object_prefix}{part.file_name}": part.sha256 for part in chunk_result.parts
+    }
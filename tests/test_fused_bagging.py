@@ -0,0 +1,98 @@
+"""Tests for single-pass BagIt checksumming during tar packaging."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tarfile
+from functools import partial
+from pathlib import Path
+
+import bagit
+
+from packaging.archive_chunks import build_chunked_tar_archive
+from packaging.archive_reassembly import reassemble_archive_from_manifest
+from packaging.fused_bagging import add_bag_to_tar
+from packaging.manifests import bag_directory, prepare_bag_layout
+
+TAG_FILES = ["bagit.txt", "bag-info.txt", "manifest-sha256.txt", "tagmanifest-sha256.txt"]
+BAG_INFO = {"project_id": "42", "drive_name": "drive01", "Bagging-Date": "2026-01-01"}
+
+
+def _write_drive(root: Path) -> None:
+    (root / "nested" / "deeper").mkdir(parents=True)
+    (root / "z-last.txt").write_bytes(b"z" * 700)
+    (root / "a-first.txt").write_bytes(b"a" * 1200)
+    (root / "nested" / "b.bin").write_bytes(os.urandom(5000))
+    (root / "nested" / "deeper" / "c.bin").write_bytes(b"")
+    (root / "nested" / "line\nbreak.txt").write_bytes(b"odd name")
+    (root / "ro-crate-metadata.json").write_text("{}", encoding="utf-8")
+
+
+def _fused_package(drive: Path, output_dir: Path) -> None:
+    prepare_bag_layout(drive)
+    build_chunked_tar_archive(
+        source_dir=drive,
+        output_dir=output_dir,
+        base_name=drive.name,
+        part_size_bytes=1000,
+        add_members=partial(add_bag_to_tar, bag_info=BAG_INFO),
+    )
+
+
+def test_fused_bagging_matches_bag_directory(tmp_path: Path) -> None:
+    expected = tmp_path / "expected" / "drive01"
+    fused = tmp_path / "fused" / "drive01"
+    _write_drive(expected)
+    shutil.copytree(expected, fused)
+
+    bag_directory(expected, bag_info=dict(BAG_INFO))
+    _fused_package(fused, tmp_path / "parts")
+
+    for name in TAG_FILES:
+        assert (fused / name).read_bytes() == (expected / name).read_bytes(), name
+    bagit.Bag(str(fused)).validate()
+
+
+def test_fused_bagging_updates_existing_bag_like_bag_directory(tmp_path: Path) -> None:
+    expected = tmp_path / "expected" / "drive01"
+    _write_drive(expected)
+    bag_directory(expected, bag_info=dict(BAG_INFO))
+    (expected / "data" / "added.txt").write_bytes(b"new payload")
+    fused = tmp_path / "fused" / "drive01"
+    shutil.copytree(expected, fused)
+
+    bag_directory(expected, bag_info={"project_id": "43"})
+    prepare_bag_layout(fused)
+    build_chunked_tar_archive(
+        source_dir=fused,
+        output_dir=tmp_path / "parts",
+        base_name="drive01",
+        part_size_bytes=1000,
+        add_members=partial(add_bag_to_tar, bag_info={"project_id": "43"}),
+    )
+
+    for name in TAG_FILES:
+        assert (fused / name).read_bytes() == (expected / name).read_bytes(), name
+
+
+def test_fused_archive_extracts_to_valid_bag(tmp_path: Path) -> None:
+    drive = tmp_path / "drive01"
+    _write_drive(drive)
+    output_dir = tmp_path / "parts"
+    _fused_package(drive, output_dir)
+
+    archive_path = reassemble_archive_from_manifest(
+        parts_dir=output_dir,
+        manifest_path=output_dir / "archive-manifest.json",
+        output_tar_path=tmp_path / "drive01.tar.gz",
+    )
+    restore_dir = tmp_path / "restore"
+    with tarfile.open(archive_path, "r:gz") as tar:
+        names = tar.getnames()
+        tar.extractall(restore_dir, filter="data")
+
+    # Regenerated tag files are appended once the payload has been hashed.
+    assert names[-3:] == ["drive01/bag-info.txt", "drive01/manifest-sha256.txt", "drive01/tagmanifest-sha256.txt"]
+    assert len(names) == len(set(names))
+    bagit.Bag(str(restore_dir / "drive01")).validate()
@@ -0,0 +1,95 @@
+"""Tests for the independent (self-contained) archive part layout."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from models.common import ArchiveCodec, ArchivePartLayout
+from packaging.archive_chunks import ArchivePartInfo, build_chunked_tar_archive, verify_tar_parts_stream
+from packaging.archive_reassembly import reassemble_archive_from_manifest
+from packaging.independent_parts import extract_independent_tar_parts, verify_independent_tar_parts
+
+
+def _write_tree(root: Path) -> None:
+    (root / "nested" / "deeper").mkdir(parents=True)
+    for i in range(12):
+        (root / f"file-{i:02d}.bin").write_bytes(os.urandom(2000 * i))
+    # Larger than a part, so its data spans several parts.
+    (root / "nested" / "large.bin").write_bytes(os.urandom(250_000))
+    (root / "nested" / "deeper" / "small.txt").write_text("hello", encoding="utf-8")
+
+
+def _build(tmp_path: Path, codec: ArchiveCodec = ArchiveCodec.GZIP) -> tuple[Path, Path, list[ArchivePartInfo]]:
+    source_dir = tmp_path / "drive01"
+    _write_tree(source_dir)
+    output_dir = tmp_path / "parts"
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=output_dir,
+        base_name="drive01",
+        part_size_bytes=40_000,
+        codec=codec,
+        part_layout=ArchivePartLayout.INDEPENDENT,
+    )
+    return source_dir, output_dir, result.parts
+
+
+def _assert_same_tree(expected: Path, actual: Path) -> None:
+    expected_files = sorted(p.relative_to(expected) for p in expected.rglob("*"))
+    assert sorted(p.relative_to(actual) for p in actual.rglob("*")) == expected_files
+    for rel_path in expected_files:
+        if (expected / rel_path).is_file():
+            assert (actual / rel_path).read_bytes() == (expected / rel_path).read_bytes()
+
+
+def test_each_part_decodes_alone_and_concatenation_is_a_valid_tar_gz(tmp_path: Path) -> None:
+    source_dir, output_dir, parts = _build(tmp_path)
+
+    assert len(parts) > 3
+    tar_offset = 0
+    for part in parts:
+        assert part.tar_offset == tar_offset
+        decoded = gzip.decompress((output_dir / part.file_name).read_bytes())
+        assert len(decoded) == part.tar_size
+        assert part.tar_offset % tarfile.BLOCKSIZE == 0
+        tar_offset += len(decoded)
+
+    manifest = json.loads((output_dir / "archive-manifest.json").read_text(encoding="utf-8"))
+    assert manifest["part_layout"] == "independent"
+    assert manifest["parts"][1]["tar_offset"] == parts[1].tar_offset
+
+    archive_path = reassemble_archive_from_manifest(
+        parts_dir=output_dir,
+        manifest_path=output_dir / "archive-manifest.json",
+        output_tar_path=tmp_path / "drive01.tar.gz",
+    )
+    with tarfile.open(archive_path, "r:gz") as tar:
+        tar.extractall(tmp_path / "sequential", filter="data")
+    _assert_same_tree(source_dir, tmp_path / "sequential" / "drive01")
+
+
+@pytest.mark.parametrize("codec", [ArchiveCodec.GZIP, ArchiveCodec.ZSTD])
+def test_parallel_extract_matches_source(tmp_path: Path, codec: ArchiveCodec) -> None:
+    source_dir, output_dir, parts = _build(tmp_path, codec)
+
+    # Root dir, 12 files, nested/, nested/large.bin, nested/deeper/, small.txt
+    assert verify_independent_tar_parts(parts, output_dir, codec, workers=4) == 17
+    assert extract_independent_tar_parts(parts, output_dir, tmp_path / "restore", codec, workers=4) == 17
+    _assert_same_tree(source_dir, tmp_path / "restore" / "drive01")
+
+
+def test_parallel_verify_rejects_corrupt_part(tmp_path: Path) -> None:
+    _, output_dir, parts = _build(tmp_path)
+    part_path = output_dir / parts[2].file_name
+    data = bytearray(part_path.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    part_path.write_bytes(bytes(data))
+
+    with pytest.raises(tarfile.TarError):
+        verify_tar_parts_stream(parts=parts, parts_dir=output_dir, workers=4)
@@ -0,0 +1,182 @@
+"""Tests for the tar member offset index and path-filtered extraction."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from models.common import ArchiveCodec, ArchivePartLayout
+from packaging.archive_chunks import ChunkedArchiveResult, build_chunked_tar_archive
+from packaging.independent_parts import extract_selected_members
+from packaging.member_index import (
+    MEMBER_INDEX_FILE_NAME,
+    MemberIndexEntry,
+    MemberIndexWriter,
+    parts_for_members,
+    read_member_index,
+    select_members,
+)
+
+
+def _build(tmp_path: Path, codec: ArchiveCodec = ArchiveCodec.GZIP) -> tuple[Path, ChunkedArchiveResult]:
+    source_dir = tmp_path / "drive01"
+    (source_dir / "data" / "results").mkdir(parents=True)
+    (source_dir / "data" / "raw").mkdir(parents=True)
+    for i in range(8):
+        (source_dir / "data" / "raw" / f"raw-{i}.bin").write_bytes(os.urandom(30_000))
+    # Larger than a part, so its data spans several parts.
+    (source_dir / "data" / "results" / "large.bin").write_bytes(os.urandom(150_000))
+    (source_dir / "data" / "results" / "summary.txt").write_text("done", encoding="utf-8")
+    (source_dir / "bagit.txt").write_text("BagIt-Version: 1.0\n", encoding="utf-8")
+
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=tmp_path / "parts",
+        base_name="drive01",
+        part_size_bytes=40_000,
+        codec=codec,
+        part_layout=ArchivePartLayout.INDEPENDENT,
+        member_index_file_name=MEMBER_INDEX_FILE_NAME,
+    )
+    return source_dir, result
+
+
+def _tar_size(result: ChunkedArchiveResult) -> int:
+    last = result.parts[-1]
+    assert last.tar_offset is not None and last.tar_size is not None
+    return last.tar_offset + last.tar_size
+
+
+def test_index_records_every_member_with_its_part(tmp_path: Path) -> None:
+    source_dir, result = _build(tmp_path)
+
+    assert result.member_index_path == tmp_path / "parts" / MEMBER_INDEX_FILE_NAME
+    entries = list(read_member_index(result.member_index_path))
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    assert manifest["member_index"] == {"file_name": MEMBER_INDEX_FILE_NAME, "entry_count": len(entries)}
+
+    archived = sorted(["drive01", *(f"drive01/{p.relative_to(source_dir).as_posix()}" for p in source_dir.rglob("*"))])
+    assert sorted(entry.path for entry in entries) == archived
+
+    offsets = [entry.uncompressed_offset for entry in entries]
+    assert offsets == sorted(offsets)
+    parts_by_index = {part.index: part for part in result.parts}
+    large = source_dir / "data" / "results" / "large.bin"
+    for entry in entries:
+        part = parts_by_index[entry.part_index]
+        assert part.tar_offset is not None and part.tar_size is not None
+        assert part.tar_offset <= entry.uncompressed_offset < part.tar_offset + part.tar_size
+        if entry.path == "drive01/data/results/large.bin":
+            assert entry.size == large.stat().st_size
+            assert entry.mtime == int(large.stat().st_mtime)
+
+
+def test_index_requires_independent_layout(tmp_path: Path) -> None:
+    source_dir = tmp_path / "drive01"
+    source_dir.mkdir()
+    (source_dir / "a.txt").write_text("a", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="independent part layout"):
+        build_chunked_tar_archive(
+            source_dir=source_dir,
+            output_dir=tmp_path / "parts",
+            base_name="drive01",
+            part_size_bytes=1024,
+            member_index_file_name=MEMBER_INDEX_FILE_NAME,
+        )
+
+
+def test_read_rejects_truncated_index(tmp_path: Path) -> None:
+    index_path = tmp_path / "index.bin.gz"
+    with MemberIndexWriter(index_path) as writer:
+        writer.add(MemberIndexEntry("drive01/a.txt", 1, 0, 1, 0, 0))
+    (tmp_path / "truncated.bin.gz").write_bytes(gzip.compress(gzip.decompress(index_path.read_bytes())[:-3]))
+
+    with pytest.raises(ValueError, match="Truncated"):
+        list(read_member_index(tmp_path / "truncated.bin.gz"))
+
+
+@pytest.mark.parametrize("codec", [ArchiveCodec.GZIP, ArchiveCodec.ZSTD])
+def test_selected_members_extract_from_only_their_parts(tmp_path: Path, codec: ArchiveCodec) -> None:
+    source_dir, result = _build(tmp_path, codec)
+    assert result.member_index_path is not None
+
+    selected = select_members(
+        result.member_index_path,
+        ["data/results/"],
+        source_root="drive01",
+        tar_size=_tar_size(result),
+    )
+    assert [member.entry.path for member in selected] == [
+        "drive01/data/results",
+        "drive01/data/results/large.bin",
+        "drive01/data/results/summary.txt",
+    ]
+    needed = parts_for_members(selected, result.parts)
+    assert 1 < len(needed) < len(result.parts)
+
+    # Only the needed parts are "downloaded".
+    download_dir = tmp_path / "download"
+    download_dir.mkdir()
+    for part in needed:
+        os.link(tmp_path / "parts" / part.file_name, download_dir / part.file_name)
+
+    dest = tmp_path / "restored"
+    assert extract_selected_members(result.parts, download_dir, dest, codec, selected, workers=2) == 3
+
+    restored = sorted(p.relative_to(dest).as_posix() for p in dest.rglob("*"))
+    assert restored == [
+        "drive01",
+        "drive01/data",
+        "drive01/data/results",
+        "drive01/data/results/large.bin",
+        "drive01/data/results/summary.txt",
+    ]
+    for name in ("large.bin", "summary.txt"):
+        expected = (source_dir / "data" / "results" / name).read_bytes()
+        assert (dest / "drive01" / "data" / "results" / name).read_bytes() == expected
+
+
+def test_selected_member_ending_near_a_part_boundary_needs_no_later_part(tmp_path: Path) -> None:
+    source_dir = tmp_path / "drive01"
+    (source_dir / "data").mkdir(parents=True)
+    for i in range(60):
+        (source_dir / "data" / f"f{i:03}.bin").write_bytes(os.urandom(1_000 + 97 * i))
+    result = build_chunked_tar_archive(
+        source_dir=source_dir,
+        output_dir=tmp_path / "parts",
+        base_name="drive01",
+        part_size_bytes=20_000,
+        part_layout=ArchivePartLayout.INDEPENDENT,
+        member_index_file_name=MEMBER_INDEX_FILE_NAME,
+    )
+    assert result.member_index_path is not None
+    part_starts = [part.tar_offset for part in result.parts]
+    near_boundary = 0
+
+    for i in range(60):
+        selected = select_members(
+            result.member_index_path, [f"data/f{i:03}.bin"], source_root="drive01", tar_size=_tar_size(result)
+        )
+        needed = parts_for_members(selected, result.parts)
+        # tarfile reads whole records, which would run on into the part after the member's end.
+        near_boundary += any(
+            start is not None and selected[0].end_offset <= start < selected[0].end_offset + tarfile.RECORDSIZE
+            for start in part_starts
+        )
+        download_dir = tmp_path / f"download-{i}"
+        download_dir.mkdir()
+        for part in needed:
+            os.link(tmp_path / "parts" / part.file_name, download_dir / part.file_name)
+
+        dest = tmp_path / f"restored-{i}"
+        assert extract_selected_members(result.parts, download_dir, dest, ArchiveCodec.GZIP, selected) == 1
+        expected = (source_dir / "data" / f"f{i:03}.bin").read_bytes()
+        assert (dest / "drive01" / "data" / f"f{i:03}.bin").read_bytes() == expected
+
+    assert near_boundary
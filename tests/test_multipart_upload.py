@@ -0,0 +1,224 @@
+"""Tests for resumable multipart uploads of files on disk."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import threading
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+from botocore.exceptions import ClientError
+
+from service.multipart_upload import MultipartUploadState, composite_checksum, upload_file_resumable
+from service.transfer_profile import TransferProfile
+
+PROFILE = TransferProfile(
+    multipart_threshold_bytes=1,
+    multipart_chunk_size_bytes=1000,
+    max_concurrency=2,
+    max_pool_connections=4,
+)
+
+
+class _FakeMultipartClient:
+    """In-memory stand-in for the multipart subset of the S3 API."""
+
+    def __init__(self, fail_after_uploads: int | None = None, block: threading.Event | None = None) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, tuple[str, dict[int, bytes]]] = {}
+        self.upload_part_calls = 0
+        self.checksums: list[str | None] = []
+        self.create_kwargs: list[dict[str, Any]] = []
+        self.completed_parts: list[dict[str, Any]] = []
+        self._fail_after_uploads = fail_after_uploads
+        self._block = block
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **kwargs: Any) -> dict[str, str]:  # noqa: N803
+        self.create_kwargs.append(kwargs)
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = (Key, {})
+        return {"UploadId": upload_id}
+
+    def upload_part(  # noqa: PLR0913
+        self,
+        Bucket: str,  # noqa: N803
+        Key: str,  # noqa: N803
+        UploadId: str,  # noqa: N803
+        PartNumber: int,  # noqa: N803
+        Body: Any,  # noqa: N803
+        ChecksumSHA256: str | None = None,  # noqa: N803
+    ) -> dict[str, str]:
+        if self._block is not None:
+            self._block.wait()
+        data = Body.read()
+        with self._lock:
+            if self._fail_after_uploads is not None and self.upload_part_calls >= self._fail_after_uploads:
+                raise ClientError({"Error": {"Code": "InternalError", "Message": "boom"}}, "UploadPart")
+            self.upload_part_calls += 1
+            self.checksums.append(ChecksumSHA256)
+            self.uploads[UploadId][1][PartNumber] = data
+        return {"ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    def get_paginator(self, _name: str) -> _FakeMultipartClient:
+        return self
+
+    def paginate(self, Bucket: str, Key: str, UploadId: str) -> list[dict[str, Any]]:  # noqa: N803
+        if UploadId not in self.uploads:
+            raise ClientError({"Error": {"Code": "NoSuchUpload", "Message": "gone"}}, "ListParts")
+        chunks = self.uploads[UploadId][1]
+        return [
+            {"Parts": [{"PartNumber": n, "ETag": f'"{hashlib.md5(b).hexdigest()}"'} for n, b in sorted(chunks.items())]}
+        ]
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict) -> dict[str, str]:  # noqa: N803
+        _, chunks = self.uploads.pop(UploadId)
+        parts = MultipartUpload["Parts"]
+        self.completed_parts = parts
+        self.objects[Key] = b"".join(chunks[part["PartNumber"]] for part in parts)
+        if not all("ChecksumSHA256" in part for part in parts):
+            return {}
+        # S3's composite checksum: the SHA-256 of the chunks' digests.
+        digests = b"".join(hashlib.sha256(chunks[part["PartNumber"]]).digest() for part in parts)
+        return {"ChecksumSHA256": f"{base64.b64encode(hashlib.sha256(digests).digest()).decode()}-{len(parts)}"}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> None:  # noqa: N803
+        self.uploads.pop(UploadId, None)
+
+
+class _MemoryStateStore:
+    def __init__(self) -> None:
+        self.state: dict[str, Any] | None = None
+
+    def load(self) -> MultipartUploadState | None:
+        return MultipartUploadState.from_json_dict(self.state) if self.state else None
+
+    def save(self, state: MultipartUploadState) -> None:
+        self.state = state.to_json_dict()
+
+    def clear(self) -> None:
+        self.state = None
+
+
+@pytest.fixture(name="part_file")
+def part_file_fixture(tmp_path: Path) -> Path:
+    path = tmp_path / "drive.tar.gz.part-00001"
+    path.write_bytes(os.urandom(9500))
+    return path
+
+
+def _upload(client: _FakeMultipartClient, store: _MemoryStateStore, part_file: Path, **kwargs: Any) -> bool:
+    success, _ = upload_file_resumable(
+        client,
+        "bucket",
+        "drive/part-00001",
+        part_file,
+        state_store=store,
+        profile=kwargs.pop("profile", PROFILE),
+        stall_timeout=kwargs.pop("stall_timeout", 30),
+        **kwargs,
+    )
+    return success
+
+
+def test_resumes_from_last_stored_chunk(part_file: Path) -> None:
+    client = _FakeMultipartClient(fail_after_uploads=4)
+    store = _MemoryStateStore()
+
+    # One chunk at a time, so every chunk stored before the failure is recorded.
+    assert not _upload(client, store, part_file, profile=replace(PROFILE, max_concurrency=1), send_checksums=True)
+    assert store.state is not None
+    assert len(store.state["parts"]) == 4
+    # Chunks still in flight when the attempt gave up must not land after the fake recovers.
+    for thread in threading.enumerate():
+        if thread.name.startswith("multipart-upload"):
+            thread.join()
+
+    client._fail_after_uploads = None  # pylint: disable=protected-access
+    assert _upload(client, store, part_file, send_checksums=True)
+
+    # 10 chunks in total: 4 stored by the first attempt, 6 sent by the second.
+    assert client.upload_part_calls == 10
+    assert client.objects["drive/part-00001"] == part_file.read_bytes()
+    assert all(checksum is not None for checksum in client.checksums)
+    # Chunks stored by the first attempt are still listed with their checksum.
+    assert all("ChecksumSHA256" in part for part in client.completed_parts)
+    assert store.state is None
+    assert client.uploads == {}
+
+
+def test_stalled_upload_keeps_state_for_resume(part_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("service.multipart_upload._POLL_SECONDS", 0.01)
+    release = threading.Event()
+    client = _FakeMultipartClient(block=release)
+    store = _MemoryStateStore()
+    try:
+        assert not _upload(client, store, part_file, stall_timeout=0.05)
+    finally:
+        release.set()
+
+    assert store.state is not None
+    assert store.state["upload_id"] in client.uploads
+    assert "drive/part-00001" not in client.objects
+
+
+def test_cancelled_upload_is_aborted(part_file: Path) -> None:
+    cancel = threading.Event()
+    cancel.set()
+    client = _FakeMultipartClient()
+    store = _MemoryStateStore()
+
+    assert not _upload(client, store, part_file, cancel_event=cancel)
+
+    assert store.state is None
+    assert client.uploads == {}
+    assert client.objects == {}
+
+
+def test_checksummed_upload_sends_algorithm_and_confirms_composite(part_file: Path) -> None:
+    client = _FakeMultipartClient()
+    store = _MemoryStateStore()
+
+    success, checksum = upload_file_resumable(
+        client,
+        "bucket",
+        "drive/part-00001",
+        part_file,
+        state_store=store,
+        profile=PROFILE,
+        stall_timeout=30,
+        send_checksums=True,
+    )
+
+    assert success
+    assert client.create_kwargs == [{"ChecksumAlgorithm": "SHA256"}]
+    data = part_file.read_bytes()
+    expected = {
+        number: base64.b64encode(hashlib.sha256(data[(number - 1) * 1000 : number * 1000]).digest()).decode()
+        for number in range(1, 11)
+    }
+    assert [part["ChecksumSHA256"] for part in client.completed_parts] == [expected[n] for n in range(1, 11)]
+    assert checksum == f"{composite_checksum(expected)}-10"
+
+
+def test_upload_without_checksums_reports_none(part_file: Path) -> None:
+    client = _FakeMultipartClient()
+
+    success, checksum = upload_file_resumable(
+        client,
+        "bucket",
+        "drive/part-00001",
+        part_file,
+        state_store=_MemoryStateStore(),
+        profile=PROFILE,
+        stall_timeout=30,
+    )
+
+    assert success
+    assert checksum is None
+    assert client.create_kwargs == [{}]
+    assert all("ChecksumSHA256" not in part for part in client.completed_parts)
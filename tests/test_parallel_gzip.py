@@ -0,0 +1,62 @@
+"""Tests for block-parallel gzip compression."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import os
+
+import pytest
+
+from packaging.parallel_gzip import ParallelGzipWriter
+
+
+def _compress(data: bytes, workers: int, block_size_bytes: int, write_size: int) -> bytes:
+    output = io.BytesIO()
+    with ParallelGzipWriter(output, workers=workers, block_size_bytes=block_size_bytes) as writer:
+        for start in range(0, len(data), write_size):
+            writer.write(data[start : start + write_size])
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_gzip_round_trips_multi_block_data(workers: int) -> None:
+    data = os.urandom(50_000) + b"repetitive " * 20_000
+
+    compressed = _compress(data, workers=workers, block_size_bytes=4096, write_size=3000)
+
+    assert gzip.decompress(compressed) == data
+    assert len(compressed) < len(data)
+
+
+def test_parallel_gzip_empty_input_is_valid_gzip() -> None:
+    compressed = _compress(b"", workers=2, block_size_bytes=1024, write_size=1)
+
+    assert gzip.decompress(compressed) == b""
+
+
+def test_parallel_gzip_is_deterministic() -> None:
+    data = b"deterministic " * 10_000
+
+    first = _compress(data, workers=3, block_size_bytes=2048, write_size=999)
+    second = _compress(data, workers=3, block_size_bytes=2048, write_size=5000)
+
+    assert first == second
+
+
+def test_parallel_gzip_abort_on_error_skips_trailer() -> None:
+    output = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        with ParallelGzipWriter(output, workers=2, block_size_bytes=16) as writer:
+            writer.write(b"x" * 100)
+            raise RuntimeError("tar failed")
+
+    with pytest.raises(EOFError):
+        gzip.decompress(output.getvalue())
+
+
+def test_parallel_gzip_rejects_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="workers"):
+        ParallelGzipWriter(io.BytesIO(), workers=0)
+    with pytest.raises(ValueError, match="block_size_bytes"):
+        ParallelGzipWriter(io.BytesIO(), workers=1, block_size_bytes=0)
@@ -0,0 +1,79 @@
+"""Tests for the local cache of verified archive parts."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from packaging import part_cache
+from packaging.part_cache import PartCache
+
+
+def _part(directory: Path, name: str, data: bytes) -> tuple[str, Path]:
+    path = directory / name
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest(), path
+
+
+def test_evicts_least_recently_used_unpinned_parts(tmp_path: Path) -> None:
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    cache = PartCache(tmp_path / "cache", max_bytes=20)
+    first, first_path = _part(scratch, "first", b"1" * 8)
+    second, second_path = _part(scratch, "second", b"2" * 8)
+    third, third_path = _part(scratch, "third", b"3" * 8)
+
+    assert cache.add(first, first_path)
+    assert cache.add(second, second_path)
+    # Both are pinned, so there is no room for a third part yet.
+    assert not cache.add(third, third_path)
+    cache.release(first)
+    cache.release(second)
+    # Using the first part makes the second the least recently used.
+    assert cache.acquire(first, scratch / "again")
+    cache.release(first)
+    assert cache.add(third, third_path)
+
+    assert cache.acquire(first, scratch / "first-copy")
+    assert not cache.acquire(second, scratch / "second-copy")
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.size_bytes == 16
+    # Cached parts share the inode of the verified download.
+    assert (scratch / "first-copy").stat().st_ino == first_path.stat().st_ino
+
+
+def test_reopened_cache_keeps_parts_and_drops_partial_copies(tmp_path: Path) -> None:
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    sha256, path = _part(scratch, "part", b"part data")
+    cache = PartCache(tmp_path / "cache", max_bytes=1024)
+    assert cache.add(sha256, path)
+    (tmp_path / "cache" / f"{sha256}.partial").write_bytes(b"interrupted")
+
+    reopened = PartCache(tmp_path / "cache", max_bytes=1024)
+
+    assert reopened.acquire(sha256, scratch / "linked")
+    assert (scratch / "linked").read_bytes() == b"part data"
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == [sha256]
+
+
+def test_part_being_added_is_not_handed_out_until_linked(tmp_path: Path, monkeypatch) -> None:
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    cache = PartCache(tmp_path / "cache", max_bytes=1024)
+    sha256, path = _part(scratch, "part", b"part data")
+    real_link = part_cache._link_or_copy
+    during_add: list[bool] = []
+
+    def link_while_another_job_looks(source: Path, dest: Path) -> None:
+        if source == path:
+            during_add.append(cache.acquire(sha256, scratch / "early"))
+        real_link(source, dest)
+
+    monkeypatch.setattr(part_cache, "_link_or_copy", link_while_another_job_looks)
+
+    assert cache.add(sha256, path)
+
+    assert during_add == [False]
+    assert cache.acquire(sha256, scratch / "later")
+    assert cache.size_bytes == len(b"part data")
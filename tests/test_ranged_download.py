@@ -0,0 +1,117 @@
+"""Tests for parallel ranged GET downloads."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ResponseStreamingError
+
+from service.ranged_download import (
+    ByteRange,
+    RangeDownloadError,
+    _FileDigest,
+    download_object_ranges,
+    split_ranges,
+)
+
+
+class FakeRangedClient:
+    """Serves ranged GETs of *data*; ranges in *flaky* fail once, mid-stream or short."""
+
+    def __init__(self, data: bytes, flaky: dict[str, str] | None = None) -> None:
+        self.data = data
+        self.flaky = dict(flaky or {})
+        self.requests: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def get_object(self, **kwargs: Any) -> dict[str, Any]:
+        with self._lock:
+            self.requests.append(kwargs)
+            failure = self.flaky.pop(kwargs["Range"], None)
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", kwargs["Range"])
+        assert match
+        body_bytes = self.data[int(match[1]) : int(match[2]) + 1]
+        chunks = [body_bytes[i : i + 7] for i in range(0, len(body_bytes), 7)]
+        if failure == "short":
+            chunks = chunks[:-1]
+
+        def iter_chunks(chunk_size: int) -> Any:
+            del chunk_size
+            for i, chunk in enumerate(chunks):
+                if failure == "broken" and i == 1:
+                    raise ResponseStreamingError(error="connection reset")
+                yield chunk
+
+        return {"Body": MagicMock(iter_chunks=iter_chunks)}
+
+
+def test_split_ranges_covers_object_exactly() -> None:
+    assert split_ranges(10, 4) == [ByteRange(0, 3), ByteRange(4, 7), ByteRange(8, 9)]
+    assert split_ranges(8, 4)[-1].header == "bytes=4-7"
+    assert not split_ranges(0, 4)
+
+
+def test_ranges_are_written_in_place_and_failed_ranges_retried(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("service.ranged_download.time.sleep", lambda _: None)
+    data = os.urandom(1000)
+    client = FakeRangedClient(data, flaky={"bytes=100-199": "broken", "bytes=500-599": "short"})
+    dest = tmp_path / "part.bin"
+    dest.write_bytes(b"stale content that is longer than nothing" * 100)
+
+    digest = download_object_ranges(
+        client,
+        "bucket",
+        "key",
+        dest,
+        size=len(data),
+        etag='"e"',
+        range_size=100,
+        workers=4,  # type: ignore[arg-type]
+    )
+
+    assert dest.read_bytes() == data
+    # Hashed as written, including the chunks rewritten by the retried ranges.
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert len(client.requests) == 12
+    assert all(request["IfMatch"] == '"e"' for request in client.requests)
+
+
+def test_range_failing_every_attempt_fails_download(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("service.ranged_download.time.sleep", lambda _: None)
+    client = FakeRangedClient(os.urandom(300))
+    client.get_object = MagicMock(  # type: ignore[method-assign]
+        return_value={"Body": MagicMock(iter_chunks=MagicMock(return_value=[b"x"]))}
+    )
+
+    with pytest.raises(RangeDownloadError):
+        download_object_ranges(
+            client,
+            "bucket",
+            "key",
+            tmp_path / "part.bin",
+            size=300,
+            range_size=100,
+            workers=2,
+            attempts=2,  # type: ignore[arg-type]
+        )
+
+
+def test_file_digest_hashes_out_of_order_writes_in_file_order(tmp_path: Path) -> None:
+    data = os.urandom(300)
+    fd = os.open(tmp_path / "part.bin", os.O_RDWR | os.O_CREAT)
+    try:
+        digest = _FileDigest(fd)
+        # The last range lands first, the middle one is rewritten by a retry.
+        for start, end in [(200, 300), (100, 150), (100, 200), (0, 100)]:
+            os.pwrite(fd, data[start:end], start)
+            digest.written(start, data[start:end])
+        assert digest.hexdigest(len(data)) == hashlib.sha256(data).hexdigest()
+    finally:
+        os.close(fd)
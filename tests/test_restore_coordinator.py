@@ -0,0 +1,112 @@
+"""Tests for concurrent restore initiation and readiness polling."""
+
+from __future__ import annotations
+
+import random
+import threading
+
+import pytest
+
+from service.restore_coordinator import RestoreCoordinator, RestoreProgress, backoff_delay
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _coordinator(clock: _FakeClock, progress: list[RestoreProgress], **kwargs: float) -> RestoreCoordinator:
+    return RestoreCoordinator(
+        object(),
+        "bucket",
+        restore_days=1,
+        workers=4,
+        poll_interval_cap=kwargs.get("poll_interval_cap", 60),
+        max_wait=kwargs.get("max_wait", 3600),
+        on_progress=progress.append,
+        clock=clock,
+        sleep=clock.sleep,
+        rng=random.Random(0),
+    )
+
+
+def test_polls_only_pending_keys_and_yields_each_once_ready(monkeypatch: pytest.MonkeyPatch) -> None:
+    # part-1 is in active storage; part-2 thaws on the first check, part-3 on the third.
+    checks: list[str] = []
+    thaw_after = {"part-2": 1, "part-3": 3}
+    monkeypatch.setattr(
+        "service.restore_coordinator.initiate_object_restore",
+        lambda _client, _bucket, key, days: key != "part-1",
+    )
+
+    def fake_is_ready(_client, _bucket: str, key: str) -> bool:
+        checks.append(key)
+        return checks.count(key) >= thaw_after[key]
+
+    monkeypatch.setattr("service.restore_coordinator.is_object_ready_for_download", fake_is_ready)
+    clock = _FakeClock()
+    progress: list[RestoreProgress] = []
+
+    ready = list(_coordinator(clock, progress).ready_keys(["part-1", "part-2", "part-3"]))
+
+    assert ready == ["part-1", "part-2", "part-3"]
+    assert checks.count("part-2") == 1
+    assert checks.count("part-3") == 3
+    assert "part-1" not in checks
+    assert [(p.ready, p.pending) for p in progress] == [(1, 2), (2, 1), (3, 0)]
+    assert len(clock.sleeps) == 2
+
+
+def test_backoff_doubles_with_jitter_up_to_the_cap() -> None:
+    rng = random.Random(0)
+    delays = [backoff_delay(attempt, 5.0, 30.0, rng) for attempt in range(6)]
+
+    for attempt, delay in enumerate(delays):
+        ceiling = min(30.0, 5.0 * 2**attempt)
+        assert ceiling / 2 <= delay <= ceiling
+    assert max(delays) <= 30.0
+
+
+def test_raises_timeout_when_restores_outlast_max_wait(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("service.restore_coordinator.initiate_object_restore", lambda *_a, **_k: True)
+    monkeypatch.setattr("service.restore_coordinator.is_object_ready_for_download", lambda *_a, **_k: False)
+    clock = _FakeClock()
+
+    with pytest.raises(TimeoutError, match="1 archive objects not restored"):
+        list(_coordinator(clock, [], poll_interval_cap=10, max_wait=60).ready_keys(["part-1"]))
+    assert all(delay <= 10 for delay in clock.sleeps)
+
+
+def test_stops_polling_once_the_stop_event_is_set(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("service.restore_coordinator.initiate_object_restore", lambda *_a, **_k: True)
+    checks: list[str] = []
+    stop = threading.Event()
+
+    def fake_is_ready(_client, _bucket: str, key: str) -> bool:
+        checks.append(key)
+        # Another stage of the job fails while the part is still thawing.
+        stop.set()
+        return False
+
+    monkeypatch.setattr("service.restore_coordinator.is_object_ready_for_download", fake_is_ready)
+    coordinator = RestoreCoordinator(
+        object(),
+        "bucket",
+        restore_days=1,
+        workers=1,
+        poll_interval_cap=3600,
+        max_wait=86400,
+        sleep=stop.wait,
+        stop=stop,
+    )
+
+    assert list(coordinator.ready_keys(["part-1"])) == []
+    assert checks == ["part-1"]
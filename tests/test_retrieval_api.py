@@ -1,5 +1,6 @@
 """Tests for the archive retrieval API endpoint."""
 
+import json
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
@@ -368,6 +369,45 @@ def test_create_retrieval_422_when_destination_path_missing(
     assert response.status_code == 422
 
 
+def test_create_retrieval_persists_include_paths(
+    client: TestClient,
+    session: Session,
+    completed_submission: ArchiveSubmission,
+) -> None:
+    """Path filters for a partial retrieval are stored on the record as JSON."""
+    with (
+        patch("api.routers.retrievals.run_archive_retrieval"),
+        patch(
+            "api.routers.retrievals.validate_destination_path",
+            return_value=Path(_DEST_PATH),
+        ),
+    ):
+        response = client.post(
+            f"/api/v1/retrieval/{_DRIVE_NAME}",
+            json={"destination_path": _DEST_PATH, "include_paths": ["data/results", "data/notes.txt"]},
+        )
+
+    assert response.status_code == 201
+    row = session.exec(select(ArchiveRetrieval).where(ArchiveRetrieval.drive_name == _DRIVE_NAME)).first()
+    assert row is not None
+    assert json.loads(row.include_paths_json or "null") == ["data/results", "data/notes.txt"]
+
+
+@pytest.mark.parametrize("include_paths", [[], ["data/../../etc"]])
+def test_create_retrieval_422_for_invalid_include_paths(
+    client: TestClient,
+    session: Session,
+    completed_submission: ArchiveSubmission,
+    include_paths: list[str],
+) -> None:
+    """Returns 422 for an empty filter list or a path escaping the archive root."""
+    response = client.post(
+        f"/api/v1/retrieval/{_DRIVE_NAME}",
+        json={"destination_path": _DEST_PATH, "include_paths": include_paths},
+    )
+    assert response.status_code == 422
+
+
 # ---------------------------------------------------------------------------
 # PATCH /retrieval/{retrieval_id} – update retrieval record
 # ---------------------------------------------------------------------------
@@ -0,0 +1,213 @@
+"""Tests for the retrieval worker's restore -> download -> extract part pipeline."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import Session
+
+from models.retrieval import ArchiveRetrieval, RetrievalJobStage
+from packaging.archive_chunks import ArchivePartInfo
+from packaging.part_cache import PartCache
+from workers.retrieval_worker import _PartRetrievalPipeline
+
+PREFIX = "drive/"
+PART_BYTES = {"part-1": b"first part", "part-2": b"second part"}
+SETTINGS = SimpleNamespace(
+    activescale_bucket_name="bucket",
+    activescale_restore_days=1,
+    activescale_restore_workers=2,
+    activescale_restore_poll_interval_seconds=0.01,
+    activescale_restore_poll_max_seconds=5,
+    retrieval_download_workers=2,
+)
+
+
+def _entries(**overrides: bytes) -> dict[str, dict[str, object]]:
+    entries: dict[str, dict[str, object]] = {}
+    for index, (name, data) in enumerate(PART_BYTES.items(), start=1):
+        expected = overrides.get(name, data)
+        entries[f"{PREFIX}{name}"] = {
+            "index": index,
+            "file_name": name,
+            "size_bytes": len(expected),
+            "sha256": hashlib.sha256(expected).hexdigest(),
+        }
+    return entries
+
+
+def _run(session: Session, tmp_path: Path, retrieval: ArchiveRetrieval, **overrides: bytes) -> None:
+    session.add(retrieval)
+    session.commit()
+    _PartRetrievalPipeline(
+        session=session,
+        retrieval=retrieval,
+        client=object(),
+        settings=SETTINGS,
+        object_prefix=PREFIX,
+        download_dir=tmp_path,
+        part_entries=_entries(**overrides),
+        started_at=datetime.now(),
+    ).run([f"{PREFIX}{name}" for name in PART_BYTES])
+
+
+def _retrieval(**kwargs: object) -> ArchiveRetrieval:
+    return ArchiveRetrieval(
+        drive_name="drive",
+        submission_id=1,
+        destination_path="/tmp/restored",
+        stage=RetrievalJobStage.RESTORING,
+        **kwargs,
+    )
+
+
+@pytest.fixture(name="downloads")
+def downloads_fixture(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    downloaded: list[str] = []
+
+    def fake_download(_client, _bucket: str, key: str, dest: Path) -> str:
+        dest.write_bytes(PART_BYTES[key.removeprefix(PREFIX)])
+        downloaded.append(key)
+        return hashlib.sha256(PART_BYTES[key.removeprefix(PREFIX)]).hexdigest()
+
+    monkeypatch.setattr("workers.retrieval_worker.download_file_to_disk", fake_download)
+    monkeypatch.setattr("service.restore_coordinator._BASE_POLL_DELAY_SECONDS", 0.01)
+    return downloaded
+
+
+def test_downloads_a_part_while_others_are_still_restoring(
+    tmp_path: Path, session: Session, monkeypatch: pytest.MonkeyPatch, downloads: list[str]
+) -> None:
+    # part-2 stays on tape until part-1 has been downloaded.
+    monkeypatch.setattr(
+        "service.restore_coordinator.initiate_object_restore",
+        lambda _client, _bucket, key, days: key.endswith("part-2"),
+    )
+    monkeypatch.setattr(
+        "service.restore_coordinator.is_object_ready_for_download",
+        lambda *_args: f"{PREFIX}part-1" in downloads,
+    )
+    retrieval = _retrieval()
+
+    _run(session, tmp_path, retrieval)
+
+    assert downloads == [f"{PREFIX}part-1", f"{PREFIX}part-2"]
+    assert retrieval.stage == RetrievalJobStage.DOWNLOADING
+    assert json.loads(retrieval.retrieved_part_keys_json or "[]") == downloads
+    assert (retrieval.restore_part_count, retrieval.restored_part_count) == (2, 2)
+
+
+def test_resumes_with_recorded_parts_and_retries_a_corrupt_download(
+    tmp_path: Path, session: Session, monkeypatch: pytest.MonkeyPatch, downloads: list[str]
+) -> None:
+    restored: list[str] = []
+    lock = threading.Lock()
+
+    def fake_initiate(_client, _bucket: str, key: str, days: int) -> bool:
+        with lock:
+            restored.append(key)
+        return False
+
+    monkeypatch.setattr("service.restore_coordinator.initiate_object_restore", fake_initiate)
+    (tmp_path / "part-1").write_bytes(PART_BYTES["part-1"])
+    retrieval = _retrieval(retrieved_part_keys_json=json.dumps([f"{PREFIX}part-1"]))
+
+    with pytest.raises(ValueError, match="Part checksum mismatch for part-2"):
+        _run(session, tmp_path, retrieval, **{"part-2": b"other bytes"})
+
+    # The mismatching part is downloaded again straight away, up to the attempt limit.
+    assert restored == [f"{PREFIX}part-2"]
+    assert downloads == [f"{PREFIX}part-2"] * 3
+    assert json.loads(retrieval.retrieved_part_keys_json or "[]") == [f"{PREFIX}part-1"]
+
+
+def test_extracts_while_downloading_within_the_local_part_limit(
+    tmp_path: Path, session: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    names = [f"part-{index}" for index in range(1, 6)]
+    monkeypatch.setattr("service.restore_coordinator.initiate_object_restore", lambda *_args, **_kwargs: False)
+
+    def fake_download(_client, _bucket: str, key: str, dest: Path) -> str:
+        dest.write_bytes(key.encode())
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    monkeypatch.setattr("workers.retrieval_worker.download_file_to_disk", fake_download)
+    retrieval = _retrieval()
+    session.add(retrieval)
+    session.commit()
+    pipeline = _PartRetrievalPipeline(
+        session=session,
+        retrieval=retrieval,
+        client=object(),
+        settings=SETTINGS,
+        object_prefix=PREFIX,
+        download_dir=tmp_path,
+        part_entries={},
+        started_at=datetime.now(),
+        max_local_parts=2,
+    )
+    extracted: list[bytes] = []
+    parts_on_disk: list[int] = []
+
+    def fake_extract() -> None:
+        for index, name in enumerate(names, start=1):
+            part = ArchivePartInfo(index=index, file_name=name, size_bytes=0, sha256="")
+            pipeline.wait_for_part(part)
+            parts_on_disk.append(len(list(tmp_path.iterdir())))
+            extracted.append((tmp_path / name).read_bytes())
+            (tmp_path / name).unlink()
+            pipeline.part_consumed(part)
+
+    pipeline.run([f"{PREFIX}{name}" for name in names], extract=fake_extract)
+
+    assert extracted == [f"{PREFIX}{name}".encode() for name in names]
+    assert max(parts_on_disk) <= 2
+    assert retrieval.stage == RetrievalJobStage.EXTRACTING
+
+
+def test_reuses_cached_parts_and_caches_downloads(
+    tmp_path: Path, session: Session, monkeypatch: pytest.MonkeyPatch, downloads: list[str]
+) -> None:
+    restored: list[str] = []
+
+    def fake_initiate(_client, _bucket: str, key: str, days: int) -> bool:
+        restored.append(key)
+        return False
+
+    monkeypatch.setattr("service.restore_coordinator.initiate_object_restore", fake_initiate)
+    cache = PartCache(tmp_path / "cache", max_bytes=1024)
+    first_dir = tmp_path / "first"
+    first_dir.mkdir()
+    (first_dir / "part-1").write_bytes(PART_BYTES["part-1"])
+    assert cache.add(hashlib.sha256(PART_BYTES["part-1"]).hexdigest(), first_dir / "part-1")
+    retrieval = _retrieval()
+    session.add(retrieval)
+    session.commit()
+    download_dir = tmp_path / "second"
+    download_dir.mkdir()
+    pipeline = _PartRetrievalPipeline(
+        session=session,
+        retrieval=retrieval,
+        client=object(),
+        settings=SETTINGS,
+        object_prefix=PREFIX,
+        download_dir=download_dir,
+        part_entries=_entries(),
+        started_at=datetime.now(),
+        part_cache=cache,
+    )
+
+    pipeline.run([f"{PREFIX}{name}" for name in PART_BYTES])
+    pipeline.release_cached_parts()
+
+    # part-1 came from the cache; part-2 was downloaded and is now cached too.
+    assert restored == downloads == [f"{PREFIX}part-2"]
+    assert (download_dir / "part-1").read_bytes() == PART_BYTES["part-1"]
+    assert json.loads(retrieval.retrieved_part_keys_json or "[]") == [f"{PREFIX}part-1", f"{PREFIX}part-2"]
+    assert cache.acquire(hashlib.sha256(PART_BYTES["part-2"]).hexdigest(), tmp_path / "part-2")
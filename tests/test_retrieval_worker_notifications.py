@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 from contextlib import contextmanager
 from datetime import datetime
+from hashlib import sha256
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
@@ -18,22 +19,14 @@ from models.submission import ArchiveJobStage, ArchiveSubmission
 from workers.retrieval_worker import run_archive_retrieval
 
 
-class _FakeTarFile:
-    def __init__(self, destination_path: Path, drive_name: str):
-        self._destination_path = destination_path
-        self._drive_name = drive_name
-
-    def __enter__(self) -> _FakeTarFile:
-        return self
-
-    def __exit__(self, exc_type, exc, tb) -> None:
-        return None
-
-    def extractall(self, path: Path, filter: str) -> None:
-        del filter
-        target = path / self._drive_name
-        target.mkdir(parents=True, exist_ok=True)
-        (target / "restored.txt").write_text("ok", encoding="utf-8")
+def _manifest(drive_name: str) -> dict[str, Any]:
+    part = {
+        "index": 1,
+        "file_name": "archive.tar.gz.part-00001",
+        "size_bytes": 4,
+        "sha256": sha256(b"part").hexdigest(),
+    }
+    return {"source_root": drive_name, "parts": [part]}
 
 
 def _create_submission_and_retrieval(engine: Engine, destination_path: str) -> tuple[int, int, str]:
@@ -87,6 +80,12 @@ def test_run_archive_retrieval_sends_completed_notification(tmp_path: Path, monk
         activescale_restore_poll_interval_seconds=1,
         activescale_restore_poll_max_seconds=5,
         activescale_restore_days=1,
+        activescale_restore_workers=2,
+        retrieval_download_workers=2,
+        retrieval_max_local_parts=2,
+        retrieval_part_cache_max_bytes=0,
+        retrieval_extract_workers=2,
+        bagit_checksum_workers=2,
     )
     monkeypatch.setattr("workers.retrieval_worker.get_settings", lambda: settings)
 
@@ -95,29 +94,24 @@ def test_run_archive_retrieval_sends_completed_notification(tmp_path: Path, monk
         yield object()
 
     monkeypatch.setattr("workers.retrieval_worker.get_activescale_client_context", fake_client_context)
-    monkeypatch.setattr("workers.retrieval_worker.initiate_object_restore", lambda *_args, **_kwargs: False)
+    monkeypatch.setattr("service.restore_coordinator.initiate_object_restore", lambda *_args, **_kwargs: False)
 
-    def fake_download(_client, _bucket: str, key: str, dest: Path) -> bool:
+    def fake_download(_client, _bucket: str, key: str, dest: Path) -> str:
         if str(key).endswith("archive-manifest.json"):
             dest.write_text(json.dumps({"source_root": drive_name}), encoding="utf-8")
         else:
             dest.write_bytes(b"part")
-        return True
+        return sha256(dest.read_bytes()).hexdigest()
 
     monkeypatch.setattr("workers.retrieval_worker.download_file_to_disk", fake_download)
-    monkeypatch.setattr("workers.retrieval_worker.load_archive_manifest", lambda _path: {"source_root": drive_name})
-    monkeypatch.setattr(
-        "workers.retrieval_worker.ordered_part_object_keys",
-        lambda prefix, _manifest: [f"{prefix}archive.tar.gz.part-00001"],
-    )
-    monkeypatch.setattr(
-        "workers.retrieval_worker.reassemble_archive_from_manifest",
-        lambda **kwargs: Path(str(kwargs["output_tar_path"])).write_bytes(b"tar"),
-    )
-    monkeypatch.setattr(
-        "workers.retrieval_worker.tarfile.open",
-        lambda *_args, **_kwargs: _FakeTarFile(destination_path, drive_name),
-    )
+    monkeypatch.setattr("workers.retrieval_worker.load_archive_manifest", lambda _path: _manifest(drive_name))
+
+    def fake_extract(_parts, _parts_dir: Path, dest_path: Path, _codec, **_kwargs: Any) -> None:
+        target = dest_path / drive_name
+        target.mkdir(parents=True, exist_ok=True)
+        (target / "restored.txt").write_text("ok", encoding="utf-8")
+
+    monkeypatch.setattr("workers.retrieval_worker.extract_tar_parts_stream", fake_extract)
     monkeypatch.setattr("workers.retrieval_worker.bagit_exists", lambda _path: False)
 
     notifications: list[dict[str, Any]] = []
@@ -164,6 +158,12 @@ def test_run_archive_retrieval_sends_failed_notification(tmp_path: Path, monkeyp
         activescale_restore_poll_interval_seconds=1,
         activescale_restore_poll_max_seconds=5,
         activescale_restore_days=1,
+        activescale_restore_workers=2,
+        retrieval_download_workers=2,
+        retrieval_max_local_parts=2,
+        retrieval_part_cache_max_bytes=0,
+        retrieval_extract_workers=2,
+        bagit_checksum_workers=2,
     )
     monkeypatch.setattr("workers.retrieval_worker.get_settings", lambda: settings)
 
@@ -172,20 +172,16 @@ def test_run_archive_retrieval_sends_failed_notification(tmp_path: Path, monkeyp
         yield object()
 
     monkeypatch.setattr("workers.retrieval_worker.get_activescale_client_context", fake_client_context)
-    monkeypatch.setattr("workers.retrieval_worker.initiate_object_restore", lambda *_args, **_kwargs: False)
+    monkeypatch.setattr("service.restore_coordinator.initiate_object_restore", lambda *_args, **_kwargs: False)
 
-    def fake_download(_client, _bucket: str, key: str, dest: Path) -> bool:
+    def fake_download(_client, _bucket: str, key: str, dest: Path) -> str | None:
         if str(key).endswith("archive-manifest.json"):
             dest.write_text(json.dumps({"source_root": drive_name}), encoding="utf-8")
-            return True
-        return False
+            return sha256(dest.read_bytes()).hexdigest()
+        return None
 
     monkeypatch.setattr("workers.retrieval_worker.download_file_to_disk", fake_download)
-    monkeypatch.setattr("workers.retrieval_worker.load_archive_manifest", lambda _path: {"source_root": drive_name})
-    monkeypatch.setattr(
-        "workers.retrieval_worker.ordered_part_object_keys",
-        lambda prefix, _manifest: [f"{prefix}archive.tar.gz.part-00001"],
-    )
+    monkeypatch.setattr("workers.retrieval_worker.load_archive_manifest", lambda _path: _manifest(drive_name))
 
     notifications: list[dict[str, Any]] = []
 
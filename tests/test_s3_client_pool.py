@@ -0,0 +1,81 @@
+"""Tests for the shared S3 client pool."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+from service.s3_client_pool import S3ClientPool
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_borrowers_share_one_client_per_key() -> None:
+    pool = S3ClientPool()
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    seen: list[object] = []
+
+    def borrow() -> None:
+        with pool.borrow("settings-a", factory) as client:
+            seen.append(client)
+
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert factory.call_count == 1
+    assert len({id(client) for client in seen}) == 1
+    with pool.borrow("settings-b", factory) as other:
+        assert other is not seen[0]
+    assert len(pool) == 2
+
+
+def test_idle_clients_are_evicted_but_borrowed_ones_are_kept() -> None:
+    clock = FakeClock()
+    pool = S3ClientPool(idle_timeout=60, clock=clock)
+    with pool.borrow("idle", MagicMock) as idle_client:
+        pass
+    with pool.borrow("busy", MagicMock) as busy_client:
+        clock.now = 120
+        assert pool.evict_idle() == 1
+        idle_client.close.assert_called_once()
+        busy_client.close.assert_not_called()
+    assert len(pool) == 1
+
+
+def test_unhealthy_client_is_replaced() -> None:
+    clock = FakeClock()
+    healthy = MagicMock(return_value=True)
+    pool = S3ClientPool(health_check=healthy, health_check_interval=30, clock=clock)
+    with pool.borrow("key", MagicMock) as first:
+        pass
+    with pool.borrow("key", MagicMock) as same:
+        assert same is first
+    healthy.assert_not_called()
+
+    clock.now = 31
+    healthy.return_value = False
+    with pool.borrow("key", MagicMock) as replacement:
+        assert replacement is not first
+    first.close.assert_called_once()
+    healthy.assert_called_once_with(first)
+
+
+def test_close_defers_closing_borrowed_clients() -> None:
+    pool = S3ClientPool()
+    with pool.borrow("idle", MagicMock) as idle_client:
+        pass
+    with pool.borrow("busy", MagicMock) as busy_client:
+        pool.close()
+        idle_client.close.assert_called_once()
+        busy_client.close.assert_not_called()
+    busy_client.close.assert_called_once()
+    assert len(pool) == 0
@@ -0,0 +1,107 @@
+"""Tests for bringing databases created by earlier releases up to the current schema."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import Session, select
+
+from api.dependencies import add_missing_columns
+from models.common import ArchiveCodec
+from models.retrieval import ArchiveRetrieval
+from models.submission import ArchiveSubmission
+
+# Schema created by the release before archive codecs, streamed parts and partial retrievals.
+_BASELINE_SCHEMA = [
+    """
+    CREATE TABLE archiveretrieval (
+        id INTEGER NOT NULL,
+        drive_name VARCHAR NOT NULL,
+        submission_id INTEGER NOT NULL,
+        destination_path VARCHAR NOT NULL,
+        stage VARCHAR(11) NOT NULL,
+        failure_reason VARCHAR,
+        retrieved_part_keys_json VARCHAR,
+        started_timestamp DATETIME,
+        last_updated_timestamp DATETIME,
+        completed_timestamp DATETIME,
+        failed_timestamp DATETIME,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE TABLE archivesubmission (
+        id INTEGER NOT NULL,
+        drive_id INTEGER NOT NULL,
+        project_id INTEGER NOT NULL,
+        drive_name VARCHAR NOT NULL,
+        retention_period_years INTEGER NOT NULL,
+        retention_period_justification VARCHAR,
+        data_classification VARCHAR(10) NOT NULL,
+        archive_file_key VARCHAR,
+        archive_object_prefix VARCHAR,
+        archive_manifest_key VARCHAR,
+        archive_part_keys_json VARCHAR,
+        archive_part_count INTEGER,
+        archive_total_bytes INTEGER,
+        failure_reason VARCHAR,
+        failed_timestamp DATETIME,
+        stage VARCHAR(16) NOT NULL,
+        started_timestamp DATETIME,
+        last_updated_timestamp DATETIME,
+        completed_timestamp DATETIME,
+        retry_count INTEGER NOT NULL,
+        cleanup_succeeded BOOLEAN,
+        cleanup_error VARCHAR,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    INSERT INTO archivesubmission (
+        id, drive_id, project_id, drive_name, retention_period_years, data_classification, stage, retry_count
+    ) VALUES (1, 1, 101, 'resmed202200024-testing', 7, 'SENSITIVE', 'COMPLETED', 0)
+    """,
+]
+
+
+@pytest.fixture(name="baseline_engine")
+def baseline_engine_fixture(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    with engine.begin() as connection:
+        for statement in _BASELINE_SCHEMA:
+            connection.execute(text(statement))
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def test_adds_new_columns_to_a_baseline_database(baseline_engine) -> None:
+    added = add_missing_columns(baseline_engine)
+
+    assert set(added) == {
+        "archivesubmission.archive_codec",
+        "archivesubmission.archive_part_sha256_json",
+        "archivesubmission.archive_multipart_upload_json",
+        "archiveretrieval.restore_part_count",
+        "archiveretrieval.restored_part_count",
+        "archiveretrieval.include_paths_json",
+    }
+    with Session(baseline_engine) as session:
+        submission = session.exec(select(ArchiveSubmission)).one()
+        assert submission.drive_name == "resmed202200024-testing"
+        assert submission.archive_codec is None
+        submission.archive_codec = ArchiveCodec.ZSTD
+        session.add(submission)
+        session.commit()
+        assert session.exec(select(ArchiveRetrieval)).all() == []
+
+
+def test_adding_columns_again_changes_nothing(baseline_engine) -> None:
+    add_missing_columns(baseline_engine)
+    columns = [column["name"] for column in inspect(baseline_engine).get_columns("archivesubmission")]
+
+    assert add_missing_columns(baseline_engine) == []
+    assert [column["name"] for column in inspect(baseline_engine).get_columns("archivesubmission")] == columns
@@ -0,0 +1,74 @@
+"""Tests for tar extraction with a pool of writer threads."""
+
+from __future__ import annotations
+
+import io
+import os
+import stat
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from packaging.tar_extraction import extract_members
+
+
+def _add(tar: tarfile.TarFile, name: str, data: bytes | None = None, **attrs: object) -> None:
+    info = tarfile.TarInfo(name)
+    for key, value in attrs.items():
+        setattr(info, key, value)
+    if data is not None:
+        info.size = len(data)
+    tar.addfile(info, io.BytesIO(data) if data is not None else None)
+
+
+def _stream(build: list[tuple]) -> tarfile.TarFile:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, data, attrs in build:
+            _add(tar, name, data, **attrs)
+    buffer.seek(0)
+    return tarfile.open(fileobj=buffer, mode="r|")
+
+
+def test_extracts_files_links_and_attributes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("packaging.tar_extraction._SMALL_MEMBER_BYTES", 64)
+    monkeypatch.setattr("packaging.tar_extraction._STREAM_CHUNK_BYTES", 100)
+    large = os.urandom(1000)
+    members = [
+        ("drive", None, {"type": tarfile.DIRTYPE, "mtime": 1_000_000}),
+        ("drive/small.txt", b"small", {"mode": 0o640, "mtime": 2_000_000}),
+        ("drive/nested/large.bin", large, {"mode": 0o600, "mtime": 3_000_000}),
+        *[(f"drive/many/{i}.txt", str(i).encode(), {}) for i in range(50)],
+        # A hard link's attributes apply to the inode it shares with its target.
+        (
+            "drive/hard.bin",
+            None,
+            {"type": tarfile.LNKTYPE, "linkname": "drive/nested/large.bin", "mode": 0o600, "mtime": 3_000_000},
+        ),
+        ("drive/soft.txt", None, {"type": tarfile.SYMTYPE, "linkname": "small.txt"}),
+    ]
+
+    with _stream(members) as tar:
+        assert extract_members(tar, tmp_path, workers=4) == len(members)
+
+    root = tmp_path / "drive"
+    assert (root / "small.txt").read_bytes() == b"small"
+    assert (root / "nested" / "large.bin").read_bytes() == large
+    assert all((root / "many" / f"{i}.txt").read_bytes() == str(i).encode() for i in range(50))
+    assert (root / "hard.bin").read_bytes() == large
+    assert os.readlink(root / "soft.txt") == "small.txt"
+    assert stat.S_IMODE((root / "small.txt").stat().st_mode) == 0o640
+    assert (root / "small.txt").stat().st_mtime == 2_000_000
+    assert (root / "nested" / "large.bin").stat().st_mtime == 3_000_000
+    # Set after the files inside were written, which would otherwise bump it.
+    assert root.stat().st_mtime == 1_000_000
+
+
+def test_refuses_members_the_data_filter_rejects(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+
+    with _stream([("../escape.txt", b"nope", {})]) as tar, pytest.raises(tarfile.OutsideDestinationError):
+        extract_members(tar, dest, workers=2)
+
+    assert not (tmp_path / "escape.txt").exists()
@@ -0,0 +1,61 @@
+"""Tests for S3 transfer profiles and the throughput auto-tuner."""
+
+from __future__ import annotations
+
+import socket
+
+from service.transfer_profile import TransferAutotuner, TransferProfile
+
+MIB = 1024 * 1024
+BASE = TransferProfile(
+    multipart_threshold_bytes=64 * MIB,
+    multipart_chunk_size_bytes=8 * MIB,
+    max_concurrency=8,
+    max_pool_connections=32,
+)
+
+
+def test_chunk_size_scales_with_object_and_respects_s3_limits() -> None:
+    tuner = TransferAutotuner(BASE)
+    assert tuner.concurrency == 4
+
+    # Small objects keep the configured chunk size.
+    assert tuner.profile_for(10 * MIB).multipart_chunk_size_bytes == 8 * MIB
+    # 4 workers x 4 chunks each over 1 GiB.
+    assert tuner.profile_for(1024 * MIB).multipart_chunk_size_bytes == 64 * MIB
+    # A 10 TiB object would need more than 10,000 parts at a smaller size.
+    huge = 10 * 1024 * 1024 * MIB
+    chunk = tuner.profile_for(huge).multipart_chunk_size_bytes
+    assert chunk % MIB == 0
+    assert huge / chunk <= 10_000
+
+
+def test_autotuner_climbs_while_throughput_improves_then_turns() -> None:
+    tuner = TransferAutotuner(BASE)
+    size = 1024 * MIB
+
+    for seconds in (10.0, 8.0, 6.0):
+        tuner.record(size, seconds, tuner.profile_for(size))
+    assert tuner.concurrency == 7
+
+    # Slower than the last measurement: step back down.
+    tuner.record(size, 9.0, tuner.profile_for(size))
+    assert tuner.concurrency == 6
+
+    # Transfers below the multipart threshold or made with a stale profile are ignored.
+    tuner.record(MIB, 0.001, tuner.profile_for(MIB))
+    tuner.record(size, 1.0, TransferProfile(64 * MIB, 8 * MIB, 2, 32))
+    assert tuner.concurrency == 6
+
+
+def test_autotuner_stays_within_bounds() -> None:
+    tuner = TransferAutotuner(BASE)
+    for _ in range(20):
+        tuner.record(1024 * MIB, 1.0, tuner.profile_for(1024 * MIB))
+        assert 1 <= tuner.concurrency <= BASE.max_concurrency
+
+
+def test_socket_options_only_for_configured_buffers() -> None:
+    assert not BASE.socket_options()
+    profile = TransferProfile(64 * MIB, 8 * MIB, 8, 32, socket_receive_buffer_bytes=4 * MIB)
+    assert profile.socket_options() == [(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * MIB)]